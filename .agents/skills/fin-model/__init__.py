@@ -2,8 +2,11 @@
 try:
     from .fin_model import FinModel, build_and_verify, shadow_model, scenario_ebitda
     from .verify import run_full_check
+    from .monte_carlo import simulate, shadow_model_vec
 except ImportError:  # when imported as a flat module via sys.path insert
     from fin_model import FinModel, build_and_verify, shadow_model, scenario_ebitda
     from verify import run_full_check
+    from monte_carlo import simulate, shadow_model_vec
 
-__all__ = ["FinModel", "build_and_verify", "run_full_check", "shadow_model", "scenario_ebitda"]
+__all__ = ["FinModel", "build_and_verify", "run_full_check", "shadow_model", "scenario_ebitda",
+           "simulate", "shadow_model_vec"]
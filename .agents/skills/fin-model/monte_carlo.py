@@ -0,0 +1,242 @@
+"""
+monte_carlo.py — Vectorized stochastic shadow model (MAF skill: fin-model)
+════════════════════════════════════════════════════════════════════════════
+Meta App Factory | Native Python Ecosystem
+
+`shadow_model` answers "what does the plan do?" for ONE set of assumptions and
+the workbook's Bear/Base/Bull block moves three multipliers. This module runs
+the same P&L → cash-flow arithmetic (NOL-adjusted cash tax, ΔNWC, year-1 capex)
+over 100k+ sampled scenarios at once with NumPy, one array op per model line per
+year, and reduces them to percentile bands:
+
+  • free cash flow by year, and cumulative FCF at the horizon
+  • peak funding requirement (deepest point of cumulative FCF)
+  • break-even year (first year of positive EBITDA, as in the summary)
+  • driver ranking: correlation of each sampled driver with horizon cum. FCF
+
+Drivers sampled (see DEFAULT_DISTRIBUTIONS): growth is an absolute annual rate
+centred on the assumption; volume / price / cogs / opex are multipliers
+centred on 1.0 applied to the base assumptions, exactly like scenario_ebitda.
+
+A degenerate run (every driver "fixed") reproduces shadow_model to the cent;
+`benchmark()` times the scalar shadow_model loop against the vectorized pass.
+
+Usage:
+    from monte_carlo import simulate
+    mc = simulate(assumptions, n=100_000, seed=7)
+    mc["peak_funding"]["p95"], mc["break_even_year"]["never_pct"]
+
+    python monte_carlo.py [assumptions.json] [-n 100000]   # benchmark
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+from typing import Optional
+
+import numpy as np
+
+try:
+    from .fin_model import _cogs_per_unit, shadow_model
+except ImportError:  # when imported as a flat module via sys.path insert
+    from fin_model import _cogs_per_unit, shadow_model
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# growth: absolute annual rate (mean defaults to the assumption's rate).
+# volume / price / cogs / opex: multipliers on the base assumption (mean 1.0).
+DEFAULT_DISTRIBUTIONS = {
+    "growth": {"dist": "normal", "sd": 0.10},
+    "volume": {"dist": "normal", "sd": 0.10},
+    "price": {"dist": "normal", "sd": 0.05},
+    "cogs": {"dist": "normal", "sd": 0.08},
+    "opex": {"dist": "normal", "sd": 0.10},
+}
+DRIVERS = tuple(DEFAULT_DISTRIBUTIONS)
+
+
+def _sample(rng: np.random.Generator, spec: dict, centre: float, n: int) -> np.ndarray:
+    """Draw n values for one driver. Supported: normal, lognormal, triangular, uniform, fixed."""
+    dist = spec.get("dist", "normal")
+    if dist == "fixed":
+        return np.full(n, float(spec.get("value", centre)))
+    if dist == "normal":
+        return rng.normal(float(spec.get("mean", centre)), float(spec.get("sd", 0.0)), n)
+    if dist == "lognormal":
+        # Multiplicative noise with the requested mean.
+        s = float(spec.get("sigma", spec.get("sd", 0.0)))
+        return float(spec.get("mean", centre)) * rng.lognormal(-0.5 * s * s, s, n)
+    if dist == "triangular":
+        return rng.triangular(float(spec["low"]), float(spec.get("mode", centre)), float(spec["high"]), n)
+    if dist == "uniform":
+        return rng.uniform(float(spec["low"]), float(spec["high"]), n)
+    raise ValueError(f"unknown distribution '{dist}' (use normal/lognormal/triangular/uniform/fixed)")
+
+
+def sample_drivers(a: dict, n: int, distributions: Optional[dict] = None,
+                   seed: Optional[int] = None) -> dict:
+    """Sample every driver; `distributions` overrides DEFAULT_DISTRIBUTIONS per key."""
+    specs = {**DEFAULT_DISTRIBUTIONS, **(distributions or {})}
+    unknown = set(specs) - set(DRIVERS)
+    if unknown:
+        raise ValueError(f"unknown driver(s) {sorted(unknown)}; expected {list(DRIVERS)}")
+    rng = np.random.default_rng(seed)
+    g0 = float(a.get("annual_growth_rate", 0))
+    drivers = {name: _sample(rng, specs[name], g0 if name == "growth" else 1.0, n) for name in DRIVERS}
+    # Keep draws physically meaningful: no negative prices/costs, no < -100% growth.
+    np.maximum(drivers["growth"], -0.99, out=drivers["growth"])
+    for name in ("volume", "price", "cogs", "opex"):
+        np.maximum(drivers[name], 0.0, out=drivers[name])
+    return drivers
+
+
+def shadow_model_vec(a: dict, growth, volume, price, cogs, opex) -> dict:
+    """shadow_model over arrays of drivers. Returns (n, years) arrays for the P&L /
+    cash lines plus per-scenario peak funding and break-even year (0 = never)."""
+    years = int(a.get("years", 5))
+    growth, volume, price, cogs, opex = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (growth, volume, price, cogs, opex)))
+    n = growth.shape[0]
+    unit_price = float(a.get("retail_price_per_unit", 0)) * price
+    unit_cogs = _cogs_per_unit(a) * cogs
+    annual_opex = float(a.get("monthly_fixed_opex", 0)) * 12.0 * opex
+    upm = float(a.get("units_per_month", 0)) * volume
+    tax_rate = float(a.get("tax_rate", 0))
+    nwc_ratio = float(a.get("nwc_days", 0)) / 365.0
+    capex_items = a.get("capex_items", [])
+    total_capex = sum(float(c.get("cost", 0)) for c in capex_items)
+    annual_dep = sum(float(c.get("cost", 0)) / max(float(c.get("useful_life_years", 1)), 1e-9)
+                     for c in capex_items)
+
+    ebitda = np.empty((n, years))
+    fcf = np.empty((n, years))
+    nol_bf = np.zeros(n)
+    prev_nwc = np.zeros(n)
+    growth_factor = np.ones(n)
+    for y in range(years):
+        units = upm * 12.0 * growth_factor
+        revenue = units * unit_price
+        e = units * (unit_price - unit_cogs) - annual_opex
+        ebit = e - annual_dep
+        taxable = np.maximum(0.0, ebit - nol_bf)
+        nol_bf = nol_bf - np.minimum(nol_bf, np.maximum(0.0, ebit)) + np.maximum(0.0, -ebit)
+        nwc = nwc_ratio * revenue
+        fcf[:, y] = e - (total_capex if y == 0 else 0.0) - tax_rate * taxable - (nwc - prev_nwc)
+        ebitda[:, y] = e
+        prev_nwc = nwc
+        growth_factor = growth_factor * (1.0 + growth)
+
+    cum_fcf = np.cumsum(fcf, axis=1)
+    positive = ebitda > 0
+    break_even_year = np.where(positive.any(axis=1), positive.argmax(axis=1) + 1, 0)
+    return dict(ebitda=ebitda, fcf=fcf, cum_fcf=cum_fcf,
+                peak_funding=np.maximum(0.0, -cum_fcf.min(axis=1)),
+                break_even_year=break_even_year)
+
+
+def _bands(values: np.ndarray, percentiles) -> dict:
+    """{"p5": ..., "p50": ..., "mean": ...}; a 2-D input gives per-year lists."""
+    pct = np.percentile(values, percentiles, axis=0)
+    out = {f"p{p:g}": np.round(v, 2).tolist() for p, v in zip(percentiles, pct)}
+    out["mean"] = np.round(values.mean(axis=0), 2).tolist()
+    return out
+
+
+def simulate(a: dict, n: int = 100_000, distributions: Optional[dict] = None,
+             seed: Optional[int] = None, percentiles=DEFAULT_PERCENTILES) -> dict:
+    """Run n stochastic scenarios in one vectorized pass and summarise the distributions."""
+    t0 = time.perf_counter()
+    drivers = sample_drivers(a, n, distributions, seed)
+    res = shadow_model_vec(a, **drivers)
+    years = res["fcf"].shape[1]
+
+    be = res["break_even_year"]
+    never = be == 0
+    # Discrete percentiles over "year or never"; never sorts after the horizon.
+    be_pct = np.percentile(np.where(never, years + 1, be), percentiles, method="inverted_cdf")
+    break_even = {f"p{p:g}": (int(v) if v <= years else None) for p, v in zip(percentiles, be_pct)}
+    break_even["never_pct"] = round(float(never.mean()) * 100, 2)
+    break_even["by_year_pct"] = {str(y): round(float((be == y).mean()) * 100, 2) for y in range(1, years + 1)}
+
+    horizon = res["cum_fcf"][:, -1]
+    sensitivity = {}
+    if horizon.std() > 0:
+        for name, x in drivers.items():
+            sensitivity[name] = round(float(np.corrcoef(x, horizon)[0, 1]), 3) if x.std() > 0 else 0.0
+    sensitivity = dict(sorted(sensitivity.items(), key=lambda kv: -abs(kv[1])))
+
+    return {
+        "n": n,
+        "seed": seed,
+        "years": years,
+        "percentiles": list(percentiles),
+        "distributions": {**DEFAULT_DISTRIBUTIONS, **(distributions or {})},
+        "fcf_by_year": _bands(res["fcf"], percentiles),
+        "ebitda_by_year": _bands(res["ebitda"], percentiles),
+        "cum_fcf_horizon": _bands(horizon, percentiles),
+        "peak_funding": _bands(res["peak_funding"], percentiles),
+        "break_even_year": break_even,
+        "prob_self_funding_pct": round(float((horizon > 0).mean()) * 100, 2),
+        "driver_correlation_cum_fcf": sensitivity,
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def scenario_assumptions(a: dict, growth: float, volume: float = 1.0, price: float = 1.0,
+                         cogs: float = 1.0, opex: float = 1.0) -> dict:
+    """The assumptions dict for one sampled scenario, for the scalar shadow_model."""
+    s = copy.deepcopy(a)
+    s["annual_growth_rate"] = growth
+    s["units_per_month"] = float(a.get("units_per_month", 0)) * volume
+    s["retail_price_per_unit"] = float(a.get("retail_price_per_unit", 0)) * price
+    s["monthly_fixed_opex"] = float(a.get("monthly_fixed_opex", 0)) * opex
+    for key in ("line_cost_per_minute", "labor_cost_per_unit", "packaging_cost_per_unit",
+                "logistics_cost_per_unit"):
+        s[key] = float(a.get(key, 0)) * cogs
+    for rm in s.get("raw_materials", []):
+        rm["unit_cost"] = float(rm.get("unit_cost", 0)) * cogs
+    return s
+
+
+def benchmark(a: dict, n: int = 100_000, scalar_n: int = 5_000, seed: int = 7) -> dict:
+    """Time the scalar shadow_model loop (on scalar_n scenarios, extrapolated to n)
+    against one vectorized simulate() pass, and check they agree."""
+    drivers = sample_drivers(a, scalar_n, seed=seed)
+    t0 = time.perf_counter()
+    scalar_peak = []
+    for i in range(scalar_n):
+        sm = shadow_model(scenario_assumptions(a, **{k: float(v[i]) for k, v in drivers.items()}))
+        scalar_peak.append(sm["peak_funding"])
+    scalar_s = (time.perf_counter() - t0) * n / scalar_n
+    vec_peak = shadow_model_vec(a, **drivers)["peak_funding"]
+
+    t1 = time.perf_counter()
+    simulate(a, n=n, seed=seed)
+    vec_s = time.perf_counter() - t1
+    return {
+        "n": n,
+        "scalar_s_extrapolated": round(scalar_s, 3),
+        "vectorized_s": round(vec_s, 3),
+        "speedup": round(scalar_s / vec_s, 1) if vec_s else None,
+        "max_abs_diff_peak_funding": float(np.max(np.abs(np.asarray(scalar_peak) - vec_peak))),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import os
+
+    parser = argparse.ArgumentParser(description="fin-model Monte Carlo benchmark")
+    parser.add_argument("assumptions", nargs="?",
+                        default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                             "sample_assumptions.json"))
+    parser.add_argument("-n", type=int, default=100_000)
+    args = parser.parse_args()
+    with open(args.assumptions) as f:
+        assumptions = json.load(f)
+    print(json.dumps(benchmark(assumptions, n=args.n), indent=2))
+    mc = simulate(assumptions, n=args.n, seed=7)
+    print(json.dumps({k: mc[k] for k in ("peak_funding", "break_even_year", "cum_fcf_horizon",
+                                         "driver_correlation_cum_fcf", "elapsed_ms")}, indent=2))
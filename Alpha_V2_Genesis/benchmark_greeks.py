@@ -0,0 +1,148 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║  ALPHA V2 GENESIS — GREEKS MICRO-BENCHMARK                   ║
+║  Scalar bs_greeks vs vectorized greeks_engine (offline)      ║
+╚══════════════════════════════════════════════════════════════╝
+
+Runs entirely on a cached chain snapshot — no network:
+
+  python benchmark_greeks.py                          # synthetic SPX chain
+  python benchmark_greeks.py --snapshot chain.json    # replay a saved chain
+
+A real snapshot can be captured with
+strategy_ledger.fetch_option_chain(expiry, snapshot_path="chain.json").
+
+Measures:
+  1. Every strike on the chain: strategy_ledger.bs_greeks in a loop vs one
+     bs_greeks_vec call (and the max abs difference between them).
+  2. Iron Condor strike grid: the per-condor scalar path (pandas row filter +
+     bs_greeks per leg, as fetch_leg_data / compute_live_challenger did) timed
+     on a sample and extrapolated to the full grid, vs scan_iron_condors.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from greeks_engine import (  # noqa: E402
+    bs_greeks_vec, chain_side, scan_iron_condors, ChainSnapshot,
+    load_chain_snapshot, save_chain_snapshot,
+)
+from strategy_ledger import bs_greeks  # noqa: E402
+
+
+def synthetic_chain(spot=6800.0, expiry="2026-12-18", step=5.0, t=45 / 365):
+    """SPX-like chain: 5-pt strikes over +/-40% with a downside IV skew."""
+    strikes = np.arange(round(spot * 0.6 / step) * step, spot * 1.4, step)
+    m = np.log(strikes / spot)
+    iv = np.clip(0.16 - 0.35 * m + 0.9 * m ** 2, 0.08, 1.2)
+
+    def side(flag):
+        px = bs_greeks_vec(flag, spot, strikes, t, 0.043, iv)["price"]
+        spread = np.maximum(0.05, px * 0.02)
+        return pd.DataFrame({"strike": strikes, "bid": np.maximum(px - spread / 2, 0.0),
+                             "ask": px + spread / 2, "lastPrice": px, "impliedVolatility": iv})
+
+    return ChainSnapshot(side("c"), side("p"), expiry, spot, None)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_strikes(chain, spot, t, r):
+    calls, puts = chain_side(chain.calls), chain_side(chain.puts)
+    flags = np.array(["c"] * len(calls.strike) + ["p"] * len(puts.strike))
+    K = np.concatenate([calls.strike, puts.strike])
+    iv = np.concatenate([calls.iv, puts.iv])
+
+    scalar_t, scalar = timed(lambda: [bs_greeks(f, spot, k, t, r, s) for f, k, s in zip(flags, K, iv)], repeat=3)
+    vec_t, vec = timed(lambda: bs_greeks_vec(flags, spot, K, t, r, iv))
+
+    max_diff = max(
+        float(np.max(np.abs(np.array([g[k] for g in scalar]) - vec[k]))) for k in ("delta", "gamma", "theta", "vega")
+    )
+    return len(K), scalar_t, vec_t, max_diff
+
+
+def bench_grid(chain, spot, t, r, wing, sample):
+    calls, puts = chain.calls, chain.puts
+
+    def leg(df, flag, target):
+        # The scalar path: exact-or-nearest pandas filter, then one bs_greeks call.
+        row = df[df["strike"] == target]
+        if row.empty:
+            row = df.iloc[[(df["strike"] - target).abs().idxmin()]]
+        iv = float(row["impliedVolatility"].values[0])
+        mark = (float(row["bid"].values[0]) + float(row["ask"].values[0])) / 2
+        return mark, bs_greeks(flag, spot, float(target), t, r, iv)
+
+    pg = bs_greeks_vec("p", spot, puts["strike"].to_numpy(), t, r, puts["impliedVolatility"].to_numpy())
+    cg = bs_greeks_vec("c", spot, calls["strike"].to_numpy(), t, r, calls["impliedVolatility"].to_numpy())
+    short_puts = puts["strike"].to_numpy()[(puts["strike"].to_numpy() < spot) & (np.abs(pg["delta"]) >= 0.05) & (np.abs(pg["delta"]) <= 0.20)]
+    short_calls = calls["strike"].to_numpy()[(calls["strike"].to_numpy() > spot) & (cg["delta"] >= 0.05) & (cg["delta"] <= 0.20)]
+    grid = [(p, c) for p in short_puts for c in short_calls]
+
+    rng = np.random.default_rng(7)
+    picks = rng.choice(len(grid), size=min(sample, len(grid)), replace=False)
+
+    def scalar_sample():
+        for i in picks:
+            p, c = grid[i]
+            leg(puts, "p", p - wing); leg(puts, "p", p)
+            leg(calls, "c", c); leg(calls, "c", c + wing)
+
+    sample_t, _ = timed(scalar_sample, repeat=1)
+    scalar_full = sample_t / len(picks) * len(grid)
+    vec_t, top = timed(lambda: scan_iron_condors(chain, spot, t, r, wing_width=wing, top_n=10))
+    return len(grid), scalar_full, vec_t, top
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs vectorized Black-Scholes benchmark (offline).")
+    parser.add_argument("--snapshot", help="chain snapshot JSON (written from a synthetic chain if missing)")
+    parser.add_argument("--dte", type=int, default=45)
+    parser.add_argument("--r", type=float, default=0.043)
+    parser.add_argument("--wing", type=float, default=25)
+    parser.add_argument("--scalar-sample", type=int, default=300,
+                        help="condors priced on the scalar path before extrapolating")
+    args = parser.parse_args()
+
+    path = args.snapshot or os.path.join(tempfile.gettempdir(), "alpha_benchmark_chain.json")
+    if not os.path.exists(path):
+        chain = synthetic_chain(t=args.dte / 365)
+        save_chain_snapshot(chain, path, chain.expiry, chain.spot)
+        print(f"Wrote synthetic chain snapshot: {path}")
+    chain = load_chain_snapshot(path)
+    spot, t = float(chain.spot), args.dte / 365
+
+    n, s_t, v_t, diff = bench_strikes(chain, spot, t, args.r)
+    print(f"\n[1] Greeks for {n} strikes")
+    print(f"    scalar bs_greeks : {s_t * 1e3:9.2f} ms")
+    print(f"    bs_greeks_vec    : {v_t * 1e3:9.2f} ms   ({s_t / v_t:,.0f}x)   max |diff| = {diff:.2e} (scalar rounds)")
+
+    n, s_t, v_t, top = bench_grid(chain, spot, t, args.r, args.wing, args.scalar_sample)
+    print(f"\n[2] Iron Condor grid: {n:,} candidates")
+    print(f"    scalar per-condor: {s_t:9.2f} s (extrapolated from {min(args.scalar_sample, n)} condors)")
+    print(f"    scan_iron_condors: {v_t * 1e3:9.2f} ms   ({s_t / v_t:,.0f}x)")
+    if top:
+        b = top[0]["strikes"]
+        print(f"    best: {b['long_put']:.0f}/{b['short_put']:.0f}p  {b['short_call']:.0f}/{b['long_call']:.0f}c  "
+              f"credit ${top[0]['net_credit']}  POP {top[0]['pop']:.1%}  score {top[0]['score']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+╔══════════════════════════════════════════════════════════════╗
+║  ALPHA V2 GENESIS — VECTORIZED GREEKS ENGINE                 ║
+║  Batch Black-Scholes + Iron Condor Strike-Grid Scanner       ║
+║                                                              ║
+║  Modules:                                                    ║
+║  1. bs_greeks_vec — whole arrays of legs priced in one pass  ║
+║  2. Nearest-strike lookup (searchsorted, no pandas filters)  ║
+║  3. scan_iron_condors — every candidate IC on a chain at once║
+║  4. Offline chain snapshots (JSON) for replay / benchmarks   ║
+╚══════════════════════════════════════════════════════════════╝
+
+Pure numpy/scipy: no network, no logging handlers, no V3 side effects, so
+strategy_ledger, Loki and offline tooling can all import it cheaply.
+
+Greeks follow strategy_ledger.bs_greeks exactly (per single option, theta in
+$/day, vega in $ per 1pp IV). Position aggregation uses the ledger's leg
+``sign`` convention (+1 short / credit leg, -1 long / debit leg) so scanner
+output lines up with compute_position_greeks().
+"""
+
+import json
+import os
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ncdf
+    SCIPY_OK = True
+except ImportError:
+    SCIPY_OK = False
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+GREEK_KEYS = ("delta", "gamma", "theta", "vega")
+
+
+# ══════════════════════════════════════════════════════════════════
+# 1. VECTORIZED BLACK-SCHOLES
+# ══════════════════════════════════════════════════════════════════
+
+def _npdf(x):
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def bs_greeks_vec(flag, S, K, t, r, sigma):
+    """
+    Black-Scholes price + Greeks for arrays of option legs in one pass.
+
+    Every argument broadcasts against the others. ``flag`` is 'c'/'p' (or an
+    array of them) or a boolean is-call array.
+
+    Returns dict of float64 arrays: price, delta, gamma, theta, vega, plus a
+    boolean ``valid`` mask. Invalid legs (t, sigma, S or K <= 0, or scipy
+    missing) are 0.0 across the board, matching bs_greeks()'s "unavailable".
+    """
+    flag = np.asarray(flag)
+    is_call = flag if flag.dtype == bool else (np.char.lower(flag.astype(str)) == "c")
+    S, K, t, r, sigma, is_call = np.broadcast_arrays(
+        np.asarray(S, dtype=float), np.asarray(K, dtype=float), np.asarray(t, dtype=float),
+        np.asarray(r, dtype=float), np.asarray(sigma, dtype=float), is_call,
+    )
+    valid = (t > 0) & (sigma > 0) & (S > 0) & (K > 0) & SCIPY_OK
+
+    # Substitute harmless values for invalid legs so no warnings are raised.
+    Sv = np.where(valid, S, 1.0)
+    Kv = np.where(valid, K, 1.0)
+    tv = np.where(valid, t, 1.0)
+    sv = np.where(valid, sigma, 1.0)
+
+    sqrt_t = np.sqrt(tv)
+    d1 = (np.log(Sv / Kv) + (r + 0.5 * sv ** 2) * tv) / (sv * sqrt_t)
+    d2 = d1 - sv * sqrt_t
+    pdf_d1 = _npdf(d1)
+    disc = Kv * np.exp(-r * tv)
+
+    if SCIPY_OK:
+        cdf_d1, cdf_d2 = _ncdf(d1), _ncdf(d2)
+    else:
+        cdf_d1 = cdf_d2 = np.zeros_like(d1)
+
+    decay = -(Sv * pdf_d1 * sv) / (2 * sqrt_t)
+    price = np.where(is_call, Sv * cdf_d1 - disc * cdf_d2,
+                     disc * (1 - cdf_d2) - Sv * (1 - cdf_d1))
+    delta = np.where(is_call, cdf_d1, cdf_d1 - 1)
+    theta = np.where(is_call, decay - r * disc * cdf_d2,
+                     decay + r * disc * (1 - cdf_d2)) / 365
+    gamma = pdf_d1 / (Sv * sv * sqrt_t)
+    vega = Sv * pdf_d1 * sqrt_t / 100
+
+    zero = np.zeros_like(d1)
+    return {
+        "price": np.where(valid, price, zero),
+        "delta": np.where(valid, delta, zero),
+        "gamma": np.where(valid, gamma, zero),
+        "theta": np.where(valid, theta, zero),
+        "vega":  np.where(valid, vega, zero),
+        "valid": valid,
+    }
+
+
+def prob_above(S, X, t, r, sigma):
+    """Risk-neutral P(S_T > X) = N(d2), vectorized. 1.0 for X <= 0, 0.0 where
+    otherwise undefined."""
+    S, X, t, r, sigma = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (S, X, t, r, sigma)))
+    if not SCIPY_OK:
+        return np.zeros(S.shape)
+    ok = (S > 0) & (X > 0) & (t > 0) & (sigma > 0)
+    Xv = np.where(ok, X, 1.0)
+    Sv = np.where(ok, S, 1.0)
+    tv = np.where(ok, t, 1.0)
+    sv = np.where(ok, sigma, 1.0)
+    d2 = (np.log(Sv / Xv) + (r - 0.5 * sv ** 2) * tv) / (sv * np.sqrt(tv))
+    return np.where(ok, _ncdf(d2), np.where(X <= 0, 1.0, 0.0))
+
+
+# ══════════════════════════════════════════════════════════════════
+# 2. CHAIN ARRAYS + NEAREST-STRIKE LOOKUP
+# ══════════════════════════════════════════════════════════════════
+
+ChainSide = namedtuple("ChainSide", ["strike", "bid", "ask", "last", "iv"])
+
+
+def chain_side(df) -> ChainSide:
+    """Pull one side of an option chain (calls or puts DataFrame) into
+    strike-sorted numpy arrays."""
+    strike = df["strike"].to_numpy(dtype=float)
+    order = np.argsort(strike, kind="stable")
+
+    def col(name):
+        if name not in df:
+            return np.zeros(len(order))
+        return np.nan_to_num(df[name].to_numpy(dtype=float)[order])
+
+    return ChainSide(strike[order], col("bid"), col("ask"), col("lastPrice"), col("impliedVolatility"))
+
+
+def nearest_strike_index(strikes, targets):
+    """Index of the listed strike closest to each target (ties -> lower strike,
+    as DataFrame idxmin() does on an ascending chain). ``strikes`` must be sorted."""
+    strikes = np.asarray(strikes, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    if len(strikes) < 2:
+        return np.zeros(targets.shape, dtype=int)
+    idx = np.clip(np.searchsorted(strikes, targets, side="left"), 1, len(strikes) - 1)
+    lower = strikes[idx - 1]
+    upper = strikes[idx]
+    return np.where(np.abs(targets - lower) <= np.abs(upper - targets), idx - 1, idx)
+
+
+def mid_price(side: ChainSide, idx):
+    """Bid/ask mid, falling back to last trade where either quote is missing."""
+    bid, ask = side.bid[idx], side.ask[idx]
+    return np.where((bid > 0) & (ask > 0), (bid + ask) / 2, side.last[idx])
+
+
+# ══════════════════════════════════════════════════════════════════
+# 3. IRON CONDOR STRIKE-GRID SCAN
+# ══════════════════════════════════════════════════════════════════
+
+def scan_iron_condors(chain, spot, t, r, wing_width=25, short_delta=(0.05, 0.20),
+                      multiplier=100, top_n=10):
+    """
+    Evaluate every (short put, short call) Iron Condor on a chain at once.
+
+    Candidate short strikes are OTM options whose |delta| falls inside
+    ``short_delta``; each long wing is the listed strike nearest
+    ``wing_width`` points further out. Greeks are computed once per listed
+    strike, then the put-spread and call-spread vectors are combined by
+    broadcasting into a P x C grid of condors.
+
+    Ranking: score = POP x credit / max_loss, where POP is the risk-neutral
+    probability of expiring between the two breakevens (each side priced at
+    its short strike's IV).
+
+    Returns up to ``top_n`` dicts, best first.
+    """
+    puts, calls = chain_side(chain.puts), chain_side(chain.calls)
+    if len(puts.strike) < 2 or len(calls.strike) < 2:
+        return []
+
+    pg = bs_greeks_vec("p", spot, puts.strike, t, r, puts.iv)
+    cg = bs_greeks_vec("c", spot, calls.strike, t, r, calls.iv)
+    lo, hi = short_delta
+
+    sp = np.nonzero((puts.strike < spot) & pg["valid"]
+                    & (np.abs(pg["delta"]) >= lo) & (np.abs(pg["delta"]) <= hi))[0]
+    sc = np.nonzero((calls.strike > spot) & cg["valid"]
+                    & (cg["delta"] >= lo) & (cg["delta"] <= hi))[0]
+    lp = nearest_strike_index(puts.strike, puts.strike[sp] - wing_width)
+    lc = nearest_strike_index(calls.strike, calls.strike[sc] + wing_width)
+    keep_p, keep_c = lp != sp, lc != sc
+    sp, lp, sc, lc = sp[keep_p], lp[keep_p], sc[keep_c], lc[keep_c]
+    if not len(sp) or not len(sc):
+        return []
+
+    put_mid, call_mid = mid_price(puts, np.arange(len(puts.strike))), mid_price(calls, np.arange(len(calls.strike)))
+    put_credit = put_mid[sp] - put_mid[lp]
+    call_credit = call_mid[sc] - call_mid[lc]
+    put_width = puts.strike[sp] - puts.strike[lp]
+    call_width = calls.strike[lc] - calls.strike[sc]
+
+    # Put-side rows x call-side columns.
+    credit = put_credit[:, None] + call_credit[None, :]
+    max_loss = np.maximum(put_width[:, None], call_width[None, :]) - credit
+    be_put = puts.strike[sp][:, None] - credit
+    be_call = calls.strike[sc][None, :] + credit
+    pop = (prob_above(spot, be_put, t, r, puts.iv[sp][:, None])
+           - prob_above(spot, be_call, t, r, calls.iv[sc][None, :]))
+    pop = np.clip(pop, 0.0, 1.0)
+
+    net = {}
+    for g in GREEK_KEYS:
+        net[g] = ((pg[g][sp] - pg[g][lp])[:, None] + (cg[g][sc] - cg[g][lc])[None, :])
+
+    ok = (credit > 0) & (max_loss > 0)
+    score = np.where(ok, pop * credit / np.where(ok, max_loss, 1.0), -np.inf)
+
+    flat = score.ravel()
+    n = min(top_n, int(ok.sum()))
+    if n == 0:
+        return []
+    best = np.argpartition(-flat, n - 1)[:n]
+    best = best[np.argsort(-flat[best], kind="stable")]
+
+    results = []
+    for i, j in zip(*np.unravel_index(best, score.shape)):
+        results.append({
+            "strikes": {
+                "long_put":   float(puts.strike[lp[i]]),
+                "short_put":  float(puts.strike[sp[i]]),
+                "short_call": float(calls.strike[sc[j]]),
+                "long_call":  float(calls.strike[lc[j]]),
+            },
+            "net_credit":       round(float(credit[i, j]), 2),
+            "max_loss":         round(float(max_loss[i, j]), 2),
+            "pop":              round(float(pop[i, j]), 4),
+            "score":            round(float(score[i, j]), 4),
+            "short_put_delta":  round(float(pg["delta"][sp[i]]), 4),
+            "short_call_delta": round(float(cg["delta"][sc[j]]), 4),
+            "put_margin_pct":   round((spot - float(puts.strike[sp[i]])) / spot * 100, 2),
+            "call_margin_pct":  round((float(calls.strike[sc[j]]) - spot) / spot * 100, 2),
+            "net_delta_per_pt":  round(float(net["delta"][i, j]) * multiplier, 2),
+            "net_theta_per_day": round(float(net["theta"][i, j]) * multiplier, 2),
+            "net_vega_per_pp":   round(float(net["vega"][i, j]) * multiplier, 2),
+            "net_gamma":         round(float(net["gamma"][i, j]), 7),
+        })
+    return results
+
+
+def years_to_expiry(expiry: str, today=None) -> float:
+    """Calendar-day year fraction, floored at one day (as fetch_leg_data does)."""
+    today = today or datetime.now().date()
+    exp_date = datetime.strptime(expiry, "%Y-%m-%d").date()
+    return max((exp_date - today).days / 365.0, 1 / 365)
+
+
+# ══════════════════════════════════════════════════════════════════
+# 4. OFFLINE CHAIN SNAPSHOTS
+# ══════════════════════════════════════════════════════════════════
+
+ChainSnapshot = namedtuple("ChainSnapshot", ["calls", "puts", "expiry", "spot", "captured_at"])
+
+_SNAPSHOT_COLUMNS = ("strike", "bid", "ask", "lastPrice", "impliedVolatility")
+
+
+def save_chain_snapshot(chain, path, expiry, spot):
+    """Persist the pricing columns of a yfinance option chain to JSON."""
+    doc = {"expiry": expiry, "spot": float(spot), "captured_at": datetime.now().isoformat()}
+    for side in ("calls", "puts"):
+        df = getattr(chain, side)
+        doc[side] = {c: [float(v) for v in df[c].fillna(0.0)] for c in _SNAPSHOT_COLUMNS if c in df}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f)
+    os.replace(tmp, path)
+    return path
+
+
+def load_chain_snapshot(path) -> ChainSnapshot:
+    """Load a snapshot as a drop-in for ``yf.Ticker(...).option_chain(expiry)``."""
+    import pandas as pd
+
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    return ChainSnapshot(pd.DataFrame(doc["calls"]), pd.DataFrame(doc["puts"]),
+                         doc.get("expiry"), doc.get("spot"), doc.get("captured_at"))
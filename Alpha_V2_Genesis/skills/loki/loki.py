@@ -72,6 +72,7 @@ if _alpha_root2 in _sys2.path:
 _sys2.path.insert(0, _alpha_root2)
 
 from utils.system_alerts import play_alert_sound, show_popup
+from greeks_engine import chain_side, nearest_strike_index, mid_price, scan_iron_condors, years_to_expiry
 from skills.opinion.opinion import OpinionAgent
 
 class Loki:
@@ -513,25 +514,21 @@ class Loki:
             if chain is None:
                 return {"available": False, "reason": f"Chain unavailable for {best_exp}"}
 
-            # ── Fuzzy leg pricer w/ Slippage (75% to Nat Bid for Opening Credit) ──
-            def _leg(df, target):
-                exact = df[df['strike'] == target]
-                row   = exact if not exact.empty else df.iloc[[(df['strike'] - target).abs().idxmin()]]
-                bid   = float(row['bid'].values[0])
-                ask   = float(row['ask'].values[0])
-                last  = float(row['lastPrice'].values[0])
-                mid   = (bid + ask) / 2 if bid > 0 and ask > 0 else last
-                iv    = float(row['impliedVolatility'].values[0]) * 100
-                act   = float(row['strike'].values[0])
-                return round(mid, 2), round(bid, 2), round(ask, 2), int(act), round(iv, 2)
-
-            puts  = chain.puts
-            calls = chain.calls
-
-            lp_mid, lp_bid, lp_ask, lp_act, lp_iv = _leg(puts,  long_put)
-            sp_mid, sp_bid, sp_ask, sp_act, sp_iv = _leg(puts,  short_put)
-            sc_mid, sc_bid, sc_ask, sc_act, sc_iv = _leg(calls, short_call)
-            lc_mid, lc_bid, lc_ask, lc_act, lc_iv = _leg(calls, long_call)
+            # ── Fuzzy leg pricer: one vectorized nearest-strike pass per side ──
+            puts  = chain_side(chain.puts)
+            calls = chain_side(chain.calls)
+
+            def _legs(side, targets):
+                idx = nearest_strike_index(side.strike, targets)
+                mid = mid_price(side, idx)
+                return [(round(float(mid[k]), 2), round(float(side.bid[i]), 2), round(float(side.ask[i]), 2),
+                         int(side.strike[i]), round(float(side.iv[i]) * 100, 2))
+                        for k, i in enumerate(idx)]
+
+            (lp_mid, lp_bid, lp_ask, lp_act, lp_iv), \
+                (sp_mid, sp_bid, sp_ask, sp_act, sp_iv) = _legs(puts, [long_put, short_put])
+            (sc_mid, sc_bid, sc_ask, sc_act, sc_iv), \
+                (lc_mid, lc_bid, lc_ask, lc_act, lc_iv) = _legs(calls, [short_call, long_call])
 
             # Net credit = SELL put spread + SELL call spread with 75% OPEN slippage
             # Mid Net Credit
@@ -589,6 +586,15 @@ class Loki:
                 "source": "live_compute",
             }
 
+            # Alternatives: every candidate condor on the same chain, scored at once.
+            try:
+                # Same rate source as the ledger's scalar path (10Y yield, 4.3% offline).
+                from strategy_ledger import _fetch_risk_free_rate
+                blueprint["grid_candidates"] = scan_iron_condors(
+                    chain, spx, years_to_expiry(best_exp), _fetch_risk_free_rate(), top_n=5)
+            except Exception as e:
+                logger.warning(f"[LiveChallenger] strike-grid scan skipped: {e}")
+
             logger.info(
                 f"[LiveChallenger] {best_exp} | "
                 f"Puts {lp_act}/{sp_act}  Calls {sc_act}/{lc_act} | "
@@ -55,6 +55,10 @@ try:
     SCIPY_OK = True
 except ImportError:
     SCIPY_OK = False
+from greeks_engine import (
+    bs_greeks_vec, chain_side, nearest_strike_index, scan_iron_condors,
+    years_to_expiry, load_chain_snapshot, save_chain_snapshot,
+)
 
 # ── Path Setup ─────────────────────────────────────────────────
 ROOT    = os.path.dirname(os.path.abspath(__file__))
@@ -287,62 +291,85 @@ def fetch_market_snapshot():
     }
 
 
-def fetch_leg_data(expiry, legs, spot=None, r=None, compute_greeks=True):
+def fetch_option_chain(expiry, snapshot_path=None):
     """
-    Fetches live option marks, IV, and real Black-Scholes Greeks for each leg.
-    spot: SPX spot price for BS calculation
-    r   : risk-free rate (fetched live if None)
+    Returns the ^SPX option chain for ``expiry``.
+    snapshot_path: if the file exists the chain is replayed from it (fully
+    offline); otherwise the live chain is fetched and, when a path is given,
+    written there for later replay.
     """
-    spx = yf.Ticker("^SPX")
+    if snapshot_path and os.path.exists(snapshot_path):
+        return load_chain_snapshot(snapshot_path)
     try:
+        spx   = yf.Ticker("^SPX")
         chain = spx.option_chain(expiry)
     except Exception as e:
         logger.warning(f"Option chain fetch failed for {expiry}: {e}")
+        return None
+    if snapshot_path:
+        try:
+            save_chain_snapshot(chain, snapshot_path, expiry, _get_live_price(spx) or 0.0)
+        except Exception as e:
+            logger.warning(f"Chain snapshot write failed ({snapshot_path}): {e}")
+    return chain
+
+
+def fetch_leg_data(expiry, legs, spot=None, r=None, compute_greeks=True, chain=None):
+    """
+    Fetches live option marks, IV, and real Black-Scholes Greeks for each leg.
+    spot : SPX spot price for BS calculation
+    r    : risk-free rate (fetched live if None)
+    chain: pre-fetched chain / load_chain_snapshot() result (skips the network)
+
+    Strike lookup and Greeks are vectorized: one searchsorted per chain side
+    and a single bs_greeks_vec() call for all legs.
+    """
+    if chain is None:
+        chain = fetch_option_chain(expiry)
+        if chain is None:
+            return []
+    if not legs:
         return []
 
-    today    = datetime.now().date()
-    exp_date = datetime.strptime(expiry, "%Y-%m-%d").date()
-    t_years  = max((exp_date - today).days / 365.0, 1/365)  # at least 1 day
-    rfr      = r if r is not None else _fetch_risk_free_rate()
+    t_years = years_to_expiry(expiry)  # at least 1 day
+    rfr     = r if r is not None else _fetch_risk_free_rate()
 
-    results = []
-    for label, strike, opt_type, sign in legs:
-        df = chain.calls if opt_type == "call" else chain.puts
-        row = df[df["strike"] == strike]
-        if row.empty:
-            idx = (df["strike"] - strike).abs().idxmin()
-            row = df.iloc[[idx]]
-        bid   = float(row["bid"].values[0])
-        ask   = float(row["ask"].values[0])
-        mark  = (bid + ask) / 2
-        iv_d  = float(row["impliedVolatility"].values[0])   # decimal (e.g. 0.22)
-        iv_pc = round(iv_d * 100, 2)                         # percentage (e.g. 22.0)
-
-        # Real Black-Scholes Greeks
-        greeks = {"delta": 0.0, "gamma": 0.0, "theta": 0.0, "vega": 0.0, "source": "unavailable"}
-        if compute_greeks and spot and iv_d > 0:
-            greeks = bs_greeks(
-                flag  = 'c' if opt_type == 'call' else 'p',
-                S     = spot,
-                K     = float(strike),
-                t     = t_years,
-                r     = rfr,
-                sigma = iv_d,
-            )
+    sides = {"call": chain_side(chain.calls), "put": chain_side(chain.puts)}
+    n     = len(legs)
+    bid   = np.zeros(n); ask = np.zeros(n); iv_d = np.zeros(n)
+    for opt_type, side in sides.items():
+        pos = [i for i, leg in enumerate(legs) if leg[2] == opt_type]
+        if not pos:
+            continue
+        idx = nearest_strike_index(side.strike, [float(legs[i][1]) for i in pos])
+        bid[pos], ask[pos], iv_d[pos] = side.bid[idx], side.ask[idx], side.iv[idx]
+
+    want = np.array([bool(compute_greeks and spot) and iv > 0 for iv in iv_d])
+    greeks = bs_greeks_vec(
+        flag  = ['c' if leg[2] == 'call' else 'p' for leg in legs],
+        S     = spot or 0.0,
+        K     = [float(leg[1]) for leg in legs],
+        t     = t_years,
+        r     = rfr,
+        sigma = np.where(want, iv_d, 0.0),
+    )
 
+    results = []
+    for i, (label, strike, opt_type, sign) in enumerate(legs):
+        ok = bool(greeks["valid"][i])
         results.append({
             "label":  label, "strike": strike,
             "type":   opt_type, "sign": sign,
-            "bid":    round(bid, 2), "ask": round(ask, 2),
-            "mark":   round(mark, 2),
-            "iv_pct": iv_pc,
-            "iv_dec": round(iv_d, 5),
+            "bid":    round(float(bid[i]), 2), "ask": round(float(ask[i]), 2),
+            "mark":   round(float(bid[i] + ask[i]) / 2, 2),
+            "iv_pct": round(float(iv_d[i]) * 100, 2),
+            "iv_dec": round(float(iv_d[i]), 5),
             # Real Greeks (per single option, unscaled)
-            "delta":  greeks["delta"],
-            "gamma":  greeks["gamma"],
-            "theta":  greeks["theta"],
-            "vega":   greeks["vega"],
-            "greeks_source": greeks["source"],
+            "delta":  round(float(greeks["delta"][i]), 5),
+            "gamma":  round(float(greeks["gamma"][i]), 7),
+            "theta":  round(float(greeks["theta"][i]), 4),
+            "vega":   round(float(greeks["vega"][i]), 4),
+            "greeks_source": "black_scholes" if ok else "unavailable",
         })
     return results
 
@@ -584,11 +611,15 @@ def detect_thesis_drift(original_thesis, current_snap):
 # 5. CHALLENGER SCANNER + PIVOT ALERT
 # ══════════════════════════════════════════════════════════════════
 
-def scan_for_challenger(snap, active_trade, target_dte=45):
+def scan_for_challenger(snap, active_trade, target_dte=45, chain=None, expiry=None, rfr=None):
     """
     Identifies if a fresh Iron Condor at current optimal strikes
     offers meaningfully better risk-adjusted credit than the active position.
-    Returns challenger details + pivot recommendation if warranted.
+    Returns challenger details + pivot recommendation if warranted, plus the
+    top strike-grid alternatives from scan_iron_condors().
+
+    chain/expiry: replay a cached chain snapshot instead of hitting yfinance
+    (``expiry`` defaults to the snapshot's own).
     """
     spx   = snap["spx"]
     vix   = snap["vix"]
@@ -603,21 +634,22 @@ def scan_for_challenger(snap, active_trade, target_dte=45):
     chal_short_call = round((spx + call_dist) / 5) * 5
     chal_long_call  = chal_short_call + 25
 
-    # Fetch expiry
-    try:
-        spx_ticker  = yf.Ticker("^SPX")
-        expirations = spx_ticker.options
-        today = datetime.now().date()
-        best_exp = None
-        min_diff = float("inf")
-        for exp_str in expirations:
-            exp_d = datetime.strptime(exp_str, "%Y-%m-%d").date()
-            diff  = abs((exp_d - today).days - target_dte)
-            if diff < min_diff and (exp_d - today).days > 0:
-                min_diff = diff
-                best_exp = exp_str
-    except Exception:
-        best_exp = None
+    # Fetch expiry (an offline snapshot already knows its own)
+    best_exp = expiry or getattr(chain, "expiry", None)
+    if not best_exp:
+        try:
+            spx_ticker  = yf.Ticker("^SPX")
+            expirations = spx_ticker.options
+            today = datetime.now().date()
+            min_diff = float("inf")
+            for exp_str in expirations:
+                exp_d = datetime.strptime(exp_str, "%Y-%m-%d").date()
+                diff  = abs((exp_d - today).days - target_dte)
+                if diff < min_diff and (exp_d - today).days > 0:
+                    min_diff = diff
+                    best_exp = exp_str
+        except Exception:
+            best_exp = None
 
     if not best_exp:
         return {"available": False, "reason": "Could not fetch option expirations"}
@@ -629,10 +661,20 @@ def scan_for_challenger(snap, active_trade, target_dte=45):
         ("Long Call",  chal_long_call,  "call", -1),
     ]
 
-    leg_data = fetch_leg_data(best_exp, legs)
+    if chain is None:
+        chain = fetch_option_chain(best_exp)
+    if chain is None:
+        return {"available": False, "reason": "Option chain unavailable"}
+    if rfr is None:
+        rfr = _fetch_risk_free_rate()
+
+    leg_data = fetch_leg_data(best_exp, legs, r=rfr, chain=chain)
     if not leg_data:
         return {"available": False, "reason": "Option chain unavailable"}
 
+    # Every candidate condor on the chain, scored in one vectorized pass.
+    grid = scan_iron_condors(chain, spx, years_to_expiry(best_exp), rfr, top_n=5)
+
     net_credit = sum(r["sign"] * r["mark"] for r in leg_data)
 
     # Compare against active position's original credit
@@ -661,6 +703,7 @@ def scan_for_challenger(snap, active_trade, target_dte=45):
             else "HOLD CURRENT: Existing position is competitive or superior. No pivot justified."
         ),
         "leg_detail":         leg_data,
+        "grid_candidates":    grid,
     }
 
 
@@ -0,0 +1,231 @@
+"""
+In-process token verification cache (auth hot path).
+
+verify_jwt_token and the /notifications/stream SSE handshake used to pay an
+RS256 signature check plus a SQLite point lookup against revoked_tokens on
+every request. This module keeps both in memory:
+
+    RevocationCache
+        Mirror of the GLOBAL revoked_tokens table. A bloom filter answers the
+        common "definitely not revoked" case; bloom hits are confirmed against
+        an exact in-memory set. The mirror is refreshed incrementally by rowid
+        watermark at most once per REFRESH_INTERVAL (one indexed range query
+        for the whole process, not one per request) and fully resynced every
+        RESYNC_INTERVAL so deleted / vacuumed rows are never stale forever.
+
+    VerifiedTokenCache
+        Bounded LRU of already-verified token payloads. Entries expire exactly
+        at the token's own ``exp`` claim, and are bound to the public key that
+        verified them so a gateway key rotation invalidates everything.
+        Revocation is still checked on every request -- a cached payload only
+        skips the signature verification, never the blacklist.
+
+Design guarantees:
+- Failure handling matches the previous is_jti_revoked(): a DB error while
+  refreshing is logged and the last known mirror keeps serving (fail-open on
+  storage errors, exactly as the direct lookup did).
+- Revocations written by another process (Module 0 Gateway) become visible
+  within REFRESH_INTERVAL seconds; note_revoked() makes local revocations
+  visible immediately.
+"""
+
+import os
+import math
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from local_db import get_default_db_connection
+
+logger = logging.getLogger("AuthCache")
+
+REFRESH_INTERVAL = float(os.environ.get("ERP_REVOCATION_REFRESH_SECONDS", "1.0"))
+RESYNC_INTERVAL = float(os.environ.get("ERP_REVOCATION_RESYNC_SECONDS", "300"))
+TOKEN_CACHE_SIZE = int(os.environ.get("ERP_TOKEN_CACHE_SIZE", "4096"))
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on one blake2b)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationCache:
+    """Watermark-refreshed in-memory mirror of revoked_tokens."""
+
+    def __init__(self, connect=get_default_db_connection,
+                 refresh_interval: float = REFRESH_INTERVAL,
+                 resync_interval: float = RESYNC_INTERVAL):
+        self._connect = connect
+        self.refresh_interval = refresh_interval
+        self.resync_interval = resync_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._revoked = set()
+        self._bloom = BloomFilter(1024)
+        self._watermark = 0
+        self._last_refresh = None     # None -> refresh on first check
+        self._last_resync = None      # None -> first refresh is a full resync
+        self._stats = {"checks": 0, "bloom_negative": 0, "bloom_false_positive": 0,
+                       "revoked_hits": 0, "refreshes": 0, "resyncs": 0, "refresh_errors": 0}
+
+    def _rebuild_bloom(self) -> None:
+        bloom = BloomFilter(max(1024, len(self._revoked) * 2))
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def _add(self, jti: str) -> None:
+        if jti in self._revoked:
+            return
+        self._revoked.add(jti)
+        if self._bloom.count >= self._bloom.capacity:
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(jti)
+
+    def refresh(self, force_resync: bool = False) -> None:
+        """Pull rows past the watermark (or everything, on resync)."""
+        now = time.monotonic()
+        resync = (force_resync or self._last_resync is None
+                  or now - self._last_resync >= self.resync_interval)
+        conn = self._connect()
+        try:
+            if resync:
+                rows = conn.execute("SELECT rowid, jti FROM revoked_tokens").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT rowid, jti FROM revoked_tokens WHERE rowid > ? ORDER BY rowid",
+                    (self._watermark,),
+                ).fetchall()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if resync:
+                self._revoked = {r[1] for r in rows}
+                self._rebuild_bloom()
+                self._watermark = max((r[0] for r in rows), default=0)
+                self._last_resync = now
+                self._stats["resyncs"] += 1
+            else:
+                for rowid, jti in rows:
+                    self._add(jti)
+                    self._watermark = max(self._watermark, rowid)
+            self._last_refresh = now
+            self._stats["refreshes"] += 1
+
+    def _maybe_refresh(self) -> None:
+        if (self._last_refresh is not None
+                and time.monotonic() - self._last_refresh < self.refresh_interval):
+            return
+        # One refresher at a time; everyone else serves the current mirror.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep serving the last known mirror; retry on the next interval.
+            self._last_refresh = time.monotonic()
+            self._stats["refresh_errors"] += 1
+            logger.error(f"Failed to refresh revoked-token cache: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def note_revoked(self, jti: str) -> None:
+        """Make a revocation performed by this process visible immediately."""
+        if jti:
+            with self._lock:
+                self._add(jti)
+
+    def is_revoked(self, jti) -> bool:
+        self._maybe_refresh()
+        self._stats["checks"] += 1
+        if not jti:
+            return False
+        if jti not in self._bloom:
+            self._stats["bloom_negative"] += 1
+            return False
+        if jti in self._revoked:
+            self._stats["revoked_hits"] += 1
+            return True
+        self._stats["bloom_false_positive"] += 1
+        return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "revoked": len(self._revoked), "watermark": self._watermark,
+                    "bloom_bits": self._bloom.num_bits, "bloom_hashes": self._bloom.num_hashes}
+
+
+class VerifiedTokenCache:
+    """LRU of verified JWT payloads, each expiring at its own ``exp`` claim."""
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # sha256(token) -> (exp, key_id, payload)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0}
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+    def get(self, token: str, public_key: str):
+        key = self._digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            exp, key_id, payload = entry
+            if exp <= now or key_id != self._digest(public_key):
+                # Expired tokens fall through to jwt.decode, which raises the
+                # same ExpiredSignatureError the route always returned.
+                del self._entries[key]
+                self._stats["expired"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return payload
+
+    def put(self, token: str, public_key: str, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[self._digest(token)] = (exp, self._digest(public_key), payload)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+revocation_cache = RevocationCache()
+token_cache = VerifiedTokenCache()
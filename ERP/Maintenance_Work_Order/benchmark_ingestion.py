@@ -0,0 +1,137 @@
+"""
+Bulk MWO ingestion benchmark.
+
+Generates a synthetic MWO CSV (default 1,000,000 rows), runs it through the
+same IngestionPipeline / validate_mwo_chunk / MWO_UPSERT_SQL that
+POST /api/admin/mwo/bulk-upload uses, against a scratch SQLite database, and
+samples the parent process RSS while it runs. A warm-up run at a tenth of the
+size is measured first: with bounded in-flight chunks the peak RSS of the full
+run should stay within a few MB of the warm-up, i.e. memory is flat in the
+number of rows.
+
+Run: venv/Scripts/python.exe benchmark_ingestion.py [--rows 1000000] [--workers 4]
+"""
+import os
+import csv
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ingestion_engine import IngestionPipeline, iter_csv_rows, CHUNK_SIZE, MAX_WORKERS  # noqa: E402
+from maintenance_backend import validate_mwo_chunk, MWO_UPSERT_SQL  # noqa: E402
+
+WORK_ORDERS_DDL = """
+    CREATE TABLE work_orders (
+        mwo_id TEXT PRIMARY KEY,
+        status TEXT,
+        dm_urgency TEXT,
+        hm_priority TEXT,
+        description TEXT,
+        assigned_tech TEXT,
+        manual_log TEXT,
+        start_date TEXT,
+        equipment_id TEXT
+    )
+"""
+
+
+def current_rss_mb() -> float:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        import resource
+        # Linux reports KiB, macOS bytes; only a peak is available here.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2 ** 20 if sys.platform == "darwin" else 1024)
+
+
+class RssSampler:
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+
+def write_csv(path: str, rows: int) -> None:
+    statuses = ("UNASSIGNED", "ASSIGNED", "IN_PROGRESS", "COMPLETED")
+    urgencies = ("Low", "Normal", "High", "Critical")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["mwo_id", "equipment_id", "description", "status", "dm_urgency",
+                    "hm_priority", "assigned_tech", "manual_log", "start_date"])
+        for i in range(rows):
+            w.writerow([f"MWO-B{i:08d}", f"EQ-{i % 500:04d}", f"Synthetic fault report #{i}",
+                        statuses[i % 4], urgencies[i % 4], urgencies[(i + 1) % 4],
+                        "", "", "2025-01-01T08:00:00"])
+
+
+def run_once(csv_path: str, rows: int, workers: int, chunk_size: int) -> dict:
+    db_dir = tempfile.mkdtemp(prefix="ingest_bench_db_")
+    db_path = os.path.join(db_dir, "bench.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(WORK_ORDERS_DDL)
+    conn.commit()
+    conn.close()
+
+    def connect():
+        c = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        c.execute("PRAGMA synchronous=NORMAL")
+        return c
+
+    pipeline = IngestionPipeline("mwo", MWO_UPSERT_SQL, validate_mwo_chunk, connect=connect,
+                                 chunk_size=chunk_size, workers=workers)
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        job = pipeline.run(iter_csv_rows(csv_path), source=os.path.basename(csv_path))
+        elapsed = time.perf_counter() - start
+    return {"rows": rows, "status": job["status"], "written": job["rows_written"],
+            "rejected": job["rows_rejected"], "seconds": elapsed,
+            "rows_per_s": rows / elapsed if elapsed else 0.0, "peak_rss_mb": sampler.peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    results = []
+    for rows in (max(1, args.rows // 10), args.rows):
+        csv_path = os.path.join(tempfile.mkdtemp(prefix="ingest_bench_csv_"), f"mwo_{rows}.csv")
+        write_csv(csv_path, rows)
+        print(f"Generated {rows:,} rows ({os.path.getsize(csv_path) / 2 ** 20:.1f} MB)")
+        results.append(run_once(csv_path, rows, args.workers, args.chunk_size))
+        os.remove(csv_path)
+
+    print(f"\n{'rows':>10} {'status':>10} {'written':>10} {'seconds':>8} {'rows/s':>10} {'peak RSS':>10}")
+    for r in results:
+        print(f"{r['rows']:>10,} {r['status']:>10} {r['written']:>10,} {r['seconds']:>8.1f} "
+              f"{r['rows_per_s']:>10,.0f} {r['peak_rss_mb']:>8.1f}MB")
+    growth = results[-1]["peak_rss_mb"] - results[0]["peak_rss_mb"]
+    print(f"\nPeak RSS growth from {results[0]['rows']:,} to {results[-1]['rows']:,} rows: {growth:+.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
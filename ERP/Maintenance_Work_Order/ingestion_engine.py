@@ -0,0 +1,355 @@
+"""
+Shared streaming bulk-ingestion engine for the ERP CSV / XLSX endpoints.
+
+Every bulk path used to roll its own loop: the MWO importer validated in a
+process pool but held every validated batch in memory until the whole file was
+parsed, the users importer executed one INSERT per row, and the XLSX endpoints
+loaded the full workbook into a list before touching the database. This module
+gives them one pipeline:
+
+    parse (calling thread) --> validate (process pool) --> write (writer thread)
+
+- Parsing is streamed: CSV via csv.DictReader, XLSX via openpyxl read-only
+  mode, so a file is never materialised in memory.
+- Validation runs on fixed-size chunks in a ProcessPoolExecutor. At most
+  ``max_inflight`` chunks are outstanding at any time; when the writer falls
+  behind, the parser blocks on the bounded hand-off queue (back-pressure), so
+  memory stays flat regardless of file size.
+- A single writer thread applies chunks IN FILE ORDER (later rows still win an
+  ON CONFLICT upsert, exactly as with the sequential loops) using executemany,
+  one BEGIN IMMEDIATE transaction per chunk. If a chunk's executemany fails it
+  is replayed row by row so one bad row only costs itself, matching the old
+  row-by-row importers.
+- Progress is recorded in the ``ingestion_jobs`` table of the tenant database,
+  updated inside the same transaction as each chunk, so a polled job row never
+  claims rows that were not committed.
+"""
+
+import os
+import csv
+import time
+import uuid
+import queue
+import sqlite3
+import logging
+import threading
+import contextvars
+import concurrent.futures
+from itertools import islice
+
+from local_db import get_db_connection
+
+logger = logging.getLogger("IngestionEngine")
+
+CHUNK_SIZE = int(os.environ.get("ERP_INGEST_CHUNK_SIZE", "5000"))
+MAX_WORKERS = int(os.environ.get("ERP_INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+MAX_ERROR_SAMPLES = 20
+
+JOB_QUEUED = "QUEUED"
+JOB_RUNNING = "RUNNING"
+JOB_COMPLETED = "COMPLETED"
+JOB_FAILED = "FAILED"
+
+_JOB_COLUMNS = ("job_id", "kind", "status", "source", "rows_read", "rows_written",
+                "rows_rejected", "chunks_committed", "error", "created_at",
+                "started_at", "updated_at", "finished_at")
+
+
+# --- Readers ---------------------------------------------------------------
+
+def iter_csv_rows(path: str):
+    """Yield each data row of a CSV file as a dict keyed by its header."""
+    with open(path, mode="r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
+
+
+def iter_xlsx_rows(source):
+    """Yield each non-empty data row of the active sheet as a dict.
+
+    ``source`` may be a path or a binary file object. The workbook is opened in
+    read-only mode, which streams rows instead of building the full cell grid.
+    Header cells are stripped; rows that are entirely empty are skipped.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(filename=source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header or not any(header):
+            raise ValueError("Empty file")
+        header = [str(h).strip() if h is not None else "" for h in header]
+        for values in rows:
+            if not any(v not in (None, "") for v in values):
+                continue
+            yield dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def xlsx_header(source) -> list:
+    """Return the stripped header row of an XLSX workbook."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(filename=source, read_only=True, data_only=True)
+    try:
+        header = next(wb.active.iter_rows(max_row=1, values_only=True), None)
+        return [str(h).strip() for h in header if h is not None] if header else []
+    finally:
+        wb.close()
+
+
+def iter_rows(path: str):
+    """Dispatch to the CSV or XLSX reader by file extension."""
+    if path.lower().endswith(".xlsx"):
+        return iter_xlsx_rows(path)
+    return iter_csv_rows(path)
+
+
+def chunked(iterable, size: int):
+    """Yield lists of at most ``size`` items without materialising the source."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- Job progress ----------------------------------------------------------
+
+def ensure_job_table(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingestion_jobs (
+            job_id TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            status TEXT NOT NULL,
+            source TEXT,
+            rows_read INTEGER NOT NULL DEFAULT 0,
+            rows_written INTEGER NOT NULL DEFAULT 0,
+            rows_rejected INTEGER NOT NULL DEFAULT 0,
+            chunks_committed INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at REAL NOT NULL,
+            started_at REAL,
+            updated_at REAL NOT NULL,
+            finished_at REAL
+        )
+    """)
+
+
+def create_job(kind: str, source: str = None, connect=get_db_connection) -> str:
+    """Register a QUEUED job and return its id (e.g. ``ING-1F2E3D4C5B6A``)."""
+    job_id = f"ING-{uuid.uuid4().hex[:12].upper()}"
+    now = time.time()
+    conn = connect()
+    try:
+        ensure_job_table(conn)
+        conn.execute(
+            "INSERT INTO ingestion_jobs (job_id, kind, status, source, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, JOB_QUEUED, source, now, now),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return job_id
+
+
+def get_job(job_id: str, connect=get_db_connection):
+    """Return the job's progress row as a dict, or None if it does not exist."""
+    conn = connect()
+    try:
+        ensure_job_table(conn)
+        row = conn.execute(
+            f"SELECT {', '.join(_JOB_COLUMNS)} FROM ingestion_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return dict(zip(_JOB_COLUMNS, row)) if row is not None else None
+
+
+def _update_job(conn: sqlite3.Connection, job_id: str, **fields) -> None:
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{k} = ?" for k in fields)
+    conn.execute(f"UPDATE ingestion_jobs SET {assignments} WHERE job_id = ?",
+                 (*fields.values(), job_id))
+
+
+# --- Pipeline --------------------------------------------------------------
+
+_DONE = object()
+
+
+class IngestionPipeline:
+    """Bounded parse -> validate -> write pipeline for one target statement.
+
+    ``validate`` must be a module-level function (it is pickled into worker
+    processes) taking a list of raw row dicts and returning
+    ``(valid_param_tuples, rejected_count)``. ``sql`` is the parameterised
+    INSERT / upsert the tuples are bound to.
+    """
+
+    def __init__(self, kind: str, sql: str, validate, connect=get_db_connection,
+                 chunk_size: int = CHUNK_SIZE, workers: int = MAX_WORKERS, max_inflight: int = None):
+        self.kind = kind
+        self.sql = sql
+        self.validate = validate
+        self.connect = connect
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.max_inflight = max_inflight or max(2, workers * 2)
+
+    def run(self, rows, job_id: str = None, source: str = None) -> dict:
+        """Ingest ``rows`` (any iterable of dicts) and return the final job row."""
+        if job_id is None:
+            job_id = create_job(self.kind, source, connect=self.connect)
+
+        state = {"read": 0, "written": 0, "rejected": 0, "chunks": 0,
+                 "errors": [], "fatal": None}
+        handoff = queue.Queue(maxsize=self.max_inflight)
+        # The writer must see the same tenant binding as the caller.
+        ctx = contextvars.copy_context()
+        writer = threading.Thread(target=ctx.run, args=(self._write_loop, job_id, handoff, state),
+                                  name=f"ingest-writer-{job_id}", daemon=True)
+        writer.start()
+
+        executor = (concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+                    if self.workers > 0 else None)
+        try:
+            for chunk in chunked(rows, self.chunk_size):
+                if state["fatal"] is not None:
+                    break
+                if executor is not None:
+                    work = executor.submit(self.validate, chunk)
+                else:
+                    work = self._validate_inline(chunk)
+                # Blocks while max_inflight chunks are pending: back-pressure.
+                handoff.put((len(chunk), work))
+        except Exception as e:
+            state["fatal"] = state["fatal"] or f"Parse failure: {e}"
+            logger.error(f"[INGEST {job_id}] {state['fatal']}")
+        finally:
+            handoff.put(_DONE)
+            writer.join()
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        self._finish(job_id, state)
+        return get_job(job_id, connect=self.connect)
+
+    def _validate_inline(self, chunk):
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self.validate(chunk))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _write_loop(self, job_id: str, handoff: queue.Queue, state: dict) -> None:
+        conn = None
+        try:
+            conn = self.connect()
+            ensure_job_table(conn)
+            _update_job(conn, job_id, status=JOB_RUNNING, started_at=time.time())
+            conn.commit()
+        except Exception as e:
+            state["fatal"] = f"Writer could not open the database: {e}"
+            logger.error(f"[INGEST {job_id}] {state['fatal']}")
+
+        while True:
+            item = handoff.get()
+            if item is _DONE:
+                break
+            n_raw, future = item
+            if state["fatal"] is not None:
+                # Keep draining so the producer never blocks on a dead writer.
+                future.cancel()
+                continue
+            state["read"] += n_raw
+            try:
+                valid, rejected = future.result()
+            except Exception as e:
+                self._note_error(state, f"Validation worker failure: {e}")
+                state["rejected"] += n_raw
+                continue
+            state["rejected"] += rejected
+            try:
+                self._write_chunk(conn, job_id, valid, state)
+            except Exception as e:
+                state["fatal"] = f"Chunk write failure: {e}"
+                logger.error(f"[INGEST {job_id}] {state['fatal']}")
+
+        if conn is not None:
+            conn.close()
+
+    def _write_chunk(self, conn: sqlite3.Connection, job_id: str, valid: list, state: dict) -> None:
+        written = len(valid)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if valid:
+                try:
+                    conn.executemany(self.sql, valid)
+                except sqlite3.Error as e:
+                    # Isolate the offending rows instead of losing the chunk.
+                    conn.rollback()
+                    conn.execute("BEGIN IMMEDIATE")
+                    written = 0
+                    for params in valid:
+                        try:
+                            conn.execute(self.sql, params)
+                            written += 1
+                        except sqlite3.Error as row_error:
+                            self._note_error(state, f"{row_error} for {params[0]!r}")
+                    logger.warning(f"[INGEST {job_id}] Chunk replayed row-by-row after: {e}")
+            state["written"] += written
+            state["rejected"] += len(valid) - written
+            state["chunks"] += 1
+            _update_job(conn, job_id, rows_read=state["read"], rows_written=state["written"],
+                        rows_rejected=state["rejected"], chunks_committed=state["chunks"])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _note_error(state: dict, message: str) -> None:
+        if len(state["errors"]) < MAX_ERROR_SAMPLES:
+            state["errors"].append(message)
+
+    def _finish(self, job_id: str, state: dict) -> None:
+        status = JOB_FAILED if state["fatal"] else JOB_COMPLETED
+        error = state["fatal"] or ("; ".join(state["errors"]) or None)
+        conn = self.connect()
+        try:
+            ensure_job_table(conn)
+            _update_job(conn, job_id, status=status, error=error, rows_read=state["read"],
+                        rows_written=state["written"], rows_rejected=state["rejected"],
+                        chunks_committed=state["chunks"], finished_at=time.time())
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info(f"[INGEST {job_id}] {self.kind} {status}. Read: {state['read']}, "
+                    f"Written: {state['written']}, Rejected: {state['rejected']}")
+
+
+def run_file_job(pipeline: IngestionPipeline, file_path: str, job_id: str = None) -> dict:
+    """Run ``pipeline`` over a spooled upload and always remove the temp file."""
+    try:
+        return pipeline.run(iter_rows(file_path), job_id=job_id, source=os.path.basename(file_path))
+    finally:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def write_in_chunks(cursor, sql: str, rows, chunk_size: int = CHUNK_SIZE) -> int:
+    """executemany ``rows`` in bounded slices inside the caller's transaction.
+
+    For the synchronous all-or-nothing XLSX endpoints, which keep their single
+    transaction but should not pay one statement round-trip per row.
+    """
+    total = 0
+    for chunk in chunked(rows, chunk_size):
+        cursor.executemany(sql, chunk)
+        total += len(chunk)
+    return total
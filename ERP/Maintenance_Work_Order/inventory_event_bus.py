@@ -0,0 +1,150 @@
+"""
+Inventory / PO event bus for the /notifications/stream SSE feed.
+
+Replaces the old global ring buffer that every SSE client re-scanned on a
+2-second sleep loop. Events are now pushed:
+
+- One channel per tenant, each with its own monotonically increasing sequence
+  number and a bounded replay history, so a tenant only ever sees its own
+  events and a reconnecting EventSource can resume from ``Last-Event-ID``.
+- publish() may be called from any thread (sync routes run in FastAPI's
+  threadpool, background tasks in workers). Subscribers are woken on their own
+  event loop via call_soon_threadsafe, so delivery latency is a loop tick, not
+  a poll interval, and idle clients cost nothing.
+- Each subscriber has a bounded queue. A slow consumer never blocks publishers
+  or other clients: when its queue is full the OLDEST pending event is dropped
+  and counted, and the client can resume via Last-Event-ID from history.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+
+logger = logging.getLogger("InventoryEventBus")
+
+HISTORY_SIZE = 200
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """One connected SSE client: a bounded drop-oldest queue plus a wakeup."""
+
+    def __init__(self, bus, tenant_id: str, loop: asyncio.AbstractEventLoop, max_queue: int):
+        self.bus = bus
+        self.tenant_id = tenant_id
+        self.loop = loop
+        self.dropped = 0
+        self._queue = deque(maxlen=max_queue)
+        self._wakeup = asyncio.Event()
+
+    def _deliver(self, event: dict) -> None:
+        # Runs on self.loop only.
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(event)
+        self._wakeup.set()
+
+    async def next_batch(self, timeout: float) -> list:
+        """Wait up to ``timeout`` seconds for events; returns [] on timeout."""
+        if not self._queue:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        batch = list(self._queue)
+        self._queue.clear()
+        return batch
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class _Channel:
+    __slots__ = ("seq", "history", "subscribers")
+
+    def __init__(self, history_size: int):
+        self.seq = 0
+        self.history = deque(maxlen=history_size)
+        self.subscribers = set()
+
+
+class InventoryEventBus:
+    def __init__(self, history_size: int = HISTORY_SIZE, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def _channel(self, tenant_id: str) -> _Channel:
+        channel = self._channels.get(tenant_id)
+        if channel is None:
+            channel = self._channels[tenant_id] = _Channel(self.history_size)
+        return channel
+
+    def publish(self, tenant_id: str, event_type: str, payload: dict) -> dict:
+        """Append an event to the tenant's channel and wake its subscribers."""
+        with self._lock:
+            channel = self._channel(tenant_id)
+            channel.seq += 1
+            event = {
+                "id": channel.seq,
+                "type": event_type,
+                "payload": payload,
+                "ts": datetime.now(timezone.utc).isoformat(),
+            }
+            channel.history.append(event)
+            subscribers = list(channel.subscribers)
+
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        for sub in subscribers:
+            if sub.loop is current_loop:
+                sub._deliver(event)
+                continue
+            try:
+                sub.loop.call_soon_threadsafe(sub._deliver, event)
+            except RuntimeError:
+                # Subscriber's loop is gone (server shutdown / dead worker).
+                self.unsubscribe(sub)
+        return event
+
+    def subscribe(self, tenant_id: str, last_event_id=None) -> Subscription:
+        """Register a subscriber on the running loop.
+
+        With ``last_event_id`` the history newer than it is replayed first; a
+        missing or unparseable id starts from "now" like a fresh EventSource.
+        """
+        sub = Subscription(self, tenant_id, asyncio.get_running_loop(), self.queue_size)
+        try:
+            cursor = int(last_event_id) if last_event_id not in (None, "") else None
+        except (TypeError, ValueError):
+            cursor = None
+        with self._lock:
+            channel = self._channel(tenant_id)
+            if cursor is not None:
+                for event in channel.history:
+                    if event["id"] > cursor:
+                        sub._deliver(event)
+            channel.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            channel = self._channels.get(sub.tenant_id)
+            if channel is not None:
+                channel.subscribers.discard(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                tenant: {"seq": ch.seq, "history": len(ch.history), "subscribers": len(ch.subscribers)}
+                for tenant, ch in self._channels.items()
+            }
+
+
+inventory_event_bus = InventoryEventBus()
@@ -1,10 +1,13 @@
 import os
 import re
+import time
 import sqlite3
 import shutil
+import weakref
 import threading
 import contextvars
 import logging
+from collections import OrderedDict, deque
 
 logger = logging.getLogger("LocalDB")
 
@@ -69,13 +72,226 @@ def _apply_connection_pragmas(conn: sqlite3.Connection) -> sqlite3.Connection:
 
     return conn
 
+
+# --- Connection pool -------------------------------------------------------
+# Every route does `conn = get_db_connection() ... finally: conn.close()`.
+# Rather than opening a new file handle and replaying the pragmas per request,
+# connections are checked out of a per-database-path pool and close() returns
+# them to it. The pool is bounded by a process-wide open-connection budget
+# (each SQLite connection holds file descriptors for the db, -wal and -shm),
+# evicts connections idle longer than POOL_IDLE_TIMEOUT, and drops whole
+# tenants that go quiet so inactive tenants do not pin file handles.
+POOL_MAX_IDLE_PER_DB = int(os.environ.get("ERP_DB_POOL_MAX_IDLE_PER_DB", "8"))
+POOL_MAX_OPEN = int(os.environ.get("ERP_DB_POOL_MAX_OPEN", "64"))
+POOL_IDLE_TIMEOUT = float(os.environ.get("ERP_DB_POOL_IDLE_TIMEOUT", "300"))
+_POOL_SWEEP_INTERVAL = 30.0
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands it back to its pool.
+
+    Callers keep the existing contract unchanged; the pool is invisible to them.
+    Use really_close() to actually release the underlying file handles."""
+
+    _pool = None
+    _pool_path = None
+    _checked_out = False
+    _overflow = False
+
+    def close(self):
+        pool = self._pool
+        if pool is None:
+            super().close()
+        elif self._checked_out:
+            pool._release(self)
+
+    def really_close(self):
+        self._pool = None
+        super().close()
+
+
+class _DbPool:
+    __slots__ = ("idle", "checkouts", "opened", "last_used")
+
+    def __init__(self):
+        self.idle = deque()          # (conn, released_at)
+        self.checkouts = 0
+        self.opened = 0
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool:
+    """Bounded, thread-safe SQLite connection pool keyed by database path."""
+
+    def __init__(self, max_idle_per_db: int = POOL_MAX_IDLE_PER_DB,
+                 max_open: int = POOL_MAX_OPEN, idle_timeout: float = POOL_IDLE_TIMEOUT):
+        self.max_idle_per_db = max_idle_per_db
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._dbs = OrderedDict()            # path -> _DbPool, LRU order
+        self._in_use = weakref.WeakSet()     # checked-out connections
+        self._pid = os.getpid()
+        self._last_sweep = time.monotonic()
+        self._stats = {"hits": 0, "misses": 0, "overflow": 0, "evictions": 0, "discarded": 0}
+
+    def _open_count(self) -> int:
+        return len(self._in_use) + sum(len(p.idle) for p in self._dbs.values())
+
+    def _check_fork(self) -> None:
+        # SQLite handles must never cross a fork (ProcessPoolExecutor workers):
+        # forget the parent's connections without touching them.
+        if os.getpid() != self._pid:
+            self._dbs = OrderedDict()
+            self._in_use = weakref.WeakSet()
+            self._pid = os.getpid()
+
+    def acquire(self, db_path: str) -> PooledConnection:
+        now = time.monotonic()
+        with self._lock:
+            self._check_fork()
+            if now - self._last_sweep > _POOL_SWEEP_INTERVAL:
+                self._sweep_locked(now)
+            pool = self._dbs.get(db_path)
+            if pool is None:
+                pool = self._dbs[db_path] = _DbPool()
+            self._dbs.move_to_end(db_path)
+            pool.last_used = now
+            pool.checkouts += 1
+            if pool.idle:
+                conn, _ = pool.idle.pop()
+                conn._checked_out = True
+                self._in_use.add(conn)
+                self._stats["hits"] += 1
+                return conn
+            self._stats["misses"] += 1
+            if self._open_count() >= self.max_open:
+                self._evict_lru_idle_locked(exclude=db_path)
+            overflow = self._open_count() >= self.max_open
+            pool.opened += 1
+
+        conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10,
+                               isolation_level=None, factory=PooledConnection)
+        _apply_connection_pragmas(conn)
+        conn._pool = self
+        conn._pool_path = db_path
+        conn._checked_out = True
+        # Budget exhausted by in-use connections: serve the request anyway,
+        # but close this handle on release instead of pooling it.
+        conn._overflow = overflow
+        with self._lock:
+            if overflow:
+                self._stats["overflow"] += 1
+            self._in_use.add(conn)
+        return conn
+
+    def _release(self, conn: PooledConnection) -> None:
+        conn._checked_out = False
+        if conn._overflow:
+            self._discard(conn)
+            return
+        try:
+            # Never hand the next caller a half-finished transaction or a
+            # row_factory some route swapped out.
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        with self._lock:
+            self._in_use.discard(conn)
+            pool = self._dbs.get(conn._pool_path)
+            if (pool is None or os.getpid() != self._pid
+                    or len(pool.idle) >= self.max_idle_per_db
+                    or self._open_count() >= self.max_open):
+                close_it = True
+            else:
+                pool.idle.append((conn, time.monotonic()))
+                close_it = False
+        if close_it:
+            self._discard(conn)
+
+    def _discard(self, conn: PooledConnection) -> None:
+        with self._lock:
+            self._in_use.discard(conn)
+            self._stats["discarded"] += 1
+        try:
+            conn.really_close()
+        except sqlite3.Error:
+            pass
+
+    def _evict_lru_idle_locked(self, exclude: str = None) -> None:
+        for path, pool in self._dbs.items():
+            if path != exclude and pool.idle:
+                conn, _ = pool.idle.popleft()
+                self._stats["evictions"] += 1
+                conn.really_close()
+                return
+
+    def _sweep_locked(self, now: float) -> None:
+        self._last_sweep = now
+        for path in list(self._dbs):
+            pool = self._dbs[path]
+            while pool.idle and now - pool.idle[0][1] > self.idle_timeout:
+                conn, _ = pool.idle.popleft()
+                self._stats["evictions"] += 1
+                conn.really_close()
+            if not pool.idle and now - pool.last_used > self.idle_timeout:
+                # Inactive tenant: forget it entirely (in-use handles still
+                # close normally since their pool entry is gone).
+                del self._dbs[path]
+
+    def evict_idle(self) -> None:
+        """Close idle connections past the idle timeout (also runs on checkout)."""
+        with self._lock:
+            self._sweep_locked(time.monotonic())
+
+    def close_all(self) -> None:
+        """Close every idle connection and forget all per-db pools."""
+        with self._lock:
+            pools, self._dbs = self._dbs, OrderedDict()
+        for pool in pools.values():
+            for conn, _ in pool.idle:
+                conn.really_close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "open": self._open_count(),
+                "in_use": len(self._in_use),
+                "max_open": self.max_open,
+                "databases": {
+                    os.path.basename(path): {
+                        "idle": len(pool.idle),
+                        "checkouts": pool.checkouts,
+                        "opened": pool.opened,
+                    }
+                    for path, pool in self._dbs.items()
+                },
+            }
+
+
+_pool = ConnectionPool()
+
+
+def get_pool_stats() -> dict:
+    """Checkout/hit/eviction counters for the process-wide connection pool."""
+    return _pool.stats()
+
+
+def close_pooled_connections() -> None:
+    """Release every idle pooled connection (shutdown, tests, db file swaps)."""
+    _pool.close_all()
+
+
 def _connect_default() -> sqlite3.Connection:
-    """Open a connection to the default database, bypassing tenant routing.
+    """Check out a connection to the default database, bypassing tenant routing.
     Connects to the LOCAL copy outside Google Drive to prevent file lock deadlocks.
     isolation_level=None forces autocommit mode, empowering routes to explicitly
     declare BEGIN IMMEDIATE TRANSACTION boundaries for concurrency locking."""
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10, isolation_level=None)
-    return _apply_connection_pragmas(conn)
+    return _pool.acquire(DB_PATH)
 
 
 def get_default_db_connection() -> sqlite3.Connection:
@@ -212,8 +428,7 @@ def get_db_connection_for_tenant(tenant_id) -> sqlite3.Connection:
                     conn.close()
                 _initialized_tenants.add(tenant_id)
 
-    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
-    return _apply_connection_pragmas(conn)
+    return _pool.acquire(db_path)
 
 
 def _create_base_tables(conn: sqlite3.Connection) -> None:
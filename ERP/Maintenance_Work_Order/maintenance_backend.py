@@ -14,7 +14,7 @@ import jwt
 import uuid
 from datetime import datetime, timedelta, timezone
 import concurrent.futures
-from itertools import islice
+from itertools import chain
 from fastapi import FastAPI, APIRouter, HTTPException, Query, UploadFile, File, BackgroundTasks, Header, Body, Depends, Security, Response, Path
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
@@ -68,11 +68,17 @@ from local_db import (
     set_current_tenant,
     reset_current_tenant,
     get_current_tenant,
+    get_pool_stats,
     _validate_tenant_id,
     DEFAULT_TENANT_ID,
 )
 from starlette.middleware.base import BaseHTTPMiddleware
 from plugin_manager import trigger_tenant_hook
+from auth_cache import revocation_cache, token_cache
+from ingestion_engine import (
+    IngestionPipeline, create_job, get_job, run_file_job,
+    iter_xlsx_rows, xlsx_header, write_in_chunks,
+)
 import agent_matrix
 import ipaddress
 import os
@@ -172,17 +178,18 @@ api_router = APIRouter(prefix="/api")
 
 def is_jti_revoked(jti: str) -> bool:
     # GLOBAL table: the JTI blacklist is cross-tenant (tokens are issued/revoked
-    # by the Module 0 Gateway), so this MUST bypass tenant routing. A tenant-bound
-    # connection would read an empty per-tenant copy and miss revoked tokens.
-    conn = get_default_db_connection()
-    try:
-        row = conn.execute("SELECT 1 FROM revoked_tokens WHERE jti = ?", (jti,)).fetchone()
-        return row is not None
-    except Exception as e:
-        logger.error(f"Failed to check JTI status: {e}")
-        return False
-    finally:
-        conn.close()
+    # by the Module 0 Gateway), so this MUST bypass tenant routing. Served from
+    # the in-process mirror of revoked_tokens (see auth_cache.py), which reads
+    # the default database by rowid watermark instead of once per request.
+    return revocation_cache.is_revoked(jti)
+
+def _decode_jwt(token: str) -> dict:
+    """RS256-verify a token, reusing the payload of a recently verified one."""
+    payload = token_cache.get(token, PUBLIC_KEY)
+    if payload is None:
+        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[ALGORITHM])
+        token_cache.put(token, PUBLIC_KEY, payload)
+    return payload
 
 def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(security)) -> dict:
     if not PUBLIC_KEY:
@@ -190,9 +197,9 @@ def verify_jwt_token(credentials: HTTPAuthorizationCredentials = Security(securi
         
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[ALGORITHM])
+        payload = _decode_jwt(token)
         
-        # JTI check routed to persistent storage
+        # JTI check routed to the revocation mirror
         if is_jti_revoked(payload.get("jti")):
             raise HTTPException(status_code=401, detail="Token Revoked (JTI Blacklisted).")
             
@@ -924,23 +931,21 @@ async def bulk_ingest_equipment(file: UploadFile = File(...), jwt_payload: dict
         
     content = await file.read()
     try:
-        wb = openpyxl.load_workbook(filename=io.BytesIO(content), data_only=True)
-        ws = wb.active
-        header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
+        header_row = xlsx_header(io.BytesIO(content))
         if not header_row: raise ValueError("Empty file")
         expected_fields = {"nomenclature", "category_name", "status", "department_name", "location", "hm_name"}
         if not expected_fields.issubset(set(header_row)):
             raise HTTPException(status_code=400, detail=f"Invalid XLSX structure. Expected minimum headers: {', '.join(expected_fields)}")
-        rows = []
-        for row_values in ws.iter_rows(min_row=2, values_only=True):
-            if not any(row_values): continue
-            row_dict = dict(zip(header_row, row_values))
-            rows.append(row_dict)
+        # Streamed (read-only) rows; peek one so an empty sheet is still a 400.
+        rows = iter_xlsx_rows(io.BytesIO(content))
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = chain([first_row], rows)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to read XLSX: {e}")
-    if not rows:
+    if first_row is None:
         raise HTTPException(status_code=400, detail="CSV file is empty.")
         
     conn = get_db_connection()
@@ -963,69 +968,71 @@ async def bulk_ingest_equipment(file: UploadFile = File(...), jwt_payload: dict
 
         cursor.execute("BEGIN TRANSACTION")
         
-        inserted_count = 0
-        for i, row in enumerate(rows):
-            # Clean up keys and values
-            row_data = {k.strip(): str(v).strip() if v is not None else None for k, v in row.items()}
+        def equipment_params():
+            for i, row in enumerate(rows):
+                # Clean up keys and values
+                row_data = {k.strip(): str(v).strip() if v is not None else None for k, v in row.items()}
             
-            # Resolve Names to IDs
-            cat_name = row_data.get('category_name')
-            if not cat_name:
-                raise ValueError(f"Row {i+2}: Missing category_name")
-            if cat_name.lower() not in cat_map:
-                new_cat = f"CAT-{uuid.uuid4().hex[:6].upper()}"
-                cursor.execute("INSERT INTO erp_categories (id, name) VALUES (?, ?)", (new_cat, cat_name.strip()))
-                cat_map[cat_name.lower()] = new_cat
-            cat_id = cat_map[cat_name.lower()]
+                # Resolve Names to IDs
+                cat_name = row_data.get('category_name')
+                if not cat_name:
+                    raise ValueError(f"Row {i+2}: Missing category_name")
+                if cat_name.lower() not in cat_map:
+                    new_cat = f"CAT-{uuid.uuid4().hex[:6].upper()}"
+                    cursor.execute("INSERT INTO erp_categories (id, name) VALUES (?, ?)", (new_cat, cat_name.strip()))
+                    cat_map[cat_name.lower()] = new_cat
+                cat_id = cat_map[cat_name.lower()]
                 
-            dep_name = row_data.get('department_name')
-            if not dep_name:
-                raise ValueError(f"Row {i+2}: Missing department_name")
-            if dep_name.lower() not in dep_map:
-                new_dep = f"DEP-{uuid.uuid4().hex[:6].upper()}"
-                cursor.execute("INSERT INTO erp_departments (id, name) VALUES (?, ?)", (new_dep, dep_name.strip()))
-                dep_map[dep_name.lower()] = new_dep
-            dep_id = dep_map[dep_name.lower()]
+                dep_name = row_data.get('department_name')
+                if not dep_name:
+                    raise ValueError(f"Row {i+2}: Missing department_name")
+                if dep_name.lower() not in dep_map:
+                    new_dep = f"DEP-{uuid.uuid4().hex[:6].upper()}"
+                    cursor.execute("INSERT INTO erp_departments (id, name) VALUES (?, ?)", (new_dep, dep_name.strip()))
+                    dep_map[dep_name.lower()] = new_dep
+                dep_id = dep_map[dep_name.lower()]
             
-            hm_name = row_data.get('hm_name')
-            if not hm_name or hm_name.lower() not in hm_map:
-                raise ValueError(f"Row {i+2}: Unknown HM Name '{hm_name}'")
-            hm_id = hm_map[hm_name.lower()]
+                hm_name = row_data.get('hm_name')
+                if not hm_name or hm_name.lower() not in hm_map:
+                    raise ValueError(f"Row {i+2}: Unknown HM Name '{hm_name}'")
+                hm_id = hm_map[hm_name.lower()]
             
-            loc_name = row_data.get('location')
-            if not loc_name:
-                raise ValueError(f"Row {i+2}: Missing location")
-            if loc_name.lower() not in loc_map:
-                new_loc = f"LOC-{uuid.uuid4().hex[:6].upper()}"
-                cursor.execute("INSERT INTO erp_locations (id, name) VALUES (?, ?)", (new_loc, loc_name.strip()))
-                loc_map[loc_name.lower()] = new_loc
-            loc_id = loc_map[loc_name.lower()]
+                loc_name = row_data.get('location')
+                if not loc_name:
+                    raise ValueError(f"Row {i+2}: Missing location")
+                if loc_name.lower() not in loc_map:
+                    new_loc = f"LOC-{uuid.uuid4().hex[:6].upper()}"
+                    cursor.execute("INSERT INTO erp_locations (id, name) VALUES (?, ?)", (new_loc, loc_name.strip()))
+                    loc_map[loc_name.lower()] = new_loc
+                loc_id = loc_map[loc_name.lower()]
             
-            # Autonomously generate PK
-            equipment_id = f"EQ-{uuid.uuid4().hex[:6].upper()}"
+                # Autonomously generate PK
+                equipment_id = f"EQ-{uuid.uuid4().hex[:6].upper()}"
             
-            # Status validation
-            status = row_data.get('status', 'ACTIVE') or 'ACTIVE'
-            status = status.upper()
-            if status not in {"ACTIVE", "DEGRADED", "OFFLINE"}:
-                raise ValueError(f"Row {i+2}: Status must be ACTIVE, DEGRADED, or OFFLINE.")
+                # Status validation
+                status = row_data.get('status', 'ACTIVE') or 'ACTIVE'
+                status = status.upper()
+                if status not in {"ACTIVE", "DEGRADED", "OFFLINE"}:
+                    raise ValueError(f"Row {i+2}: Status must be ACTIVE, DEGRADED, or OFFLINE.")
                 
-            cursor.execute(
-                """
-                INSERT INTO erp_equipment (equipment_id, nomenclature, category_id, status, department_id, location_id, assigned_hm_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    equipment_id, 
-                    row_data.get('nomenclature'), 
-                    cat_id, 
-                    status, 
-                    dep_id, 
-                    loc_id, 
+                yield (
+                    equipment_id,
+                    row_data.get('nomenclature'),
+                    cat_id,
+                    status,
+                    dep_id,
+                    loc_id,
                     hm_id
                 )
-            )
-            inserted_count += 1
+
+        inserted_count = write_in_chunks(
+            cursor,
+            """
+            INSERT INTO erp_equipment (equipment_id, nomenclature, category_id, status, department_id, location_id, assigned_hm_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            equipment_params(),
+        )
             
         conn.commit()
         return {"status": "success", "message": f"Successfully ingested {inserted_count} equipment records."}
@@ -1610,6 +1617,20 @@ def get_system_directive():
         raise HTTPException(status_code=503, detail="Directive context unavailable or not loaded.")
     return {"status": "success", "directive": GLOBAL_AI_DIRECTIVE_CONTEXT}
 
+@api_router.get("/admin/system/db-pool")
+def get_db_pool_stats(jwt_payload: dict = Depends(verify_jwt_token)):
+    """Connection pool occupancy and hit/eviction counters (all tenants)."""
+    if jwt_payload.get("role") not in ["ADMINISTRATOR", "ADMIN"]:
+        raise HTTPException(status_code=403, detail="RBAC Violation: ADMIN clearance required.")
+    return {"status": "success", "pool": get_pool_stats()}
+
+@api_router.get("/admin/system/auth-cache")
+def get_auth_cache_stats(jwt_payload: dict = Depends(verify_jwt_token)):
+    """Revoked-token mirror and verified-token LRU counters."""
+    if jwt_payload.get("role") not in ["ADMINISTRATOR", "ADMIN"]:
+        raise HTTPException(status_code=403, detail="RBAC Violation: ADMIN clearance required.")
+    return {"status": "success", "revocations": revocation_cache.stats(), "tokens": token_cache.stats()}
+
 @api_router.get("/mwo/technicians")
 def get_technicians(jwt_payload: dict = Depends(verify_jwt_token)):
     role = jwt_payload.get("role")
@@ -2435,59 +2456,36 @@ class UserUploadSchema(BaseModel):
     def empty_string_to_none(cls, v):
         return None if v == "" else v
 
-def process_csv_background(file_path: str):
-    conn = get_db_connection()
-    # Enforce WAL mode for concurrent read/writes
-    conn.execute("PRAGMA journal_mode=WAL;") 
-    cursor = conn.cursor()
-    
+def validate_user_chunk(raw_chunk: list) -> tuple:
+    valid = []
+    errors = 0
+    for raw_row in raw_chunk:
+        try:
+            # Rigorous Schema Validation before DB interaction
+            r = UserUploadSchema(**raw_row)
+            valid.append((r.user_id, r.name, r.role, r.department, r.reports_to_hm_id))
+        except Exception as ve:
+            logger.error(f"Schema violation for row {raw_row}: {ve}")
+            errors += 1
+    return valid, errors
+
+USER_UPSERT_SQL = """
+    INSERT INTO users (user_id, name, role, department, reports_to_hm_id)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(user_id) DO UPDATE SET
+        name=excluded.name,
+        role=excluded.role,
+        department=excluded.department,
+        reports_to_hm_id=excluded.reports_to_hm_id
+"""
+
+def process_csv_background(file_path: str, job_id: str = None):
+    pipeline = IngestionPipeline("users", USER_UPSERT_SQL, validate_user_chunk)
     try:
-        rows_processed = 0
-        errors = 0
-        with open(file_path, mode='r', encoding='utf-8') as f:
-            csv_reader = csv.DictReader(f)
-            
-            for raw_row in csv_reader:
-                try:
-                    # Rigorous Schema Validation before DB interaction
-                    valid_row = UserUploadSchema(**raw_row)
-                    
-                    cursor.execute("""
-                        INSERT INTO users (user_id, name, role, department, reports_to_hm_id)
-                        VALUES (?, ?, ?, ?, ?)
-                        ON CONFLICT(user_id) DO UPDATE SET
-                            name=excluded.name,
-                            role=excluded.role,
-                            department=excluded.department,
-                            reports_to_hm_id=excluded.reports_to_hm_id
-                    """, (
-                        valid_row.user_id,
-                        valid_row.name,
-                        valid_row.role,
-                        valid_row.department,
-                        valid_row.reports_to_hm_id
-                    ))
-                    rows_processed += 1
-                except ValidationError as ve:
-                    logger.error(f"Schema violation for row {raw_row}: {ve}")
-                    errors += 1
-                    continue # Skip invalid rows, do not crash batch
-                except Exception as e:
-                    logger.error(f"DB Error for row {raw_row}: {e}")
-                    errors += 1
-                    continue
-                    
-        conn.commit()
-        logger.info(f"[BACKGROUND WORKER] CSV Ingestion Complete. Processed: {rows_processed}, Skipped: {errors}")
+        job = run_file_job(pipeline, file_path, job_id=job_id)
+        logger.info(f"[BACKGROUND WORKER] CSV Ingestion {job['status']}. Processed: {job['rows_written']}, Skipped: {job['rows_rejected']}")
     except Exception as e:
-        conn.rollback()
         logger.error(f"Critical failure in background CSV processing: {e}")
-    finally:
-        conn.close()
-        # Autonomous cleanup of temp file
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
 
 import concurrent.futures
 
@@ -2605,83 +2603,39 @@ def validate_mwo_chunk(raw_chunk: list) -> tuple:
             errors += 1
     return valid, errors
 
-def process_mwo_csv_background(file_path: str):
+MWO_UPSERT_SQL = """
+    INSERT INTO work_orders (
+        mwo_id, status, dm_urgency, hm_priority, description,
+        assigned_tech, manual_log, start_date, equipment_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(mwo_id) DO UPDATE SET
+        status=excluded.status,
+        dm_urgency=excluded.dm_urgency,
+        hm_priority=excluded.hm_priority,
+        description=excluded.description,
+        assigned_tech=excluded.assigned_tech,
+        manual_log=excluded.manual_log,
+        start_date=excluded.start_date,
+        equipment_id=excluded.equipment_id
+"""
+
+def process_mwo_csv_background(file_path: str, job_id: str = None):
+    # Streamed parse -> pooled validation -> chunked executemany writer, with
+    # bounded in-flight chunks so memory stays flat for arbitrarily large files.
+    pipeline = IngestionPipeline("mwo", MWO_UPSERT_SQL, validate_mwo_chunk)
     try:
-        rows_processed = 0
-        errors = 0
-        validated_batches = []
-        chunk_size = 5000
-        
-        # Phase 1: CPU-Bound Decoupling with Strictly Streamed I/O
-        with open(file_path, mode='r', encoding='utf-8') as f:
-            csv_reader = csv.DictReader(f)
-            
-            with concurrent.futures.ProcessPoolExecutor() as executor:
-                futures = []
-                while True:
-                    # Stream exactly 5000 rows into memory, preventing OOM
-                    chunk = list(islice(csv_reader, chunk_size))
-                    if not chunk:
-                        break
-                    futures.append(executor.submit(validate_mwo_chunk, chunk))
-                
-                for future in concurrent.futures.as_completed(futures):
-                    try:
-                        valid_batch, batch_errors = future.result()
-                        errors += batch_errors
-                        if valid_batch:
-                            validated_batches.append(valid_batch)
-                    except Exception as e:
-                        logger.error(f"ProcessPool execution error: {e}")
-
-        # Phase 2 & 3: Deferred DB Connection & Atomic Batch Write
-        conn = get_db_connection()
-        try:
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
-            
-            for batch in validated_batches:
-                cursor = conn.cursor()
-                cursor.execute("BEGIN IMMEDIATE")
-                try:
-                    cursor.executemany("""
-                        INSERT INTO work_orders (
-                            mwo_id, status, dm_urgency, hm_priority, description,
-                            assigned_tech, manual_log, start_date, equipment_id
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(mwo_id) DO UPDATE SET
-                            status=excluded.status,
-                            dm_urgency=excluded.dm_urgency,
-                            hm_priority=excluded.hm_priority,
-                            description=excluded.description,
-                            assigned_tech=excluded.assigned_tech,
-                            manual_log=excluded.manual_log,
-                            start_date=excluded.start_date,
-                            equipment_id=excluded.equipment_id
-                    """, batch)
-                    conn.commit()
-                    rows_processed += len(batch)
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"Batch write failure: {e}")
-        finally:
-            conn.close()
-            
-        logger.info(f"[BACKGROUND WORKER] Ingestion Complete. Processed: {rows_processed}, Skipped: {errors}")
-        
+        job = run_file_job(pipeline, file_path, job_id=job_id)
+        logger.info(f"[BACKGROUND WORKER] Ingestion {job['status']}. Processed: {job['rows_written']}, Skipped: {job['rows_rejected']}")
     except Exception as e:
         logger.error(f"Critical failure in MWO processing: {e}")
-    finally:
-        if os.path.exists(file_path):
-            os.remove(file_path)
 
 @api_router.post("/admin/mwo/bulk-upload", status_code=202)
 async def bulk_upload_mwos(background_tasks: BackgroundTasks, jwt_payload: dict = Depends(verify_jwt_token), file: UploadFile = File(...)):
     if jwt_payload.get("role") not in ["ADMINISTRATOR", "ADMIN", "DM", "HM"]:
         raise HTTPException(status_code=403, detail="RBAC Violation: Insufficient clearance for bulk MWO ingestion.")
         
-    if not file.filename.endswith((".csv", ".json")):
-        raise HTTPException(status_code=400, detail="Strictly CSV/JSON payloads authorized.")
+    if not file.filename.endswith((".csv", ".json", ".xlsx")):
+        raise HTTPException(status_code=400, detail="Strictly CSV/JSON/XLSX payloads authorized.")
     
     tmp_path = f"/tmp/mwo_{uuid.uuid4().hex}_{file.filename}"
     
@@ -2694,9 +2648,10 @@ async def bulk_upload_mwos(background_tasks: BackgroundTasks, jwt_payload: dict
     finally:
         await file.close()
 
-    add_tenant_task(background_tasks, process_mwo_csv_background, tmp_path)
+    job_id = create_job("mwo", file.filename)
+    add_tenant_task(background_tasks, process_mwo_csv_background, tmp_path, job_id)
     
-    return {"status": "accepted", "message": "MWO payload queued for secure validation and processing."}
+    return {"status": "accepted", "job_id": job_id, "message": "MWO payload queued for secure validation and processing."}
 
 @api_router.post("/admin/users/bulk-upload", status_code=202)
 async def bulk_upload_users(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
@@ -2716,9 +2671,19 @@ async def bulk_upload_users(background_tasks: BackgroundTasks, file: UploadFile
         await file.close()
 
     # Offload strictly to background thread
-    add_tenant_task(background_tasks, process_csv_background, tmp_path)
+    job_id = create_job("users", file.filename)
+    add_tenant_task(background_tasks, process_csv_background, tmp_path, job_id)
     
-    return {"status": "accepted", "message": "Payload queued for validation and processing."}
+    return {"status": "accepted", "job_id": job_id, "message": "Payload queued for validation and processing."}
+
+@api_router.get("/admin/ingest/jobs/{job_id}")
+def get_ingestion_job(job_id: str, jwt_payload: dict = Depends(verify_jwt_token)):
+    if jwt_payload.get("role") not in ["ADMINISTRATOR", "ADMIN", "DM", "HM"]:
+        raise HTTPException(status_code=403, detail="RBAC Violation: Insufficient clearance for ingestion telemetry.")
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job {job_id} not found.")
+    return job
 
 @api_router.get("/orders/active")
 async def get_active_orders():
@@ -3548,14 +3513,10 @@ async def bulk_ingest_personnel(file: UploadFile = File(...), jwt_payload: dict
         
     content = await file.read()
     try:
-        wb = openpyxl.load_workbook(filename=io.BytesIO(content), data_only=True)
-        ws = wb.active
-        header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
-        rows = []
-        for row_values in ws.iter_rows(min_row=2, values_only=True):
-            if not any(row_values): continue
-            row_dict = dict(zip(header_row, row_values))
-            rows.append(row_dict)
+        rows = iter_xlsx_rows(io.BytesIO(content))
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = chain([first_row], rows)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to read XLSX: {e}")
         
@@ -3622,8 +3583,7 @@ async def bulk_ingest_personnel(file: UploadFile = File(...), jwt_payload: dict
         # Sort so that Managers are inserted before Technicians to satisfy Foreign Key constraints
         parsed_users.sort(key=lambda u: 0 if u['role'] in ['ADMINISTRATOR', 'ADMIN', 'DM', 'HM'] else 1)
 
-        # Pass 2: Resolve HM relationships and insert
-        inserted_count = 0
+        # Pass 2: Resolve HM relationships
         for user in parsed_users:
             hm_name = user['reports_to']
             hm_id = None
@@ -3633,21 +3593,29 @@ async def bulk_ingest_personnel(file: UploadFile = File(...), jwt_payload: dict
                 if hm_name.lower().strip() not in hm_map:
                     raise ValueError(f"Row {user['row_index']}: Unknown HM Name '{hm_name}'")
                 hm_id = hm_map[hm_name.lower().strip()]
-
-            pin_hash = bcrypt.hashpw(user['pin'].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-            user['pin_hash'] = pin_hash
             user['reports_to_hm_id'] = hm_id
 
-            # First inventory manager designated for a department self-heals its
-            # inventory category.
+        # bcrypt releases the GIL, so the per-user hashes run in parallel threads.
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            hashes = executor.map(
+                lambda p: bcrypt.hashpw(p.encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
+                [user['pin'] for user in parsed_users],
+            )
+            for user, pin_hash in zip(parsed_users, hashes):
+                user['pin_hash'] = pin_hash
+
+        # First inventory manager designated for a department self-heals its
+        # inventory category.
+        for user in parsed_users:
             if user['is_inventory_manager'] == 1:
                 assert_department_category_exists(cursor, user['department_id'], user['id'])
 
-            cursor.execute(
-                "INSERT INTO erp_employees (id, name, role, pin_hash, is_active, department_id, reports_to_hm_id, is_inventory_manager) VALUES (?, ?, ?, ?, 1, ?, ?, ?)",
-                (user['id'], user['name'], user['role'], pin_hash, user['department_id'], hm_id, user['is_inventory_manager'])
-            )
-            inserted_count += 1
+        inserted_count = write_in_chunks(
+            cursor,
+            "INSERT INTO erp_employees (id, name, role, pin_hash, is_active, department_id, reports_to_hm_id, is_inventory_manager) VALUES (?, ?, ?, ?, 1, ?, ?, ?)",
+            ((user['id'], user['name'], user['role'], user['pin_hash'], user['department_id'],
+              user['reports_to_hm_id'], user['is_inventory_manager']) for user in parsed_users),
+        )
 
         conn.commit()
 
@@ -3696,14 +3664,10 @@ async def bulk_ingest_part(file: UploadFile = File(...), jwt_payload: dict = Dep
         
     content = await file.read()
     try:
-        wb = openpyxl.load_workbook(filename=io.BytesIO(content), data_only=True)
-        ws = wb.active
-        header_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True))
-        rows = []
-        for row_values in ws.iter_rows(min_row=2, values_only=True):
-            if not any(row_values): continue
-            row_dict = dict(zip(header_row, row_values))
-            rows.append(row_dict)
+        rows = iter_xlsx_rows(io.BytesIO(content))
+        first_row = next(rows, None)
+        if first_row is not None:
+            rows = chain([first_row], rows)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to read XLSX: {e}")
         
@@ -3717,26 +3681,27 @@ async def bulk_ingest_part(file: UploadFile = File(...), jwt_payload: dict = Dep
 
         cursor.execute("BEGIN TRANSACTION")
         
-        inserted_count = 0
-        for i, row in enumerate(rows):
-            row_data = {k.strip(): str(v).strip() if v is not None else None for k, v in row.items()}
-            
-            cat_name = row_data.get('category_name')
-            if not cat_name:
-                raise ValueError(f"Row {i+2}: Missing category_name")
-            if cat_name.lower() not in cat_map:
-                new_cat = f"CAT-{uuid.uuid4().hex[:6].upper()}"
-                cursor.execute("INSERT INTO erp_categories (id, name) VALUES (?, ?)", (new_cat, cat_name.strip()))
-                cat_map[cat_name.lower()] = new_cat
-            cat_id = cat_map[cat_name.lower()]
-
-            new_id = f"PRT-{uuid.uuid4().hex[:6].upper()}"
+        def part_params():
+            for i, row in enumerate(rows):
+                row_data = {k.strip(): str(v).strip() if v is not None else None for k, v in row.items()}
             
-            cursor.execute(
-                "INSERT INTO erp_parts (part_id, nomenclature, category_id, quantity_on_hand, reorder_threshold, unit_cost) VALUES (?, ?, ?, ?, ?, ?)",
-                (new_id, row_data.get('nomenclature'), cat_id, int(row_data.get('quantity_on_hand', 0)), int(row_data.get('reorder_threshold', 5)), float(row_data.get('unit_cost', 0.0)))
-            )
-            inserted_count += 1
+                cat_name = row_data.get('category_name')
+                if not cat_name:
+                    raise ValueError(f"Row {i+2}: Missing category_name")
+                if cat_name.lower() not in cat_map:
+                    new_cat = f"CAT-{uuid.uuid4().hex[:6].upper()}"
+                    cursor.execute("INSERT INTO erp_categories (id, name) VALUES (?, ?)", (new_cat, cat_name.strip()))
+                    cat_map[cat_name.lower()] = new_cat
+                cat_id = cat_map[cat_name.lower()]
+
+                new_id = f"PRT-{uuid.uuid4().hex[:6].upper()}"
+                yield (new_id, row_data.get('nomenclature'), cat_id, int(row_data.get('quantity_on_hand', 0)), int(row_data.get('reorder_threshold', 5)), float(row_data.get('unit_cost', 0.0)))
+
+        inserted_count = write_in_chunks(
+            cursor,
+            "INSERT INTO erp_parts (part_id, nomenclature, category_id, quantity_on_hand, reorder_threshold, unit_cost) VALUES (?, ?, ?, ?, ?, ?)",
+            part_params(),
+        )
             
         conn.commit()
         return {"status": "success", "message": f"Successfully ingested {inserted_count} parts."}
@@ -4441,45 +4406,48 @@ from collections import deque
 from typing import List
 
 # --- Inventory Event Bus (SSE) ---
-# Bounded in-memory ring buffer; SSE clients poll for events newer than their cursor.
-_inventory_events = deque(maxlen=200)
-_inventory_event_seq = 0
-_inventory_event_lock = __import__("threading").Lock()
+# Per-tenant push channels with Last-Event-ID resume; see inventory_event_bus.py.
+from inventory_event_bus import inventory_event_bus
+
+SSE_KEEPALIVE_SECONDS = 15.0
 
 def emit_inventory_event(event_type: str, payload: dict):
-    global _inventory_event_seq
-    with _inventory_event_lock:
-        _inventory_event_seq += 1
-        _inventory_events.append({
-            "id": _inventory_event_seq,
-            "type": event_type,
-            "payload": payload,
-            "ts": datetime.now(timezone.utc).isoformat()
-        })
+    """Publish to the current tenant's channel. Safe from sync routes and workers."""
+    inventory_event_bus.publish(get_current_tenant() or DEFAULT_TENANT_ID, event_type, payload)
 
 @api_router.get("/notifications/stream")
-async def inventory_notification_stream(token: str = Query(...)):
+async def inventory_notification_stream(
+    request: Request,
+    token: str = Query(...),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """SSE feed for inventory/PO events. EventSource cannot set headers, so the JWT rides a query param."""
     if not PUBLIC_KEY:
         raise HTTPException(status_code=503, detail="Cryptographic Gateway Unavailable.")
     try:
-        payload = jwt.decode(token, PUBLIC_KEY, algorithms=[ALGORITHM])
+        payload = _decode_jwt(token)
         if is_jti_revoked(payload.get("jti")):
             raise HTTPException(status_code=401, detail="Token Revoked.")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=403, detail="Cryptographic Verification Failed.")
 
+    # Resolve the tenant now: the middleware's context binding is reset before
+    # the streaming body is iterated.
+    tenant_id = getattr(request.state, "tenant_id", None) or get_current_tenant() or DEFAULT_TENANT_ID
+    subscription = inventory_event_bus.subscribe(tenant_id, last_event_id)
+
     async def event_generator():
-        cursor = _inventory_event_seq
-        yield "event: connected\ndata: {}\n\n"
-        while True:
-            with _inventory_event_lock:
-                fresh = [e for e in _inventory_events if e["id"] > cursor]
-                if fresh:
-                    cursor = fresh[-1]["id"]
-            for e in fresh:
-                yield f"id: {e['id']}\nevent: {e['type']}\ndata: {json.dumps(e)}\n\n"
-            await asyncio.sleep(2)
+        try:
+            yield "event: connected\ndata: {}\n\n"
+            while True:
+                batch = await subscription.next_batch(SSE_KEEPALIVE_SECONDS)
+                if not batch:
+                    yield ": keep-alive\n\n"
+                    continue
+                for e in batch:
+                    yield f"id: {e['id']}\nevent: {e['type']}\ndata: {json.dumps(e)}\n\n"
+        finally:
+            subscription.close()
 
     return StreamingResponse(event_generator(), media_type="text/event-stream",
                              headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -0,0 +1,102 @@
+"""
+auth_cache verification: revoked-token mirror + verified-token LRU.
+
+Drives RevocationCache against a temp SQLite file standing in for the default
+database, so no gateway or live ERP data is needed.
+
+Run: venv/Scripts/python.exe -m pytest test_auth_cache.py
+"""
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from auth_cache import BloomFilter, RevocationCache, VerifiedTokenCache  # noqa: E402
+
+
+def _revocation_db(tmp_path):
+    path = str(tmp_path / "global.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE revoked_tokens (jti TEXT PRIMARY KEY, revoked_at DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    conn.commit()
+    conn.close()
+    calls = {"n": 0}
+
+    def connect():
+        calls["n"] += 1
+        return sqlite3.connect(path)
+
+    def revoke(jti):
+        c = sqlite3.connect(path)
+        c.execute("INSERT INTO revoked_tokens (jti) VALUES (?)", (jti,))
+        c.commit()
+        c.close()
+
+    return connect, revoke, calls
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(500)
+    items = [f"jti-{i}" for i in range(500)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(5000))
+    assert false_positives < 50
+
+
+def test_revocations_are_picked_up_by_watermark(tmp_path):
+    connect, revoke, calls = _revocation_db(tmp_path)
+    revoke("old")
+    cache = RevocationCache(connect=connect, refresh_interval=0, resync_interval=3600)
+    assert cache.is_revoked("old")
+    assert not cache.is_revoked("fresh")
+    revoke("fresh")
+    assert cache.is_revoked("fresh")
+    assert cache.stats()["resyncs"] == 1
+
+
+def test_hot_path_does_no_io_within_refresh_interval(tmp_path):
+    connect, revoke, calls = _revocation_db(tmp_path)
+    cache = RevocationCache(connect=connect, refresh_interval=3600)
+    for _ in range(1000):
+        assert not cache.is_revoked("live-token")
+    assert calls["n"] == 1
+    cache.note_revoked("live-token")
+    assert cache.is_revoked("live-token")
+
+
+def test_refresh_errors_keep_last_mirror(tmp_path):
+    connect, revoke, calls = _revocation_db(tmp_path)
+    revoke("bad")
+    cache = RevocationCache(connect=connect, refresh_interval=0)
+    assert cache.is_revoked("bad")
+
+    def broken():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    cache._connect = broken
+    assert cache.is_revoked("bad")
+    assert not cache.is_revoked("good")
+    assert cache.stats()["refresh_errors"] >= 1
+
+
+def test_verified_tokens_expire_at_exp_and_on_key_rotation():
+    cache = VerifiedTokenCache(max_entries=2)
+    payload = {"sub": "ERP-1000", "jti": "a", "exp": time.time() + 60}
+    cache.put("tok", "key-1", payload)
+    assert cache.get("tok", "key-1") is payload
+    assert cache.get("tok", "key-2") is None          # rotated key
+    cache.put("tok", "key-1", payload)
+    cache.put("old", "key-1", {"jti": "b", "exp": time.time() - 1})
+    assert cache.get("old", "key-1") is None          # past its exp
+    cache.put("x", "key-1", {"jti": "x", "exp": time.time() + 60})
+    cache.put("y", "key-1", {"jti": "y", "exp": time.time() + 60})
+    assert cache.stats()["entries"] == 2              # LRU bound
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([os.path.abspath(__file__), "-v"]))
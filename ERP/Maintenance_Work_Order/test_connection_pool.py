@@ -0,0 +1,120 @@
+"""
+local_db connection pool verification.
+
+get_db_connection() hands out pooled connections whose close() returns them to
+a per-database-path pool. These tests drive the pool directly against temp
+databases, so no gateway or live ERP data is touched.
+
+Run: venv/Scripts/python.exe -m pytest test_connection_pool.py
+"""
+import os
+import sqlite3
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_db  # noqa: E402
+from local_db import ConnectionPool  # noqa: E402
+
+
+def test_close_returns_connection_to_pool(tmp_path):
+    pool = ConnectionPool(max_idle_per_db=2, max_open=8)
+    path = str(tmp_path / "a.db")
+    c1 = pool.acquire(path)
+    c1.close()
+    c2 = pool.acquire(path)
+    assert c2 is c1, "second checkout should reuse the released connection"
+    assert c2.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert c2.row_factory is sqlite3.Row
+    c2.close()
+    assert pool.stats()["hits"] == 1
+    pool.close_all()
+
+
+def test_open_transaction_is_rolled_back_on_release(tmp_path):
+    pool = ConnectionPool()
+    path = str(tmp_path / "a.db")
+    conn = pool.acquire(path)
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.close()  # route forgot to commit
+    conn = pool.acquire(path)
+    assert not conn.in_transaction
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    conn.close()
+    pool.close_all()
+
+
+def test_open_budget_evicts_other_tenants_and_overflows(tmp_path):
+    pool = ConnectionPool(max_idle_per_db=4, max_open=2)
+    a, b, c = (str(tmp_path / f"{n}.db") for n in "abc")
+    pool.acquire(a).close()
+    pool.acquire(b).close()
+    assert pool.stats()["open"] == 2
+    held_c = pool.acquire(c)               # evicts a's idle handle
+    assert pool.stats()["evictions"] == 1
+    held_b = pool.acquire(b)
+    extra = pool.acquire(a)                # budget exhausted by in-use handles
+    assert pool.stats()["overflow"] == 1
+    extra.close()
+    for conn in (held_b, held_c):
+        conn.close()
+    assert pool.stats()["open"] <= 2
+    pool.close_all()
+
+
+def test_idle_tenants_are_swept(tmp_path):
+    pool = ConnectionPool(idle_timeout=0)
+    path = str(tmp_path / "a.db")
+    pool.acquire(path).close()
+    pool.evict_idle()
+    stats = pool.stats()
+    assert stats["open"] == 0 and stats["databases"] == {}
+
+
+def test_concurrent_checkouts_are_isolated(tmp_path):
+    pool = ConnectionPool(max_idle_per_db=4, max_open=16)
+    path = str(tmp_path / "a.db")
+    setup = pool.acquire(path)
+    setup.execute("CREATE TABLE t (x INTEGER)")
+    setup.close()
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(25):
+                conn = pool.acquire(path)
+                try:
+                    conn.execute("INSERT INTO t VALUES (?)", (n * 100 + i,))
+                finally:
+                    conn.close()
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    conn = pool.acquire(path)
+    assert not errors
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 200
+    conn.close()
+    assert pool.stats()["open"] <= 4 + 1
+    pool.close_all()
+
+
+def test_get_db_connection_uses_process_pool():
+    conn = local_db.get_db_connection()
+    conn.close()
+    again = local_db.get_db_connection()
+    assert again is conn
+    again.close()
+    assert local_db.get_pool_stats()["hits"] >= 1
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([os.path.abspath(__file__), "-v"]))
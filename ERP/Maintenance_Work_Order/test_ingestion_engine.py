@@ -0,0 +1,118 @@
+"""
+Bulk ingestion engine verification: ordered chunked upserts, per-row isolation
+of bad rows inside a failed chunk, bounded in-flight chunks through a real
+process pool, job progress rows and the streaming XLSX reader.
+
+Run: venv/Scripts/python.exe -m pytest test_ingestion_engine.py
+"""
+import io
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pytest  # noqa: E402
+import ingestion_engine  # noqa: E402
+from ingestion_engine import IngestionPipeline, get_job, iter_xlsx_rows  # noqa: E402
+
+UPSERT_SQL = """
+    INSERT INTO work_orders (mwo_id, status, description) VALUES (?, ?, ?)
+    ON CONFLICT(mwo_id) DO UPDATE SET status=excluded.status, description=excluded.description
+"""
+
+
+def validate_rows(raw_chunk):
+    # Module level so it pickles into ProcessPoolExecutor workers.
+    valid, errors = [], 0
+    for raw in raw_chunk:
+        if not raw.get("mwo_id"):
+            errors += 1
+            continue
+        valid.append((raw["mwo_id"], raw.get("status") or "UNASSIGNED", raw.get("description")))
+    return valid, errors
+
+
+@pytest.fixture
+def connect(tmp_path):
+    db_path = str(tmp_path / "ingest.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE work_orders (mwo_id TEXT PRIMARY KEY, status TEXT NOT NULL, description TEXT NOT NULL)")
+    conn.commit()
+    conn.close()
+    return lambda: sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+
+
+def _rows(connect):
+    conn = connect()
+    try:
+        return dict(conn.execute("SELECT mwo_id, status FROM work_orders").fetchall())
+    finally:
+        conn.close()
+
+
+def test_chunks_are_written_in_file_order_and_job_tracks_progress(connect):
+    rows = [{"mwo_id": f"MWO-{i % 7}", "status": f"S{i}", "description": "d"} for i in range(50)]
+    rows.append({"mwo_id": "", "description": "no id"})
+    pipeline = IngestionPipeline("mwo", UPSERT_SQL, validate_rows, connect=connect,
+                                 chunk_size=8, workers=0)
+    job = pipeline.run(rows)
+
+    assert job["status"] == ingestion_engine.JOB_COMPLETED
+    assert (job["rows_read"], job["rows_written"], job["rows_rejected"]) == (51, 50, 1)
+    assert job["chunks_committed"] == 7
+    # The last occurrence of each id wins, exactly like a sequential upsert.
+    assert _rows(connect) == {f"MWO-{k}": f"S{max(i for i in range(50) if i % 7 == k)}" for k in range(7)}
+    assert get_job(job["job_id"], connect=connect) == job
+
+
+def test_failed_chunk_is_replayed_row_by_row(connect):
+    rows = [{"mwo_id": f"MWO-{i}", "description": None if i == 3 else "ok"} for i in range(6)]
+    pipeline = IngestionPipeline("mwo", UPSERT_SQL, validate_rows, connect=connect,
+                                 chunk_size=10, workers=0)
+    job = pipeline.run(rows)
+
+    assert job["status"] == ingestion_engine.JOB_COMPLETED
+    assert (job["rows_written"], job["rows_rejected"]) == (5, 1)
+    assert "MWO-3" in job["error"]
+    assert "MWO-3" not in _rows(connect)
+
+
+def test_process_pool_with_back_pressure(connect):
+    def source():
+        for i in range(2000):
+            yield {"mwo_id": f"MWO-{i}", "description": "pooled"}
+
+    pipeline = IngestionPipeline("mwo", UPSERT_SQL, validate_rows, connect=connect,
+                                 chunk_size=100, workers=2, max_inflight=2)
+    job = pipeline.run(source())
+
+    assert job["status"] == ingestion_engine.JOB_COMPLETED
+    assert job["rows_written"] == 2000 == len(_rows(connect))
+    assert job["chunks_committed"] == 20
+
+
+def test_unknown_job_returns_none(connect):
+    assert get_job("ING-MISSING", connect=connect) is None
+
+
+def test_xlsx_reader_streams_and_skips_blank_rows():
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append([" mwo_id ", "description"])
+    ws.append(["MWO-1", "first"])
+    ws.append([None, None])
+    ws.append(["MWO-2", "second"])
+    buf = io.BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+
+    assert list(iter_xlsx_rows(buf)) == [
+        {"mwo_id": "MWO-1", "description": "first"},
+        {"mwo_id": "MWO-2", "description": "second"},
+    ]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([os.path.abspath(__file__), "-v"]))
@@ -0,0 +1,81 @@
+"""
+Inventory event bus verification: per-tenant channels, push wakeup from worker
+threads, Last-Event-ID resume and drop-oldest back-pressure.
+
+Run: venv/Scripts/python.exe -m pytest test_inventory_event_bus.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inventory_event_bus import InventoryEventBus  # noqa: E402
+
+
+def test_publish_from_thread_wakes_subscriber_immediately():
+    async def scenario():
+        bus = InventoryEventBus()
+        sub = bus.subscribe("acme")
+        threading.Timer(0.05, bus.publish, args=("acme", "po_submitted", {"po_id": "PO-1"})).start()
+        start = time.perf_counter()
+        batch = await sub.next_batch(timeout=5)
+        return batch, time.perf_counter() - start
+
+    batch, elapsed = asyncio.run(scenario())
+    assert [e["type"] for e in batch] == ["po_submitted"]
+    assert elapsed < 1.0, "delivery should not wait for a poll interval"
+
+
+def test_channels_are_isolated_per_tenant():
+    async def scenario():
+        bus = InventoryEventBus()
+        a, b = bus.subscribe("a"), bus.subscribe("b")
+        bus.publish("a", "po_recalled", {})
+        return await a.next_batch(0.1), await b.next_batch(0.1)
+
+    got_a, got_b = asyncio.run(scenario())
+    assert len(got_a) == 1 and got_b == []
+
+
+def test_last_event_id_resumes_from_history():
+    async def scenario():
+        bus = InventoryEventBus()
+        for i in range(5):
+            bus.publish("acme", "po_draft_updated", {"n": i})
+        sub = bus.subscribe("acme", last_event_id="3")
+        return await sub.next_batch(0.1)
+
+    assert [e["id"] for e in asyncio.run(scenario())] == [4, 5]
+
+
+def test_slow_subscriber_drops_oldest():
+    async def scenario():
+        bus = InventoryEventBus(queue_size=3)
+        sub = bus.subscribe("acme")
+        for i in range(10):
+            bus.publish("acme", "po_decided", {"n": i})
+        return await sub.next_batch(0.1), sub.dropped
+
+    batch, dropped = asyncio.run(scenario())
+    assert [e["payload"]["n"] for e in batch] == [7, 8, 9]
+    assert dropped == 7
+
+
+def test_idle_subscriber_times_out_and_unsubscribes():
+    async def scenario():
+        bus = InventoryEventBus()
+        sub = bus.subscribe("acme")
+        batch = await sub.next_batch(0.05)
+        sub.close()
+        return batch, bus.stats()
+
+    batch, stats = asyncio.run(scenario())
+    assert batch == [] and stats["acme"]["subscribers"] == 0
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([os.path.abspath(__file__), "-v"]))
@@ -0,0 +1,138 @@
+"""Streaming reverse proxy for /agent/{agent_id}/... routes.
+
+The agent -> port map is built from agent_registry.json once and rebuilt only
+when the file changes (mtime/size) or a compile-success callback invalidates
+it, so proxying does not re-read the registry per request.
+
+Request and response bodies are streamed, never buffered: the upload is
+forwarded chunk by chunk from the incoming ASGI stream and the upstream
+response is passed through as a StreamingResponse, so large artifacts and SSE
+endpoints of child agents use constant memory. Each agent port gets its own
+pooled httpx client capped at MAX_CONNECTIONS_PER_AGENT, so one slow agent
+cannot exhaust connections for the rest.
+"""
+import os
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import httpx
+from fastapi import HTTPException, Request
+from starlette.responses import StreamingResponse
+
+from registry_manager import REGISTRY_PATH, load_registry
+
+logger = logging.getLogger("MasterArchitect.AgentProxy")
+
+MAX_CONNECTIONS_PER_AGENT = int(os.getenv("AGENT_PROXY_MAX_CONNECTIONS", "32"))
+
+# Connection-level headers that must not be forwarded (RFC 9110 §7.6.1), plus
+# Host, which httpx sets for the upstream URL.
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade", "host",
+}
+_BODYLESS_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+
+
+class AgentRoutingTable:
+    """agent_id -> port, cached until agent_registry.json changes."""
+
+    def __init__(self, registry_path: str = REGISTRY_PATH):
+        self.registry_path = registry_path
+        self._routes: Optional[Dict[str, int]] = None
+        self._version = None
+        self._lock = asyncio.Lock()
+
+    def _file_version(self):
+        try:
+            st = os.stat(self.registry_path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def invalidate(self):
+        self._routes = None
+
+    async def port_for(self, agent_id: str) -> Optional[int]:
+        version = self._file_version()
+        if self._routes is None or version != self._version:
+            async with self._lock:
+                version = self._file_version()
+                if self._routes is None or version != self._version:
+                    registry = await load_registry()
+                    self._routes = {a["id"]: a["port"] for a in registry.get("agents", []) if a.get("port")}
+                    self._version = self._file_version()
+                    logger.info(f"Agent routing table rebuilt ({len(self._routes)} agents)")
+        return self._routes.get(agent_id)
+
+
+async def _relay(upstream: httpx.Response):
+    # Release the pooled connection even if the client disconnects mid-stream.
+    try:
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    finally:
+        await upstream.aclose()
+
+
+class AgentProxy:
+    """Forwards requests to child agents with streamed bodies and per-agent pools."""
+
+    def __init__(self, routes: AgentRoutingTable = None, max_connections: int = MAX_CONNECTIONS_PER_AGENT,
+                 timeout: float = 15.0):
+        self.routes = routes or AgentRoutingTable()
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._clients: Dict[int, httpx.AsyncClient] = {}
+
+    def _client(self, port: int) -> httpx.AsyncClient:
+        client = self._clients.get(port)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=f"http://127.0.0.1:{port}",
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+            self._clients[port] = client
+        return client
+
+    def _timeout(self, request: Request) -> httpx.Timeout:
+        # Event streams may legitimately go quiet for longer than a normal read.
+        if "text/event-stream" in request.headers.get("accept", ""):
+            return httpx.Timeout(self.timeout, read=None)
+        return httpx.Timeout(self.timeout)
+
+    async def forward(self, request: Request, agent_id: str, path: str, method: str = None) -> StreamingResponse:
+        target_port = await self.routes.port_for(agent_id)
+        if not target_port:
+            logger.error(f"Proxy forwarding failed: Agent '{agent_id}' is not in registry.")
+            raise HTTPException(status_code=502, detail=f"Proxy error: Agent '{agent_id}' is not in registry.")
+
+        method = method or request.method
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS]
+        has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+        content = request.stream() if has_body or method not in _BODYLESS_METHODS else None
+
+        client = self._client(target_port)
+        upstream_request = client.build_request(
+            method, "/" + path.lstrip("/"), headers=headers,
+            params=request.query_params.multi_items(), content=content, timeout=self._timeout(request),
+        )
+        try:
+            upstream = await client.send(upstream_request, stream=True)
+        except httpx.PoolTimeout:
+            logger.warning(f"Proxy pool for '{agent_id}' (port {target_port}) saturated")
+            raise HTTPException(status_code=503, detail=f"Proxy error: Agent '{agent_id}' is at its connection limit.")
+        except Exception as e:
+            logger.error(f"Proxy forwarding failed to port {target_port} for /{path.lstrip('/')}: {e}")
+            raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
+
+        # Raw bytes pass through untouched, so Content-Encoding/Length stay valid.
+        resp_headers = {k: v for k, v in upstream.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        return StreamingResponse(_relay(upstream), status_code=upstream.status_code, headers=resp_headers)
+
+    async def aclose(self):
+        for client in list(self._clients.values()):
+            await client.aclose()
+        self._clients.clear()
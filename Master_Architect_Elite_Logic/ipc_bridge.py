@@ -5,6 +5,7 @@ import time
 import asyncio
 import logging
 import aiofiles
+from pathlib import Path
 
 # Configure logging to match server style
 logger = logging.getLogger("MasterArchitect.IPCBridge")
@@ -13,6 +14,9 @@ logger = logging.getLogger("MasterArchitect.IPCBridge")
 BRIDGE_CLIENTS = []
 
 _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(_SCRIPT_DIR))
+
+from shared_modules.dispatch_queue import SpoolWatcher, get_spool
 
 async def register_client():
     """
@@ -50,186 +54,194 @@ async def broadcast_event(event: dict):
         except Exception as e:
             logger.error(f"Failed to queue event to SSE client: {e}")
 
+# Claims older than this belong to a bridge that died mid-run; they go back to pending.
+STALE_INFLIGHT_SECONDS = 3600.0
+REQUEUE_STALE_INTERVAL = 60.0
+
+
 async def start_ipc_bridge(owner_port: int = None):
     """
-    Continuous async polling loop targeting ay2_dispatch_queue.
+    Continuous async consumer of the ay2_dispatch_queue spool.
     Coordinates subprocess execution, strategic pauses, and life-cycle archival.
 
-    owner_port: when set, blueprints are claimed via an atomic rename so exactly one
-    instance in the shared-queue fleet actuates each one (prevents the cross-process race).
+    Blueprints are claimed one at a time through the shared DispatchSpool: each claim is
+    an atomic rename into inflight/, so exactly one instance in the shared-queue fleet
+    actuates each one and a burst is spread across the fleet. The SpoolWatcher wakes on
+    filesystem events (or a cheap mtime poll) instead of listing the directory every
+    second. owner_port tags the claims. A blueprint whose actuation fails or is cancelled
+    is released back to pending, and claims stranded by a dead bridge are re-queued at
+    startup and every REQUEUE_STALE_INTERVAL seconds.
     """
     ay2_queue_dir = os.path.join(_SCRIPT_DIR, "ay2_dispatch_queue")
     os.makedirs(ay2_queue_dir, exist_ok=True)
-    
+    spool = get_spool(Path(ay2_queue_dir))
+    watcher = SpoolWatcher(spool, owner=f"port-{owner_port}" if owner_port is not None else None,
+                           batch_size=1)
+
     logger.info(f"Actuating IPC Bridge Watchdog. Spool directory: {ay2_queue_dir}")
-    
-    while True:
-        try:
-            # Audit directory for pending files
-            if not os.path.exists(ay2_queue_dir):
-                await asyncio.sleep(1)
-                continue
-                
-            files = sorted([
-                f for f in os.listdir(ay2_queue_dir)
-                if f.startswith("pending_blueprint_") and f.endswith(".json")
-            ])
-            
-            if not files:
-                await asyncio.sleep(1)
-                continue
-                
-            filename = files[0]
-            file_path = os.path.join(ay2_queue_dir, filename)
-
-            # ── Atomic claim: single owner across the shared-queue fleet ──
-            # Rename the pending file to a port-scoped "claimed" name. os.rename is
-            # atomic on one filesystem, so exactly one instance wins; losers get an
-            # error and skip. `filename` keeps the ORIGINAL name so the downstream
-            # paused_/archived_/broken_ renames preserve the legacy filenames the
-            # existing E2E suite asserts on.
-            if owner_port is not None:
-                claimed_path = os.path.join(ay2_queue_dir, f"claimed_{owner_port}_{filename}")
-                try:
-                    os.rename(file_path, claimed_path)
-                except (FileNotFoundError, OSError):
-                    await asyncio.sleep(0.05)
-                    continue
-                file_path = claimed_path
-
-            logger.info(f"IPC Watchdog discovered blueprint: {filename}")
-            
-            # Read spooled JSON to evaluate properties
+
+    last_requeue = None
+    try:
+        while True:
             try:
-                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                blueprint_data = json.loads(content)
+                if last_requeue is None or time.monotonic() - last_requeue >= REQUEUE_STALE_INTERVAL:
+                    last_requeue = time.monotonic()
+                    await asyncio.to_thread(spool.requeue_stale, STALE_INFLIGHT_SECONDS)
+                for inflight_path in await asyncio.to_thread(watcher.next_batch, 1.0):
+                    if not await _run_claimed(spool, inflight_path):
+                        await asyncio.sleep(1)   # the old pending loop's retry cadence
             except Exception as e:
-                logger.error(f"Error reading/parsing pending blueprint {filename}: {e}")
-                # Rename to broken to avoid infinite loop
-                broken_name = filename.replace("pending_blueprint_", "broken_blueprint_")
-                os.rename(file_path, os.path.join(ay2_queue_dir, broken_name))
-                await broadcast_event({
-                    "type": "circuit_breaker",
-                    "status": "HALTED",
-                    "blueprint_file": filename,
-                    "error": f"Failed to parse blueprint JSON: {str(e)}"
-                })
-                continue
-                
-            # Rule 1: Evaluate Strategic Pause (Zero-Trust Pause)
-            if blueprint_data.get("Strategic_Pause") is True:
-                paused_name = filename.replace("pending_blueprint_", "paused_blueprint_")
-                paused_path = os.path.join(ay2_queue_dir, paused_name)
-                
-                os.rename(file_path, paused_path)
-                logger.warning(f"Strategic Pause detected. Renamed {filename} to {paused_name}")
-                
-                await broadcast_event({
-                    "type": "strategic_pause",
-                    "status": "PAUSED",
-                    "blueprint_file": paused_name
-                })
-                # Yield to the next loop tick without executing, awaiting POST /approve or POST /reject
+                logger.error(f"Global fracture in start_ipc_bridge event loop: {e}")
                 await asyncio.sleep(1)
-                continue
-                
-            # Rule 2: Execution via subprocess spawn
+    finally:
+        watcher.close()
+
+
+async def _run_claimed(spool, inflight_path) -> bool:
+    """Actuate one claimed blueprint. On failure or cancellation, hand it back to pending."""
+    try:
+        await _actuate_blueprint(spool, inflight_path)
+        return True
+    except BaseException as e:
+        if inflight_path.exists():
+            try:
+                spool.release(inflight_path.name)
+                logger.warning(f"Released {inflight_path.name} back to pending after: {e!r}")
+            except OSError as release_error:
+                logger.error(f"Could not release {inflight_path.name}: {release_error}")
+        if not isinstance(e, Exception):
+            raise
+        logger.error(f"Global fracture in start_ipc_bridge event loop: {e}")
+        return False
+
+
+async def _actuate_blueprint(spool, inflight_path):
+    """Run one claimed blueprint and retire it as paused_, archived_ or broken_."""
+    # `filename` keeps the ORIGINAL pending_ name so the paused_/archived_/broken_
+    # names match the legacy filenames the existing E2E suite asserts on.
+    filename = inflight_path.name
+    file_path = str(inflight_path)
+    logger.info(f"IPC Watchdog discovered blueprint: {filename}")
+
+    # Read spooled JSON to evaluate properties
+    try:
+        async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+            content = await f.read()
+        blueprint_data = json.loads(content)
+    except Exception as e:
+        logger.error(f"Error reading/parsing pending blueprint {filename}: {e}")
+        # Retire as broken to avoid an infinite loop
+        spool.complete(filename, ok=False)
+        await broadcast_event({
+            "type": "circuit_breaker",
+            "status": "HALTED",
+            "blueprint_file": filename,
+            "error": f"Failed to parse blueprint JSON: {str(e)}"
+        })
+        return
+
+    # Rule 1: Evaluate Strategic Pause (Zero-Trust Pause)
+    if blueprint_data.get("Strategic_Pause") is True:
+        paused_name = spool.pause(filename).name
+        logger.warning(f"Strategic Pause detected. Renamed {filename} to {paused_name}")
+
+        await broadcast_event({
+            "type": "strategic_pause",
+            "status": "PAUSED",
+            "blueprint_file": paused_name
+        })
+        # Not executed: awaiting POST /approve (back to pending_) or POST /reject
+        return
+
+    # Rule 2: Execution via subprocess spawn
+    await broadcast_event({
+        "type": "execution_start",
+        "status": "EXECUTING",
+        "blueprint_file": filename
+    })
+    
+    # Formulate subprocess arguments
+    cmd = ["antigravity", "--execute-blueprint", file_path, "--headless-diagnostics"]
+    process = None
+    
+    try:
+        # Try spawning global antigravity CLI
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        # Fallback to programmatic mock CLI execution
+        logger.info("Global antigravity command not found. Falling back to local mock_antigravity.py")
+        mock_script = os.path.join(_SCRIPT_DIR, "mock_antigravity.py")
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            mock_script,
+            "--execute-blueprint",
+            file_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+    fatal_exception_detected = False
+    exception_trace = []
+    
+    async def read_stdout(stream):
+        while True:
+            line_bytes = await stream.readline()
+            if not line_bytes:
+                break
+            line = line_bytes.decode("utf-8", errors="ignore")
             await broadcast_event({
-                "type": "execution_start",
-                "status": "EXECUTING",
-                "blueprint_file": filename
+                "type": "agent_stream",
+                "emitter": "IPC_BRIDGE_STDOUT",
+                "content": line
             })
             
-            # Formulate subprocess arguments
-            cmd = ["antigravity", "--execute-blueprint", file_path, "--headless-diagnostics"]
-            process = None
-            
-            try:
-                # Try spawning global antigravity CLI
-                process = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-            except FileNotFoundError:
-                # Fallback to programmatic mock CLI execution
-                logger.info("Global antigravity command not found. Falling back to local mock_antigravity.py")
-                mock_script = os.path.join(_SCRIPT_DIR, "mock_antigravity.py")
-                process = await asyncio.create_subprocess_exec(
-                    sys.executable,
-                    mock_script,
-                    "--execute-blueprint",
-                    file_path,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-            fatal_exception_detected = False
-            exception_trace = []
-            
-            async def read_stdout(stream):
-                while True:
-                    line_bytes = await stream.readline()
-                    if not line_bytes:
-                        break
-                    line = line_bytes.decode("utf-8", errors="ignore")
-                    await broadcast_event({
-                        "type": "agent_stream",
-                        "emitter": "IPC_BRIDGE_STDOUT",
-                        "content": line
-                    })
-                    
-            async def read_stderr(stream):
-                nonlocal fatal_exception_detected
-                while True:
-                    line_bytes = await stream.readline()
-                    if not line_bytes:
-                        break
-                    line = line_bytes.decode("utf-8", errors="ignore")
-                    await broadcast_event({
-                        "type": "agent_stream",
-                        "emitter": "IPC_BRIDGE_STDERR",
-                        "content": line
-                    })
-                    
-                    # Capture tracebacks and check for database/playwright exceptions
-                    line_lower = line.lower()
-                    if any(pat in line_lower for pat in ["fatal", "exception", "integrityerror", "unique constraint failed", "error"]):
-                        fatal_exception_detected = True
-                        exception_trace.append(line.strip())
-                        
-            # Execute streams concurrently
-            await asyncio.gather(
-                read_stdout(process.stdout),
-                read_stderr(process.stderr)
-            )
-            
-            return_code = await process.wait()
-            logger.info(f"Subprocess terminated with exit code {return_code}")
-            
-            # Rule 3: Lifecycle Archival (Single-Execution Guarantee)
-            archived_name = filename.replace("pending_blueprint_", "archived_blueprint_")
-            archived_path = os.path.join(ay2_queue_dir, archived_name)
-            os.rename(file_path, archived_path)
-            logger.info(f"Spool queue cleaned. Blueprint archived to {archived_name}")
+    async def read_stderr(stream):
+        nonlocal fatal_exception_detected
+        while True:
+            line_bytes = await stream.readline()
+            if not line_bytes:
+                break
+            line = line_bytes.decode("utf-8", errors="ignore")
+            await broadcast_event({
+                "type": "agent_stream",
+                "emitter": "IPC_BRIDGE_STDERR",
+                "content": line
+            })
             
-            if fatal_exception_detected or return_code != 0:
-                logger.error("Fatal exception captured in watchdog process.")
-                await broadcast_event({
-                    "type": "circuit_breaker",
-                    "status": "HALTED",
-                    "blueprint_file": archived_name,
-                    "error": "\n".join(exception_trace) if exception_trace else f"Subprocess exited with code {return_code}"
-                })
-            else:
-                await broadcast_event({
-                    "type": "execution_success",
-                    "status": "COMPLETED",
-                    "blueprint_file": archived_name
-                })
+            # Capture tracebacks and check for database/playwright exceptions
+            line_lower = line.lower()
+            if any(pat in line_lower for pat in ["fatal", "exception", "integrityerror", "unique constraint failed", "error"]):
+                fatal_exception_detected = True
+                exception_trace.append(line.strip())
                 
-        except Exception as e:
-            logger.error(f"Global fracture in start_ipc_bridge event loop: {e}")
-            
-        await asyncio.sleep(1)
+    # Execute streams concurrently
+    await asyncio.gather(
+        read_stdout(process.stdout),
+        read_stderr(process.stderr)
+    )
+    
+    return_code = await process.wait()
+    logger.info(f"Subprocess terminated with exit code {return_code}")
+    
+    # Rule 3: Lifecycle Archival (Single-Execution Guarantee)
+    archived_name = spool.complete(filename).name
+    logger.info(f"Spool queue cleaned. Blueprint archived to {archived_name}")
+    
+    if fatal_exception_detected or return_code != 0:
+        logger.error("Fatal exception captured in watchdog process.")
+        await broadcast_event({
+            "type": "circuit_breaker",
+            "status": "HALTED",
+            "blueprint_file": archived_name,
+            "error": "\n".join(exception_trace) if exception_trace else f"Subprocess exited with code {return_code}"
+        })
+    else:
+        await broadcast_event({
+            "type": "execution_success",
+            "status": "COMPLETED",
+            "blueprint_file": archived_name
+        })
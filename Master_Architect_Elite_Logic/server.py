@@ -113,6 +113,7 @@ app = FastAPI(
 import httpx
 import re
 from registry_manager import load_registry
+from agent_proxy import AgentProxy
 
 # Server-side document parsing (PDF/DOCX/PPTX/...) so C-Suite sub-agents
 # receive clean text rather than opaque Google File API placeholders.
@@ -136,59 +137,25 @@ except Exception as _pa_err:
 # Establish a global httpx.AsyncClient lifecycle singleton to prevent socket exhaustion
 http_client = httpx.AsyncClient()
 
+# Child-agent proxy: cached agent->port routing table, streamed bodies, per-agent pools
+agent_proxy = AgentProxy()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     await http_client.aclose()
+    await agent_proxy.aclose()
 
 REGISTERED_PROXY_ROUTES = set()
 
 def make_proxy_handler(agent_id: str, path_template: str, method: str):
     async def proxy_handler(request: Request):
-        # Dynamically look up the active port from agent_registry.json to support dynamic runtime hotswapping
-        registry = await load_registry()
-        target_port = None
-        for agent in registry.get("agents", []):
-            if agent["id"] == agent_id:
-                target_port = agent["port"]
-                break
-                
-        if not target_port:
-            logger.error(f"Proxy forwarding failed: Agent '{agent_id}' is not in registry.")
-            raise HTTPException(status_code=502, detail=f"Proxy error: Agent '{agent_id}' is not in registry.")
-            
+        # The port comes from the cached routing table, which follows agent_registry.json
+        # so runtime hotswaps still take effect.
         actual_path = path_template
         for k, v in request.path_params.items():
             actual_path = actual_path.replace(f"{{{k}}}", str(v))
-            
-        url = f"http://127.0.0.1:{target_port}{actual_path}"
-        query_params = dict(request.query_params)
-        body = await request.body()
-        
-        # Keep standard headers, except for Host
-        headers = {k: v for k, v in request.headers.items() if k.lower() != 'host'}
-        
-        try:
-            response = await http_client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=query_params,
-                content=body,
-                timeout=15.0
-            )
-            
-            # Filter response headers
-            resp_headers = {k: v for k, v in response.headers.items() if k.lower() not in ['content-length', 'content-encoding']}
-            
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=resp_headers
-            )
-        except Exception as e:
-            logger.error(f"Proxy forwarding failed to port {target_port} for {actual_path}: {e}")
-            raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
-            
+        return await agent_proxy.forward(request, agent_id, actual_path, method=method)
+
     return proxy_handler
 
 def register_agent_proxy(agent_name: str, port: int, api_endpoints: list):
@@ -261,47 +228,14 @@ from genesis_orchestrator import ON_COMPILE_SUCCESS_CALLBACKS
 
 def on_genesis_compile_success(agent_name: str, port: int, api_endpoints: list):
     logger.info(f"Dynamic callback fired: Registering compiled agent {agent_name} proxies on port {port}")
+    agent_proxy.routes.invalidate()
     register_agent_proxy(agent_name, port, api_endpoints)
 
 ON_COMPILE_SUCCESS_CALLBACKS.append(on_genesis_compile_success)
 
 @app.api_route("/agent/{agent_id}/{proxy_path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def dynamic_wildcard_proxy(agent_id: str, proxy_path: str, request: Request):
-    registry = await load_registry()
-    target_port = None
-    for agent in registry.get("agents", []):
-        if agent["id"] == agent_id:
-            target_port = agent["port"]
-            break
-            
-    if not target_port:
-        logger.error(f"Proxy forwarding failed: Agent '{agent_id}' is not in registry.")
-        raise HTTPException(status_code=502, detail=f"Proxy error: Agent '{agent_id}' is not in registry.")
-        
-    url = f"http://127.0.0.1:{target_port}/{proxy_path}"
-    query_params = dict(request.query_params)
-    body = await request.body()
-    
-    headers = {k: v for k, v in request.headers.items() if k.lower() != 'host'}
-    
-    try:
-        response = await http_client.request(
-            method=request.method,
-            url=url,
-            headers=headers,
-            params=query_params,
-            content=body,
-            timeout=15.0
-        )
-        resp_headers = {k: v for k, v in response.headers.items() if k.lower() not in ['content-length', 'content-encoding']}
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=resp_headers
-        )
-    except Exception as e:
-        logger.error(f"Proxy forwarding failed to port {target_port} for /{proxy_path}: {e}")
-        raise HTTPException(status_code=502, detail=f"Proxy error: {str(e)}")
+    return await agent_proxy.forward(request, agent_id, proxy_path)
 
 @app.api_route("/api/apps/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def proxy_apps_to_gateway(path: str, request: Request):
@@ -1954,13 +1888,13 @@ async def review(req: ReviewRequest):
                 historical_context = ""
                 try:
                     from backend.core.vector_store import VectorStore
-                    from backend.services.embedding_service import GoogleEmbeddingService
+                    from backend.services.embedding_service import get_embedding_service
                 except ImportError:
                     from core.vector_store import VectorStore
-                    from services.embedding_service import GoogleEmbeddingService
+                    from services.embedding_service import get_embedding_service
                 
                 pre_fetch_store = VectorStore(persist_directory="./chroma_data")
-                pre_fetch_service = GoogleEmbeddingService()
+                pre_fetch_service = get_embedding_service()
                 
                 logger.info("Semantic Recall Hook: Vectorizing raw CEO objective...")
                 embedding_res = await pre_fetch_service.get_embedding_async(user_query)
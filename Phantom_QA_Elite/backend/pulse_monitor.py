@@ -0,0 +1,203 @@
+"""
+pulse_monitor.py — Background health prober behind /api/pulse
+================================================================
+Probes every known app port concurrently (asyncio TCP connects, no blocking
+sockets on the event loop), keeps a per-app health state with the time of the
+last status change and a connect-latency histogram, and rebuilds the /api/pulse
+payload after each sweep so the endpoint just returns the latest snapshot.
+
+The target list is only reloaded when sync_manifest.json changes. Auto-heal
+is debounced: an app must fail `heal_after` consecutive sweeps before the
+heal callback fires (the callback keeps its own cooldown).
+"""
+
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger("PhantomQA.Pulse")
+
+# Connect-latency histogram bucket upper bounds, in milliseconds.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def _port_of(info: dict) -> int:
+    return int(info["url"].split(":")[-1])
+
+
+class AppHealth:
+    """Rolling health record for one app."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "unknown"
+        self.since = None            # when status last changed
+        self.checked_at = None
+        self.latency_ms = None
+        self.consecutive_failures = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)   # last bucket: > max bound
+
+    def record(self, ok: bool, latency_ms: Optional[float], now: float) -> bool:
+        """Update from one probe. Returns True if the status changed."""
+        status = "online" if ok else "offline"
+        changed = status != self.status
+        if changed:
+            self.status, self.since = status, now
+        self.checked_at = now
+        if ok:
+            self.latency_ms = round(latency_ms, 2)
+            self.consecutive_failures = 0
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if latency_ms <= bound:
+                    self.histogram[i] += 1
+                    break
+            else:
+                self.histogram[-1] += 1
+        else:
+            self.latency_ms = None
+            self.consecutive_failures += 1
+        return changed
+
+    def histogram_dict(self) -> Dict[str, int]:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self.histogram))
+
+
+class PulseMonitor:
+    def __init__(self, load_targets: Callable[[], Dict[str, dict]], manifest_path=None,
+                 interval: float = 5.0, timeout: float = 1.0, heal_after: int = 2,
+                 on_offline: Callable[[str, dict], None] = None,
+                 on_online: Callable[[str], None] = None, host: str = "127.0.0.1"):
+        self.load_targets = load_targets
+        self.manifest_path = str(manifest_path) if manifest_path else None
+        self.interval = interval
+        self.timeout = timeout
+        self.heal_after = heal_after
+        self.on_offline = on_offline
+        self.on_online = on_online
+        self.host = host
+        self.health: Dict[str, AppHealth] = {}
+        self._targets: Optional[Dict[str, dict]] = None
+        self._manifest_version = None
+        self._snapshot: Optional[dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sweep_lock = asyncio.Lock()
+
+    # ── Targets ────────────────────────────────────────────────
+
+    def _manifest_stamp(self):
+        if not self.manifest_path:
+            return None
+        try:
+            st = os.stat(self.manifest_path)
+            return (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def targets(self) -> Dict[str, dict]:
+        stamp = self._manifest_stamp()
+        if self._targets is None or stamp != self._manifest_version:
+            self._targets = self.load_targets()
+            self._manifest_version = stamp
+            for gone in set(self.health) - set(self._targets):
+                del self.health[gone]
+        return self._targets
+
+    # ── Probing ────────────────────────────────────────────────
+
+    async def _probe(self, port: int):
+        started = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, port), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False, None
+        latency_ms = (time.perf_counter() - started) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True, latency_ms
+
+    async def sweep(self) -> dict:
+        """Probe all targets at once, update health state, and rebuild the snapshot."""
+        async with self._sweep_lock:
+            started = time.perf_counter()
+            targets = await asyncio.to_thread(self.targets)
+            names = list(targets)
+            outcomes = await asyncio.gather(*(self._probe(_port_of(targets[n])) for n in names))
+            now = time.time()
+            for name, (ok, latency_ms) in zip(names, outcomes):
+                info = targets[name]
+                state = self.health.setdefault(name, AppHealth(name))
+                changed = state.record(ok, latency_ms, now)
+                if changed:
+                    logger.info(f"[Pulse] {name} is now {state.status}")
+                if ok and changed and self.on_online:
+                    self.on_online(name)
+                if (not ok and state.consecutive_failures >= self.heal_after and self.on_offline
+                        and str(info.get("manifest_status")).lower() == "active"):
+                    try:
+                        self.on_offline(name, info)
+                    except Exception as e:
+                        logger.error(f"[Pulse] Heal dispatch for {name} failed: {e}")
+            self._snapshot = self._build_snapshot(targets, now, (time.perf_counter() - started) * 1000)
+            return self._snapshot
+
+    def _build_snapshot(self, targets: Dict[str, dict], now: float, sweep_ms: float) -> dict:
+        apps = {}
+        for name, info in targets.items():
+            state = self.health[name]
+            entry = {
+                "status": state.status,
+                "url": info["url"],
+                "manifest_status": info.get("manifest_status", "UNKNOWN"),
+                "since": datetime.fromtimestamp(state.since).isoformat() if state.since else None,
+                "latency_ms": state.latency_ms,
+                "consecutive_failures": state.consecutive_failures,
+                "latency_histogram": state.histogram_dict(),
+            }
+            if state.status == "online":
+                entry["details"] = {"status": "socket_connected"}
+            apps[name] = entry
+        online = sum(1 for a in apps.values() if a["status"] == "online")
+        return {
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+            "total_apps": len(apps),
+            "online": online,
+            "offline": len(apps) - online,
+            "sweep_ms": round(sweep_ms, 2),
+            "apps": apps,
+        }
+
+    async def snapshot(self) -> dict:
+        """The latest sweep result; sweeps once if nothing has run yet."""
+        if self._snapshot is None:
+            return await self.sweep()
+        return self._snapshot
+
+    # ── Background loop ────────────────────────────────────────
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"[Pulse] Sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -54,6 +54,7 @@ from agents.architect import run_architect
 from agents.ghost_user import run_ghost_user
 from agents.skeptic import run_skeptic
 from warroom_interface import warroom_respond
+from pulse_monitor import PulseMonitor
 
 # ── Ghost Stream Event Queue ─────────────────────────────
 _ghost_stream_clients: dict[str, asyncio.Queue] = {}
@@ -188,6 +189,10 @@ async def dashboard():
 # Track active reboots so we don't spawn 50 processes while waiting for boot
 healing_locks = {}
 
+# Construct absolute path pointing straight to the Antigravity-AI Agents root
+# ROOT = Meta_App_Factory/Phantom_QA_Elite
+SYNC_MANIFEST_PATH = ROOT.parent.parent / "sync_manifest.json"
+
 def get_dynamic_ports():
     ports = {
         "Meta_App_Factory": {
@@ -205,9 +210,7 @@ def get_dynamic_ports():
     }
     try:
         import json
-        # Construct absolute path pointing straight to the Antigravity-AI Agents root
-        # ROOT = Meta_App_Factory/Phantom_QA_Elite
-        manifest_path = ROOT.parent.parent / "sync_manifest.json"
+        manifest_path = SYNC_MANIFEST_PATH
         
         if manifest_path.exists():
             with open(manifest_path, "r", encoding="utf-8") as f:
@@ -283,45 +286,47 @@ def auto_heal_agent(name: str, info: dict):
     except Exception as e:
         logger.error(f"Failed to auto-heal {name}: {e}")
 
-@app.get("/api/pulse")
-async def pulse_scan():
-    """Scan all dynamically discovered C-Suite ports and report health using native sockets."""
-    import socket
-    results = {}
-    known_ports = get_dynamic_ports()
+def _heal_offline_app(name: str, info: dict):
+    # Subsystem Auto-Healer Dispatch (never for ourselves)
+    if name != "Phantom_QA_Elite":
+        auto_heal_agent(name, info)
 
-    for name, info in known_ports.items():
-        try:
-            port = int(info["url"].split(":")[-1])
-            with socket.create_connection(('127.0.0.1', port), timeout=1):
-                results[name] = {
-                    "status": "online",
-                    "url": info["url"],
-                    "details": {"status": "socket_connected"},
-                    "manifest_status": info.get("manifest_status", "UNKNOWN")
-                }
-                # Clear healing lock if it successfully came online
-                if name in healing_locks:
-                    del healing_locks[name]
-        except Exception:
-            results[name] = {
-                "status": "offline", 
-                "url": info["url"], 
-                "manifest_status": info.get("manifest_status", "UNKNOWN")
-            }
-            
-            # Subsystem Auto-Healer Dispatch
-            if name != "Phantom_QA_Elite" and str(info.get("manifest_status")).lower() == "active":
-                auto_heal_agent(name, info)
 
-    online = sum(1 for r in results.values() if r["status"] == "online")
-    return {
-        "timestamp": datetime.now().isoformat(),
-        "total_apps": len(known_ports),
-        "online": online,
-        "offline": len(known_ports) - online,
-        "apps": results,
-    }
+def _clear_healing_lock(name: str):
+    # Clear healing lock once the app is back online
+    healing_locks.pop(name, None)
+
+
+# Background prober: all ports probed concurrently every few seconds; the
+# manifest is only re-read when it changes.
+pulse_monitor = PulseMonitor(
+    get_dynamic_ports,
+    manifest_path=SYNC_MANIFEST_PATH,
+    interval=float(os.environ.get("PULSE_INTERVAL_SECONDS", "5")),
+    on_offline=_heal_offline_app,
+    on_online=_clear_healing_lock,
+)
+
+
+@app.on_event("startup")
+async def start_pulse_monitor():
+    pulse_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_pulse_monitor():
+    await pulse_monitor.stop()
+
+
+@app.get("/api/pulse")
+async def pulse_scan(refresh: bool = False):
+    """Health of all dynamically discovered C-Suite ports, served from the background prober.
+
+    Pass refresh=true to force an immediate sweep.
+    """
+    if refresh:
+        return await pulse_monitor.sweep()
+    return await pulse_monitor.snapshot()
 
 
 # ═══════════════════════════════════════════════════════════
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _no_prompt_cache(monkeypatch):
+    """Keep model_router tests deterministic: never serve responses from data/llm_cache.db."""
+    monkeypatch.setenv("MODEL_ROUTER_CACHE", "0")
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Master_Architect_Elite_Logic"))
+
+import agent_proxy
+import registry_manager
+
+
+class _ChildAgent(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/events"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(3):
+                data = f"data: {i}\n\n".encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+                time.sleep(0.3)
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        digest, size = hashlib.sha256(), 0
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 65536))
+            digest.update(chunk)
+            size += len(chunk)
+            remaining -= len(chunk)
+        body = json.dumps({"size": size, "sha256": digest.hexdigest()}).encode()
+        self.send_response(201)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def proxy_url(tmp_path, monkeypatch):
+    import uvicorn
+    from fastapi import FastAPI, Request
+
+    child = ThreadingHTTPServer(("127.0.0.1", 0), _ChildAgent)
+    threading.Thread(target=child.serve_forever, daemon=True).start()
+    registry = tmp_path / "agent_registry.json"
+    registry.write_text(json.dumps({"agents": [{"id": "child", "name": "Child", "status": "ACTIVE",
+                                                "port": child.server_port}]}))
+    monkeypatch.setattr(registry_manager, "REGISTRY_PATH", str(registry))
+
+    loads = []
+    real_load = agent_proxy.load_registry
+
+    async def counting_load():
+        loads.append(1)
+        return await real_load()
+    monkeypatch.setattr(agent_proxy, "load_registry", counting_load)
+
+    proxy = agent_proxy.AgentProxy(agent_proxy.AgentRoutingTable(str(registry)))
+    app = FastAPI()
+
+    @app.api_route("/agent/{agent_id}/{proxy_path:path}", methods=["GET", "POST"])
+    async def wildcard(agent_id: str, proxy_path: str, request: Request):
+        return await proxy.forward(request, agent_id, proxy_path)
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}", registry, loads
+    server.should_exit = True
+    child.shutdown()
+
+
+def test_routing_table_is_cached_until_the_registry_changes(proxy_url):
+    base, registry, loads = proxy_url
+    with httpx.Client(base_url=base) as client:
+        for _ in range(5):
+            assert client.get("/agent/child/status", params={"q": "1"}).json() == {"path": "/status?q=1"}
+        assert len(loads) == 1
+        assert client.get("/agent/ghost/status").status_code == 502
+
+        data = json.loads(registry.read_text())
+        data["agents"].append({"id": "ghost", "name": "Ghost", "status": "ACTIVE",
+                               "port": data["agents"][0]["port"]})
+        registry.write_text(json.dumps(data))
+        assert client.get("/agent/ghost/status").status_code == 200
+        assert len(loads) == 2
+
+
+def test_large_upload_and_sse_stream_through(proxy_url):
+    base, _, _ = proxy_url
+    payload = os.urandom(8 * 1024 * 1024)
+
+    async def run():
+        async with httpx.AsyncClient(base_url=base, timeout=30) as client:
+            async def chunks():
+                for i in range(0, len(payload), 1 << 20):
+                    yield payload[i:i + (1 << 20)]
+            up = await client.post("/agent/child/upload", content=chunks(),
+                                   headers={"Content-Length": str(len(payload))})
+
+            started, arrivals = time.perf_counter(), []
+            async with client.stream("GET", "/agent/child/events",
+                                     headers={"Accept": "text/event-stream"}) as resp:
+                async for chunk in resp.aiter_text():
+                    arrivals.append((time.perf_counter() - started, chunk))
+            return up, resp, arrivals
+
+    up, resp, arrivals = asyncio.run(run())
+    assert up.status_code == 201
+    assert up.json() == {"size": len(payload), "sha256": hashlib.sha256(payload).hexdigest()}
+    assert resp.headers["content-type"] == "text/event-stream"
+    assert "".join(c for _, c in arrivals) == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    # The first event is relayed before the child has finished the stream.
+    assert arrivals[0][0] < 0.5
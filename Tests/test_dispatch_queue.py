@@ -0,0 +1,135 @@
+import json
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_modules.dispatch_queue import DispatchSpool, SpoolWatcher
+
+
+def test_burst_in_one_second_keeps_every_mandate_in_order(tmp_path):
+    spool = DispatchSpool(tmp_path)
+    names = [spool.dispatch(f"mandate {i}") for i in range(50)]
+
+    assert len(set(names)) == 50 and names == sorted(names)
+    assert spool.pending(limit=100) == names
+    assert json.loads((tmp_path / names[7]).read_text())["mandate"] == "mandate 7"
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_concurrent_claims_hand_each_blueprint_to_exactly_one_consumer(tmp_path):
+    spool = DispatchSpool(tmp_path)
+    for i in range(40):
+        spool.dispatch(f"m{i}")
+    claimed, lock = [], threading.Lock()
+
+    def consumer(owner):
+        # A separate spool per consumer, as separate processes would have.
+        mine = DispatchSpool(tmp_path)
+        while True:
+            batch = mine.claim_batch(limit=5, owner=owner)
+            if not batch and not mine.pending():
+                return
+            with lock:
+                claimed.extend(p.name for p in batch)
+
+    threads = [threading.Thread(target=consumer, args=(f"c{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(claimed) == 40 and len(set(claimed)) == 40
+    assert spool.counts() == {"inflight": 40}
+
+
+def test_lifecycle_is_tracked_in_the_status_index(tmp_path):
+    spool = DispatchSpool(tmp_path)
+    ok, bad, requeued = (spool.dispatch(m) for m in ("ok", "bad", "requeued"))
+    execution_id = json.loads((tmp_path / ok).read_text())["execution_id"]
+
+    for name in (ok, bad, requeued):
+        assert spool.claim(name, owner="w1") == tmp_path / "inflight" / name
+    assert spool.claim(ok) is None
+    spool.complete(ok)
+    spool.complete(bad, ok=False)
+    assert spool.requeue_stale(older_than=0) == [requeued]
+
+    assert spool.status(execution_id)["status"] == "archived"
+    assert (tmp_path / ok.replace("pending_", "archived_")).exists()
+    assert spool.status(bad)["filename"] == bad.replace("pending_", "broken_")
+    assert spool.pending() == [requeued]
+
+
+def test_files_from_other_producers_are_indexed(tmp_path):
+    spool = DispatchSpool(tmp_path)
+    (tmp_path / "pending_blueprint_1700000000.json").write_text("{}")
+    (tmp_path / "claimed_5050_pending_blueprint_1700000001.json").write_text("{}")
+    assert spool.pending() == ["pending_blueprint_1700000000.json"]
+
+    os.rename(tmp_path / "pending_blueprint_1700000000.json", tmp_path / "paused_blueprint_1700000000.json")
+    assert spool.pending() == []
+    assert spool.counts() == {"paused": 1, "inflight": 1}
+
+
+def test_own_writes_do_not_force_a_directory_rescan(tmp_path, monkeypatch):
+    spool = DispatchSpool(tmp_path)
+    spool.sync(force=True)
+    listdir, scans = os.listdir, []
+    monkeypatch.setattr(os, "listdir", lambda path: scans.append(path) or listdir(path))
+
+    names = [spool.dispatch(f"m{i}") for i in range(5)]
+    assert spool.pending() == names
+    [claimed] = spool.claim_batch(limit=1)
+    spool.complete(claimed.name)
+    assert spool.pending() == names[1:] and scans == []
+
+    # A file written by another producer is still picked up.
+    (tmp_path / "pending_blueprint_9999999999999999999_1.json").write_text("{}")
+    assert spool.pending()[-1] == "pending_blueprint_9999999999999999999_1.json"
+    assert scans
+
+
+def test_watcher_returns_a_batch_when_work_arrives(tmp_path):
+    spool = DispatchSpool(tmp_path)
+    watcher = SpoolWatcher(spool, owner="w", poll_interval=0.05)
+    assert watcher.next_batch(timeout=0.1) == []
+
+    threading.Timer(0.1, lambda: [spool.dispatch(f"m{i}") for i in range(3)]).start()
+    batch = watcher.next_batch(timeout=2)
+    watcher.close()
+    assert len(batch) >= 1 and all(p.parent.name == "inflight" for p in batch)
+
+
+def test_bridge_releases_a_blueprint_whose_actuation_fails(tmp_path, monkeypatch):
+    import asyncio
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "Master_Architect_Elite_Logic"))
+    import ipc_bridge
+
+    async def spawn_fails(*args, **kwargs):
+        raise PermissionError("antigravity is not executable")
+
+    monkeypatch.setattr(ipc_bridge.asyncio, "create_subprocess_exec", spawn_fails)
+    spool = DispatchSpool(tmp_path)
+    name = spool.dispatch("m")
+    (claimed,) = spool.claim_batch(limit=16, owner="w")
+
+    assert asyncio.run(ipc_bridge._run_claimed(spool, claimed)) is False
+    assert spool.pending() == [name] and spool.status(name)["status"] == "pending"
+    assert not (tmp_path / "inflight" / name).exists()
+
+    async def cancelled_mid_run():
+        (claimed,) = spool.claim_batch(limit=1, owner="w")
+        task = asyncio.create_task(ipc_bridge._run_claimed(spool, claimed))
+        await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            return True
+
+    monkeypatch.setattr(ipc_bridge.asyncio, "create_subprocess_exec",
+                        lambda *a, **k: asyncio.sleep(10))
+    assert asyncio.run(cancelled_mid_run())
+    assert spool.pending() == [name]
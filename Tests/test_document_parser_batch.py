@@ -0,0 +1,135 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import document_parser_service as dps
+from document_parser_service import DocumentParserService
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    # Keyword fallback instead of Gemini.
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    # Stand-in for a successful Gemini analysis (only those are cached).
+    monkeypatch.setattr(DocumentParserService, "_ai_analyze",
+                        lambda self, text, name: dict(self._keyword_categorize(text), analysis_source="gemini"))
+
+
+def _write_docs(folder, count):
+    paths = []
+    for i in range(count):
+        path = folder / f"doc_{i}.txt"
+        path.write_text(f"Invoice {i}: payment of the quarterly budget and tax balance.")
+        paths.append(str(path))
+    return paths
+
+
+def test_batch_dedups_and_the_cache_survives_a_restart(tmp_path, gemini):
+    cache = str(tmp_path / "parse_cache.db")
+    paths = _write_docs(tmp_path, 4)
+    (tmp_path / "copy.txt").write_bytes(open(paths[0], "rb").read())
+    paths += [str(tmp_path / "copy.txt"), str(tmp_path / "missing.txt"), str(tmp_path / "image.png")]
+
+    svc = DocumentParserService(cache_path=cache)
+    batch = svc.parse_many(paths, source_app="Tests")
+    statuses = [r.get("status") for r in batch["results"]]
+    assert statuses == ["parsed"] * 4 + ["skipped", None, None]
+    assert batch["results"][0]["category"] == "Finance"
+    assert set(batch["results"][0]["timings_ms"]) == {"hash", "extract", "ai"}
+    assert batch["stats"]["parsed"] == 4 and batch["stats"]["skipped"] == 1
+    svc.close()
+
+    restarted = DocumentParserService(cache_path=cache)
+    again = restarted.parse_many(paths[:4], source_app="Tests")
+    assert [r["status"] for r in again["results"]] == ["skipped"] * 4
+    assert again["results"][2]["cached_result"]["parse_id"] == batch["results"][2]["parse_id"]
+    assert restarted.parse(paths[1])["status"] == "skipped"
+    assert restarted.was_already_parsed(paths[3])
+
+    forced = restarted.parse_many(paths[:2], reparse=True)
+    assert [r["status"] for r in forced["results"]] == ["parsed", "parsed"]
+    restarted.close()
+
+
+def test_keyword_fallback_results_are_not_cached(tmp_path):
+    paths = _write_docs(tmp_path, 2)
+    svc = DocumentParserService(cache_path=str(tmp_path / "parse_cache.db"))
+    first = svc.parse_many(paths)["results"]
+    assert [r["analysis_source"] for r in first] == ["keyword_fallback"] * 2
+    assert svc.parse(paths[0])["status"] == "parsed"   # re-analyzed, not skipped
+    assert len(svc.cache) == 0 and not svc.was_already_parsed(paths[1])
+    svc.close()
+
+
+def test_ai_stage_runs_with_bounded_concurrency(tmp_path, monkeypatch):
+    svc = DocumentParserService(cache_path="")
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def slow_ai(text, file_name):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.1)
+        with lock:
+            in_flight[0] -= 1
+        return {"category": "Ops", "confidence": 0.9, "summary": file_name, "entities": {}}
+
+    monkeypatch.setattr(svc, "_ai_analyze", slow_ai)
+    started = time.perf_counter()
+    batch = svc.parse_many(_write_docs(tmp_path, 8), ai_concurrency=4)
+    assert batch["stats"]["parsed"] == 8
+    assert peak[0] == 4
+    assert time.perf_counter() - started < 0.6   # serial would be 0.8s
+    svc.close()
+
+
+def test_large_pdfs_fan_out_by_page_range(tmp_path, monkeypatch):
+    pdf = tmp_path / "report.pdf"
+    pdf.write_bytes(b"%PDF-1.4 stub")
+    calls = []
+
+    def fake_pages(self, path, start=0, stop=None):
+        calls.append(start)
+        return [f"page {n}" for n in range(start, min(stop, 40))], 40
+
+    # Run the workers in-process so the fake extractor is visible to them.
+    monkeypatch.setattr(DocumentParserService, "_extract_pdf_pages", fake_pages)
+    monkeypatch.setattr(dps, "PDF_PAGES_PER_TASK", 16)
+    svc = DocumentParserService(cache_path="")
+    svc._pool = ThreadPoolExecutor(max_workers=4)
+
+    result = svc.parse_many([str(pdf)])["results"][0]
+    assert sorted(calls) == [0, 16, 32]
+    assert result["status"] == "parsed"
+    assert result["extracted"]["raw_text_preview"].startswith("page 0\n\npage 1\n\n")
+    svc.close()
+
+
+def test_failed_extraction_in_the_process_pool_is_not_cached(tmp_path):
+    if any(_importable(m) for m in ("pdfplumber", "PyPDF2")):
+        pytest.skip("a PDF library is installed; the stub file would be parsed")
+    pdf = tmp_path / "broken.pdf"
+    pdf.write_bytes(b"%PDF-1.4 stub")
+    svc = DocumentParserService(cache_path="", max_workers=1)
+    result = svc.parse_many([str(pdf)])["results"][0]
+    assert result["status"] == "error" and "pdfplumber" in result["error"]
+    assert len(svc.cache) == 0
+    svc.close()
+
+
+def _importable(module):
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
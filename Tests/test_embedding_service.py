@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+
+from backend.services.embedding_service import GoogleEmbeddingService
+
+
+class _StubGemini(BaseHTTPRequestHandler):
+    """Answers batchEmbedContents with a vector derived from each text."""
+    calls = []
+    missing_models = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model = self.path.split("/models/")[1].split(":")[0]
+        _StubGemini.calls.append((model, [r["content"]["parts"][0]["text"] for r in body["requests"]]))
+        if model in _StubGemini.missing_models:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if any("BAD" in r["content"]["parts"][0]["text"] for r in body["requests"]):
+            self.send_response(400)   # the whole batch is rejected for one bad text
+            self.end_headers()
+            return
+        out = json.dumps({"embeddings": [{"values": [float(len(r["content"]["parts"][0]["text"])), 0.5]}
+                                         for r in body["requests"]]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    _StubGemini.calls, _StubGemini.missing_models = [], set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGemini)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/v1beta"
+    server.shutdown()
+
+
+def test_concurrent_requests_are_coalesced_into_one_batch_call(stub_url, tmp_path):
+    svc = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path=str(tmp_path / "c.sqlite3"))
+
+    async def run():
+        results = await asyncio.gather(*(svc.get_embedding_async("x" * i) for i in range(1, 21)),
+                                       svc.get_embedding_async("x"))
+        await svc.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert results[0] == [1.0, 0.5] and results[19] == [20.0, 0.5] and results[20] == [1.0, 0.5]
+    assert len(_StubGemini.calls) == 1 and len(_StubGemini.calls[0][1]) == 20
+
+
+def test_batches_split_at_max_batch_and_hit_the_disk_cache(stub_url, tmp_path):
+    cache = str(tmp_path / "c.sqlite3")
+    texts = [f"doc {i}" for i in range(7)]
+    svc = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path=cache, max_batch=3)
+    assert len(asyncio.run(svc.get_embeddings_batch_async(texts))) == 7
+    assert sorted(len(c[1]) for c in _StubGemini.calls) == [1, 3, 3]
+
+    # A fresh service (e.g. after a restart) reads the same vectors from disk.
+    again = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path=cache)
+    assert asyncio.run(again.get_embeddings_batch_async(texts + ["new"])) == [[5.0, 0.5]] * 7 + [[3.0, 0.5]]
+    assert _StubGemini.calls[-1][1] == ["new"] and again.stats["cache_hits"] == 7
+
+
+def test_model_fallback_is_remembered_and_failures_return_502(stub_url, tmp_path):
+    _StubGemini.missing_models = {"gemini-embedding-2"}
+    svc = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path="")
+    asyncio.run(svc.get_embedding_async("a"))
+    asyncio.run(svc.get_embedding_async("b"))
+    assert [c[0] for c in _StubGemini.calls] == ["gemini-embedding-2", "text-embedding-004", "text-embedding-004"]
+
+    _StubGemini.missing_models.add("text-embedding-004")
+    res = asyncio.run(svc.get_embeddings_batch_async(["c", "d"]))
+    assert isinstance(res, JSONResponse) and res.status_code == 502
+
+    offline = GoogleEmbeddingService(api_key="k", base_url="http://127.0.0.1:9/v1beta", cache_path="")
+    res = asyncio.run(offline.get_embedding_async("a"))
+    assert json.loads(res.body)["detail"] == "Google Embedding API offline or timed out."
+
+
+def test_a_rejected_text_fails_alone(stub_url, tmp_path):
+    svc = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path="")
+    texts = [f"doc {i}" for i in range(7)] + ["BAD"]
+
+    async def run():
+        results = await asyncio.gather(*(svc.get_embedding_async(t) for t in texts))
+        await svc.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert results[:7] == [[5.0, 0.5]] * 7
+    assert isinstance(results[7], JSONResponse) and "400" in json.loads(results[7].body)["detail"]
+    # One coalesced call, then a bisection down to the bad text: log2(8) extra rounds, not one call per text.
+    assert len(_StubGemini.calls) <= 7 and svc.stats["embedded"] == 7
+
+
+def test_clients_are_per_loop_and_all_closed(stub_url):
+    svc = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path="")
+    other = asyncio.new_event_loop()
+    worker = threading.Thread(target=other.run_forever, daemon=True)
+    worker.start()
+    try:
+        asyncio.run_coroutine_threadsafe(svc.get_embedding_async("a"), other).result(5)
+
+        async def run():
+            await svc.get_embedding_async("b")
+            clients = list(svc._clients.values())
+            await svc.aclose()
+            return clients
+
+        clients = asyncio.run(run())
+        assert len(clients) == 2 and all(c.is_closed for c in clients)
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        worker.join(5)
+        other.close()
+
+
+def test_each_loop_batches_its_own_requests(stub_url):
+    svc = GoogleEmbeddingService(api_key="k", base_url=stub_url, cache_path="", batch_window=0.2)
+    other = asyncio.new_event_loop()
+    worker = threading.Thread(target=other.run_forever, daemon=True)
+    worker.start()
+    try:
+        async def run():
+            # Both loops queue within one batch window; each must flush and resolve its own futures.
+            elsewhere = asyncio.run_coroutine_threadsafe(svc.get_embeddings_batch_async(["x", "y"]), other)
+            here = await svc.get_embeddings_batch_async(["a", "b", "c"])
+            queues = dict(svc._queues)
+            theirs = await asyncio.wrap_future(elsewhere)
+            await svc.aclose()
+            return here, theirs, queues
+
+        here, theirs, queues = asyncio.run(asyncio.wait_for(run(), timeout=5))
+        assert here == [[1.0, 0.5]] * 3 and theirs == [[1.0, 0.5]] * 2
+        assert sorted(texts for _, texts in _StubGemini.calls) == [["a", "b", "c"], ["x", "y"]]
+        assert len(queues) == 2 and all(not q.pending and q.flush_handle is None for q in queues.values())
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        worker.join(5)
+        other.close()
@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "claude-mcp-bridge"))
+
+import episodic_memory
+from episodic_memory import recall_similar, record_episode
+
+QUERY = "There is an ImportError in loop_engine when starting"
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    path = tmp_path / "episodes.jsonl"
+    monkeypatch.setattr(episodic_memory, "EPISODES_LOG", path)
+    monkeypatch.setattr(episodic_memory, "_indexes", {})
+    record_episode("t1", "Fix ImportError in loop_engine.py", "complete",
+                   "Stale __pycache__ — cleared and reran", resolution="clear pycache")
+    record_episode("t2", "Deploy ERP to production", "escalate", "Tier 3 gate")
+    record_episode("t3", "Build SKU search endpoint", "complete", "Added /api/inventory/skus/search route")
+    return path
+
+
+def _snapshot(log):
+    return log.with_name("episodes.index.json")
+
+
+def test_snapshot_is_batched_and_flushed_at_exit(log, monkeypatch):
+    assert [h["trace_id"] for h in recall_similar(QUERY)][:1] == ["t1"]
+    assert not _snapshot(log).exists()   # 3 episodes: below SAVE_EVERY_EPISODES
+
+    monkeypatch.setattr(episodic_memory, "SAVE_EVERY_EPISODES", 4)
+    record_episode("t4", "Rotate API keys", "complete", "keys rotated")
+    recall_similar(QUERY)
+    assert len(json.loads(_snapshot(log).read_text())["offsets"]) == 4
+
+    record_episode("t5", "Rotate API keys again", "complete", "")
+    recall_similar(QUERY)
+    assert len(json.loads(_snapshot(log).read_text())["offsets"]) == 4
+    episodic_memory._save_indexes()
+    assert len(json.loads(_snapshot(log).read_text())["offsets"]) == 5
+
+
+def test_reloaded_snapshot_catches_up_on_later_appends(log, monkeypatch):
+    recall_similar(QUERY)
+    episodic_memory._save_indexes()
+    monkeypatch.setattr(episodic_memory, "_indexes", {})   # a fresh process
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"trace_id": "t4", "instruction": "ImportError in loop_engine again",
+                            "summary": "", "tags": []}) + "\n")
+    idx = episodic_memory._index()
+    assert len(idx.offsets) == 3   # loaded from the snapshot, not rebuilt from the log
+    assert [h["trace_id"] for h in recall_similar(QUERY)][:2] == ["t4", "t1"]
+    assert len(idx.offsets) == 4 and idx.unsaved == 1
+
+    # A rewritten log invalidates the snapshot and the index is rebuilt.
+    log.write_text(json.dumps({"trace_id": "t9", "instruction": "ImportError in loop_engine",
+                               "summary": "", "tags": []}) + "\n", encoding="utf-8")
+    assert [h["trace_id"] for h in recall_similar(QUERY)] == ["t9"]
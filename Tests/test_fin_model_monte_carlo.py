@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("openpyxl")   # fin_model builds workbooks; the shadow model lives beside it
+
+SKILL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         ".agents", "skills", "fin-model")
+sys.path.insert(0, SKILL_DIR)
+
+from fin_model import shadow_model
+from monte_carlo import DRIVERS, sample_drivers, scenario_assumptions, shadow_model_vec, simulate
+
+with open(os.path.join(SKILL_DIR, "sample_assumptions.json")) as f:
+    SAMPLE = json.load(f)
+
+
+def test_fixed_drivers_reproduce_the_scalar_shadow_model():
+    fixed = {name: {"dist": "fixed"} for name in DRIVERS}
+    mc = simulate(SAMPLE, n=10, distributions=fixed)
+    base = shadow_model(SAMPLE)
+
+    assert mc["fcf_by_year"]["p50"] == [round(r["fcf"], 2) for r in base["rows"]]
+    assert mc["peak_funding"]["p5"] == mc["peak_funding"]["p95"] == round(base["peak_funding"], 2)
+    assert mc["break_even_year"]["p50"] == base["ebitda_inflection_year"]
+
+
+def test_vectorized_matches_scalar_loop_per_scenario():
+    drivers = sample_drivers(SAMPLE, 200, seed=3)
+    vec = shadow_model_vec(SAMPLE, **drivers)
+    for i in range(200):
+        sm = shadow_model(scenario_assumptions(SAMPLE, **{k: float(v[i]) for k, v in drivers.items()}))
+        assert vec["fcf"][i] == pytest.approx([r["fcf"] for r in sm["rows"]], abs=1e-6)
+        assert vec["peak_funding"][i] == pytest.approx(sm["peak_funding"], abs=1e-6)
+        assert vec["break_even_year"][i] == (sm["ebitda_inflection_year"] or 0)
+
+
+def test_100k_scenarios_give_ordered_bands_quickly():
+    started = time.perf_counter()
+    mc = simulate(SAMPLE, n=100_000, seed=11)
+    assert time.perf_counter() - started < 1.0
+
+    pf = mc["peak_funding"]
+    assert pf["p5"] <= pf["p25"] <= pf["p50"] <= pf["p75"] <= pf["p95"]
+    be = mc["break_even_year"]
+    assert sum(be["by_year_pct"].values()) + be["never_pct"] == pytest.approx(100, abs=0.05)
+    assert mc == {**simulate(SAMPLE, n=100_000, seed=11), "elapsed_ms": mc["elapsed_ms"]}
+    with pytest.raises(ValueError):
+        simulate(SAMPLE, n=10, distributions={"tariffs": {"dist": "fixed"}})
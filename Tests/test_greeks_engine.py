@@ -0,0 +1,119 @@
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+pytest.importorskip("scipy")
+pytest.importorskip("yfinance")   # strategy_ledger (the scalar path) imports it
+
+ALPHA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Alpha_V2_Genesis")
+sys.path.insert(0, ALPHA_DIR)
+
+from greeks_engine import bs_greeks_vec, prob_above, scan_iron_condors  # noqa: E402
+
+# Keep ledger.log / ledger_state.json out of Alpha_Data while importing the ledger.
+_runtime = os.environ.get("ALPHA_RUNTIME_DIR")
+os.environ["ALPHA_RUNTIME_DIR"] = tempfile.mkdtemp(prefix="alpha_runtime_")
+try:
+    from benchmark_greeks import synthetic_chain  # noqa: E402
+    from strategy_ledger import bs_greeks, compute_position_greeks, fetch_leg_data  # noqa: E402
+finally:
+    if _runtime is None:
+        os.environ.pop("ALPHA_RUNTIME_DIR")
+    else:
+        os.environ["ALPHA_RUNTIME_DIR"] = _runtime
+
+SPOT, T, R = 6800.0, 30 / 365, 0.043
+# bs_greeks rounds: delta 5dp, gamma 7dp, theta and vega 4dp.
+TOLERANCE = {"delta": 5e-6, "gamma": 5e-8, "theta": 5e-5, "vega": 5e-5}
+
+
+@pytest.fixture(scope="module")
+def chain():
+    return synthetic_chain(spot=SPOT, step=25.0, t=T)
+
+
+def _scalar_leg(df, flag, strike):
+    """fetch_leg_data's old per-leg path: exact-or-nearest pandas filter for the
+    quote and IV, then bs_greeks at the requested strike."""
+    row = df[df["strike"] == strike]
+    if row.empty:
+        row = df.iloc[[(df["strike"] - strike).abs().idxmin()]]
+    sigma = float(row["impliedVolatility"].values[0])
+    mark = (float(row["bid"].values[0]) + float(row["ask"].values[0])) / 2
+    return mark, bs_greeks(flag, SPOT, float(strike), T, R, sigma)
+
+
+def test_vectorized_greeks_match_the_scalar_path(chain):
+    for flag, df in (("c", chain.calls), ("p", chain.puts)):
+        strikes, iv = df["strike"].to_numpy(), df["impliedVolatility"].to_numpy()
+        vec = bs_greeks_vec(flag, SPOT, strikes, T, R, iv)
+        assert vec["valid"].all()
+        for key, tol in TOLERANCE.items():
+            scalar = np.array([bs_greeks(flag, SPOT, k, T, R, s)[key] for k, s in zip(strikes, iv)])
+            assert np.max(np.abs(scalar - vec[key])) <= tol, key
+
+    invalid = bs_greeks_vec(["c", "p", "c"], SPOT, [6800, 6800, 0], [0.0, T, T], R, [0.2, 0.0, 0.2])
+    assert not invalid["valid"].any()
+    assert bs_greeks("c", SPOT, 6800, 0.0, R, 0.2)["source"] == "unavailable"
+    for key in TOLERANCE:
+        assert (invalid[key] == 0.0).all()
+
+
+def test_fetch_leg_data_matches_the_per_leg_loop(chain):
+    legs = [("Long Put", 6390, "put", -1), ("Short Put", 6500, "put", 1),
+            ("Short Call", 7010, "call", 1), ("Long Call", 7100, "call", -1)]
+    expiry = (np.datetime64("today") + 30).astype(str)
+    vectorized = fetch_leg_data(expiry, legs, spot=SPOT, r=R, chain=chain)
+    for leg, (label, strike, opt_type, sign) in zip(vectorized, legs):
+        df = chain.calls if opt_type == "call" else chain.puts
+        mark, greeks = _scalar_leg(df, opt_type[0], strike)
+        assert leg["mark"] == round(mark, 2)
+        for key, tol in TOLERANCE.items():
+            assert abs(leg[key] - greeks[key]) <= 2 * tol, (label, key)
+
+
+def test_condor_scan_matches_a_scalar_brute_force(chain, wing=25.0):
+    puts, calls = chain.puts, chain.calls
+    short_puts = [k for k in puts["strike"] if k < SPOT
+                  and 0.05 <= abs(_scalar_leg(puts, "p", k)[1]["delta"]) <= 0.20]
+    short_calls = [k for k in calls["strike"] if k > SPOT
+                   and 0.05 <= _scalar_leg(calls, "c", k)[1]["delta"] <= 0.20]
+    assert len(short_puts) > 3 and len(short_calls) > 3
+
+    brute = {}
+    for sp in short_puts:
+        for sc in short_calls:
+            (lp_mark, lp), (sp_mark, spg) = _scalar_leg(puts, "p", sp - wing), _scalar_leg(puts, "p", sp)
+            (sc_mark, scg), (lc_mark, lc) = _scalar_leg(calls, "c", sc), _scalar_leg(calls, "c", sc + wing)
+            credit = (sp_mark - lp_mark) + (sc_mark - lc_mark)
+            max_loss = wing - credit
+            if credit <= 0 or max_loss <= 0:
+                continue
+            sp_iv = float(puts.loc[puts["strike"] == sp, "impliedVolatility"].iloc[0])
+            sc_iv = float(calls.loc[calls["strike"] == sc, "impliedVolatility"].iloc[0])
+            pop = float(np.clip(prob_above(SPOT, sp - credit, T, R, sp_iv)
+                                - prob_above(SPOT, sc + credit, T, R, sc_iv), 0, 1))
+            net = compute_position_greeks([dict(g, sign=s) for g, s in
+                                           ((lp, -1), (spg, 1), (scg, 1), (lc, -1))])
+            brute[(sp, sc)] = (pop * credit / max_loss, credit, max_loss, net)
+
+    ranked = sorted(brute, key=lambda key: -brute[key][0])
+    top = scan_iron_condors(chain, SPOT, T, R, wing_width=wing, top_n=len(brute) + 10)
+    assert len(top) == len(brute)
+    assert [(c["strikes"]["short_put"], c["strikes"]["short_call"]) for c in top[:5]] == ranked[:5]
+
+    for candidate in top:
+        strikes = candidate["strikes"]
+        score, credit, max_loss, net = brute[(strikes["short_put"], strikes["short_call"])]
+        assert (strikes["long_put"], strikes["long_call"]) == (strikes["short_put"] - wing,
+                                                               strikes["short_call"] + wing)
+        assert candidate["net_credit"] == pytest.approx(credit, abs=0.006)
+        assert candidate["max_loss"] == pytest.approx(max_loss, abs=0.006)
+        assert candidate["score"] == pytest.approx(score, abs=1e-4)
+        # The scalar legs are rounded before aggregation; allow for that.
+        assert candidate["net_theta_per_day"] == pytest.approx(net["net_theta_per_day"], abs=0.03)
+        assert candidate["net_vega_per_pp"] == pytest.approx(net["net_vega_per_pp"], abs=0.03)
+        assert candidate["net_delta_per_pt"] == pytest.approx(net["net_delta_per_pt"], abs=0.03)
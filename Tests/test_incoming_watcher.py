@@ -0,0 +1,187 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import incoming_watcher
+from incoming_watcher import IncomingIndex, IncomingWatcher, _file_hash
+
+
+class _WarRoom(BaseHTTPRequestHandler):
+    seeded = []
+    in_flight = peak = 0
+    lock = threading.Lock()
+    delay = 0.0
+
+    def do_POST(self):
+        cls = type(self)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+            if self.path == "/api/warroom/seed":
+                cls.seeded.append(body["topic"])
+        payload = json.dumps({"challenge_id": "ch-1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def warroom():
+    _WarRoom.seeded, _WarRoom.in_flight, _WarRoom.peak, _WarRoom.delay = [], 0, 0, 0.0
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = ThreadingHTTPServer(("127.0.0.1", port), _WarRoom)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def projects(tmp_path, monkeypatch):
+    monkeypatch.setattr(incoming_watcher, "_state_file", str(tmp_path / "legacy_state.json"))
+    root = tmp_path / "projects"
+    (root / "Alpha" / "incoming").mkdir(parents=True)
+    (root / "Alpha" / "src").mkdir()
+    return root
+
+
+def _watcher(projects, warroom, tmp_path, **kw):
+    kw.setdefault("settle_seconds", 0.2)
+    kw.setdefault("poll_interval", 0.05)
+    return IncomingWatcher(str(projects), IncomingIndex(str(tmp_path / "index.db")), warroom,
+                           use_events=False, **kw)
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_new_file_is_audited_once_after_it_settles(projects, warroom, tmp_path):
+    watcher = _watcher(projects, warroom, tmp_path)
+    watcher.start()
+    assert watcher.mode == "polling"
+
+    (projects / "Alpha" / "src" / "main.py").write_text("print()")   # outside incoming/
+    upload = projects / "Alpha" / "incoming" / "ledger.csv"
+    started = time.monotonic()
+    upload.write_text("a,b\n")
+    for _ in range(3):   # still being written: must not be audited mid-copy
+        time.sleep(0.1)
+        with upload.open("a") as f:
+            f.write("1,2\n")
+    assert _WarRoom.seeded == []
+
+    assert _wait_for(lambda: _WarRoom.seeded)
+    assert time.monotonic() - started < 1.5
+    time.sleep(0.3)
+    assert _WarRoom.seeded == ["Legacy Audit: Alpha/ledger.csv — New file in incoming/"]
+    watcher.close()
+
+    restarted = _watcher(projects, warroom, tmp_path)
+    assert restarted.scan_once() == []
+    upload.write_text("rewritten\n")
+    os.utime(upload, ns=(0, 10**9))   # settled long ago
+    assert [r["filename"] for r in restarted.scan_once()] == ["ledger.csv"]
+    restarted.close()
+
+
+def test_burst_is_seeded_concurrently_with_a_bounded_pool(projects, warroom, tmp_path):
+    _WarRoom.delay = 0.1
+    nested = projects / "Alpha" / "incoming" / "batch"
+    nested.mkdir()
+    for i in range(8):
+        (nested / f"f{i}.txt").write_text(str(i))
+        os.utime(nested / f"f{i}.txt", ns=(0, 10**9))
+    watcher = _watcher(projects, warroom, tmp_path, seed_workers=4)
+
+    started = time.perf_counter()
+    results = watcher.scan_once()
+    elapsed = time.perf_counter() - started
+    assert sorted(r["filename"] for r in results) == [f"f{i}.txt" for i in range(8)]
+    assert all(r["warroom_seeded"] and r["challenge_id"] == "ch-1" for r in results)
+    assert _WarRoom.peak == 4
+    assert elapsed < 1.2   # serial would be 16 posts x 0.1s
+    assert watcher.index.count() == 8
+    watcher.close()
+
+
+def test_legacy_state_is_imported_once(projects, warroom, tmp_path):
+    old = projects / "Alpha" / "incoming" / "old.pdf"
+    old.write_text("audited by the previous watcher")
+    os.utime(old, ns=(0, 10**9))
+    with open(incoming_watcher._state_file, "w", encoding="utf-8") as f:
+        json.dump({"processed": [_file_hash(str(old))]}, f)
+    new = projects / "Alpha" / "incoming" / "new.pdf"
+    new.write_text("fresh")
+    os.utime(new, ns=(0, 10**9))
+
+    watcher = _watcher(projects, warroom, tmp_path)
+    assert [r["filename"] for r in watcher.scan_once()] == ["new.pdf"]
+    assert watcher.index.import_legacy_state(incoming_watcher._state_file, str(projects)) == 0
+    assert watcher.index.count() == 2
+    watcher.close()
+
+
+def test_polling_catches_an_in_place_overwrite(projects, warroom, tmp_path):
+    upload = projects / "Alpha" / "incoming" / "ledger.csv"
+    upload.write_text("v1\n")
+    os.utime(upload, ns=(0, 10**9))
+    watcher = _watcher(projects, warroom, tmp_path, reconcile_interval=600, poll_reconcile_interval=0.3)
+    watcher.start()
+    assert _wait_for(lambda: len(_WarRoom.seeded) == 1)
+
+    incoming_mtime = os.stat(upload.parent).st_mtime_ns
+    upload.write_text("v2, same directory entry\n")
+    assert os.stat(upload.parent).st_mtime_ns == incoming_mtime
+    assert _wait_for(lambda: len(_WarRoom.seeded) == 2)
+    watcher.close()
+
+
+class _Observer:
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule(self, handler, path, recursive=False):
+        self.scheduled.append((os.path.relpath(path, self.root), recursive))
+
+
+def test_observer_watches_only_incoming_trees_recursively(projects, warroom, tmp_path):
+    watcher = _watcher(projects, warroom, tmp_path)
+    watcher._observer = observer = _Observer()
+    observer.root = str(projects)
+    watcher._watch_dirs()
+    assert sorted(observer.scheduled) == [(".", False), ("Alpha", False),
+                                          (os.path.join("Alpha", "incoming"), True)]
+
+    fresh = projects / "Beta" / "incoming"
+    fresh.mkdir(parents=True)
+    (fresh / "memo.txt").write_text("moved in with the project")
+    watcher.notify(str(projects / "Beta"))
+    assert observer.scheduled[3:] == [("Beta", False), (os.path.join("Beta", "incoming"), True)]
+    assert list(watcher._pending) == [str(fresh / "memo.txt")]
+    watcher._watch_dirs()
+    assert len(observer.scheduled) == 5
+    watcher._observer = None
+    watcher.close()
@@ -0,0 +1,74 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import institutional_memory as im
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    projects = tmp_path / "projects"
+    shared = projects / "_shared"
+    shared.mkdir(parents=True)
+    monkeypatch.setattr(im, "PROJECTS_DIR", str(projects))
+    monkeypatch.setattr(im, "SHARED_LESSONS", str(shared / "lessons.json"))
+    monkeypatch.setattr(im, "LESSONS_DB", str(shared / "lessons.db"))
+    monkeypatch.setattr(im, "_conn", None)
+    yield projects
+    if im._conn is not None:
+        im._conn.close()
+
+
+def test_record_and_filter_by_project_and_category(store):
+    im.record_lesson("architecture", "Isolate project state", project_name="Aether", tags=["state"])
+    im.record_lesson("self_heal", "Retry flaky sockets", project_name="Other")
+    im.record_lesson("self_heal", "Validate JSON before parsing")
+
+    aether_only = im.get_lessons(project_name="Aether", include_global=False)
+    assert [l["summary"] for l in aether_only] == ["Isolate project state"]
+    assert aether_only[0]["tags"] == ["state"]
+
+    heals = im.get_lessons(category="self_heal")
+    assert {l["summary"] for l in heals} == {"Retry flaky sockets", "Validate JSON before parsing"}
+    assert "Isolate project state" in im.get_lessons_for_build("Aether")
+
+
+def test_search_is_case_insensitive_substring(store):
+    im.record_lesson("architecture", "Always VALIDATE payloads", details="trace here", tags=["json-schema"])
+    im.record_lesson("architecture", "Unrelated")
+    assert [l["summary"] for l in im.search_lessons("validate")] == ["Always VALIDATE payloads"]
+    assert len(im.search_lessons("son-sch")) == 1
+    assert len(im.search_lessons("al")) == 1  # short query uses the LIKE path
+    assert im.search_lessons("nothing matches") == []
+
+
+def test_global_cap_keeps_project_history(store, monkeypatch):
+    monkeypatch.setattr(im, "GLOBAL_CAP", 5)
+    monkeypatch.setattr(im, "PROJECT_CAP", 3)
+    monkeypatch.setattr(im, "_PRUNE_EVERY", 1)
+    for i in range(10):
+        im.record_lesson("architecture", f"p{i}", project_name="Aether")
+    assert len(im.get_lessons(limit=100)) == 5
+    assert len(im.get_lessons(project_name="Aether", include_global=False, limit=100)) == 5
+    for i in range(10):
+        im.record_lesson("architecture", f"g{i}")
+    project = im.get_lessons(project_name="Aether", include_global=False, limit=100)
+    assert [l["summary"] for l in project] == ["p9", "p8", "p7"]
+
+
+def test_legacy_json_is_imported_once(store):
+    shared = store / "_shared"
+    g = {"id": "L-1", "category": "override", "summary": "global one", "details": "",
+         "tags": [], "project": "_global", "created_at": "2026-01-01T00:00:00"}
+    p = dict(g, id="L-2", summary="project only", project="Aether", created_at="2025-12-01T00:00:00")
+    (shared / "lessons.json").write_text(json.dumps([g]), encoding="utf-8")
+    (store / "Aether").mkdir()
+    (store / "Aether" / "lessons.json").write_text(json.dumps([p, g]), encoding="utf-8")
+
+    assert [l["summary"] for l in im.get_lessons(project_name="Aether")] == ["global one", "project only"]
+    assert im.import_json_lessons() == 0
+    assert len(im.get_lessons(project_name="Aether")) == 2
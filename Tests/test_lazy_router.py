@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+import textwrap
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_modules import lazy_router
+from shared_modules.lazy_router import LazyRouter, lazy_routers, warm_up
+from shared_modules.startup_profiler import StartupProfiler, format_report
+
+
+@pytest.fixture
+def heavy_module(tmp_path, monkeypatch):
+    """A router module with an import-time side effect we can count."""
+    (tmp_path / "heavy_subsystem.py").write_text(textwrap.dedent("""
+        import time
+        from fastapi import APIRouter
+
+        IMPORTS = []
+        IMPORTS.append(time.sleep(0.2))   # e.g. opening a vector store
+        router = APIRouter(prefix="/api/heavy")
+
+        @router.get("/ping")
+        def ping():
+            return {"pong": len(IMPORTS)}
+
+        @router.get("/shadowed")
+        def shadowed():
+            return {"from": "heavy"}
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "heavy_subsystem"
+    sys.modules.pop("heavy_subsystem", None)
+
+
+def _app(module, **kw):
+    app = FastAPI()
+    early = APIRouter()
+
+    @early.get("/api/heavy/shadowed")
+    def eager_shadowed():
+        return {"from": "eager"}
+
+    app.include_router(early)
+    lazy = LazyRouter(app, "/api/heavy", module, **kw)
+
+    @app.get("/api/light")
+    def light():
+        return {"ok": True}
+
+    return app, lazy
+
+
+def test_router_loads_on_first_request_in_place(heavy_module):
+    loads = []
+    app, lazy = _app(heavy_module, on_load=loads.append)
+    client = TestClient(app)
+
+    assert client.get("/api/light").json() == {"ok": True}
+    assert heavy_module not in sys.modules and not lazy.loaded
+
+    assert client.get("/api/heavy/ping").json() == {"pong": 1}
+    assert client.get("/api/heavy/ping").json() == {"pong": 1}
+    assert len(loads) == 1 and lazy.loaded
+    assert lazy not in app.router.routes
+    # Routes registered before the placeholder still win, as with an eager include.
+    assert client.get("/api/heavy/shadowed").json() == {"from": "eager"}
+    assert "/api/heavy/ping" in client.get("/openapi.json").json()["paths"]
+
+
+def test_concurrent_first_requests_share_one_import(heavy_module):
+    loads = []
+    app, lazy = _app(heavy_module, on_load=loads.append)
+
+    async def burst():
+        await asyncio.gather(*(lazy.warm_up() for _ in range(5)))
+
+    asyncio.run(burst())
+    assert len(loads) == 1 and lazy.loaded
+    assert TestClient(app).get("/api/heavy/ping").status_code == 200
+
+
+def test_failed_import_returns_503_and_retries(heavy_module, monkeypatch):
+    app, lazy = _app("no_such_subsystem")
+    client = TestClient(app)
+    response = client.get("/api/heavy/ping")
+    assert response.status_code == 503 and "no_such_subsystem" in response.json()["error"]
+    assert client.get("/api/light").status_code == 200
+
+    lazy.module = heavy_module          # the dependency gets installed
+    assert client.get("/api/heavy/ping").status_code == 503   # still inside the retry window
+    monkeypatch.setattr(lazy_router, "RETRY_SECONDS", 0)
+    assert client.get("/api/heavy/ping").json() == {"pong": 1}
+    assert lazy.error is None
+
+
+def test_background_warmup_loads_every_lazy_router(heavy_module):
+    app, lazy = _app(heavy_module)
+    assert lazy_routers(app) == [lazy]
+    asyncio.run(warm_up(app, delay=0.01))
+    assert lazy.loaded
+
+
+def test_profiler_times_imports_and_initializers(heavy_module):
+    profiler = StartupProfiler(enabled=True)
+    profiler.install_import_hook(__name__)
+    try:
+        import heavy_subsystem  # noqa: F401
+        import json  # already loaded: not reported  # noqa: F401
+    finally:
+        profiler.remove_import_hook()
+    with profiler.section("watchdogs"):
+        pass
+    asyncio.run(profiler.run("memory engine", lambda: asyncio.sleep(0.05)))
+
+    report = profiler.finish(write=False)
+    assert [e["name"] for e in report["imports"]] == ["heavy_subsystem"]
+    assert report["imports"][0]["ms"] >= 200
+    assert [e["name"] for e in report["initializers"]] == ["memory engine", "watchdogs"]
+    assert "heavy_subsystem" in format_report(report)
+
+    quiet = StartupProfiler(enabled=False)
+    quiet.install_import_hook(__name__)
+    assert quiet._real_import is None
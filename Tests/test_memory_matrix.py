@@ -0,0 +1,90 @@
+import os
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.docs, self.add_calls, self.query_calls = [], 0, 0
+
+    def add(self, ids, documents, metadatas):
+        self.add_calls += 1
+        self.docs.extend(documents)
+
+    def query(self, query_texts, n_results):
+        self.query_calls += 1
+        return {"documents": [list(self.docs[-n_results:])]}
+
+
+class _FakeClient:
+    instances = 0
+
+    def __init__(self, path):
+        _FakeClient.instances += 1
+        self.collection = _FakeCollection()
+
+    def get_or_create_collection(self, name, metadata):
+        return self.collection
+
+
+@pytest.fixture
+def amm(monkeypatch):
+    # chromadb is an optional heavyweight dependency; the matrix only needs the client API.
+    monkeypatch.setitem(sys.modules, "chromadb", types.SimpleNamespace(PersistentClient=_FakeClient))
+    import agent_memory_matrix
+    monkeypatch.setattr(agent_memory_matrix, "_chromadb", None)
+    monkeypatch.setattr(agent_memory_matrix, "_memory_matrix", None)
+    _FakeClient.instances = 0
+    return agent_memory_matrix
+
+
+def test_singleton_starts_one_client(amm):
+    assert amm.get_memory_matrix() is amm.get_memory_matrix()
+    assert _FakeClient.instances == 1
+
+
+def test_writes_are_batched_and_visible_to_the_next_query(amm):
+    m = amm.VectorMemoryMatrix(db_path="unused", flush_interval=5.0)
+    ids = m.lock_memories([("s", f"plan {i}", {"i": i}) for i in range(10)])
+    assert len(set(ids)) == 10
+    result = m.retrieve_context("plan", n_results=2)
+    assert result == {"documents": [["plan 8", "plan 9"]]}
+    assert m.collection.add_calls == 1
+    m.close()
+
+
+def test_query_cache_normalizes_and_is_invalidated_by_writes(amm):
+    m = amm.VectorMemoryMatrix(db_path="unused")
+    m.lock_memory("s", "first", {})
+    m.retrieve_context("SaaS  Launch")
+    m.retrieve_context("saas launch")["documents"][0].append("mutated")
+    assert m.collection.query_calls == 1
+    assert m.retrieve_context("saas launch") == {"documents": [["first"]]}
+
+    m.lock_memory("s", "second", {})
+    assert m.retrieve_context("saas launch") == {"documents": [["first", "second"]]}
+    assert m.collection.query_calls == 2
+    stats = m.metrics()
+    assert stats["cache_hits"] == 2 and stats["writes"] == 2 and stats["pending_writes"] == 0
+    m.close()
+
+
+def test_a_write_during_a_query_keeps_the_result_out_of_the_cache(amm):
+    m = amm.VectorMemoryMatrix(db_path="unused")
+    query = m.collection.query
+
+    def racing_query(query_texts, n_results):
+        result = query(query_texts, n_results)
+        m._write_batch([("s_race", "racing", {})])   # lands after the search read the index
+        return result
+
+    m.collection.query = racing_query
+    assert m.retrieve_context("launch") == {"documents": [[]]}
+    m.collection.query = query
+    assert m.retrieve_context("launch") == {"documents": [["racing"]]}
+    assert m.collection.query_calls == 2
+    m.close()
@@ -0,0 +1,59 @@
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_router
+
+
+def test_route_many_runs_calls_concurrently_and_keeps_order():
+    """Seven independent agent prompts should cost ~one round-trip, not seven."""
+    async def fake_gemini(prompt, system_prompt="", api_key="", model_name=model_router.GEMINI_FLASH):
+        await asyncio.sleep(0.2)
+        return f"reply to {prompt}"
+
+    calls = [{"task_type": "CEO", "prompt": f"p{i}"} for i in range(7)]
+    with patch("model_router._acall_gemini", side_effect=fake_gemini):
+        start = time.perf_counter()
+        results = asyncio.run(model_router.route_many(calls))
+        elapsed = time.perf_counter() - start
+
+    assert results == [f"🤖 [Gemini Flash] reply to p{i}" for i in range(7)]
+    assert elapsed < 0.2 * 3
+
+
+def test_route_async_follows_heavy_tier_fallback():
+    """Claude failure falls back strictly to Gemini Pro, as in the sync router."""
+    async def empty(*args, **kwargs):
+        return ""
+
+    async def pro(prompt, system_prompt="", api_key="", model_name=model_router.GEMINI_FLASH):
+        return f"{model_name} ok"
+
+    with patch("model_router._acall_claude", side_effect=empty):
+        with patch("model_router._acall_gemini", side_effect=pro):
+            res = asyncio.run(model_router.route_async("CFO", "Calculate Capex"))
+
+    assert res == "🤖 [Gemini Pro] gemini-2.5-pro ok"
+
+
+def test_route_many_isolates_failures():
+    async def flaky(prompt, system_prompt="", api_key="", model_name=model_router.GEMINI_FLASH):
+        if prompt == "boom":
+            raise RuntimeError("boom")
+        return "ok"
+
+    with patch("model_router._acall_gemini", side_effect=flaky):
+        results = asyncio.run(model_router.route_many([
+            {"task_type": "CEO", "prompt": "boom"},
+            {"task_type": "CMO", "prompt": "fine"},
+        ]))
+
+    assert results == ["", "🤖 [Gemini Flash] ok"]
+
+
+def test_sync_calls_share_one_session():
+    assert model_router._get_session() is model_router._get_session()
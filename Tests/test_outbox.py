@@ -0,0 +1,167 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from outbox import Outbox, _ResilienceConfig
+from local_state_manager import StateManager
+
+
+class _Webhook(BaseHTTPRequestHandler):
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.received.append(json.loads(body))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port):
+    _Webhook.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Webhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    cfg = tmp_path / "resilience_config.json"
+    cfg.write_text(json.dumps({
+        "local_queue_buffer": {"max_retries": 3},
+        "n8n_backoff": {"base_seconds": 0.05, "max_seconds": 0.2},
+        "circuit_breaker_defaults": {"failure_threshold": 2, "cooldown_seconds": 0.2, "success_threshold": 1},
+    }))
+    box = Outbox(str(tmp_path / "outbox.db"), config=_ResilienceConfig(str(cfg)), autostart_replay=False)
+    yield box
+    box.close()
+
+
+def test_send_is_recorded_and_pooled(outbox):
+    port = _free_port()
+    server = _serve(port)
+    url = f"http://127.0.0.1:{port}/webhook?key=SECRET"
+    assert [outbox.post(url, {"n": i}, "Tests") for i in range(5)] == ["sent"] * 5
+    server.shutdown()
+
+    assert [p["n"] for p in _Webhook.received] == list(range(5))
+    stats = outbox.stats()
+    assert stats["sent"] == 5 and stats["pending"] == 0
+    assert "SECRET" not in outbox.recent(1)[0]["url"]
+
+
+def test_unreachable_target_opens_the_breaker_and_replay_drains_it(outbox):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/webhook"
+    assert [outbox.post(url, {"n": i}, "Tests", timeout=1) for i in range(4)] == ["buffered"] * 4
+    assert outbox.breaker(url).state == "open"
+    assert outbox.recent(1)[0]["error"] == "Circuit open"   # no connect attempted
+    # The two failed sends are backing off; the two breaker-buffered ones are due but deferred.
+    assert outbox.replay() == {"synced": 0, "retrying": 0, "deferred": 2}
+
+    server = _serve(port)
+    time.sleep(0.25)   # breaker cooldown and retry backoff
+    assert outbox.replay()["synced"] == 4
+    server.shutdown()
+    assert sorted(p["n"] for p in _Webhook.received) == [0, 1, 2, 3]
+    assert outbox.stats()["sent"] == 4 and outbox.breaker(url).state == "closed"
+
+
+def test_retries_back_off_then_dead_letter(outbox):
+    url = f"http://127.0.0.1:{_free_port()}/webhook"
+    outbox.enqueue(url, {"n": 1}, "Tests", status="pending")
+    for _ in range(6):
+        outbox.replay(force=True, timeout=1)
+        assert outbox.replay(timeout=1)["retrying"] == 0   # still backing off
+    assert outbox.stats()["dead"] == 1
+    assert outbox.requeue() == 1 and outbox.stats()["pending"] == 1
+
+
+def test_concurrent_replayers_claim_disjoint_batches(outbox, tmp_path):
+    for i in range(40):
+        outbox.enqueue("http://127.0.0.1:9/x", {"n": i}, "Tests", status="pending")
+    other = Outbox(outbox.db_path, config=outbox.config, autostart_replay=False)
+    claimed, lock = [], threading.Lock()
+
+    def drain(box):
+        while True:
+            batch = box.claim_due(7)
+            if not batch:
+                return
+            with lock:
+                claimed.extend(row["id"] for row in batch)
+
+    threads = [threading.Thread(target=drain, args=(box,)) for box in (outbox, other, outbox, other)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    other.close()
+    assert len(claimed) == 40 and len(set(claimed)) == 40
+
+
+def test_state_manager_and_legacy_files_use_the_outbox(outbox, tmp_path):
+    sm = StateManager(state_file=str(tmp_path / "missing.json"), outbox=outbox)
+    assert not outbox.has_backlog()
+    answered = sm.log_outgoing("http://127.0.0.1:9/x", {"a": 0}, "Tests")
+    sm.mark_failed(answered, "Invalid JSON Response", 200)   # delivered: never replayed
+    entry = sm.log_outgoing("http://127.0.0.1:9/x", {"a": 1}, "Tests")
+    sm.schedule_retry(entry, "connection refused")
+    assert outbox.has_backlog()
+    sm.set_safe_buffer_mode(True)
+    assert sm.get_stats() == {"total": 2, "pending": 1, "sent": 0, "failed": 1, "safe_buffer_mode": True}
+    assert outbox.post("http://127.0.0.1:9/x", {"a": 2}, "Tests") == "buffered"
+
+    legacy = tmp_path / "pending_sync"
+    legacy.mkdir()
+    for i in range(2):
+        # Same-second names used to collide; both must survive the import.
+        (legacy / f"Tests_20260101_000000_{i}.json").write_text(
+            json.dumps({"url": "http://127.0.0.1:9/x", "payload": {"i": i}, "project": "Tests"}))
+    assert outbox.import_legacy_files(str(legacy)) == 2
+    assert not list(legacy.iterdir())
+    assert outbox.stats()["pending"] == 4 and outbox.stats()["failed"] == 1
+
+
+def test_bad_legacy_files_do_not_kill_the_replay_worker(outbox, tmp_path, monkeypatch):
+    legacy = tmp_path / "pending_sync"
+    legacy.mkdir()
+    (legacy / "a_list.json").write_text(json.dumps(["not", "an", "object"]))
+    (legacy / "b_locked.json").write_text(json.dumps({"url": "http://127.0.0.1:9/x", "payload": {}}))
+    (legacy / "c_ok.json").write_text(json.dumps({"url": "http://127.0.0.1:9/x", "payload": {"ok": 1}}))
+    real_remove = os.remove
+
+    def remove(path):
+        if path.endswith("b_locked.json"):
+            raise PermissionError(13, "file is locked", path)
+        real_remove(path)
+
+    monkeypatch.setattr(os, "remove", remove)
+    assert outbox.import_legacy_files(str(legacy)) == 1
+    assert sorted(p.name for p in legacy.iterdir()) == ["a_list.json", "b_locked.json"]
+    assert outbox.stats()["pending"] == 1
+
+    # An import that blows up is logged by the loop; the worker keeps replaying.
+    monkeypatch.setattr(outbox, "import_legacy_files", lambda: 1 / 0)
+    outbox.autostart_replay = True
+    outbox.ensure_replay_worker()
+    time.sleep(0.2)
+    assert outbox._worker.is_alive()
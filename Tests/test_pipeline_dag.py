@@ -0,0 +1,97 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from warroom_protocol import (
+    AgentResourceLock, PipelineCycleError, PipelineDAGExecutor, PipelineStep,
+)
+
+
+def _step(agent, deps=(), gate=False):
+    return PipelineStep(agent_name=agent, phase="test", depends_on=list(deps), is_gate=gate)
+
+
+def _runner(log, delays, active=None):
+    async def run_step(step):
+        log.append(("start", step.agent_name))
+        if active is not None:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(delays.get(step.agent_name, 0.05))
+        if active is not None:
+            active["now"] -= 1
+        log.append(("end", step.agent_name))
+        return step.agent_name
+    return run_step
+
+
+def _gate(failing):
+    return lambda step, result: {"passed": step.agent_name not in failing, "reason": "test"}
+
+
+def test_independent_steps_overlap_and_wall_time_tracks_critical_path():
+    steps = [_step("CMO"), _step("CPO"), _step("CLO"), _step("CEO", ["CMO"]),
+             _step("CFO", ["CMO", "CEO"]), _step("CRITIC", ["CFO", "CPO", "CLO"])]
+    delays = {"CMO": 0.1, "CEO": 0.1, "CFO": 0.1, "CPO": 0.15, "CLO": 0.05, "CRITIC": 0.05}
+    log = []
+    dag = PipelineDAGExecutor(steps, _runner(log, delays), gate_check=_gate(()),
+                              resource_lock=AgentResourceLock(max_concurrent_llm_calls=3))
+    result = asyncio.run(dag.run())
+
+    assert result.results == {s.agent_name: s.agent_name for s in steps}
+    assert log[:3] == [("start", "CMO"), ("start", "CPO"), ("start", "CLO")]
+    assert log.index(("end", "CMO")) < log.index(("start", "CEO"))
+    assert result.critical_path == ["CMO", "CEO", "CFO", "CRITIC"]
+    assert result.critical_path_seconds == pytest.approx(0.35, abs=0.1)
+    assert result.wall_seconds < result.serial_seconds - 0.15
+    assert result.timing_summary()["steps"]["CPO"]["status"] == "done"
+
+
+def test_llm_slot_budget_bounds_fan_out():
+    steps = [_step(f"A{i}") for i in range(6)]
+    active = {"now": 0, "peak": 0}
+    dag = PipelineDAGExecutor(steps, _runner([], {}, active), gate_check=_gate(()),
+                              resource_lock=AgentResourceLock(max_concurrent_llm_calls=2))
+    result = asyncio.run(dag.run())
+    assert active["peak"] == 2
+    assert len(result.results) == 6
+
+
+def test_failed_gate_halts_downstream_but_lets_in_flight_steps_finish():
+    steps = [_step("CMO"), _step("CLO"), _step("CTO", ["CMO"], gate=True), _step("CFO", ["CTO"])]
+    log = []
+    dag = PipelineDAGExecutor(steps, _runner(log, {"CLO": 0.2}), gate_check=_gate({"CTO"}),
+                              resource_lock=AgentResourceLock())
+    result = asyncio.run(dag.run())
+
+    assert result.halted and result.gate_failure["agent"] == "CTO"
+    assert ("end", "CLO") in log
+    assert ("start", "CFO") not in log
+    statuses = {a: t.status for a, t in result.timings.items()}
+    assert statuses == {"CMO": "done", "CLO": "done", "CTO": "gate_failed", "CFO": "skipped"}
+
+
+def test_step_exception_propagates_after_drain():
+    async def run_step(step):
+        if step.agent_name == "CMO":
+            raise RuntimeError("budget exceeded")
+        await asyncio.sleep(0.05)
+
+    lock = AgentResourceLock(max_concurrent_llm_calls=2)
+    dag = PipelineDAGExecutor([_step("CMO"), _step("CLO"), _step("CEO", ["CMO"])], run_step,
+                              gate_check=_gate(()), resource_lock=lock)
+    with pytest.raises(RuntimeError, match="budget exceeded"):
+        asyncio.run(dag.run())
+    # Every slot came back.
+    assert lock.acquire_llm_slot("probe", timeout=0) and lock.acquire_llm_slot("probe", timeout=0)
+
+
+def test_external_dependencies_are_satisfied_and_cycles_rejected():
+    dag = PipelineDAGExecutor([_step("CRITIC", ["CMO", "CFO"])], _runner([], {}), gate_check=_gate(()))
+    assert dag.topological_order() == ["CRITIC"]
+    with pytest.raises(PipelineCycleError):
+        PipelineDAGExecutor([_step("A", ["B"]), _step("B", ["A"])], _runner([], {}))
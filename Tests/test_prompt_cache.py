@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_router
+import prompt_cache
+from prompt_cache import PromptCache, make_key
+
+
+def test_memory_lru_evicts_oldest(tmp_path):
+    cache = PromptCache(db_path=None, max_memory_entries=2)
+    for k in ("a", "b", "c"):
+        cache.put(k, k.upper(), ttl=60)
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_new_instance_and_expires(tmp_path):
+    db = str(tmp_path / "cache.db")
+    PromptCache(db_path=db).put("k", "v", ttl=60)
+    fresh = PromptCache(db_path=db)
+    assert fresh.get("k") == "v"
+    assert fresh.stats()["disk_hits"] == 1
+
+    fresh.put("short", "v", ttl=1)
+    with patch("prompt_cache.time.time", return_value=time.time() + 5):
+        assert fresh.get("short") is None
+
+
+def test_key_depends_on_model_and_system_prompt():
+    base = make_key("CFO", "m1", "", "p")
+    assert base != make_key("CFO", "m2", "", "p")
+    assert base != make_key("CFO", "m1", "sys", "p")
+    assert base == make_key("CFO", "m1", "", "p")
+
+
+def test_route_serves_duplicates_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_ROUTER_CACHE", "1")
+    monkeypatch.setattr(prompt_cache, "_cache", PromptCache(db_path=str(tmp_path / "c.db")))
+    with patch("model_router._call_gemini", return_value="fresh") as mock_gemini:
+        first = model_router.route("market_intel", "Analyze TAM")
+        second = model_router.route("market_intel", "Analyze TAM")
+        model_router.route("market_intel", "Analyze TAM", use_cache=False)
+    assert first == second == "🤖 [Gemini Flash] fresh"
+    assert mock_gemini.call_count == 2
+    assert model_router.cache_stats()["hits"] == 1
+
+
+def test_failed_and_chat_calls_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_ROUTER_CACHE", "1")
+    monkeypatch.setattr(prompt_cache, "_cache", PromptCache(db_path=str(tmp_path / "c.db")))
+    with patch("model_router._call_gemini", return_value="") as mock_gemini:
+        model_router.route("market_intel", "x")
+        model_router.route("market_intel", "x")
+    assert mock_gemini.call_count == 2
+    with patch("model_router._call_gemini", return_value="hi") as mock_gemini:
+        model_router.route("chat", "hello")
+        model_router.route("chat", "hello")
+        model_router.route("unlisted_task_type", "hello")   # not opted in via TASK_TTL
+        model_router.route("unlisted_task_type", "hello")
+    assert mock_gemini.call_count == 4
+
+
+def test_fallback_answers_are_not_cached_under_the_preferred_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_ROUTER_CACHE", "1")
+    monkeypatch.setattr(prompt_cache, "_cache", PromptCache(db_path=str(tmp_path / "c.db")))
+    monkeypatch.setattr(model_router, "get_model_for_task", lambda task_type: model_router.CLAUDE_SONNET)
+    with patch("model_router._call_claude", return_value="") as mock_claude, \
+            patch("model_router._call_gemini", return_value="from gemini"):
+        assert model_router.route("architect", "design it").startswith("🤖 [Gemini Pro]")
+        model_router.route("architect", "design it")
+    assert mock_claude.call_count == 2
+    assert model_router.cache_stats()["stores"] == 0
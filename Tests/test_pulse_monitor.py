@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Phantom_QA_Elite", "backend"))
+
+import pulse_monitor
+from pulse_monitor import PulseMonitor
+
+
+def _closed_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_sweep_probes_all_ports_concurrently(monkeypatch):
+    async def hanging_connect(host, port):
+        await asyncio.sleep(60)
+    # Every connect hangs until the probe timeout, like a blackholed port.
+    monkeypatch.setattr(pulse_monitor.asyncio, "open_connection", hanging_connect)
+    targets = {f"app{i}": {"url": f"http://127.0.0.1:{9000 + i}", "manifest_status": "active"}
+               for i in range(20)}
+    monitor = PulseMonitor(lambda: targets, timeout=0.3)
+
+    started = time.perf_counter()
+    snap = asyncio.run(monitor.sweep())
+    assert time.perf_counter() - started < 2
+    assert snap["total_apps"] == 20 and snap["offline"] == 20
+
+
+def test_status_changes_and_debounced_heal(tmp_path):
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    targets = {"svc": {"url": f"http://127.0.0.1:{port}", "manifest_status": "active"}}
+    healed, revived = [], []
+    monitor = PulseMonitor(lambda: targets, heal_after=2, timeout=0.5,
+                           on_offline=lambda n, i: healed.append(n), on_online=revived.append)
+
+    async def run():
+        first = await monitor.sweep()
+        listener.close()
+        second = await monitor.sweep()
+        third = await monitor.sweep()
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first["apps"]["svc"]["status"] == "online"
+    assert first["apps"]["svc"]["latency_ms"] is not None
+    assert sum(first["apps"]["svc"]["latency_histogram"].values()) == 1
+    assert revived == ["svc"]
+
+    assert second["apps"]["svc"]["status"] == "offline"
+    assert second["apps"]["svc"]["since"] != first["apps"]["svc"]["since"]
+    assert third["apps"]["svc"]["since"] == second["apps"]["svc"]["since"]
+    # Only the second consecutive failure dispatches a heal.
+    assert healed == ["svc"]
+
+
+def test_targets_reload_only_when_the_manifest_changes(tmp_path):
+    manifest = tmp_path / "sync_manifest.json"
+    manifest.write_text(json.dumps({"apps": ["a"]}))
+    loads = []
+
+    def load():
+        loads.append(1)
+        names = json.loads(manifest.read_text())["apps"]
+        return {n: {"url": f"http://127.0.0.1:{_closed_port()}", "manifest_status": "inactive"} for n in names}
+
+    monitor = PulseMonitor(load, manifest_path=manifest, timeout=0.2)
+    for _ in range(3):
+        monitor.targets()
+    assert len(loads) == 1
+
+    manifest.write_text(json.dumps({"apps": ["a", "b"]}))
+    assert set(monitor.targets()) == {"a", "b"}
+    assert len(loads) == 2
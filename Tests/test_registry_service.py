@@ -0,0 +1,89 @@
+import json
+import multiprocessing
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registry_service import RegistryService, get_registry_service
+
+
+def _bump(reg):
+    reg["apps"].setdefault("Counter", {"n": 0})["n"] += 1
+
+
+def _bump_many(path, times):
+    svc = RegistryService(path)
+    for _ in range(times):
+        svc.update(_bump)
+
+
+def _write_external(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    # Coarse filesystem timestamps: make sure the mtime moves.
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_reads_are_cached_until_the_file_changes(tmp_path):
+    path = str(tmp_path / "registry.json")
+    _write_external(path, {"apps": {"CFO_Agent": {"port": 5070}}})
+    svc = RegistryService(path)
+    events = []
+    svc.subscribe(lambda data, changed: events.append(changed))
+
+    for _ in range(50):
+        assert svc.get_app("CFO_Agent") == {"port": 5070}
+    assert svc.reloads == 1
+    svc.read()["apps"]["CFO_Agent"]["port"] = 1   # copies never leak into the cache
+    assert svc.snapshot()["apps"]["CFO_Agent"]["port"] == 5070
+
+    _write_external(path, {"apps": {"CFO_Agent": {"port": 5071}, "CMO_Agent": {"port": 5020}}})
+    assert svc.get_app("CFO_Agent") == {"port": 5071}
+    assert svc.reloads == 2 and events == [{"CFO_Agent", "CMO_Agent"}]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"apps": {"CFO_Ag')   # a non-atomic writer caught mid-write
+    assert svc.get_app("CMO_Agent") == {"port": 5020}
+    assert get_registry_service(path) is get_registry_service(path)
+
+
+def test_update_is_atomic_and_notifies(tmp_path):
+    path = str(tmp_path / "registry.json")
+    svc = RegistryService(path)
+    assert svc.get_app("Counter") is None
+    events = []
+    unsubscribe = svc.subscribe(lambda data, changed: events.append(changed))
+
+    threads = [threading.Thread(target=_bump_many, args=(path, 20)) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for _ in range(20):
+        svc.update(_bump)
+    for t in threads:
+        t.join()
+
+    assert svc.get_app("Counter") == {"n": 60}
+    assert json.load(open(path, encoding="utf-8"))["services"] == {}
+    assert len(events) >= 20 and all(e == {"Counter"} for e in events)
+    assert [p for p in os.listdir(tmp_path) if p.endswith(".tmp")] == []
+
+    seen = len(events)
+    unsubscribe()
+    assert svc.update(lambda reg: False)["apps"]["Counter"] == {"n": 60}
+    svc.update(_bump)
+    assert len(events) == seen
+
+
+def test_cross_process_writers_do_not_lose_updates(tmp_path):
+    path = str(tmp_path / "registry.json")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_bump_many, args=(path, 25)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+    assert RegistryService(path).get_app("Counter") == {"n": 75}
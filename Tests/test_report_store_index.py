@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from warroom_protocol import ReportStore, WarRoomReport
+
+
+def _report(agent, phase="market", iteration=1, **payload):
+    return WarRoomReport(agent=agent, phase=phase, project_id="P", iteration=iteration,
+                         handoff_payload=payload)
+
+
+def test_latest_and_iteration_lookups_use_the_index(tmp_path):
+    store = ReportStore(base_dir=str(tmp_path))
+    store.save(_report("CMO", iteration=1, v=1))
+    store.save(_report("CTO", phase="technical", iteration=1))
+    # Same second as the first CMO save: the newer row must win.
+    store.save(_report("CMO", phase="drill_defense", iteration=2, v=2))
+
+    assert store.get_latest("P", "CMO", ghost_alert=False).handoff_payload == {"v": 2}
+    assert store.get_latest("P", "CMO", phase="market", ghost_alert=False).handoff_payload == {"v": 1}
+    assert [r.agent for r in store.get_latest_iteration_reports("P", 1)] == ["CMO", "CTO"]
+    assert store.get_latest("P", "CFO", ghost_alert=False) is None
+
+
+def test_cached_reports_are_copies(tmp_path):
+    store = ReportStore(base_dir=str(tmp_path))
+    store.save(_report("CFO", roi=10.0))
+    store.get_latest("P", "CFO", ghost_alert=False).handoff_payload["roi"] = 99.0
+    assert store.get_latest("P", "CFO", ghost_alert=False).handoff_payload == {"roi": 10.0}
+
+
+def test_files_written_outside_the_store_are_backfilled(tmp_path):
+    pdir = tmp_path / "P"
+    pdir.mkdir()
+    (pdir / "CLO_legal_20250101T000000.json").write_text(json.dumps(_report("CLO", "legal").model_dump()))
+    (pdir / "CEO_validation_20250101T000001.json").write_text("{not json")
+
+    store = ReportStore(base_dir=str(tmp_path))
+    assert [r.agent for r in store.get_all_for_project("P")] == ["CLO"]
+
+    os.remove(pdir / "CLO_legal_20250101T000000.json")
+    (pdir / "CPO_product_20250101T000002.json").write_text(json.dumps(_report("CPO", "product").model_dump()))
+    assert [r.agent for r in store.iter_project_reports("P")] == ["CPO"]
+
+    # A second store (e.g. another process) shares the index.
+    assert ReportStore(base_dir=str(tmp_path)).get_latest("P", "CPO", ghost_alert=False).agent == "CPO"
+
+
+def test_corrupt_report_is_retried_once_rewritten(tmp_path):
+    pdir = tmp_path / "P"
+    pdir.mkdir()
+    partial = pdir / "CFO_financial_20250101T000000.json"
+    partial.write_text('{"agent": "CF')   # another tool caught mid-write
+    store = ReportStore(base_dir=str(tmp_path))
+    assert store.get_all_for_project("P") == []
+
+    dir_mtime = os.stat(pdir).st_mtime_ns
+    partial.write_text(json.dumps(_report("CFO", "financial").model_dump()))
+    os.utime(pdir, ns=(dir_mtime, dir_mtime))   # an in-place rewrite leaves the directory alone
+    assert [r.agent for r in store.get_all_for_project("P")] == ["CFO"]
+
+
+def test_clear_project_drops_index_rows(tmp_path):
+    store = ReportStore(base_dir=str(tmp_path))
+    store.save(_report("CMO"))
+    store.clear_project("P")
+    assert store.get_all_for_project("P") == []
+    assert store.get_latest("P", "CMO", ghost_alert=False) is None
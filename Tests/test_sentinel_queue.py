@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sentinel_queue_store
+from sentinel_queue_store import SentinelQueueStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SentinelQueueStore(str(tmp_path / "q.db"))
+    yield s
+    s.close()
+
+
+def test_priority_then_fifo_and_tasks_survive_reopen(tmp_path):
+    db = str(tmp_path / "q.db")
+    s = SentinelQueueStore(db)
+    for name, prio in [("low-1", 0), ("high", 5), ("low-2", 0)]:
+        s.enqueue("node", "review", {"name": name}, priority=prio)
+    s.close()
+
+    s = SentinelQueueStore(db)
+    assert [t["payload"]["name"] for t in s.lease(max_tasks=3)] == ["high", "low-1", "low-2"]
+    assert s.lease() == []
+    s.close()
+
+
+def test_expired_lease_is_redelivered_and_stale_token_rejected(store):
+    task_id = store.enqueue("node", "review", {})
+    first = store.lease(visibility_timeout=0.05)[0]
+    time.sleep(0.1)
+    second = store.lease(visibility_timeout=30)[0]
+
+    assert second["task_id"] == task_id and second["attempts"] == 2
+    assert store.ack(task_id, first["lease_token"]) is False
+    assert store.extend(task_id, second["lease_token"], 60) is True
+    assert store.ack(task_id, second["lease_token"]) is True
+    assert store.stats()["done"] == 1 and store.depth() == 0
+
+
+def test_nack_backs_off_then_dead_letters(store):
+    task_id = store.enqueue("node", "review", {}, max_attempts=2)
+    t = store.lease()[0]
+    assert store.nack(task_id, t["lease_token"], error="boom", delay=0.05) == "ready"
+    assert store.lease() == []  # still backing off
+    time.sleep(0.06)
+    t = store.lease()[0]
+    assert store.nack(task_id, t["lease_token"], error="boom again") == "dead"
+    assert [d["last_error"] for d in store.dead_letters()] == ["boom again"]
+
+    assert store.requeue_dead(task_id)
+    assert store.lease()[0]["attempts"] == 1
+
+
+def test_long_poll_dequeue_wakes_on_enqueue(tmp_path, monkeypatch):
+    import sentinel_queue_daemon
+    monkeypatch.setattr(sentinel_queue_store, "_queue_store", SentinelQueueStore(str(tmp_path / "q.db")))
+
+    async def run():
+        transport = httpx.ASGITransport(app=sentinel_queue_daemon.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://broker/v1/queue") as client:
+            assert (await client.get("/dequeue")).status_code == 404
+            started = time.perf_counter()
+            waiter = asyncio.create_task(client.get("/dequeue", params={"wait": 5}))
+            await asyncio.sleep(0.1)
+            await client.post("/enqueue", json={"source_node": "n", "task_type": "t", "payload": {"x": 1}})
+            res = await waiter
+            waited = time.perf_counter() - started
+            task = res.json()["task"]
+            ack = await client.post("/ack", json={"task_id": task["task_id"], "lease_token": task["lease_token"]})
+            again = await client.post("/ack", json={"task_id": task["task_id"], "lease_token": task["lease_token"]})
+            return res, waited, ack, again
+
+    res, waited, ack, again = asyncio.run(run())
+    assert res.status_code == 200 and res.json()["task"]["payload"] == {"x": 1}
+    assert waited < 1.0
+    assert ack.status_code == 200 and again.status_code == 409
+    sentinel_queue_store._queue_store.close()
+
+
+def test_idle_dequeue_purges_old_acked_tasks(tmp_path, monkeypatch):
+    import sentinel_queue_daemon
+    store = SentinelQueueStore(str(tmp_path / "q.db"))
+    monkeypatch.setattr(sentinel_queue_store, "_queue_store", store)
+    monkeypatch.setattr(sentinel_queue_daemon, "_last_purge", None)
+    for name in ("old", "recent"):
+        store.enqueue("n", "t", {"name": name})
+        task = store.lease()[0]
+        assert store.ack(task["task_id"], task["lease_token"])
+    store._db.execute("UPDATE tasks SET finished_at = ? WHERE json_extract(payload, '$.name') = 'old'",
+                      (time.time() - 2 * sentinel_queue_daemon.DONE_RETENTION_SECONDS,))
+
+    async def run():
+        transport = httpx.ASGITransport(app=sentinel_queue_daemon.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://broker/v1/queue") as client:
+            return (await client.get("/dequeue")).status_code
+
+    assert asyncio.run(run()) == 404
+    assert store.stats()["done"] == 1
+    store.enqueue("n", "t", {"name": "newer"})
+    store._db.execute("UPDATE tasks SET status = 'done', finished_at = 0")
+    assert asyncio.run(run()) == 404   # inside PURGE_INTERVAL_SECONDS: left alone
+    assert store.stats()["done"] == 2
+    store.close()
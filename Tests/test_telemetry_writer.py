@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_modules.telemetry as telemetry
+
+
+@pytest.fixture
+def tdb(tmp_path, monkeypatch):
+    db = str(tmp_path / "maf_telemetry.db")
+    monkeypatch.setattr(telemetry, "DB_PATH", db)
+    monkeypatch.setattr(telemetry, "_writer", None)
+    telemetry.init_db(db)
+    yield db
+    if telemetry._writer is not None:
+        telemetry._writer.close()
+
+
+def test_record_is_buffered_and_rolled_up(tdb):
+    for _ in range(3):
+        telemetry.record_usage("app-a", "gemini-2.5-pro", 1000, 100)
+    telemetry.record_usage("app-b", "claude-haiku-4-5", 10, 0)
+
+    stats = telemetry.get_stats()
+    assert stats["totals"]["calls"] == 4 and stats["totals"]["total_tokens"] == 3310
+    assert stats["by_app"][0] == {"name": "app-a", "input_tokens": 3000, "output_tokens": 300,
+                                  "total_tokens": 3300, "cost_usd": 0.00675, "calls": 3}
+    with sqlite3.connect(tdb) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM token_usage").fetchone()[0] == 4
+        assert conn.execute("SELECT COUNT(*) FROM usage_hourly").fetchone()[0] == 2
+    assert telemetry.writer_stats()["written"] == 4
+
+
+def test_time_windows_read_the_hourly_rollup(tdb):
+    with sqlite3.connect(tdb) as conn:
+        conn.execute("INSERT INTO usage_hourly VALUES ('2020-01-01 10:00:00', 'old', 'm', 5, 5, 10, 1)")
+    telemetry.record_usage("new", "m", 1, 1)
+
+    assert [a["name"] for a in telemetry.get_stats(hours=1)["by_app"]] == ["new"]
+    window = telemetry.get_stats(since="2020-01-01 10:30:00", until="2020-01-01T11:00:00")
+    assert [a["name"] for a in window["by_app"]] == ["old"]
+    assert window["window"] == {"since": "2020-01-01 10:00:00", "until": "2020-01-01 11:00:00"}
+    assert telemetry.get_stats()["totals"]["calls"] == 2
+
+    # A date-only bound is midnight, not a string that sorts after every hour of the day.
+    day = telemetry.get_stats(since="2020-01-01", until="2020-01-02")
+    assert [a["name"] for a in day["by_app"]] == ["old"]
+    assert day["window"]["since"] == "2020-01-01 00:00:00"
+    assert telemetry.get_stats(since="2020-01-01T12:30:00+02:00")["window"]["since"] == "2020-01-01 10:00:00"
+    with pytest.raises(ValueError):
+        telemetry.get_stats(since="yesterday")
+
+
+def test_existing_rows_are_backfilled_into_the_rollup(tmp_path):
+    db = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE token_usage (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "timestamp DATETIME DEFAULT CURRENT_TIMESTAMP, app_id VARCHAR NOT NULL, "
+                     "model_name VARCHAR NOT NULL, input_tokens INTEGER NOT NULL, "
+                     "output_tokens INTEGER NOT NULL, total_tokens INTEGER NOT NULL)")
+        conn.executemany("INSERT INTO token_usage (timestamp, app_id, model_name, input_tokens, output_tokens, "
+                         "total_tokens) VALUES (?, 'a', 'm', 1, 2, 3)",
+                         [("2024-05-01 09:15:00",), ("2024-05-01 09:45:00",), ("2024-05-01 10:05:00",)])
+    telemetry.init_db(db)
+    telemetry.init_db(db)
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT hour, calls, total_tokens FROM usage_hourly ORDER BY hour").fetchall() == [
+            ("2024-05-01 09:00:00", 2, 6), ("2024-05-01 10:00:00", 1, 3)]
+
+
+def test_decorated_async_call_does_not_wait_for_sqlite(tdb):
+    class Usage:
+        input_tokens, output_tokens = 7, 3
+
+    class Resp:
+        usage, model = Usage(), "claude-sonnet-4-6"
+
+    @telemetry.track_operational_cost("deco")
+    async def call():
+        return Resp()
+
+    started = time.perf_counter()
+    asyncio.run(call())
+    assert time.perf_counter() - started < 0.05
+    assert telemetry.get_stats()["by_model"][0]["name"] == "claude-sonnet-4-6"
+
+
+def test_full_buffer_drops_oldest(tmp_path):
+    writer = telemetry.TelemetryWriter(db_path=str(tmp_path / "t.db"), capacity=2)
+    writer._thread = object()  # keep the flusher from starting
+    for n in range(3):
+        writer.submit(("2024-01-01 00:00:00", "a", "m", n, 0, n))
+    assert [row[3] for row in writer._buffer] == [1, 2]
+    assert writer.metrics()["dropped"] == 1
@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from warroom_log_store import WarRoomLogStore, LEGACY_NAME
+
+
+def _opened(topic):
+    return {"type": "dialogue", "agent": "SYSTEM", "message": f'SESSION OPENED — Topic: "{topic}"', "timestamp": topic}
+
+
+def _msg(i):
+    return {"type": "dialogue", "agent": "CEO", "message": f"m{i}"}
+
+
+def test_append_is_buffered_until_read(tmp_path):
+    store = WarRoomLogStore(root_dir=str(tmp_path), flush_interval=60)
+    store.append("P", _msg(0))
+    assert store._pending["P"] == [_msg(0)]
+    assert store.count("P") == 1
+    assert store.tail("P", 5) == [_msg(0)]
+    store.close()
+
+
+def test_read_waits_for_an_in_flight_flush(tmp_path):
+    store = WarRoomLogStore(root_dir=str(tmp_path), flush_interval=60)
+    write_batch, started = store._write_batch, threading.Event()
+
+    def slow_write(project, msgs):
+        if msgs[0] == _msg(0):
+            started.set()
+            time.sleep(0.2)
+        write_batch(project, msgs)
+
+    store._write_batch = slow_write
+    store.append("P", _msg(0))
+    flusher = threading.Thread(target=store.flush)
+    flusher.start()
+    started.wait(5)
+    store.append("P", _msg(1))
+    # The older batch is written first, and the read sees both messages.
+    assert store.read_messages("P") == [_msg(0), _msg(1)]
+    flusher.join()
+    store.close()
+
+
+def test_sessions_are_paged_newest_first(tmp_path):
+    store = WarRoomLogStore(root_dir=str(tmp_path))
+    store.append("P", _msg("pre"))
+    for topic in ("a", "b", "c"):
+        store.append("P", _opened(topic))
+        store.append("P", _msg(topic))
+    sessions, total = store.read_sessions("P", offset=0, limit=2)
+    assert total == 4
+    assert [s["topic"] for s in sessions] == ["c", "b"]
+    assert sessions[0]["messages"] == [_opened("c"), _msg("c")]
+    sessions, _ = store.read_sessions("P", offset=3, limit=2)
+    assert sessions[0]["topic"] == "Unknown"
+    store.close()
+
+
+def test_compaction_keeps_newest_and_index_survives_reopen(tmp_path):
+    store = WarRoomLogStore(root_dir=str(tmp_path), max_messages=10, compact_factor=2)
+    for i in range(25):
+        store.append("P", _msg(i))
+    store.flush()
+    assert store.count("P") <= 20
+    assert store.tail("P", 1) == [_msg(24)]
+    store.close()
+
+    reopened = WarRoomLogStore(root_dir=str(tmp_path))
+    msgs = reopened.read_messages("P")
+    assert msgs[-1] == _msg(24)
+    assert len(msgs) == reopened.count("P")
+
+
+def test_torn_index_is_rebuilt(tmp_path):
+    store = WarRoomLogStore(root_dir=str(tmp_path))
+    for i in range(5):
+        store.append("P", _msg(i))
+    store.close()
+    with open(tmp_path / "P" / "warroom_history.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(_msg(5)) + "\n")
+
+    reopened = WarRoomLogStore(root_dir=str(tmp_path))
+    assert reopened.count("P") == 6
+    assert reopened.read_messages("P", 4, 6) == [_msg(4), _msg(5)]
+
+
+def test_legacy_snapshot_is_imported_once(tmp_path):
+    pdir = tmp_path / "P"
+    pdir.mkdir()
+    (pdir / LEGACY_NAME).write_text(json.dumps({"messages": [_opened("x"), _msg(1)]}), encoding="utf-8")
+    store = WarRoomLogStore(root_dir=str(tmp_path))
+    sessions, total = store.read_sessions("P")
+    assert total == 1 and sessions[0]["topic"] == "x"
+    assert not (pdir / LEGACY_NAME).exists()
+    store.clear("P")
+    assert store.count("P") == 0
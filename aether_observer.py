@@ -307,6 +307,7 @@ def _start_file_watcher():
 
         while True:
             try:
+                new_docs = {}   # source_app -> [paths], parsed as one batch per app
                 # Walk all project subdirectories
                 for dirpath, dirnames, filenames in os.walk(_WATCH_ROOT):
                     # Skip hidden dirs, node_modules, __pycache__, .git
@@ -327,16 +328,20 @@ def _start_file_watcher():
 
                         print(f"[{timestamp()}] 📄 FileWatcher: New document detected → {fname} ({source_app})")
                         log_event({"event": "file_detected", "file": fname, "source_app": source_app})
+                        new_docs.setdefault(source_app, []).append(full)
 
-                        result = parser.parse(full, source_app=source_app)
+                for source_app, paths in new_docs.items():
+                    batch = parser.parse_many(paths, source_app=source_app)
+                    for result in batch["results"]:
                         if result.get("status") == "parsed":
                             result = router.route(result)
                             parser.log_to_master_index(result)
-                            print(f"[{timestamp()}]    ✅ Parsed → {result['category']} → {result['routing'].get('destination', 'index')}")
+                            print(f"[{timestamp()}]    ✅ Parsed {result['file_name']} → {result['category']} → {result['routing'].get('destination', 'index')}")
                         elif result.get("status") == "skipped":
-                            pass  # Already parsed (dedup)
+                            pass  # Already parsed (dedup, persists across restarts)
                         else:
                             print(f"[{timestamp()}]    ⚠️ Parse issue: {result.get('error', 'unknown')}")
+                    log_event({"event": "batch_parsed", "source_app": source_app, **batch["stats"]})
 
             except Exception as e:
                 print(f"[{timestamp()}] [FileWatcher ERROR] {e}")
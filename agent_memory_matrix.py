@@ -1,55 +1,242 @@
 import os
 import sys
+import copy
+import time
+import atexit
+import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
-# =====================================================================
-# Pydantic v1 Python 3.14 Compatibility Hotfix
-# Ensures chromadb can be imported without type inference ConfigErrors
-# =====================================================================
-try:
-    import pydantic.v1.fields as pydantic_fields
-    from typing import Any
-    old_infer = pydantic_fields.ModelField.infer
-    def new_infer(*args, **kwargs):
+logger = logging.getLogger("MemoryMatrix")
+
+_chromadb = None
+_chromadb_lock = threading.Lock()
+
+
+def _import_chromadb():
+    """Import chromadb once per process, applying the pydantic hotfix first."""
+    global _chromadb
+    with _chromadb_lock:
+        if _chromadb is not None:
+            return _chromadb
+
+        # =====================================================================
+        # Pydantic v1 Python 3.14 Compatibility Hotfix
+        # Ensures chromadb can be imported without type inference ConfigErrors
+        # =====================================================================
         try:
-            return old_infer(*args, **kwargs)
-        except Exception as e:
-            # Fall back to Any annotation if Pydantic v1 fails to infer the type
-            kwargs['annotation'] = Any
-            try:
-                return old_infer(*args, **kwargs)
-            except Exception:
-                raise e
-    pydantic_fields.ModelField.infer = new_infer
-except Exception:
-    pass
+            import pydantic.v1.fields as pydantic_fields
+            from typing import Any
+            old_infer = pydantic_fields.ModelField.infer
+            def new_infer(*args, **kwargs):
+                try:
+                    return old_infer(*args, **kwargs)
+                except Exception as e:
+                    # Fall back to Any annotation if Pydantic v1 fails to infer the type
+                    kwargs['annotation'] = Any
+                    try:
+                        return old_infer(*args, **kwargs)
+                    except Exception:
+                        raise e
+            pydantic_fields.ModelField.infer = new_infer
+        except Exception:
+            pass
+
+        import chromadb
+        _chromadb = chromadb
+        return chromadb
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
 
-import chromadb
-from chromadb.config import Settings
 
 class VectorMemoryMatrix:
-    def __init__(self):
-        # Strict local persistent storage. 
+    """Chroma-backed semantic memory for War Room strategies.
+
+    Use get_memory_matrix() — the client is expensive to start, so one
+    instance is shared per process. Writes are queued and flushed to the
+    collection in batches by a background thread; recall goes through a
+    small TTL cache keyed on the normalized query. Any pending writes are
+    flushed before a query so a session always recalls what it just locked.
+    """
+
+    def __init__(self, db_path: str = None, cache_ttl: float = 300.0, cache_size: int = 128,
+                 batch_size: int = 64, flush_interval: float = 0.5):
+        started = time.perf_counter()
+        chromadb = _import_chromadb()
+        # Strict local persistent storage.
         # Physical disk mutation confined to the secure vault directory.
-        db_path = Path(__file__).parent / "vault" / "vector_store"
-        self.client = chromadb.PersistentClient(path=str(db_path))
-        
+        db_path = db_path or str(Path(__file__).parent / "vault" / "vector_store")
+        self.client = chromadb.PersistentClient(path=db_path)
+
         # Enforce exact collection schema
         self.collection = self.client.get_or_create_collection(
             name="architect_memory",
             metadata={"hnsw:space": "cosine"}
         )
 
-    def lock_memory(self, session_id: str, payload: str, metadata: dict):
-        self.collection.add(
-            documents=[payload],
-            metadatas=[metadata],
-            ids=[f"{session_id}_{os.urandom(4).hex()}"]
-        )
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (expires_at, result)
+        self._cache_lock = threading.Lock()
+        self._generation = 0                     # bumped by every batch write
+
+        self._pending: list = []                 # (id, document, metadata)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._flusher = None
+        self._closed = False
+
+        self._metrics = {
+            "init_ms": (time.perf_counter() - started) * 1000,
+            "queries": 0, "cache_hits": 0, "query_ms_total": 0.0,
+            "writes": 0, "flushes": 0, "flush_ms_total": 0.0, "write_errors": 0,
+        }
+
+    # ── Writes ─────────────────────────────────────────────────────
+
+    def lock_memory(self, session_id: str, payload: str, metadata: dict) -> str:
+        """Queue one memory for the next batch flush. Returns its id."""
+        return self.lock_memories([(session_id, payload, metadata)])[0]
+
+    def lock_memories(self, entries) -> list:
+        """Queue (session_id, payload, metadata) tuples; returns their ids."""
+        items = [(f"{session_id}_{os.urandom(4).hex()}", payload, metadata)
+                 for session_id, payload, metadata in entries]
+        if not items:
+            return []
+        with self._cond:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="memory-matrix-flush",
+                                                 daemon=True)
+                self._flusher.start()
+            self._pending.extend(items)
+            self._cond.notify_all()
+        return [item[0] for item in items]
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Give concurrent writers a moment to join the batch,
+                # unless someone is blocked in flush().
+                if len(self._pending) < self.batch_size and not (self._closed or self._flush_waiters):
+                    self._cond.wait(self.flush_interval)
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                self._in_flight += len(batch)
+            self._write_batch(batch)
+            with self._cond:
+                self._in_flight -= len(batch)
+                self._cond.notify_all()
+
+    def _write_batch(self, batch: list):
+        started = time.perf_counter()
+        try:
+            self.collection.add(
+                ids=[item[0] for item in batch],
+                documents=[item[1] for item in batch],
+                metadatas=[item[2] for item in batch],
+            )
+            self._metrics["writes"] += len(batch)
+        except Exception as e:
+            self._metrics["write_errors"] += len(batch)
+            logger.error(f"[Memory Matrix] Batch write of {len(batch)} memories failed: {e}")
+        finally:
+            self._metrics["flushes"] += 1
+            self._metrics["flush_ms_total"] += (time.perf_counter() - started) * 1000
+            # New memories change what a query should return.
+            with self._cache_lock:
+                self._generation += 1
+                self._cache.clear()
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Block until every queued memory is written. False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self):
+        """Flush queued memories and stop the background writer."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ── Reads ──────────────────────────────────────────────────────
 
     def retrieve_context(self, query: str, n_results: int = 3):
         # Similarity search executed strictly before codebase generation
-        return self.collection.query(
+        started = time.perf_counter()
+        if self._pending or self._in_flight:
+            self.flush()  # read-your-writes; also invalidates the cache
+        key = (_normalize_query(query), n_results)
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit and hit[0] > now:
+                self._cache.move_to_end(key)
+                self._metrics["queries"] += 1
+                self._metrics["cache_hits"] += 1
+                self._metrics["query_ms_total"] += (time.perf_counter() - started) * 1000
+                return copy.deepcopy(hit[1])
+            generation = self._generation
+
+        result = self.collection.query(
             query_texts=[query],
             n_results=n_results
         )
+        with self._cache_lock:
+            # A batch written while the query ran may not be in the result: don't cache it.
+            if self._generation == generation:
+                self._cache[key] = (now + self.cache_ttl, result)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        self._metrics["queries"] += 1
+        self._metrics["query_ms_total"] += (time.perf_counter() - started) * 1000
+        return copy.deepcopy(result)
+
+    def metrics(self) -> dict:
+        """Timing and cache counters for telemetry."""
+        m = dict(self._metrics)
+        m["avg_query_ms"] = round(m["query_ms_total"] / m["queries"], 3) if m["queries"] else 0.0
+        m["avg_flush_ms"] = round(m["flush_ms_total"] / m["flushes"], 3) if m["flushes"] else 0.0
+        m["cache_hit_rate"] = round(m["cache_hits"] / m["queries"], 3) if m["queries"] else 0.0
+        with self._cond:
+            m["pending_writes"] = len(self._pending) + self._in_flight
+        return m
+
+
+_memory_matrix = None
+_memory_matrix_lock = threading.Lock()
+
+
+def get_memory_matrix() -> VectorMemoryMatrix:
+    """Get or create the process-wide VectorMemoryMatrix."""
+    global _memory_matrix
+    if _memory_matrix is None:
+        with _memory_matrix_lock:
+            if _memory_matrix is None:
+                _memory_matrix = VectorMemoryMatrix()
+                atexit.register(_memory_matrix.close)
+                logger.info(f"[Memory Matrix] Client ready in {_memory_matrix.metrics()['init_ms']:.0f}ms")
+    return _memory_matrix
@@ -10,6 +10,11 @@ import json
 import logging
 import re
 
+# Per-import timing when FACTORY_PROFILE_STARTUP=1 (see shared_modules/startup_profiler.py).
+from shared_modules.startup_profiler import get_startup_profiler
+_startup_profiler = get_startup_profiler()
+_startup_profiler.install_import_hook(__name__)
+
 # Ensure telemetry directory exists
 log_dir = "/var/log/aether_net"
 os.makedirs(log_dir, exist_ok=True)
@@ -52,7 +57,7 @@ from wisdom_vault import get_wisdom_vault
 
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, UploadFile, File, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse, Response
 from pydantic import BaseModel
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
@@ -85,19 +90,27 @@ async def lifespan(app: FastAPI):
     # load, the verifier stays unregistered and EVERY build session refuses (D2).
     # The seal is the differential behavior watched after boot (build refuses
     # without a Selection, passes with one) — this log line is present-not-wired.
-    try:
-        import sys as _s, os as _o
-        _s.path.insert(0, _o.path.join(_o.path.dirname(__file__), "claude-mcp-bridge"))
-        from panel import selection as _sel                      # import registers the verifier
-        from shared_modules import build_guard as _bg
-        logger.warning(f"[ClaudeAY] sanctioned-build choke ARMED="
-                       f"{_bg._selection_verifier is not None} (verifier live at boot)")
-    except Exception as _e:
-        logger.critical(f"[ClaudeAY] choke NOT armed at boot ({_e}) — builds refuse (D2 fail-closed)")
-    await start_memory_engine()
-    # Phase 1: Eradicate zombie OCR/processing tasks orphaned by prior engine crash
-    sweep_zombie_jobs()
+    with _startup_profiler.section("ClaudeAY build choke"):
+        try:
+            import sys as _s, os as _o
+            _s.path.insert(0, _o.path.join(_o.path.dirname(__file__), "claude-mcp-bridge"))
+            from panel import selection as _sel                      # import registers the verifier
+            from shared_modules import build_guard as _bg
+            logger.warning(f"[ClaudeAY] sanctioned-build choke ARMED="
+                           f"{_bg._selection_verifier is not None} (verifier live at boot)")
+        except Exception as _e:
+            logger.critical(f"[ClaudeAY] choke NOT armed at boot ({_e}) — builds refuse (D2 fail-closed)")
+    await _startup_profiler.run("memory engine", start_memory_engine)
+    # Heavy routers mount on first request; warm them in the background once the hub is serving.
+    warmup = None
+    if LAZY_WARMUP_SECONDS >= 0:
+        warmup = asyncio.create_task(warm_lazy_routers(app, delay=LAZY_WARMUP_SECONDS))
+    _startup_profiler.finish()
     yield
+    if warmup is not None:
+        warmup.cancel()
+    close_document_parser()
+    close_incoming_watcher()
     await stop_memory_engine()
 
 from llm_router import router as builder_router
@@ -105,35 +118,44 @@ from api_qa_telemetry import qa_router
 from api_atomizer_bridge import atomizer_router
 from api_phantom_qa import qa_router as engine_qa_router
 from api_venture_architect import venture_router
-from api_playwright_bridge import playwright_router
 from api_qa_orchestrator import orchestrator_router
-from api_alpha_genesis import router as alpha_router, sweep_zombie_jobs
 from agents.cio_agent import router as cio_agent_router
 from agents.warroom_agent import router as warroom_agent_router
 from api_projects import projects_router
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "backend")))
 
 from backend.app.routers.inventory_router import router as inventory_router
-from backend.app.routers.cio_router import router as backend_cio_router
-from backend.app.routers.vector_router import router as vector_router
+from shared_modules.lazy_router import LazyRouter, warm_up as warm_lazy_routers, lazy_routers
 from pydantic import BaseModel as _CostBaseModel
+from typing import Optional
 import shared_modules.telemetry as _telemetry
 
+# Seconds after startup before lazy routers are loaded in the background; negative = first request only.
+LAZY_WARMUP_SECONDS = float(os.getenv("FACTORY_LAZY_WARMUP_SECONDS", "5"))
+
+
+def _sweep_alpha_zombies(module):
+    # Phase 1: Eradicate zombie OCR/processing tasks orphaned by prior engine crash
+    module.sweep_zombie_jobs()
+
+
 app = FastAPI(title="Antigravity Meta App Factory API", version="3.0", lifespan=lifespan)
+# Heavy subsystems are LazyRouters: they keep their place in the route order but import on
+# first request or warmup (Chroma VectorStore for CIO/vector, Playwright bridge, Alpha Genesis DB).
 app.include_router(builder_router, prefix="/api/v1")
 app.include_router(qa_router)
 app.include_router(atomizer_router)
 app.include_router(engine_qa_router)
 app.include_router(venture_router)
-app.include_router(playwright_router)
+LazyRouter(app, "/api/v1/playwright", "api_playwright_bridge", "playwright_router")
 app.include_router(orchestrator_router)
-app.include_router(alpha_router)
+LazyRouter(app, "/api/v2/alpha", "api_alpha_genesis", on_load=_sweep_alpha_zombies)
 app.include_router(cio_agent_router)
 app.include_router(warroom_agent_router)
 app.include_router(inventory_router)
 app.include_router(projects_router)
-app.include_router(backend_cio_router)
-app.include_router(vector_router)
+LazyRouter(app, "/api/cio", "backend.app.routers.cio_router")
+LazyRouter(app, "/api/vector", "backend.app.routers.vector_router")
 
 
 # ── CORS ──────────────────────────────────────────────────────
@@ -162,11 +184,34 @@ def telemetry_record(rec: _TelemetryRecord):
 
 
 @app.get("/api/telemetry/stats")
-def telemetry_stats():
-    return _telemetry.get_stats()
+def telemetry_stats(hours: Optional[float] = None, since: Optional[str] = None, until: Optional[str] = None):
+    try:
+        stats = _telemetry.get_stats(hours=hours, since=since, until=until)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    stats["writer"] = _telemetry.writer_stats()
+    try:
+        from prompt_cache import get_prompt_cache
+        stats["llm_cache"] = get_prompt_cache().stats()
+    except Exception as e:
+        stats["llm_cache"] = {"error": str(e)}
+    return stats
+
+
+@app.get("/api/startup/profile")
+def startup_profile():
+    """Cold-start timings (imports only with FACTORY_PROFILE_STARTUP=1) and lazy router status."""
+    report = _startup_profiler.report()
+    report["lazy_routers"] = [r.status() for r in lazy_routers(app)]
+    return report
 
 REGISTRY_PATH = os.path.join(SCRIPT_DIR, "registry.json")
 
+# All registry.json access in this process goes through one cached, lock-serialized service.
+import time as _time
+from registry_service import get_registry_service
+_registry = get_registry_service(REGISTRY_PATH)
+
 # ── Load .env so GEMINI_API_KEY and all secrets are available to every thread ──
 try:
     from dotenv import load_dotenv as _load_dotenv
@@ -183,28 +228,22 @@ except ImportError:
 def _update_registry(app_name: str, blueprint: str, description: str = ""):
     """Write a new app entry to registry.json after a successful build."""
     from datetime import datetime, timezone
-    try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = {"services": {}, "apps": {}, "last_updated": ""}
-
-    if "apps" not in data:
-        data["apps"] = {}
-
-    now = datetime.now(timezone.utc).isoformat()
-    data["apps"][app_name] = {
-        "status": "scaffolding",
-        "type": description or "App",
-        "port": None,
-        "blueprint": blueprint,
-        "capabilities": [],
-        "last_build": now,
-    }
-    data["last_updated"] = now
 
-    with open(REGISTRY_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    def _add(data):
+        if "apps" not in data:
+            data["apps"] = {}
+        now = datetime.now(timezone.utc).isoformat()
+        data["apps"][app_name] = {
+            "status": "scaffolding",
+            "type": description or "App",
+            "port": None,
+            "blueprint": blueprint,
+            "capabilities": [],
+            "last_build": now,
+        }
+        data["last_updated"] = now
+
+    _registry.update(_add)
     logger.info(f"Registry updated: '{app_name}' added to {REGISTRY_PATH}")
 
 # ── Stream Bridge Import ──────────────────────────────────────
@@ -271,9 +310,7 @@ except ImportError as e:
 async def get_registry_raw():
     """Serve the central architecture SSoT (registry.json) as-is for downstream agents."""
     try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data
+        return _registry.snapshot()
     except Exception as e:
         logger.error(f"Failed to read registry: {e}")
         return JSONResponse(status_code=500, content={"error": f"Failed to load registry: {str(e)}"})
@@ -943,48 +980,60 @@ def agent_status():
     return agents
 
 
+# Ghost-node purge (os.path.exists per app) runs at most this often; in between,
+# /api/registry is answered from the cached listing while the file is unchanged.
+REGISTRY_PRUNE_SECONDS = float(os.getenv("REGISTRY_PRUNE_SECONDS", "30"))
+_registry_listing = {"version": None, "checked_at": 0.0, "apps": []}
+
+
+def _registry_app_path(name: str, info: dict) -> str:
+    rel_path = info.get("path")
+    if rel_path:
+        return os.path.abspath(os.path.join(SCRIPT_DIR, rel_path.lstrip("/\\")))
+    return os.path.join(SCRIPT_DIR, name)
+
+
+def _purge_ghost_apps(data: dict):
+    """registry.update() mutator: drop apps whose directory no longer exists (OS Synchronization Gate)."""
+    ghosts = [name for name, info in data.get("apps", {}).items()
+              if isinstance(info, dict) and not os.path.exists(_registry_app_path(name, info))]
+    for name in ghosts:
+        logger.warning(f"[AUTO-PURGE] Eradicating ghost node from registry: {name}")
+        del data["apps"][name]
+    return bool(ghosts)
+
+
+def _invalidate_registry_listing(_data, changed):
+    _registry_listing["version"] = None
+
+
+_registry.subscribe(_invalidate_registry_listing)
+
+
 @app.get("/api/registry")
-def get_registry():
+def get_registry(request: Request = None):
     """Return the list of registered apps."""
     try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8-sig") as f:
-            data = json.load(f)
-
-        dirty = False
-        apps = []
-        valid_apps = {}
-        for name, info in data.get("apps", {}).items():
-            if not isinstance(info, dict):
-                continue
-                
-            # OS Synchronization Gate
-            rel_path = info.get("path")
-            if rel_path:
-                app_path = os.path.abspath(os.path.join(SCRIPT_DIR, rel_path.lstrip("/\\")))
-            else:
-                app_path = os.path.join(SCRIPT_DIR, name)
-                
-            if not os.path.exists(app_path):
-                logger.warning(f"[AUTO-PURGE] Eradicating ghost node from registry: {name}")
-                dirty = True
-                continue
-                
-            valid_apps[name] = info
-            apps.append({
+        listing = _registry_listing
+        if listing["version"] != f'"{_registry.version}"' or _time.monotonic() - listing["checked_at"] > REGISTRY_PRUNE_SECONDS:
+            data = _registry.snapshot()
+            if any(isinstance(info, dict) and not os.path.exists(_registry_app_path(name, info))
+                   for name, info in data.get("apps", {}).items()):
+                data = _registry.update(_purge_ghost_apps)
+            apps = [{
                 "name": name,
                 "status": info.get("status", "unknown"),
                 "type": info.get("type", "App"),
                 "port": info.get("port"),
                 "path": info.get("path", ""),
                 "form_url": info.get("form_url"),
-            })
-            
-        if dirty:
-            data["apps"] = valid_apps
-            with open(REGISTRY_PATH, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
+            } for name, info in data.get("apps", {}).items() if isinstance(info, dict)]
+            listing = {"version": f'"{_registry.version}"', "checked_at": _time.monotonic(), "apps": apps}
+            _registry_listing.update(listing)
 
-        return {"apps": apps}
+        if request is not None and request.headers.get("if-none-match") == listing["version"]:
+            return Response(status_code=304, headers={"ETag": listing["version"]})
+        return JSONResponse({"apps": listing["apps"]}, headers={"ETag": listing["version"]})
     except Exception as e:
         logger.error(f"Registry read failed: {e}")
         return JSONResponse({"error": f"Registry unavailable: {e}", "apps": []}, status_code=500)
@@ -1121,20 +1170,59 @@ async def upload_document(file: UploadFile = File(...)):
     if not PARSER_AVAILABLE:
         return JSONResponse({"error": "DocumentParserService not available."}, status_code=503)
 
+    batch = await _parse_and_route_uploads([file])
+    return batch["results"][0]
+
+
+@app.post("/api/documents/upload/batch")
+async def upload_documents_batch(files: list[UploadFile] = File(...)):
+    """Parse many uploaded documents in one pipeline run; returns per-file results and stage timings."""
+    if not PARSER_AVAILABLE:
+        return JSONResponse({"error": "DocumentParserService not available."}, status_code=503)
+    return await _parse_and_route_uploads(files)
+
+
+async def _parse_and_route_uploads(files: list) -> dict:
+    # Extraction runs in the parser's process pool and routing/logging on threads,
+    # so the event loop is never blocked on a document.
+    import asyncio
     upload_dir = os.path.join(SCRIPT_DIR, "uploads")
     os.makedirs(upload_dir, exist_ok=True)
-    dest = os.path.join(upload_dir, file.filename)
 
-    content = await file.read()
+    paths = []
+    for file in files:
+        name = os.path.basename(file.filename)
+        dest = os.path.join(upload_dir, name)
+        stem, ext = os.path.splitext(name)
+        n = 1
+        while dest in paths:   # same basename twice in one batch: keep both files
+            n += 1
+            dest = os.path.join(upload_dir, f"{stem} ({n}){ext}")
+        content = await file.read()
+        await asyncio.to_thread(_write_upload, dest, content)
+        paths.append(dest)
+
+    batch = await _doc_parser.parse_many_async(paths, source_app="Meta_App_Factory")
+
+    async def route(result):
+        if result.get("status") != "parsed":
+            return result
+        return await asyncio.to_thread(_doc_router.route, result)
+
+    batch["results"] = list(await asyncio.gather(*(route(r) for r in batch["results"])))
+    await asyncio.to_thread(lambda: [_doc_parser.log_to_master_index(r) for r in batch["results"]])
+    return batch
+
+
+def _write_upload(dest: str, content: bytes):
     with open(dest, "wb") as f:
         f.write(content)
 
-    result = _doc_parser.parse(dest, source_app="Meta_App_Factory")
-    if result.get("status") == "parsed":
-        result = _doc_router.route(result)
-        _doc_parser.log_to_master_index(result)
 
-    return result
+def close_document_parser():
+    """Called from the lifespan on shutdown: stops the extraction pool and closes the parse cache."""
+    if PARSER_AVAILABLE:
+        _doc_parser.close()
 
 
 ORCHESTRATION_STATE = "healthy"
@@ -1868,13 +1956,11 @@ async def war_room_dispatch(req: WarRoomDispatchRequest, request: Request):
                     description = f"Autonomous Forge Deployment — QA-validated and deployed {_dt.now().strftime('%Y-%m-%d %H:%M')}",
                 )
                 # Upgrade status from "scaffolding" → "active"
-                with open(REGISTRY_PATH, "r", encoding="utf-8") as _rf:
-                    _reg = json.load(_rf)
-                _reg["apps"][app_name]["status"] = "active"
-                _reg["apps"][app_name]["deployed_by"] = "Autonomous_Forge_Phase11"
-                _reg["apps"][app_name]["staging_source"] = staging_fname
-                with open(REGISTRY_PATH, "w", encoding="utf-8") as _wf:
-                    json.dump(_reg, _wf, indent=4)
+                def _activate(_reg):
+                    _reg["apps"][app_name]["status"] = "active"
+                    _reg["apps"][app_name]["deployed_by"] = "Autonomous_Forge_Phase11"
+                    _reg["apps"][app_name]["staging_source"] = staging_fname
+                _registry.update(_activate)
                 logger.info(f"[DEPLOY] '{app_name}' registered as active in registry.json")
                 registry_status = "✅ Registered in `registry.json`"
             except Exception as reg_err:
@@ -3706,14 +3792,9 @@ def _do_launch(app_name: str, port_override: int = None) -> dict:
         os.path.join(SCRIPT_DIR, "agents", app_name)
     ])
     
-    try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            reg_data = json.load(f)
-        app_info = reg_data.get("apps", {}).get(app_name, {})
-        if app_info.get("path"):
-            candidates.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, app_info["path"])))
-    except Exception:
-        pass
+    app_info = _registry.get_app(app_name) or {}
+    if app_info.get("path"):
+        candidates.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, app_info["path"])))
 
     app_dir = None
     for candidate in candidates:
@@ -3745,9 +3826,7 @@ def _do_launch(app_name: str, port_override: int = None) -> dict:
     else:
         assigned_port = 5010
         try:
-            with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-                reg_data = json.load(f)
-            app_info = reg_data.get("apps", {}).get(app_name, {})
+            app_info = _registry.get_app(app_name) or {}
             if app_info.get("port"):
                 assigned_port = int(app_info["port"])
         except Exception:
@@ -3931,15 +4010,16 @@ def _watchdog_loop():
             logger.error(f"Watchdog error: {e}")
 
 # Start watchdog thread on module load
-_watchdog_thread = _threading.Thread(target=_watchdog_loop, daemon=True, name="app-watchdog")
-_watchdog_thread.start()
+with _startup_profiler.section("watchdogs"):
+    _watchdog_thread = _threading.Thread(target=_watchdog_loop, daemon=True, name="app-watchdog")
+    _watchdog_thread.start()
 
-# Start Aether Native Watchdog (Phase 7)
-try:
-    from native_watchdog import get_native_watchdog
-    get_native_watchdog().start_background_loop()
-except Exception as e:
-    logger.error(f"Failed to start Aether Native Watchdog: {e}")
+    # Start Aether Native Watchdog (Phase 7)
+    try:
+        from native_watchdog import get_native_watchdog
+        get_native_watchdog().start_background_loop()
+    except Exception as e:
+        logger.error(f"Failed to start Aether Native Watchdog: {e}")
 logger.info("🐕 App Watchdog started (30s interval, auto-restart with 5min cooldown)")
 
 
@@ -3948,8 +4028,7 @@ async def get_running_apps():
     """Return list of currently running apps with health status."""
     # ── Dynamic Port Scan & Auto-Adoption ──
     try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            reg_data = json.load(f)
+        reg_data = _registry.snapshot()
         
         ports_to_check = {}
         for app_name, app_info in reg_data.get("apps", {}).items():
@@ -4047,38 +4126,20 @@ _persuasion_score: int = 5  # 1-10 Critic agreement
 _session_active: bool = False
 
 # UPGRADE 2: War Room Persistence (Per-Project)
-def _get_history_path(project: str):
-    pdir = os.path.join(SCRIPT_DIR, "projects", project)
-    os.makedirs(pdir, exist_ok=True)
-    return os.path.join(pdir, "warroom_history.json")
+# Append-only segment log — see warroom_log_store.py
+from warroom_log_store import get_warroom_log_store
+_warroom_log_store = get_warroom_log_store()
 
 def _load_warroom_history(project: str):
-    """Load War Room history from disk on startup."""
+    """Load the newest War Room messages from the project's log on connect."""
     if project not in _warroom_logs: _warroom_logs[project] = []
-    path = _get_history_path(project)
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            _warroom_logs[project] = data.get("messages", [])[-200:]
+        if _warroom_log_store.exists(project):
+            _warroom_logs[project] = _warroom_log_store.tail(project, 200)
             logger.info(f"War Room: loaded {len(_warroom_logs[project])} messages for {project}")
     except Exception as e:
         logger.warning(f"War Room history load failed for {project}: {e}")
 
-def _save_warroom_history(project: str):
-    """Persist War Room messages to disk."""
-    path = _get_history_path(project)
-    try:
-        data = {
-            "last_updated": _dt.now().isoformat(),
-            "message_count": len(_warroom_logs.get(project, [])),
-            "messages": _warroom_logs.get(project, [])[-500:],  # Keep last 500
-        }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, default=str)
-    except Exception as e:
-        logger.warning(f"War Room history save failed for {project}: {e}")
-
 # Agent personas for the boardroom
 _AGENTS = {
     "CEO": {"icon": "👔", "color": "#3b82f6", "role": "Chief Executive Officer"},
@@ -4267,8 +4328,8 @@ async def _broadcast(msg: dict, project: str = "Aether"):
     # Keep last 200 in memory
     if len(_warroom_logs[project]) > 200:
         _warroom_logs[project].pop(0)
-    # Persist to disk (Upgrade 2)
-    _save_warroom_history(project)
+    # Persist to disk (Upgrade 2) — queued, flushed in batches off the event loop
+    _warroom_log_store.append(project, msg)
     
     dead = []
     for ws in _warroom_clients.get(project, []):
@@ -5607,7 +5668,7 @@ def api_build_context(project_name: str = None):
     return {"context": context, "project": project_name}
 
 try:
-    from incoming_watcher import audit_incoming, watch_incoming
+    from incoming_watcher import audit_incoming, watch_incoming, get_incoming_watcher
     _watcher_available = True
     logger.info("Incoming Watcher loaded.")
 except ImportError:
@@ -5620,7 +5681,6 @@ try:
 except ImportError:
     _archiver_available = False
 
-_watcher_thread = None
 
 
 @app.post("/api/incoming/scan")
@@ -5628,21 +5688,35 @@ async def incoming_scan():
     """One-shot scan of projects/*/incoming/ directories."""
     if not _watcher_available:
         return JSONResponse({"error": "incoming_watcher.py not found"}, status_code=500)
-    results = audit_incoming()
+    # Seeding posts back to this server, so keep the event loop free while it runs.
+    results = await asyncio.to_thread(audit_incoming)
     return {"status": "ok", "files_detected": len(results), "results": results}
 
 
 @app.post("/api/incoming/watch")
 async def incoming_watch_start():
     """Start the background incoming file watcher."""
-    global _watcher_thread
     if not _watcher_available:
         return JSONResponse({"error": "incoming_watcher.py not found"}, status_code=500)
-    if _watcher_thread and _watcher_thread.is_alive():
-        return {"status": "already_running"}
-    _watcher_thread = threading.Thread(target=watch_incoming, args=(30,), daemon=True)
-    _watcher_thread.start()
-    return {"status": "watcher_started", "interval": 30}
+    watcher = get_incoming_watcher()
+    if watcher.status()["running"]:
+        return {"status": "already_running", **watcher.status()}
+    await asyncio.to_thread(watch_incoming)
+    return {"status": "watcher_started", **watcher.status()}
+
+
+@app.get("/api/incoming/status")
+async def incoming_status():
+    """Watcher mode (events/polling), files still settling and the size of the seen-file index."""
+    if not _watcher_available:
+        return JSONResponse({"error": "incoming_watcher.py not found"}, status_code=500)
+    return get_incoming_watcher().status()
+
+
+def close_incoming_watcher():
+    """Called from the lifespan on shutdown: stops the watcher thread, the seed pool and the index."""
+    if _watcher_available:
+        get_incoming_watcher().close()
 
 
 @app.post("/api/n8n/archive")
@@ -6060,41 +6134,12 @@ def phantom_report(filename: str):
 def warroom_history(project: str = "Aether", limit: int = 50, offset: int = 0):
     """Return full War Room debate history from disk for a specific project with strict pagination."""
     try:
-        path = _get_history_path(project)
-        sessions = []
-        total = 0
-        last_updated = None
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            messages = data.get("messages", [])
-            last_updated = data.get("last_updated")
-            # Group messages into sessions by SYSTEM "SESSION OPENED" markers
-            current_session = {"topic": "Unknown", "started": None, "messages": []}
-            for msg in messages:
-                if msg.get("type") == "dialogue" and msg.get("agent") == "SYSTEM" and "SESSION OPENED" in msg.get("message", ""):
-                    if current_session["messages"]:
-                        sessions.append(current_session)
-                    topic = msg.get("message", "").split("Topic: ")[-1].strip('"')
-                    current_session = {
-                        "topic": topic,
-                        "started": msg.get("timestamp"),
-                        "messages": [msg],
-                    }
-                else:
-                    current_session["messages"].append(msg)
-            if current_session["messages"]:
-                sessions.append(current_session)
-            
-            sessions.reverse()
-            total = len(sessions)
-            sessions = sessions[offset : offset + limit]
-            
+        sessions, total = _warroom_log_store.read_sessions(project, offset=offset, limit=limit)
         return {
             "items": sessions,
             "total": total,
             "session_count": total,
-            "last_updated": last_updated
+            "last_updated": _warroom_log_store.last_updated(project) if total else None
         }
     except Exception as e:
         return JSONResponse({"error": str(e)}, status_code=500)
@@ -6106,9 +6151,7 @@ def warroom_history_clear(project: str = "Aether"):
     if project in _warroom_logs:
         _warroom_logs[project] = []
     try:
-        path = _get_history_path(project)
-        if os.path.exists(path):
-            os.remove(path)
+        _warroom_log_store.clear(project)
     except Exception:
         pass
     return {"status": "ok", "message": f"War Room history cleared for {project}"}
@@ -6584,11 +6627,9 @@ def route_app(app_name: str):
     
     # Fallback checking registry.json for 'port'
     try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            app_data = data.get("apps", {}).get(app_name, {})
-            if "port" in app_data and app_data["port"] is not None:
-                return RedirectResponse(url=f"http://localhost:{app_data['port']}", status_code=307)
+        app_data = _registry.get_app(app_name) or {}
+        if "port" in app_data and app_data["port"] is not None:
+            return RedirectResponse(url=f"http://localhost:{app_data['port']}", status_code=307)
     except Exception as e:
         logger.error(f"Routing error: {e}")
         
@@ -6846,12 +6887,10 @@ async def approve_pitch(pitch_id: str):
 # ── Startup: Auto-start incoming watcher + Ghost Operator ──
 @app.on_event("startup")
 async def _startup_watcher():
-    global _watcher_thread
-    
+
     #  Auto-adopt already running apps from registry.json
     try:
-        with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
-            reg_data = json.load(f)
+        reg_data = _registry.snapshot()
         
         ports_to_check = {}
         for app_name, app_info in reg_data.get("apps", {}).items():
@@ -6893,9 +6932,8 @@ async def _startup_watcher():
         logger.warning(f"Failed to auto-adopt registered apps: {e}")
 
     if _watcher_available:
-        _watcher_thread = threading.Thread(target=watch_incoming, args=(60,), daemon=True)
-        _watcher_thread.start()
-        logger.info("Incoming Watcher auto-started (60s poll)")
+        watcher = await asyncio.to_thread(watch_incoming)
+        logger.info(f"Incoming Watcher auto-started ({watcher.mode})")
     
     # ── Auto-start Venture Scout ──
     try:
@@ -6987,9 +7025,7 @@ def _resolve_app_base_dir(app_name: str, factory_dir: str) -> str:
     registry_path = os.path.join(factory_dir, "registry.json")
     if os.path.exists(registry_path):
         try:
-            with open(registry_path, "r", encoding="utf-8-sig") as f:
-                registry = json.load(f)
-            app_info = registry.get("apps", {}).get(app_name, {})
+            app_info = get_registry_service(registry_path).get_app(app_name) or {}
             app_path = app_info.get("path", "")
             
             # CRITICAL FIX: If app_path starts with ../, we must resolve it. But we should also verify it exists.
@@ -7091,7 +7127,6 @@ async def _get_last_mandate_from_logs() -> str:
     """Heuristically retrieve the last user mandate from War Room logs."""
     import os
     import json
-    import aiofiles
     try:
         latest_msg = None
         latest_ts = ""
@@ -7111,26 +7146,20 @@ async def _get_last_mandate_from_logs() -> str:
             return latest_msg
 
         # 2. Search disk history logs
-        projects_dir = os.path.join(SCRIPT_DIR, "projects")
-        if os.path.exists(projects_dir):
-            for project in os.listdir(projects_dir):
-                hpath = os.path.join(projects_dir, project, "warroom_history.json")
-                if os.path.exists(hpath):
-                    try:
-                        async with aiofiles.open(hpath, "r", encoding="utf-8") as f:
-                            data = json.loads(await f.read())
-                            messages = data.get("messages", [])
-                            for msg in messages:
-                                if msg.get("is_user") or msg.get("agent") == "COMMANDER" or (msg.get("agent") == "SYSTEM" and "Topic: " in msg.get("message", "")):
-                                    ts = msg.get("timestamp", "")
-                                    if ts > latest_ts:
-                                        latest_ts = ts
-                                        if msg.get("agent") == "SYSTEM" and "Topic: " in msg.get("message", ""):
-                                            latest_msg = msg.get("message").split("Topic: ")[-1].strip('"')
-                                        else:
-                                            latest_msg = msg.get("message")
-                    except Exception:
-                        pass
+        for project in await asyncio.to_thread(_warroom_log_store.projects):
+            try:
+                messages = await asyncio.to_thread(_warroom_log_store.read_messages, project)
+                for msg in messages:
+                    if msg.get("is_user") or msg.get("agent") == "COMMANDER" or (msg.get("agent") == "SYSTEM" and "Topic: " in msg.get("message", "")):
+                        ts = msg.get("timestamp", "")
+                        if ts > latest_ts:
+                            latest_ts = ts
+                            if msg.get("agent") == "SYSTEM" and "Topic: " in msg.get("message", ""):
+                                latest_msg = msg.get("message").split("Topic: ")[-1].strip('"')
+                            else:
+                                latest_msg = msg.get("message")
+            except Exception:
+                pass
 
         if latest_msg:
             return latest_msg
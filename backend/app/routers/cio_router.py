@@ -13,19 +13,19 @@ try:
     from backend.schemas.intelligence import CIOIntelligenceSchema
     from backend.services.cio_crawler import CIOCrawlerService
     from backend.core.vector_store import VectorStore
-    from backend.services.embedding_service import GoogleEmbeddingService
+    from backend.services.embedding_service import get_embedding_service
 except ImportError:
     from schemas.intelligence import CIOIntelligenceSchema
     from services.cio_crawler import CIOCrawlerService
     from core.vector_store import VectorStore
-    from services.embedding_service import GoogleEmbeddingService
+    from services.embedding_service import get_embedding_service
 
 logger = logging.getLogger("CioRouter")
 
 router = APIRouter(prefix="/api/cio", tags=["CIO Extraction Pipeline"])
 
 vector_store = VectorStore(persist_directory="./chroma_data")
-embedding_service = GoogleEmbeddingService()
+embedding_service = get_embedding_service()
 crawler_service = CIOCrawlerService()
 
 # Global in-memory dictionary to track task statuses
@@ -1,3 +1,5 @@
+import json
+import asyncio
 import logging
 from fastapi import APIRouter, BackgroundTasks, status
 from fastapi.responses import JSONResponse
@@ -6,10 +8,10 @@ from typing import Optional, List, Dict, Any
 
 try:
     from backend.core.vector_store import VectorStore
-    from backend.services.embedding_service import GoogleEmbeddingService
+    from backend.services.embedding_service import get_embedding_service
 except ImportError:
     from core.vector_store import VectorStore
-    from services.embedding_service import GoogleEmbeddingService
+    from services.embedding_service import get_embedding_service
 
 logger = logging.getLogger("VectorRouter")
 
@@ -17,7 +19,7 @@ router = APIRouter(prefix="/api/vector", tags=["Vector Store Engine"])
 
 # Instantiations
 vector_store = VectorStore(persist_directory="./chroma_data")
-embedding_service = GoogleEmbeddingService()
+embedding_service = get_embedding_service()
 
 class IngestPayload(BaseModel):
     id: str
@@ -28,31 +30,58 @@ class QueryPayload(BaseModel):
     query: str
     n_results: int = 5
 
+class IngestBatchPayload(BaseModel):
+    items: List[IngestPayload]
+
 async def background_vector_ingestion(payload_id: str, text: str, metadata: Optional[Dict[str, Any]]):
     """
     Background worker task to fetch embedding and write to vector store.
+    Concurrent workers share embedding API calls through the service's micro-batcher.
+    """
+    await background_vector_batch_ingestion([IngestPayload(id=payload_id, text=text, metadata=metadata)])
+
+async def background_vector_batch_ingestion(items: List[IngestPayload]) -> Dict[str, Any]:
+    """
+    Background worker task to embed a batch and write it to the vector store in one add.
+    Texts are embedded individually through the micro-batcher (still coalesced into
+    batchEmbedContents calls), so a text that fails to embed is reported by id and the
+    rest of the batch is still written.
     STRICT GUARDRAIL: chroma client disk writes run in thread pool via vector_store.add_async.
+    Returns {"written": [ids], "failed": {id: detail}}.
     """
-    logger.info(f"Asynchronous worker started for payload: {payload_id}")
-    
+    logger.info(f"Asynchronous worker started for {len(items)} payload(s): {items[0].id}{' ...' if len(items) > 1 else ''}")
+    report: Dict[str, Any] = {"written": [], "failed": {}}
+
     # 1. Contact Google Embedding Service
-    embedding_res = await embedding_service.get_embedding_async(text)
-    if isinstance(embedding_res, JSONResponse):
-        logger.error(f"Background worker embedding failure: {embedding_res.body.decode()}")
-        return
-        
+    results = await asyncio.gather(*(embedding_service.get_embedding_async(item.text) for item in items))
+    embedded = []
+    for item, res in zip(items, results):
+        if isinstance(res, JSONResponse):
+            detail = json.loads(res.body).get("detail", res.body.decode())
+            report["failed"][item.id] = detail
+            logger.error(f"Background worker embedding failure for {item.id}: {detail}")
+        else:
+            embedded.append((item, res))
+    if not embedded:
+        return report
+
     # 2. Write to ChromaDB in thread pool
     try:
         await vector_store.add_async(
             collection_name="maf_knowledge",
-            ids=[payload_id],
-            embeddings=[embedding_res],
-            metadatas=[metadata or {}],
-            documents=[text]
+            ids=[item.id for item, _ in embedded],
+            embeddings=[vector for _, vector in embedded],
+            metadatas=[item.metadata or {} for item, _ in embedded],
+            documents=[item.text for item, _ in embedded]
         )
-        logger.info(f"Asynchronous vector write complete for payload: {payload_id}")
+        report["written"] = [item.id for item, _ in embedded]
+        logger.info(f"Asynchronous vector write complete for {len(embedded)} payload(s), "
+                    f"{len(report['failed'])} failed to embed")
     except Exception as e:
         logger.error(f"Background vector database write failure: {e}")
+        for item, _ in embedded:
+            report["failed"][item.id] = f"Database write error: {e}"
+    return report
 
 @router.post("/ingest", status_code=status.HTTP_202_ACCEPTED)
 async def ingest_payload(payload: IngestPayload, background_tasks: BackgroundTasks):
@@ -72,6 +101,21 @@ async def ingest_payload(payload: IngestPayload, background_tasks: BackgroundTas
         "payload_id": payload.id
     }
 
+@router.post("/ingest/batch", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_batch(payload: IngestBatchPayload, background_tasks: BackgroundTasks):
+    """
+    Bulk ingestion endpoint. The whole batch is embedded in batchEmbedContents
+    calls and written to ChromaDB with a single add. Items whose text fails to
+    embed are logged by id and skipped; the rest of the batch is still written.
+    """
+    if payload.items:
+        background_tasks.add_task(background_vector_batch_ingestion, items=payload.items)
+    return {
+        "status": "ACCEPTED",
+        "detail": f"{len(payload.items)} ingestion payload(s) spooled to background worker.",
+        "payload_ids": [item.id for item in payload.items]
+    }
+
 @router.post("/query")
 async def query_payload(payload: QueryPayload):
     """
@@ -1,99 +1,324 @@
 # Phase 2 Semantic Recall - Verified for text-embedding-004 & gemini-embedding-2 fallback
 import os
-import httpx
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
 from typing import List, Union, Dict, Any, Optional
+
+import httpx
 from fastapi.responses import JSONResponse
 
+logger = logging.getLogger("EmbeddingService")
+
+DEFAULT_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+# Tried in order; a 404 moves to the next model and the choice is remembered.
+EMBEDDING_MODELS = ("gemini-embedding-2", "text-embedding-004")
+OUTPUT_DIMENSIONALITY = 768
+# batchEmbedContents accepts at most 100 requests per call.
+MAX_BATCH_SIZE = 100
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "embedding_cache.sqlite3"
+)
+
+
+def _gateway_error(detail: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=502,
+        content={
+            "error": "Gateway Unreachable",
+            "detail": detail
+        }
+    )
+
+
+class _ApiError(str):
+    """Error detail returned by _call_batch_api, carrying the HTTP status (None for transport errors)."""
+    def __new__(cls, detail: str, status: Optional[int] = None):
+        err = super().__new__(cls, detail)
+        err.status = status
+        return err
+
+    @property
+    def rejects_input(self) -> bool:
+        # A 4xx other than not-found / timeout / rate-limit means the request content was refused.
+        return self.status is not None and 400 <= self.status < 500 and self.status not in (404, 408, 429)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store on disk (SQLite, WAL).
+    Keys are sha256(model, dimensionality, text), so identical payloads are
+    only ever embedded once per model.
+    """
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+        self._db.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{OUTPUT_DIMENSIONALITY}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        keys = {self.key(model, t): t for t in texts}
+        found = {}
+        key_list = list(keys)
+        with self._lock:
+            for i in range(0, len(key_list), 500):
+                chunk = key_list[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    vec = array("d")
+                    vec.frombytes(blob)
+                    found[keys[key]] = vec.tolist()
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        rows = [(self.key(model, t), array("d", v).tobytes()) for t, v in vectors.items()]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows)
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class _LoopBatch:
+    """Texts waiting to be embedded on one event loop and the timer that flushes them.
+    Only touched from that loop, so its futures are always resolved on their own loop."""
+
+    def __init__(self):
+        self.pending: Dict[str, List[asyncio.Future]] = {}
+        self.flush_handle = None
+        self.tasks = set()
+
+
 class GoogleEmbeddingService:
     """
-    Service class interfacing with the Google Gemini text-embedding-004 API.
+    Service class interfacing with the Google Gemini embedding API.
     STRICT GUARDRAIL: Implements 502 Fallback Protocol trapping RequestError and TimeoutException
     and returning a mathematically uniform error fallback envelope.
-    Includes a dynamic, resilient, self-healing fallback to gemini-embedding-2 if text-embedding-004 is 404.
+    Includes a resilient, self-healing fallback to text-embedding-004 if gemini-embedding-2 is 404;
+    the fallback decision is remembered for the life of the service.
     Mathematically forces 768-dimensional Matryoshka output project formatting.
+
+    Concurrent get_embedding_async calls arriving within batch_window seconds are
+    coalesced into one batchEmbedContents call over a pooled client. The pending
+    queue and the client are both kept per event loop, and every vector is cached on disk by content hash. If the API rejects a
+    batch with a 4xx, the batch is bisected so only the offending texts fail.
     """
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 cache_path: Optional[str] = None, max_batch: int = MAX_BATCH_SIZE,
+                 batch_window: float = 0.005, timeout: float = 10.0,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY", "")
         if self.api_key:
             self.api_key = self.api_key.strip("'\"")
-        self.api_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-embedding-2:embedContent"
+        self.base_url = (base_url or os.getenv("GEMINI_API_BASE") or DEFAULT_API_BASE).rstrip("/")
+        self.max_batch = max(1, min(max_batch, MAX_BATCH_SIZE))
+        self.batch_window = batch_window
+        self.timeout = timeout
+        self._transport = transport
+        self._model_index = 0
+
+        # An empty path (argument or EMBEDDING_CACHE_PATH="") disables the disk cache.
+        if cache_path is None:
+            cache_path = os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+
+        self._clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._clients_lock = threading.Lock()
+        self._queues: Dict[asyncio.AbstractEventLoop, _LoopBatch] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "api_calls": 0, "embedded": 0, "batches": 0}
+
+    @property
+    def model(self) -> str:
+        return EMBEDDING_MODELS[self._model_index]
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pooled connections are bound to the loop that opened them, so each loop gets its own client.
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                # Forget clients of loops that have since closed; their connections died with the loop.
+                for stale in [lp for lp in self._clients if lp.is_closed()]:
+                    del self._clients[stale]
+                client = self._clients[loop] = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    transport=self._transport,
+                    headers={"Content-Type": "application/json"},
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+            return client
+
+    def _get_queue(self, loop: asyncio.AbstractEventLoop) -> _LoopBatch:
+        with self._clients_lock:
+            queue = self._queues.get(loop)
+            if queue is None:
+                for stale in [lp for lp in self._queues if lp.is_closed()]:
+                    del self._queues[stale]
+                queue = self._queues[loop] = _LoopBatch()
+            return queue
+
+    async def aclose(self) -> None:
+        """Close every pooled HTTP client: this loop's directly, other live loops' on their own loop."""
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            clients, self._clients = self._clients, {}
+        for owner, client in clients.items():
+            if client.is_closed or owner.is_closed():
+                continue
+            if owner is loop:
+                await client.aclose()
+            elif owner.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), owner))
 
     async def get_embedding_async(self, text: str) -> Union[List[float], JSONResponse]:
         """
         Retrieves the float embedding values for a given text.
         STRICT GUARDRAIL: Traps httpx connection failures and returns a 502 JSONResponse fallback.
         """
-        # Resolve API key dynamically to protect against import-order bugs
-        api_key = self.api_key or os.getenv("GEMINI_API_KEY", "")
-        if api_key:
-            api_key = api_key.strip("'\"")
+        self.stats["requests"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        queue = self._get_queue(loop)
+        queue.pending.setdefault(text, []).append(future)
+        if len(queue.pending) >= self.max_batch:
+            self._flush_pending(queue)
+        elif queue.flush_handle is None:
+            queue.flush_handle = loop.call_later(self.batch_window, self._flush_pending, queue)
 
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {"Content-Type": "application/json"}
-                params = {"key": api_key}
-                
-                # First attempt: gemini-embedding-2
-                payload = {
-                    "model": "models/gemini-embedding-2",
-                    "content": {
-                        "parts": [{"text": text}]
-                    },
-                    "output_dimensionality": 768
-                }
-                response = await client.post(self.api_url, headers=headers, params=params, json=payload)
-                
-                # Self-healing fallback if 404 (Not Found or Unsupported in this API key/region)
-                if response.status_code == 404:
-                    fallback_url = "https://generativelanguage.googleapis.com/v1beta/models/text-embedding-004:embedContent"
-                    fallback_payload = {
-                        "model": "models/text-embedding-004",
-                        "content": {
-                            "parts": [{"text": text}]
-                        },
-                        "output_dimensionality": 768
-                    }
-                    response = await client.post(fallback_url, headers=headers, params=params, json=fallback_payload)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    values = data.get("embedding", {}).get("values", [])
-                    if values:
-                        return values
-                    else:
-                        return JSONResponse(
-                            status_code=502,
-                            content={
-                                "error": "Gateway Unreachable",
-                                "detail": "Empty or malformed embedding response from Google API."
-                            }
-                        )
-                else:
-                    return JSONResponse(
-                        status_code=502,
-                        content={
-                            "error": "Gateway Unreachable",
-                            "detail": f"Google Embedding API returned status code {response.status_code}."
-                        }
-                    )
-        except (httpx.RequestError, httpx.TimeoutException) as e:
-            # Trapped Connection Exception - 502 Gateway Unreachable
-            return JSONResponse(
-                status_code=502,
-                content={
-                    "error": "Gateway Unreachable",
-                    "detail": "Google Embedding API offline or timed out."
-                }
-            )
+        result = await future
+        if isinstance(result, str):
+            return _gateway_error(result)
+        return list(result)
 
     async def get_embeddings_batch_async(self, texts: List[str]) -> Union[List[List[float]], JSONResponse]:
         """
         Retrieves batch float embedding values for a list of texts.
+        All texts are queued in the same tick, so they go out as max_batch-sized API calls.
         """
-        embeddings = []
-        for text in texts:
-            res = await self.get_embedding_async(text)
+        results = await asyncio.gather(*(self.get_embedding_async(text) for text in texts))
+        for res in results:
             if isinstance(res, JSONResponse):
                 return res  # Bubble up the 502 Gateway Unreachable error
-            embeddings.append(res)
-        return embeddings
+        return list(results)
+
+    def _flush_pending(self, queue: _LoopBatch) -> None:
+        if queue.flush_handle is not None:
+            queue.flush_handle.cancel()
+            queue.flush_handle = None
+        if not queue.pending:
+            return
+        batch, queue.pending = queue.pending, {}
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        queue.tasks.add(task)
+        task.add_done_callback(queue.tasks.discard)
+
+    async def _run_batch(self, batch: Dict[str, List[asyncio.Future]]) -> None:
+        try:
+            result = await self._embed_texts(list(batch))
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} failed: {e}")
+            result = "Google Embedding API offline or timed out."
+        for i, (text, futures) in enumerate(batch.items()):
+            value = result if isinstance(result, str) else result[i]
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+    async def _embed_texts(self, texts: List[str]) -> List[Union[List[float], str]]:
+        """Embed unique texts, serving what we can from the disk cache. Failed texts get an error detail."""
+        self.stats["batches"] += 1
+        found = await asyncio.to_thread(self.cache.get_many, self.model, texts) if self.cache else {}
+        self.stats["cache_hits"] += len(found)
+        misses = [t for t in texts if t not in found]
+        if misses:
+            found.update(await self._fetch(misses))
+        return [found[t] for t in texts]
+
+    async def _fetch(self, texts: List[str]) -> Dict[str, Union[List[float], str]]:
+        """Embed texts through the API and cache the vectors. A batch the API rejects
+        outright (4xx) is split in half and retried, so one bad text fails alone."""
+        res = await self._call_batch_api(texts)
+        if isinstance(res, str):
+            if res.rejects_input and len(texts) > 1:
+                mid = len(texts) // 2
+                left = await self._fetch(texts[:mid])
+                left.update(await self._fetch(texts[mid:]))
+                return left
+            return {t: res for t in texts}
+        model, vectors = res
+        fresh = dict(zip(texts, vectors))
+        if self.cache:
+            await asyncio.to_thread(self.cache.put_many, model, fresh)
+        self.stats["embedded"] += len(texts)
+        return fresh
+
+    async def _call_batch_api(self, texts: List[str]):
+        """POST one batchEmbedContents request; returns (model, vectors) or an error detail."""
+        # Resolve API key dynamically to protect against import-order bugs
+        api_key = self.api_key or os.getenv("GEMINI_API_KEY", "")
+        if api_key:
+            api_key = api_key.strip("'\"")
+        client = self._get_client()
+
+        while True:
+            model = self.model
+            payload = {
+                "requests": [
+                    {
+                        "model": f"models/{model}",
+                        "content": {"parts": [{"text": text}]},
+                        "output_dimensionality": OUTPUT_DIMENSIONALITY
+                    }
+                    for text in texts
+                ]
+            }
+            self.stats["api_calls"] += 1
+            try:
+                response = await client.post(f"{self.base_url}/models/{model}:batchEmbedContents",
+                                             params={"key": api_key}, json=payload)
+            except (httpx.RequestError, httpx.TimeoutException):
+                # Trapped Connection Exception - 502 Gateway Unreachable
+                return _ApiError("Google Embedding API offline or timed out.")
+
+            # Self-healing fallback if 404 (Not Found or Unsupported in this API key/region)
+            if response.status_code == 404 and self._model_index < len(EMBEDDING_MODELS) - 1:
+                if self.model == model:
+                    self._model_index += 1
+                    logger.warning(f"{model} returned 404; using {self.model} from now on")
+                continue
+            if response.status_code != 200:
+                return _ApiError(f"Google Embedding API returned status code {response.status_code}.",
+                                 response.status_code)
+
+            try:
+                vectors = [e.get("values") for e in response.json().get("embeddings", [])]
+            except (ValueError, AttributeError):
+                vectors = []
+            if len(vectors) != len(texts) or not all(vectors):
+                return _ApiError("Empty or malformed embedding response from Google API.")
+            return model, vectors
+
+
+_embedding_service = None
+
+
+def get_embedding_service() -> GoogleEmbeddingService:
+    """Get or create the process-wide GoogleEmbeddingService."""
+    global _embedding_service
+    if _embedding_service is None:
+        _embedding_service = GoogleEmbeddingService()
+    return _embedding_service
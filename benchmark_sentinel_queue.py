@@ -0,0 +1,122 @@
+"""
+benchmark_sentinel_queue.py — Enqueue→ack throughput/latency for the Sentinel queue
+═══════════════════════════════════════════════════════════════════════════════════════
+Runs against a throwaway SQLite file, entirely in-process:
+
+  python benchmark_sentinel_queue.py                       # both modes
+  python benchmark_sentinel_queue.py --mode store -c 8     # SentinelQueueStore, 8 consumer threads
+  python benchmark_sentinel_queue.py --mode http -n 2000   # broker app over ASGI, long-poll consumers
+
+store: producer and consumer threads call the store directly (lease → ack).
+http:  producer and consumer coroutines talk to sentinel_queue_daemon.app through
+       httpx.ASGITransport, so the numbers include request handling and long-poll
+       wakeups but no network.
+
+Latency is measured from just before enqueue to just after a successful ack.
+
+Author: Antigravity Master Architect
+Version: 1.0.0
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sentinel_queue_store  # noqa: E402
+from sentinel_queue_store import SentinelQueueStore  # noqa: E402
+
+
+def _report(label, latencies, wall):
+    latencies = sorted(latencies)
+    q = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    print(f"  {label:<6} {len(latencies):>6} tasks  {len(latencies) / wall:>9.0f} tasks/s  "
+          f"p50 {q[49] * 1000:7.2f}ms  p95 {q[94] * 1000:7.2f}ms  p99 {q[98] * 1000:7.2f}ms")
+
+
+def bench_store(db_path, n, consumers, batch):
+    store = SentinelQueueStore(db_path)
+    latencies, lock = [], threading.Lock()
+    done = threading.Event()
+
+    def consume():
+        while not done.is_set():
+            tasks = store.lease(max_tasks=batch, visibility_timeout=30, consumer="bench")
+            if not tasks:
+                time.sleep(0.0005)
+                continue
+            for task in tasks:
+                store.ack(task["task_id"], task["lease_token"])
+                elapsed = time.perf_counter() - task["payload"]["t0"]
+                with lock:
+                    latencies.append(elapsed)
+                    if len(latencies) == n:
+                        done.set()
+
+    threads = [threading.Thread(target=consume, daemon=True) for _ in range(consumers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for i in range(n):
+        store.enqueue("bench", "noop", {"t0": time.perf_counter(), "i": i}, priority=i % 3)
+    done.wait()
+    wall = time.perf_counter() - started
+    for t in threads:
+        t.join()
+    store.close()
+    _report("store", latencies, wall)
+
+
+async def bench_http(db_path, n, consumers, batch):
+    import httpx
+    import sentinel_queue_daemon
+
+    sentinel_queue_store._queue_store = SentinelQueueStore(db_path)
+    transport = httpx.ASGITransport(app=sentinel_queue_daemon.app)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://broker/v1/queue") as client:
+        async def consume():
+            while len(latencies) < n:
+                res = await client.get("/dequeue", params={"wait": 1, "max_tasks": batch})
+                if res.status_code != 200:
+                    continue
+                for task in res.json()["tasks"]:
+                    await client.post("/ack", json={"task_id": task["task_id"], "lease_token": task["lease_token"]})
+                    latencies.append(time.perf_counter() - task["payload"]["t0"])
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(consume()) for _ in range(consumers)]
+        for i in range(n):
+            await client.post("/enqueue", json={"source_node": "bench", "task_type": "noop",
+                                                "payload": {"t0": time.perf_counter(), "i": i}})
+        await asyncio.gather(*workers)
+        wall = time.perf_counter() - started
+    sentinel_queue_store._queue_store.close()
+    _report("http", latencies, wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["store", "http", "both"], default="both")
+    parser.add_argument("-n", "--tasks", type=int, default=5000)
+    parser.add_argument("-c", "--consumers", type=int, default=4)
+    parser.add_argument("-b", "--batch", type=int, default=1, help="tasks leased per dequeue")
+    args = parser.parse_args()
+
+    print(f"Sentinel queue: {args.tasks} tasks, {args.consumers} consumers, lease batch {args.batch}")
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.mode in ("store", "both"):
+            bench_store(os.path.join(tmp, "store.db"), args.tasks, args.consumers, args.batch)
+        if args.mode in ("http", "both"):
+            asyncio.run(bench_http(os.path.join(tmp, "http.db"), args.tasks, args.consumers, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ from cfo_excel_architect import get_cfo_architect
 # Additive binding: live formula-driven model (fin-model) + board packaging
 # (fin-model-presentation). Import is lazy-safe — the skills themselves are only
 # loaded when a model is actually requested (see cfo_financial_skills.load_skills).
-from cfo_financial_skills import detect_model_intent, build_model_and_pack
+from cfo_financial_skills import detect_model_intent, build_model_and_pack, simulate_scenarios
 
 logger = logging.getLogger("CFOAgent")
 
@@ -162,6 +162,18 @@ Do NOT wrap the JSON in Markdown block formatting. Output raw JSON only.
             logger.error(f"CFO financial-model build failed: {e}")
             return {"status": "error", "message": f"fin-model build failed: {e}"}
 
+    def simulate_scenarios(self, assumptions: dict, n: int = 100_000, distributions: dict = None,
+                           seed: int = None) -> dict:
+        """Full-distribution scenario analysis (growth/volume/price/COGS/opex drawn
+        stochastically) instead of the five fixed Bear..Blue-Sky points: percentile
+        bands for FCF, peak funding and break-even year."""
+        try:
+            return {"status": "success", **simulate_scenarios(assumptions, n=n, distributions=distributions,
+                                                              seed=seed)}
+        except Exception as e:
+            logger.error(f"CFO scenario simulation failed: {e}")
+            return {"status": "error", "message": f"fin-model simulation failed: {e}"}
+
     def extract_assumptions(self, instruction: str, context: dict = None) -> dict:
         """Use the CFO's LLM (Claude via model_router) to turn a natural-language
         request into the fin-model assumptions dict. Falls back to a minimal,
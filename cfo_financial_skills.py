@@ -78,6 +78,16 @@ def load_skills():
     return _fm.build_and_verify, _fp.present, paths
 
 
+def simulate_scenarios(assumptions: dict, n: int = 100_000, distributions: dict = None,
+                       seed: int = None) -> dict:
+    """Monte Carlo over the fin-model shadow model: percentile bands for FCF, peak
+    funding and break-even year across n sampled scenarios (NumPy, no workbook)."""
+    if _FIN_MODEL_DIR not in sys.path:
+        sys.path.insert(0, _FIN_MODEL_DIR)
+    import monte_carlo as _mc                    # noqa: E402
+    return _mc.simulate(assumptions, n=n, distributions=distributions, seed=seed)
+
+
 def _artifact_dir(project_id: str) -> str:
     safe = "".join(c for c in (project_id or "cfo_model") if c.isalnum() or c in (" ", "_", "-")).strip() or "cfo_model"
     path = os.path.join(_FACTORY_DIR, "projects", safe, "artifacts", "cfo_reports")
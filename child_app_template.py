@@ -8,11 +8,11 @@ It inherits 100% of the Hardened V3.0 architecture:
     the factory's .env access. Child apps NEVER handle raw keys.
 
   • StateManager — every outgoing call is logged with a UUID +
-    timestamp in local_pending_sync.json BEFORE the HTTP POST.
+    timestamp in the SQLite outbox (data/outbox.db) BEFORE the HTTP POST.
 
   • Safe-Buffer mode — if n8n Cloud is unreachable, payloads
-    are queued to pending_sync/ and the Recovery Sync Engine
-    (recovery_sync.py) delivers them when connectivity returns.
+    stay in the outbox and its replay worker (or recovery_sync.py)
+    delivers them when connectivity returns.
 
   • Watchdog preflight — cloud health is validated before any
     data-heavy operation via the Resonance_Watchdog_V3 ping
@@ -100,9 +100,9 @@ def execute():
       3. Attempt POST to n8n target
       4. Mark result (sent / buffered / failed)
 
-    If the cloud is down, the payload is automatically queued
-    to pending_sync/ and the Recovery Sync Engine (recovery_sync.py)
-    will deliver it when connectivity returns.
+    If the cloud is down, the payload is automatically kept in the
+    outbox and the replay worker (or recovery_sync.py) will deliver
+    it when connectivity returns.
     """
 
     # ── Step 1: Preflight ────────────────────────────────
@@ -129,7 +129,7 @@ def execute():
     if status == "sent":
         print("  ✅ Payload delivered to n8n Cloud.")
     elif status == "buffered":
-        print("  ⚠️ Cloud lag detected. Data secured in local_pending_sync.json")
+        print("  ⚠️ Cloud lag detected. Data secured in the outbox (data/outbox.db)")
         print("     Recovery Sync Engine will deliver when cloud recovers.")
     elif status == "failed":
         print("  ❌ n8n returned a server error (5xx).")
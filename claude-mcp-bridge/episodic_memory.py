@@ -12,12 +12,31 @@ Store: logs/episodes.jsonl — append-only, one JSON object per line:
 Retrieval: token-overlap scoring (IDF-weighted) over instruction +
 summary + tags. Deliberately dependency-free — no embeddings service
 to keep alive; at this corpus size lexical scoring is competitive.
+
+Index: logs/episodes.index.json — inverted index (token → episode ids)
+plus the byte offset of every episode line. It is maintained
+incrementally: recall catches up on lines appended since the last
+look (by this or any other process), so it only touches the posting
+lists of the query tokens and reads the top-k episodes back by offset.
+The whole log is indexed; there is no episode cap. The index is rebuilt
+from the log only when the tokenizer schema changes or the log was
+truncated / replaced.
+
+The log is the source of truth and the index file only a snapshot of it,
+so recording an episode is a plain append, and the snapshot is rewritten
+at most every SAVE_EVERY_EPISODES new episodes / SAVE_INTERVAL_SECONDS
+(and at exit). Episodes missing from a stale snapshot are re-indexed
+from the log on the next load.
 """
 
+import hashlib
 import json
 import math
+import os
 import re
-from collections import Counter
+import time
+import atexit
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -36,6 +55,168 @@ def _tokens(text: str) -> list[str]:
             if t not in _STOPWORDS]
 
 
+def _episode_tokens(ep: dict) -> set[str]:
+    return set(_tokens(
+        f"{ep.get('instruction','')} {ep.get('summary','')} "
+        f"{' '.join(ep.get('tags', []))}"
+    ))
+
+
+# Any change to what gets indexed must change this string — a persisted
+# index with a different schema is discarded and rebuilt from the log.
+INDEX_SCHEMA = "1:" + hashlib.sha1(
+    (_TOKEN_RE.pattern + "|" + " ".join(sorted(_STOPWORDS))).encode()
+).hexdigest()[:12]
+_HEAD_BYTES = 256   # log fingerprint: detects a replaced/rotated log
+SAVE_EVERY_EPISODES = 500
+SAVE_INTERVAL_SECONDS = 300.0
+
+
+class _EpisodeIndex:
+    """Inverted index over one episodes log. Guard with `lock`."""
+
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+        self.index_path = log_path.with_name(log_path.stem + ".index.json")
+        self.lock = threading.Lock()
+        self.unsaved = 0                      # episodes indexed since the last save
+        self.saved_at = time.monotonic()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offsets: list[int] = []          # episode id → byte offset
+        self.postings: dict[str, list[int]] = {}
+        self.indexed_bytes = 0
+        self.head = hashlib.sha1(b"").hexdigest()
+        self._idf: dict[str, float] = {}
+        self._idf_n = -1
+
+    # ── persistence ──────────────────────────────────────────────────────
+    def load(self) -> None:
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if data.get("schema") != INDEX_SCHEMA:
+                return
+            self.offsets = data["offsets"]
+            self.postings = data["postings"]
+            self.indexed_bytes = data["indexed_bytes"]
+            self.head = data["head"]
+        except Exception:
+            self._reset()
+
+    def save(self) -> None:
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "schema": INDEX_SCHEMA,
+            "indexed_bytes": self.indexed_bytes,
+            "head": self.head,
+            "offsets": self.offsets,
+            "postings": self.postings,
+        }, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        self.unsaved = 0
+        self.saved_at = time.monotonic()
+
+    def maybe_save(self, force: bool = False) -> None:
+        """Persist the index if enough has changed since the last save."""
+        if not self.unsaved:
+            return
+        if (force or self.unsaved >= SAVE_EVERY_EPISODES
+                or time.monotonic() - self.saved_at >= SAVE_INTERVAL_SECONDS):
+            self.save()
+
+    # ── maintenance ──────────────────────────────────────────────────────
+    def refresh(self) -> bool:
+        """Index lines appended since the last call. Returns True if the
+        index changed."""
+        try:
+            size = self.log_path.stat().st_size
+        except FileNotFoundError:
+            changed = bool(self.offsets)
+            self._reset()
+            if changed:
+                self.unsaved = 1
+            return changed
+        with open(self.log_path, "rb") as f:
+            if size < self.indexed_bytes or self._fingerprint(f, self.indexed_bytes) != self.head:
+                self._reset()
+                self.unsaved = 1          # the saved snapshot is stale even if the log is now empty
+                rebuilt = True
+            else:
+                rebuilt = False
+            if size == self.indexed_bytes:
+                return rebuilt
+            f.seek(self.indexed_bytes)
+            pos = self.indexed_bytes
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial write in progress — pick it up next time
+                start, pos = pos, pos + len(line)
+                try:
+                    ep = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(ep, dict):
+                    continue
+                doc = len(self.offsets)
+                self.offsets.append(start)
+                self.unsaved += 1
+                for t in _episode_tokens(ep):
+                    self.postings.setdefault(t, []).append(doc)
+            changed = rebuilt or pos != self.indexed_bytes
+            self.indexed_bytes = pos
+            self.head = self._fingerprint(f, pos)
+        return changed
+
+    @staticmethod
+    def _fingerprint(f, upto: int) -> str:
+        f.seek(0)
+        return hashlib.sha1(f.read(min(upto, _HEAD_BYTES))).hexdigest()
+
+    # ── queries ──────────────────────────────────────────────────────────
+    def idf(self, t: str) -> float:
+        n = len(self.offsets)
+        if n != self._idf_n:
+            self._idf, self._idf_n = {}, n
+        val = self._idf.get(t)
+        if val is None:
+            val = self._idf[t] = math.log(1 + n / (1 + len(self.postings.get(t, ()))))
+        return val
+
+    def read_episode(self, doc: int) -> dict:
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offsets[doc])
+            return json.loads(f.readline())
+
+
+_indexes: dict[Path, _EpisodeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _index() -> _EpisodeIndex:
+    """The index for the current EPISODES_LOG (resolved at call time so
+    callers and tests can repoint the store)."""
+    path = Path(EPISODES_LOG)
+    with _indexes_lock:
+        idx = _indexes.get(path)
+        if idx is None:
+            idx = _indexes[path] = _EpisodeIndex(path)
+            idx.load()
+    return idx
+
+
+@atexit.register
+def _save_indexes() -> None:
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for idx in indexes:
+        try:
+            with idx.lock:
+                idx.maybe_save(force=True)
+        except Exception:
+            pass
+
+
 def record_episode(trace_id: str, instruction: str, status: str,
                    summary: str, files_changed: list | None = None,
                    resolution: str = "", tags: list | None = None) -> None:
@@ -58,7 +239,8 @@ def record_episode(trace_id: str, instruction: str, status: str,
         pass
 
 
-def _load_episodes(max_episodes: int = 2000) -> list[dict]:
+def _load_episodes(max_episodes: int | None = None) -> list[dict]:
+    """Full scan of the log (no index). Kept for tooling and audits."""
     if not EPISODES_LOG.exists():
         return []
     episodes = []
@@ -72,7 +254,7 @@ def _load_episodes(max_episodes: int = 2000) -> list[dict]:
                     continue
     except Exception:
         return []
-    return episodes[-max_episodes:]
+    return episodes[-max_episodes:] if max_episodes else episodes
 
 
 def recall_similar(instruction: str, k: int = 3,
@@ -84,37 +266,29 @@ def recall_similar(instruction: str, k: int = 3,
     query = set(_tokens(instruction))
     if not query:
         return []
-    episodes = _load_episodes()
-    if not episodes:
-        return []
+    try:
+        idx = _index()
+        with idx.lock:
+            idx.refresh()
+            idx.maybe_save()
+            if not idx.offsets:
+                return []
 
-    # Document frequency over the corpus
-    df: Counter = Counter()
-    docs: list[set] = []
-    for ep in episodes:
-        toks = set(_tokens(
-            f"{ep.get('instruction','')} {ep.get('summary','')} "
-            f"{' '.join(ep.get('tags', []))}"
-        ))
-        docs.append(toks)
-        df.update(toks)
-
-    n = len(episodes)
-    def idf(t: str) -> float:
-        return math.log(1 + n / (1 + df[t]))
-
-    query_weight = sum(idf(t) for t in query) or 1.0
-    scored = []
-    for ep, toks in zip(episodes, docs):
-        overlap = query & toks
-        if not overlap:
-            continue
-        score = sum(idf(t) for t in overlap) / query_weight
-        if score >= min_score:
-            scored.append((score, ep))
-
-    scored.sort(key=lambda pair: pair[0], reverse=True)
-    return [dict(ep, _score=round(score, 3)) for score, ep in scored[:k]]
+            query_weight = sum(idx.idf(t) for t in query) or 1.0
+            scores: dict[int, float] = {}
+            for t in query:
+                w = idx.idf(t)
+                for doc in idx.postings.get(t, ()):
+                    scores[doc] = scores.get(doc, 0.0) + w
+
+            # Ties keep log order, as the full-scan scorer did.
+            ranked = sorted(((s / query_weight, doc) for doc, s in scores.items()
+                             if s / query_weight >= min_score),
+                            key=lambda pair: (-pair[0], pair[1]))[:k]
+            return [dict(idx.read_episode(doc), _score=round(score, 3))
+                    for score, doc in ranked]
+    except Exception:
+        return []
 
 
 def format_recall_block(episodes: list[dict]) -> str:
@@ -156,4 +330,17 @@ if __name__ == "__main__":
     block = format_recall_block(hits)
     ok3 = block.startswith("<PAST_EPISODES") and "resolution" in block
     print(f"  [{'PASS' if ok3 else 'FAIL'}] recall block renders")
-    print(f"\n{sum([ok1, ok2, ok3])}/3 passed")
+    # A fresh process (empty in-memory cache) must agree with the index
+    # maintained incrementally, and pick up appends made behind its back.
+    # The snapshot is only written every SAVE_EVERY_EPISODES / at exit, so
+    # flush it the way the atexit hook would before "restarting".
+    _save_indexes()
+    _indexes.clear()
+    with open(EPISODES_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"trace_id": "t4", "instruction": "ImportError in loop_engine again",
+                            "summary": "", "tags": []}) + "\n")
+    hits3 = recall_similar("There is an ImportError in loop_engine when starting")
+    ok4 = [h["trace_id"] for h in hits3][:2] == ["t4", "t1"] and \
+        EPISODES_LOG.with_name("episodes.index.json").exists()
+    print(f"  [{'PASS' if ok4 else 'FAIL'}] persisted index reloads and catches up on appends")
+    print(f"\n{sum([ok1, ok2, ok3, ok4])}/4 passed")
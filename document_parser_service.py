@@ -10,10 +10,19 @@ Part of the Meta_App_Factory V3 infrastructure.
 Works alongside scribe.py (documentation GENERATOR) as the
 document PARSER — complementary roles.
 
+Batch ingestion (parse_many) runs as a pipeline:
+    hash (thread pool) → persistent sha256 cache lookup (SQLite)
+    → extraction (process pool; large PDFs split into page ranges)
+    → AI analysis (asyncio, bounded concurrency) → cache write
+with per-stage timings, so a large folder ingests at disk/CPU speed and a
+restart never re-parses a file whose bytes were already analyzed. Keyword
+fallback results (Gemini unavailable) are not cached.
+
 Usage:
     from document_parser_service import DocumentParserService
     parser = DocumentParserService()
     result = parser.parse("path/to/contract.pdf", source_app="Sentinel_Bridge")
+    batch = parser.parse_many(["a.pdf", "b.docx"], source_app="Sentinel_Bridge")
 """
 
 import os
@@ -21,10 +30,16 @@ import sys
 import json
 import re
 import uuid
+import time
+import asyncio
 import hashlib
 import logging
+import sqlite3
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 try:
     from pydantic import BaseModel, field_validator
@@ -61,6 +76,15 @@ CATEGORIES = ["Legal", "Finance", "Ops", "Medical", "Technical", "Other"]
 
 # ── Supported file types ──────────────────────────────────
 SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt", ".csv", ".md", ".pptx"}
+# Extracted in the process pool; the rest are cheap reads done on a thread.
+CPU_BOUND_EXTENSIONS = {".pdf", ".docx", ".doc", ".pptx"}
+
+# ── Batch pipeline tuning ─────────────────────────────────
+PARSE_CACHE_PATH = os.getenv("DOCUMENT_PARSE_CACHE_PATH",
+                             os.path.join(FACTORY_DIR, "data", "document_parse_cache.db"))
+EXTRACT_WORKERS = int(os.getenv("DOCUMENT_PARSER_WORKERS", "0")) or (os.cpu_count() or 2)
+AI_CONCURRENCY = int(os.getenv("DOCUMENT_PARSER_AI_CONCURRENCY", "4"))
+PDF_PAGES_PER_TASK = int(os.getenv("DOCUMENT_PARSER_PDF_PAGES_PER_TASK", "16"))
 
 
 # ── Pydantic Validation Gate (Rule 0: Critic Gate) ────────
@@ -92,20 +116,116 @@ if PYDANTIC_AVAILABLE:
             return v
 
 
+class ParseCache:
+    """
+    Persistent sha256 → parse result store (SQLite, WAL).
+    Only successful parses are stored, so failed files are retried on the next
+    run. An empty path keeps the cache in memory for this process only.
+    """
+
+    def __init__(self, path: str):
+        if path and path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            " file_hash TEXT PRIMARY KEY, file_name TEXT, category TEXT,"
+            " parsed_at TEXT NOT NULL, result TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def get_many(self, hashes: List[str]) -> dict:
+        found = {}
+        keys = list(dict.fromkeys(hashes))
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT file_hash, result FROM parse_cache WHERE file_hash IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((h, json.loads(r)) for h, r in rows)
+        return found
+
+    def get(self, file_hash: str) -> Optional[dict]:
+        return self.get_many([file_hash]).get(file_hash)
+
+    def put(self, file_hash: str, result: dict) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO parse_cache (file_hash, file_name, category, parsed_at, result)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (file_hash, result.get("file_name"), result.get("category"),
+                 result.get("timestamp") or datetime.now().isoformat(), json.dumps(result, default=str)),
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ── Process-pool workers (module level so they pickle under spawn) ──
+_worker_parser_instance = None
+
+
+def _worker_parser() -> "DocumentParserService":
+    global _worker_parser_instance
+    if _worker_parser_instance is None:
+        _worker_parser_instance = DocumentParserService(cache_path="")
+    return _worker_parser_instance
+
+
+def _extract_job(file_path: str, ext: str, first_page: int = 0):
+    """
+    Extract one file (or one PDF page range) in a worker process.
+    Returns (text, total_pages, work_ms); for PDFs `text` is the list of page
+    texts of [first_page, first_page + PDF_PAGES_PER_TASK).
+    """
+    started = time.perf_counter()
+    parser = _worker_parser()
+    pages = None
+    try:
+        if ext == ".pdf":
+            text, pages = parser._extract_pdf_pages(file_path, first_page, first_page + PDF_PAGES_PER_TASK)
+        else:
+            text = parser._extract_text(file_path, ext)
+    except Exception as e:
+        text = f"ERROR: {e}"
+    return text, pages, (time.perf_counter() - started) * 1000
+
+
 class DocumentParserService:
     """
     Global utility for document text extraction and AI-driven categorization.
 
     Pipeline:
-        1. Extract raw text from file (PDF/DOCX/TXT/CSV)
-        2. Compute file hash for dedup
+        1. Compute file hash; skip files already in the persistent parse cache
+        2. Extract raw text from file (PDF/DOCX/PPTX/TXT/CSV)
         3. Call Gemini to classify category + extract entities
-        4. Return unified JSON schema
+        4. Return unified JSON schema (and cache it by hash)
     """
 
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = None, max_workers: int = EXTRACT_WORKERS):
         self._parse_log_path = os.path.join(FACTORY_DIR, "MASTER_INDEX.md")
-        self._seen_hashes: set = set()
+        self._cache_path = PARSE_CACHE_PATH if cache_path is None else cache_path
+        self._cache: Optional[ParseCache] = None
+        self._max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def cache(self) -> ParseCache:
+        if self._cache is None:
+            self._cache = ParseCache(self._cache_path)
+        return self._cache
 
     # ═══════════════════════════════════════════════════════
     #  PUBLIC API
@@ -135,22 +255,40 @@ class DocumentParserService:
         parse_id = str(uuid.uuid4())
         logger.info(f"[{parse_id[:8]}] Parsing: {file_name} (source: {source_app})")
 
-        # Step 1: Compute hash for dedup
+        # Step 1: Compute hash for dedup (persistent across restarts)
+        t0 = time.perf_counter()
         file_hash = self._compute_hash(file_path)
-        if file_hash in self._seen_hashes:
+        previous = self.cache.get(file_hash)
+        if previous:
             logger.info(f"[{parse_id[:8]}] Skipped — already parsed (hash: {file_hash[:16]})")
-            return {"parse_id": parse_id, "status": "skipped", "reason": "duplicate", "file_hash": file_hash}
-        self._seen_hashes.add(file_hash)
+            return self._skipped(parse_id, file_hash, previous)
+        t1 = time.perf_counter()
 
         # Step 2: Extract raw text
         raw_text = self._extract_text(file_path, ext)
         if not raw_text or raw_text.startswith("ERROR:"):
             return {"parse_id": parse_id, "status": "error", "error": raw_text or "No text extracted"}
+        t2 = time.perf_counter()
 
         # Step 3: AI categorization + entity extraction
         ai_result = self._ai_analyze(raw_text, file_name)
+        t3 = time.perf_counter()
 
         # Step 4: Build unified result
+        result = self._build_result(parse_id, source_app, file_name, file_hash, raw_text, ai_result)
+        result["timings_ms"] = {"hash": round((t1 - t0) * 1000, 2), "extract": round((t2 - t1) * 1000, 2),
+                                "ai": round((t3 - t2) * 1000, 2)}
+        self._cache_result(file_hash, result)
+        return result
+
+    def _cache_result(self, file_hash: str, result: dict) -> None:
+        # A keyword-fallback result (Gemini unavailable) is not cached, so the
+        # file gets a real analysis the next time it is seen.
+        if result.get("analysis_source") != "keyword_fallback":
+            self.cache.put(file_hash, result)
+
+    def _build_result(self, parse_id: str, source_app: str, file_name: str, file_hash: str,
+                      raw_text: str, ai_result: dict) -> dict:
         result = {
             "parse_id": parse_id,
             "timestamp": datetime.now().isoformat(),
@@ -159,6 +297,7 @@ class DocumentParserService:
             "file_hash": f"sha256:{file_hash}",
             "category": ai_result.get("category", "Other"),
             "confidence": ai_result.get("confidence", 0.0),
+            "analysis_source": ai_result.get("analysis_source", "gemini"),
             "extracted": {
                 "summary": ai_result.get("summary", ""),
                 "entities": ai_result.get("entities", {}),
@@ -177,6 +316,152 @@ class DocumentParserService:
 
         return result
 
+    @staticmethod
+    def _skipped(parse_id: str, file_hash: str, previous: dict) -> dict:
+        return {"parse_id": parse_id, "status": "skipped", "reason": "duplicate", "file_hash": file_hash,
+                "previous_parse_id": previous.get("parse_id"), "cached_result": previous}
+
+    # ═══════════════════════════════════════════════════════
+    #  BATCH PIPELINE
+    # ═══════════════════════════════════════════════════════
+
+    def parse_many(self, file_paths: List[str], source_app: str = "unknown",
+                   ai_concurrency: int = AI_CONCURRENCY, reparse: bool = False) -> dict:
+        """
+        Parse a batch of documents. Synchronous wrapper around parse_many_async
+        (call that directly from inside an event loop).
+
+        Returns:
+            {"results": [one parse()-shaped dict per input path, in order],
+             "stats": counts + per-stage timings in ms}
+        """
+        return asyncio.run(self.parse_many_async(file_paths, source_app, ai_concurrency, reparse))
+
+    async def parse_many_async(self, file_paths: List[str], source_app: str = "unknown",
+                               ai_concurrency: int = AI_CONCURRENCY, reparse: bool = False) -> dict:
+        """
+        Batch pipeline: hash every file on threads, drop files whose hash is in
+        the parse cache (or repeats within the batch), extract the rest in the
+        process pool (PDFs fanned out by page range), and run AI analysis with at
+        most `ai_concurrency` calls in flight. `reparse=True` ignores the cache.
+        """
+        wall_start = time.perf_counter()
+        results: list = [None] * len(file_paths)
+        stage_ms = {"hash": 0.0, "extract": 0.0, "ai": 0.0}
+
+        # Stage 1: validate + hash
+        entries = []
+        for i, path in enumerate(file_paths):
+            path = os.path.abspath(path)
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in SUPPORTED_EXTENSIONS:
+                results[i] = {"error": f"Unsupported file type: {ext}", "supported": list(SUPPORTED_EXTENSIONS)}
+            elif not os.path.exists(path):
+                results[i] = {"error": f"File not found: {path}"}
+            else:
+                entries.append((i, path, ext))
+
+        async def timed_hash(path):
+            started = time.perf_counter()
+            digest = await asyncio.to_thread(self._compute_hash, path)
+            return digest, (time.perf_counter() - started) * 1000
+
+        hashed = await asyncio.gather(*(timed_hash(path) for _, path, _ in entries))
+        stage_ms["hash"] = sum(ms for _, ms in hashed)
+        cached = {} if reparse else await asyncio.to_thread(self.cache.get_many, [h for h, _ in hashed])
+
+        todo, claimed = [], set()
+        for (i, path, ext), (file_hash, hash_ms) in zip(entries, hashed):
+            if file_hash in cached or file_hash in claimed:
+                previous = cached.get(file_hash) or {}
+                results[i] = self._skipped(str(uuid.uuid4()), file_hash, previous)
+                continue
+            claimed.add(file_hash)
+            todo.append((i, path, ext, file_hash, hash_ms))
+
+        # Stages 2 + 3: extraction feeds AI analysis as each file completes
+        ai_slots = asyncio.Semaphore(max(1, ai_concurrency))
+
+        async def run(i, path, ext, file_hash, hash_ms):
+            parse_id = str(uuid.uuid4())
+            file_name = os.path.basename(path)
+            raw_text, extract_ms = await self._extract_async(path, ext)
+            stage_ms["extract"] += extract_ms
+            if not raw_text or raw_text.startswith("ERROR:"):
+                results[i] = {"parse_id": parse_id, "status": "error", "file_name": file_name,
+                              "error": raw_text or "No text extracted"}
+                return
+            async with ai_slots:
+                started = time.perf_counter()
+                ai_result = await asyncio.to_thread(self._ai_analyze, raw_text, file_name)
+                ai_ms = (time.perf_counter() - started) * 1000
+            stage_ms["ai"] += ai_ms
+            result = self._build_result(parse_id, source_app, file_name, file_hash, raw_text, ai_result)
+            result["timings_ms"] = {"hash": round(hash_ms, 2), "extract": round(extract_ms, 2),
+                                    "ai": round(ai_ms, 2)}
+            await asyncio.to_thread(self._cache_result, file_hash, result)
+            results[i] = result
+
+        await asyncio.gather(*(run(*job) for job in todo))
+
+        statuses = [r.get("status", "error") for r in results]
+        stats = {
+            "files": len(file_paths),
+            "parsed": statuses.count("parsed"),
+            "skipped": statuses.count("skipped"),
+            "errors": statuses.count("error"),
+            "stage_ms": {k: round(v, 2) for k, v in stage_ms.items()},
+            "wall_ms": round((time.perf_counter() - wall_start) * 1000, 2),
+        }
+        logger.info(f"Batch parse: {stats['parsed']} parsed, {stats['skipped']} skipped, "
+                    f"{stats['errors']} errors in {stats['wall_ms']:.0f}ms")
+        return {"results": results, "stats": stats}
+
+    async def _extract_async(self, path: str, ext: str):
+        """(text, work_ms) — CPU-bound formats go to the process pool, plain text to a thread."""
+        if ext not in CPU_BOUND_EXTENSIONS:
+            started = time.perf_counter()
+            text = await asyncio.to_thread(self._extract_text, path, ext)
+            return text, (time.perf_counter() - started) * 1000
+
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        text, pages, work_ms = await loop.run_in_executor(pool, _extract_job, path, ext, 0)
+        if ext != ".pdf" or isinstance(text, str):
+            return text, work_ms
+
+        # Large PDFs: the first task reports the page count; fan out the rest.
+        parts = list(text)
+        if pages > PDF_PAGES_PER_TASK:
+            chunks = await asyncio.gather(*(
+                loop.run_in_executor(pool, _extract_job, path, ext, first)
+                for first in range(PDF_PAGES_PER_TASK, pages, PDF_PAGES_PER_TASK)
+            ))
+            for chunk, _, chunk_ms in chunks:
+                if isinstance(chunk, str):
+                    return chunk, work_ms + chunk_ms
+                parts.extend(chunk)
+                work_ms += chunk_ms
+        return self._join_pdf_pages(parts), work_ms
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: safe to start from a threaded server, and what Windows uses anyway
+                self._pool = ProcessPoolExecutor(max_workers=self._max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def close(self):
+        """Shut down the extraction pool and close the parse cache."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
     def is_supported(self, file_path: str) -> bool:
         """Check if a file type is supported for parsing."""
         ext = os.path.splitext(file_path)[1].lower()
@@ -187,7 +472,7 @@ class DocumentParserService:
         if not os.path.exists(file_path):
             return False
         file_hash = self._compute_hash(file_path)
-        return file_hash in self._seen_hashes
+        return self.cache.get(file_hash) is not None
 
     def log_to_master_index(self, result: dict):
         """Append a parse entry to MASTER_INDEX.md."""
@@ -236,24 +521,31 @@ class DocumentParserService:
             return f"ERROR: {e}"
 
     def _extract_pdf(self, path: str) -> str:
+        parts, _ = self._extract_pdf_pages(path)
+        if isinstance(parts, str):
+            return parts
+        return self._join_pdf_pages(parts)
+
+    def _extract_pdf_pages(self, path: str, start: int = 0, stop: Optional[int] = None):
+        """(page texts for pages[start:stop], total page count); an ERROR string instead of the list on failure."""
         try:
             import pdfplumber
-            text_parts = []
             with pdfplumber.open(path) as pdf:
-                for page in pdf.pages:
-                    t = page.extract_text()
-                    if t:
-                        text_parts.append(t)
-            return "\n\n".join(text_parts) if text_parts else "ERROR: No text found in PDF"
+                return [page.extract_text() or "" for page in pdf.pages[start:stop]], len(pdf.pages)
         except ImportError:
             # Fallback: try PyPDF2
             try:
                 from PyPDF2 import PdfReader
                 reader = PdfReader(path)
-                text_parts = [page.extract_text() or "" for page in reader.pages]
-                return "\n\n".join(text_parts) if any(text_parts) else "ERROR: No text in PDF"
+                pages = list(reader.pages)
+                return [page.extract_text() or "" for page in pages[start:stop]], len(pages)
             except ImportError:
-                return "ERROR: Install pdfplumber or PyPDF2 for PDF support (pip install pdfplumber)"
+                return "ERROR: Install pdfplumber or PyPDF2 for PDF support (pip install pdfplumber)", 0
+
+    @staticmethod
+    def _join_pdf_pages(parts: List[str]) -> str:
+        text_parts = [t for t in parts if t]
+        return "\n\n".join(text_parts) if text_parts else "ERROR: No text found in PDF"
 
     def _extract_docx(self, path: str) -> str:
         try:
@@ -317,7 +609,7 @@ class DocumentParserService:
         api_key = os.getenv("GEMINI_API_KEY", "")
         if not api_key or not REQUESTS_AVAILABLE:
             logger.warning("GEMINI_API_KEY not set or requests unavailable -- keyword fallback")
-            return self._keyword_categorize(text)
+            return self._fallback_analysis(text)
 
         prompt = f"""Analyze this document and return a JSON object with:
 1. "category": One of {CATEGORIES}
@@ -341,17 +633,21 @@ Respond ONLY with a valid JSON object. No markdown fences. Use only ASCII charac
             resp = _requests.post(url, json=payload, timeout=20)
             if resp.status_code != 200:
                 logger.warning(f"Gemini API error: {resp.status_code}")
-                return self._keyword_categorize(text)
+                return self._fallback_analysis(text)
 
             response_text = resp.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
 
             # Robust JSON extraction
             response_text = self._extract_json(response_text)
-            return json.loads(response_text)
+            return dict(json.loads(response_text), analysis_source="gemini")
 
         except Exception as e:
             logger.warning(f"AI analysis failed ({e}) -- using keyword fallback")
-            return self._keyword_categorize(text)
+            return self._fallback_analysis(text)
+
+    def _fallback_analysis(self, text: str) -> dict:
+        """Keyword categorization, tagged so the result is not cached as if Gemini had produced it."""
+        return dict(self._keyword_categorize(text), analysis_source="keyword_fallback")
 
     def _keyword_categorize(self, text: str) -> dict:
         """Fallback categorization using keyword matching."""
@@ -557,7 +853,7 @@ Respond ONLY with a valid JSON array. No markdown fences. Use only ASCII charact
         """Compute SHA-256 hash of a file for dedup."""
         h = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
+            for chunk in iter(lambda: f.read(1 << 20), b""):
                 h.update(chunk)
         return h.hexdigest()
 
@@ -579,18 +875,33 @@ if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
 
     parser = argparse.ArgumentParser(description="DocumentParserService — Test Mode")
-    parser.add_argument("file", help="Path to document to parse")
+    parser.add_argument("file", nargs="+", help="Document(s) or folder(s) to parse")
     parser.add_argument("--app", default="test", help="Source app name")
     args = parser.parse_args()
 
     svc = DocumentParserService()
-    result = svc.parse(args.file, source_app=args.app)
-
-    print(json.dumps(result, indent=2, default=str))
-
-    if result.get("status") == "parsed":
-        svc.log_to_master_index(result)
-        print("\n✅ Logged to MASTER_INDEX.md")
+    if len(args.file) == 1 and os.path.isfile(args.file[0]):
+        result = svc.parse(args.file[0], source_app=args.app)
+
+        print(json.dumps(result, indent=2, default=str))
+
+        if result.get("status") == "parsed":
+            svc.log_to_master_index(result)
+            print("\n✅ Logged to MASTER_INDEX.md")
+    else:
+        paths = []
+        for target in args.file:
+            if os.path.isdir(target):
+                for dirpath, _, filenames in os.walk(target):
+                    paths.extend(os.path.join(dirpath, f) for f in filenames if svc.is_supported(f))
+            else:
+                paths.append(target)
+        batch = svc.parse_many(paths, source_app=args.app)
+        for result in batch["results"]:
+            if result.get("status") == "parsed":
+                svc.log_to_master_index(result)
+        print(json.dumps(batch["stats"], indent=2))
+        svc.close()
 # V3 AUTO-HEAL ACTIVE
 
 # V3 MIGRATION COMPLETE
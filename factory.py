@@ -688,23 +688,17 @@ You have access to new "Professional Grade" tools. DO NOT Refuse these tasks.
                     # ── STATE MANAGER + SAFE-BUFFER (Hardening V3 Sealed) ──
                     _sm = None
                     _entry_id = None
+                    response = None
                     try:
                         from local_state_manager import StateManager
                         _sm = StateManager()
 
                         # Check Safe-Buffer mode (set by heartbeat on watchdog failure)
                         if _sm.is_safe_buffer_mode():
-                            _entry_id = _sm.log_outgoing(WEBHOOK_URL, payload, project_name)
-                            _sm.mark_failed(_entry_id, "Safe-Buffer mode active — cloud unreachable")
-                            _sync_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pending_sync")
-                            os.makedirs(_sync_dir, exist_ok=True)
-                            _ts = time.strftime("%Y%m%d_%H%M%S")
-                            _queue_file = os.path.join(_sync_dir, f"{project_name}_{_ts}.json")
-                            import json as _json
-                            with open(_queue_file, "w") as _qf:
-                                _json.dump({"url": WEBHOOK_URL, "payload": payload, "project": project_name, "queued_at": _ts}, _qf, indent=2, default=str)
-                            print(f"📦 Safe-Buffer: Payload queued to {_queue_file}", flush=True)
-                            span.add_event("Safe-Buffer queue", {"file": _queue_file})
+                            _entry_id = _sm.buffer(WEBHOOK_URL, payload, project_name,
+                                                   "Safe-Buffer mode active — cloud unreachable")
+                            print(f"📦 Safe-Buffer: Payload queued to the outbox ({_entry_id[:8]})", flush=True)
+                            span.add_event("Safe-Buffer queue", {"entry_id": _entry_id})
                             return "Your request has been queued (Safe-Buffer mode active). It will be sent when cloud connectivity is restored."
 
                         # Log outgoing request BEFORE the call
@@ -718,7 +712,6 @@ You have access to new "Professional Grade" tools. DO NOT Refuse these tasks.
                     _latency_ms = (time.time() - _call_start) * 1000
                     
                     if response.status_code in [500, 502, 503, 504, 404]:
-                         if _sm and _entry_id: _sm.mark_failed(_entry_id, f"N8N Server Error: {response.status_code}")
                          raise Exception(f"N8N Server Error: {response.status_code}")
                          
                     response.raise_for_status()
@@ -736,7 +729,13 @@ You have access to new "Professional Grade" tools. DO NOT Refuse these tasks.
 
                 except Exception as e:
                     if _cb: _cb.record_failure()
-                    if _sm and _entry_id: _sm.mark_failed(_entry_id, str(e))
+                    if _sm and _entry_id:
+                        # Only a request that never reached n8n is replayed, and only once the
+                        # in-line retries are exhausted; anything the webhook answered is final.
+                        if isinstance(e, requests.exceptions.ConnectionError) and attempt == max_retries - 1:
+                            _sm.schedule_retry(_entry_id, str(e))
+                        else:
+                            _sm.mark_failed(_entry_id, str(e), response.status_code if response is not None else None)
                     delay = backoff_base * (2 ** attempt) + random.uniform(-0.4, 0.4) * backoff_base
                     print(f"⚠️ N8N Error: {str(e)}. Exponential backoff: {delay:.1f}s...", flush=True)
                     span.record_exception(e)
@@ -1534,11 +1533,17 @@ def cmd_build(args):
             _sp.run([sys.executable, sp, "--check"], cwd=app_dir,
                     capture_output=True, text=True, encoding="utf-8", errors="replace")
             break
-    if app_name in reg.get("apps", {}):
-        reg["apps"][app_name]["last_build"] = datetime.utcnow().isoformat() + "Z"
-        reg_path = os.path.join(FACTORY_DIR, "registry.json")
-        with open(reg_path, "w", encoding="utf-8") as f:
-            json.dump(reg, f, indent=4)
+    from registry_service import get_registry_service
+    built_at = datetime.utcnow().isoformat() + "Z"
+
+    def _stamp_build(registry):
+        app = registry.get("apps", {}).get(app_name)
+        if not isinstance(app, dict):
+            return False
+        app["last_build"] = built_at
+
+    # Locked, atomic read-modify-write: the hub may have changed the registry during the build.
+    get_registry_service(os.path.join(FACTORY_DIR, "registry.json")).update(_stamp_build)
     print(f"\n✅ {app_name} built!\n")
 
 
@@ -1722,78 +1727,14 @@ def safe_post(target_url: str, payload: dict, project: str = "child_app",
     V3.0 Safe-Post Pattern.
     Returns: "sent" | "buffered" | "failed"
     Auth: Antigravity_Full_v2 inherited automatically via factory .env.
-    """
-    import json as _json
-    import time as _time
-    _sm = None
-    _entry_id = None
-
-    try:
-        from local_state_manager import StateManager
-        _sm = StateManager()
-    except ImportError:
-        pass
-
-    if _sm and _sm.is_safe_buffer_mode():
-        _entry_id = _sm.log_outgoing(target_url, payload, project)
-        _sm.mark_failed(_entry_id, "Safe-Buffer mode active")
-        _queue_to_disk(target_url, payload, project)
-        return "buffered"
-
-    try:
-        _rc_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resilience_config.json")
-        if os.path.exists(_rc_path):
-            with open(_rc_path) as _f:
-                _rc = _json.load(_f)
-            _wdog = _rc.get("cloud_health", {}).get("watchdog_url", "")
-            if _wdog:
-                _probe = requests.get(_wdog, timeout=5)
-                if _probe.status_code != 200:
-                    if _sm:
-                        _entry_id = _sm.log_outgoing(target_url, payload, project)
-                        _sm.mark_failed(_entry_id, f"Watchdog returned {_probe.status_code}")
-                    _queue_to_disk(target_url, payload, project)
-                    return "buffered"
-    except requests.exceptions.RequestException:
-        if _sm:
-            _entry_id = _sm.log_outgoing(target_url, payload, project)
-            _sm.mark_failed(_entry_id, "Watchdog unreachable")
-        _queue_to_disk(target_url, payload, project)
-        return "buffered"
-    except Exception:
-        pass
-
-    if _sm:
-        _entry_id = _sm.log_outgoing(target_url, payload, project)
 
-    try:
-        _start = _time.time()
-        resp = requests.post(target_url, json=payload, timeout=timeout)
-        _latency = (_time.time() - _start) * 1000
-        if resp.status_code >= 500:
-            if _sm and _entry_id:
-                _sm.mark_failed(_entry_id, f"Server Error: {resp.status_code}")
-            return "failed"
-        if _sm and _entry_id:
-            _sm.mark_sent(_entry_id, resp.status_code, _latency)
-        return "sent"
-    except requests.exceptions.RequestException as e:
-        if _sm and _entry_id:
-            _sm.mark_failed(_entry_id, str(e))
-        _queue_to_disk(target_url, payload, project)
-        return "buffered"
-
-
-def _queue_to_disk(url: str, payload: dict, project: str):
-    """Write a payload to pending_sync/ for recovery."""
-    import json as _json
-    import time as _time
-    _sync_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pending_sync")
-    os.makedirs(_sync_dir, exist_ok=True)
-    _ts = _time.strftime("%Y%m%d_%H%M%S")
-    _path = os.path.join(_sync_dir, f"{project}_{_ts}.json")
-    with open(_path, "w") as f:
-        _json.dump({"url": url, "payload": payload, "project": project, "queued_at": _ts}, f, indent=2, default=str)
+    Delivery goes through the durable outbox (outbox.py): the payload is
+    recorded before the POST, sent over a pooled session, and buffered for
+    batched replay when Safe-Buffer mode is on, the target host's circuit
+    breaker is open, or the target is unreachable.
+    """
+    from outbox import get_outbox
+    return get_outbox().post(target_url, payload, project, timeout=timeout)
 
 
 if __name__ == "__main__":
@@ -5,18 +5,28 @@ Monitors projects/{name}/incoming/ directories for new files.
 When detected, auto-seeds a Boardroom War Room session for audit.
 
 Links audit_incoming() → War Room WebSocket + Socratic Challenger.
+
+Detection is event-driven: filesystem events (the optional watchdog package,
+inotify on Linux) when available, otherwise a cheap poll of directory mtimes
+only. A file is audited once it has settled (size/mtime unchanged for
+SETTLE_SECONDS, or closed after writing), which keeps half-copied uploads out
+of the War Room. Seen files live in a SQLite index (data/incoming_index.db)
+and seeding runs on a bounded worker pool, so a burst of drops is audited
+concurrently without hammering the API.
 """
 
 import os
 import sys
 import json
 import time
+import sqlite3
 import logging
 import hashlib
-import asyncio
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from pathlib import Path
+from typing import Callable, Dict, List, Optional
 
 sys.stdout.reconfigure(encoding="utf-8", errors="replace")
 sys.stderr.reconfigure(encoding="utf-8", errors="replace")
@@ -24,6 +34,14 @@ sys.stderr.reconfigure(encoding="utf-8", errors="replace")
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECTS_DIR = os.path.join(SCRIPT_DIR, "projects")
 WARROOM_API = "http://localhost:8000"
+INDEX_PATH = os.getenv("INCOMING_INDEX_DB", os.path.join(SCRIPT_DIR, "data", "incoming_index.db"))
+SEED_WORKERS = int(os.getenv("INCOMING_SEED_WORKERS", "4"))
+SETTLE_SECONDS = float(os.getenv("INCOMING_SETTLE_SECONDS", "0.5"))
+POLL_INTERVAL = float(os.getenv("INCOMING_POLL_SECONDS", "0.5"))
+RECONCILE_SECONDS = float(os.getenv("INCOMING_RECONCILE_SECONDS", "600"))
+# Polling sees new files through directory mtimes, but an in-place overwrite
+# leaves the directory untouched; only the reconcile pass catches it.
+POLL_RECONCILE_SECONDS = float(os.getenv("INCOMING_POLL_RECONCILE_SECONDS", "60"))
 
 logger = logging.getLogger("incoming_watcher")
 logger.setLevel(logging.INFO)
@@ -32,144 +50,562 @@ if not logger.handlers:
     handler.setFormatter(logging.Formatter("%(asctime)s [IncomingWatcher] %(message)s"))
     logger.addHandler(handler)
 
-# Track already-processed files
-_processed_hashes = set()
+# Pre-index state file (md5 of path+mtime+size); imported once into the index.
 _state_file = os.path.join(SCRIPT_DIR, "incoming_watcher_state.json")
 
 
-def _load_state():
-    """Load previously processed file hashes."""
-    global _processed_hashes
-    try:
-        if os.path.exists(_state_file):
-            with open(_state_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                _processed_hashes = set(data.get("processed", []))
-    except Exception:
-        _processed_hashes = set()
-
-
-def _save_state():
-    """Persist processed file hashes."""
-    try:
-        with open(_state_file, "w", encoding="utf-8") as f:
-            json.dump({"processed": list(_processed_hashes)}, f)
-    except Exception as e:
-        logger.error(f"Failed to save state: {e}")
-
-
 def _file_hash(filepath):
-    """Generate a hash for a file (path + mtime + size)."""
+    """Legacy fingerprint of a file (path + mtime + size), as stored in the old state file."""
     stat = os.stat(filepath)
     raw = f"{filepath}:{stat.st_mtime}:{stat.st_size}"
     return hashlib.md5(raw.encode()).hexdigest()
 
 
-def audit_incoming():
-    """
-    Scan all projects/{name}/incoming/ directories for new files.
-    For each new file detected, auto-seed a War Room boardroom session.
+class IncomingIndex:
+    """SQLite record of every incoming file already audited, keyed by path.
 
-    Returns a list of newly detected files and their audit actions.
+    A file counts as seen while its size and mtime match the stored row; an
+    overwritten file is audited again, as it was under the old hash set.
     """
-    _load_state()
-    results = []
-
-    if not os.path.exists(PROJECTS_DIR):
-        os.makedirs(PROJECTS_DIR, exist_ok=True)
-        logger.info(f"Created projects directory: {PROJECTS_DIR}")
-        return results
 
-    for project_name in os.listdir(PROJECTS_DIR):
-        project_dir = os.path.join(PROJECTS_DIR, project_name)
-        if not os.path.isdir(project_dir):
-            continue
-
-        incoming_dir = os.path.join(project_dir, "incoming")
+    def __init__(self, db_path: str = INDEX_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen_files ("
+            " path TEXT PRIMARY KEY, project TEXT, size INTEGER, mtime_ns INTEGER,"
+            " status TEXT, detected_at TEXT, warroom_seeded INTEGER, challenge_issued INTEGER,"
+            " challenge_id TEXT)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)")
+
+    def is_seen(self, path: str, size: int, mtime_ns: int) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT size, mtime_ns FROM seen_files WHERE path = ?", (path,)).fetchone()
+        return row is not None and (row["size"], row["mtime_ns"]) == (size, mtime_ns)
+
+    def claim(self, path: str, project: str, size: int, mtime_ns: int) -> bool:
+        """Atomically mark this version of the file as being audited. False if already seen."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT size, mtime_ns FROM seen_files WHERE path = ?", (path,)).fetchone()
+                if row is not None and (row["size"], row["mtime_ns"]) == (size, mtime_ns):
+                    self._db.execute("ROLLBACK")
+                    return False
+                self._db.execute(
+                    "INSERT OR REPLACE INTO seen_files (path, project, size, mtime_ns, status, detected_at)"
+                    " VALUES (?, ?, ?, ?, 'seeding', ?)",
+                    (path, project, size, mtime_ns, datetime.now().isoformat()),
+                )
+                self._db.execute("COMMIT")
+                return True
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def record(self, info: Dict):
+        with self._lock:
+            self._db.execute(
+                "UPDATE seen_files SET status = 'audited', warroom_seeded = ?, challenge_issued = ?,"
+                " challenge_id = ? WHERE path = ?",
+                (int(bool(info.get("warroom_seeded"))), int(bool(info.get("challenge_issued"))),
+                 info.get("challenge_id"), info["filepath"]),
+            )
+
+    def forget_missing(self) -> int:
+        """Drop rows for files that no longer exist."""
+        with self._lock:
+            paths = [r["path"] for r in self._db.execute("SELECT path FROM seen_files")]
+        gone = [(p,) for p in paths if not os.path.exists(p)]
+        if gone:
+            with self._lock:
+                self._db.executemany("DELETE FROM seen_files WHERE path = ?", gone)
+        return len(gone)
+
+    def import_legacy_state(self, state_file: str, projects_dir: str) -> int:
+        """One-time carry-over of the old md5 hash set for files still on disk."""
+        with self._lock:
+            done = self._db.execute("SELECT value FROM settings WHERE key = 'legacy_state_imported'").fetchone()
+        if done or not os.path.exists(state_file):
+            return 0
+        try:
+            with open(state_file, "r", encoding="utf-8") as f:
+                hashes = set(json.load(f).get("processed", []))
+        except Exception:
+            hashes = set()
+        imported = 0
+        for project, filepath, st in _walk_incoming(projects_dir) if hashes else ():
+            try:
+                if _file_hash(filepath) in hashes and self.claim(filepath, project, st.st_size, st.st_mtime_ns):
+                    self.record({"filepath": filepath})
+                    imported += 1
+            except OSError:
+                continue
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('legacy_state_imported', ?)",
+                             (datetime.now().isoformat(),))
+        return imported
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM seen_files").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _incoming_root(projects_dir: str, path: str, depth: int = 3) -> Optional[str]:
+    """Project name if path lies under projects_dir/<project>/incoming/, else None.
+
+    depth=2 also accepts the incoming/ directory itself.
+    """
+    try:
+        parts = os.path.relpath(path, projects_dir).split(os.sep)
+    except ValueError:   # different drive on Windows
+        return None
+    if len(parts) >= depth and parts[1] == "incoming" and parts[0] not in ("..", "."):
+        return parts[0]
+    return None
+
+
+def _walk_incoming(projects_dir: str):
+    """Yield (project, filepath, stat) for every file under projects/*/incoming/."""
+    if not os.path.isdir(projects_dir):
+        return
+    for project_name in os.listdir(projects_dir):
+        incoming_dir = os.path.join(projects_dir, project_name, "incoming")
         if not os.path.isdir(incoming_dir):
             continue
-
         for root, dirs, files in os.walk(incoming_dir):
             for filename in files:
                 filepath = os.path.join(root, filename)
-                fhash = _file_hash(filepath)
-
-                if fhash in _processed_hashes:
+                try:
+                    yield project_name, filepath, os.stat(filepath)
+                except OSError:
                     continue
 
-                # New file detected
-                logger.info(f"📥 New file detected: {filepath}")
 
-                file_info = {
-                    "project": project_name,
-                    "filename": filename,
-                    "filepath": filepath,
-                    "size": os.path.getsize(filepath),
-                    "detected_at": datetime.now().isoformat(),
-                }
+class IncomingWatcher:
+    """Detects settled files in projects/*/incoming/ and seeds War Room audits.
+
+    With watchdog installed the thread sleeps until a filesystem event arrives;
+    only projects/ and each project directory are watched non-recursively, and
+    each incoming/ recursively, so build output elsewhere in a project never
+    wakes the watcher. Otherwise it stats only the directories every
+    poll_interval and rescans the ones whose mtime moved. A full stat-only pass
+    against the index runs every reconcile_interval (at most
+    poll_reconcile_interval while polling, since in-place overwrites do not
+    move a directory mtime) to catch anything events missed.
+    """
 
-                # Auto-seed War Room session
-                topic = f"Legacy Audit: {project_name}/{filename} — New file in incoming/"
+    def __init__(self, projects_dir: str = PROJECTS_DIR, index: IncomingIndex = None,
+                 api_base: str = WARROOM_API, seed_workers: int = SEED_WORKERS,
+                 settle_seconds: float = SETTLE_SECONDS, poll_interval: float = POLL_INTERVAL,
+                 reconcile_interval: float = RECONCILE_SECONDS, use_events: bool = True,
+                 poll_reconcile_interval: float = POLL_RECONCILE_SECONDS,
+                 on_audited: Callable[[Dict], None] = None):
+        self.projects_dir = projects_dir
+        self._index = index
+        self.api_base = api_base
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.reconcile_interval = reconcile_interval
+        self.poll_reconcile_interval = poll_reconcile_interval
+        self.use_events = use_events
+        self.on_audited = on_audited
+        self._pool = ThreadPoolExecutor(max_workers=max(1, seed_workers), thread_name_prefix="warroom-seed")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, tuple] = {}      # path -> ((size, mtime_ns), last change)
+        self._dir_mtimes: Dict[str, int] = {}     # guarded by _lock, like _pending
+        self._watched: set = set()                # directories scheduled on the observer
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+        self._handler = None
+        self.mode = "idle"
+
+    @property
+    def index(self) -> IncomingIndex:
+        if self._index is None:
+            self._index = IncomingIndex()
+        return self._index
+
+    # ── Detection ──────────────────────────────────────────
+
+    def notify(self, path: str, closed: bool = False, modified_dir: bool = False):
+        """Record a filesystem change; the file is audited once it settles."""
+        if os.path.isdir(path):
+            if modified_dir:
+                return
+            if self._observer is not None:
+                self._watch_dirs()
+            # A directory created or moved into incoming/ (or a whole project moved
+            # into projects/) may arrive already populated.
+            if os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.projects_dir):
+                path = os.path.join(path, "incoming")
+            if os.path.isdir(path) and _incoming_root(self.projects_dir, path, depth=2) is not None:
+                self._scan_dir(path)
+                self._wakeup.set()
+            return
+        if _incoming_root(self.projects_dir, path) is None:
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._pending.pop(path, None)
+            return
+        changed_at = time.monotonic() - (self.settle_seconds if closed else 0)
+        with self._lock:
+            self._pending[path] = ((st.st_size, st.st_mtime_ns), changed_at)
+        self._wakeup.set()
+
+    def _scan_dir(self, directory: str):
+        """Queue unseen files directly in directory; recurse into new subdirectories."""
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._dir_mtimes.pop(directory, None)
+            return
+        with self._lock:
+            self._dir_mtimes[directory] = mtime
+            known = set(self._dir_mtimes)
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.path not in known:
+                    self._scan_dir(entry.path)
+            elif entry.is_file() and _incoming_root(self.projects_dir, entry.path) is not None:
                 try:
-                    resp = requests.post(
-                        f"{WARROOM_API}/api/warroom/seed",
-                        json={"topic": topic},
-                        timeout=5,
-                    )
-                    file_info["warroom_seeded"] = resp.status_code == 200
-                    logger.info(f"🏛️ War Room seeded: {topic}")
-                except Exception as e:
-                    file_info["warroom_seeded"] = False
-                    logger.warning(f"Failed to seed War Room: {e}")
-
-                # Auto-trigger Socratic Challenge on the file
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if not self.index.is_seen(entry.path, st.st_size, st.st_mtime_ns):
+                    with self._lock:
+                        if entry.path not in self._pending:
+                            self._pending[entry.path] = ((st.st_size, st.st_mtime_ns), time.monotonic())
+
+    def _poll_dirs(self):
+        """Stat every tracked directory and rescan those whose mtime moved."""
+        roots = [self.projects_dir]
+        if os.path.isdir(self.projects_dir):
+            roots += [os.path.join(self.projects_dir, p) for p in os.listdir(self.projects_dir)]
+        with self._lock:
+            known = dict(self._dir_mtimes)
+        for root in roots:
+            incoming = os.path.join(root, "incoming")
+            if root != self.projects_dir and os.path.isdir(incoming) and incoming not in known:
+                self._scan_dir(incoming)
+        with self._lock:
+            known = dict(self._dir_mtimes)
+        for directory, seen_mtime in known.items():
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                with self._lock:
+                    self._dir_mtimes.pop(directory, None)
+                continue
+            if mtime != seen_mtime:
+                self._scan_dir(directory)
+
+    def _settled(self) -> List[tuple]:
+        """Pop pending files whose size/mtime held still for settle_seconds."""
+        now, ready = time.monotonic(), []
+        with self._lock:
+            for path, (sig, changed_at) in list(self._pending.items()):
                 try:
-                    challenge_resp = requests.post(
-                        f"{WARROOM_API}/api/warroom/challenge",
-                        json={
-                            "proposal": f"Incoming file audit: {filename} in {project_name}. "
-                                        f"File size: {file_info['size']} bytes. "
-                                        f"Requires quality validation before integration.",
-                            "critic_score": 5.0,  # Start skeptical
-                        },
-                        timeout=10,
-                    )
-                    file_info["challenge_issued"] = challenge_resp.status_code == 200
-                    if challenge_resp.status_code == 200:
-                        cdata = challenge_resp.json()
-                        file_info["challenge_id"] = cdata.get("challenge_id")
-                except Exception as e:
-                    file_info["challenge_issued"] = False
-                    logger.warning(f"Failed to issue challenge: {e}")
-
-                _processed_hashes.add(fhash)
-                results.append(file_info)
-
-    _save_state()
-    return results
-
-
-def watch_incoming(interval_seconds=30):
-    """
-    Continuous watcher — polls projects/*/incoming/ at regular intervals.
-    Designed to run as a background task in the FastAPI server.
-    """
-    logger.info(f"🔍 Incoming Watcher started (interval: {interval_seconds}s)")
-    logger.info(f"   Monitoring: {PROJECTS_DIR}/*/incoming/")
+                    st = os.stat(path)
+                except OSError:
+                    del self._pending[path]
+                    continue
+                current = (st.st_size, st.st_mtime_ns)
+                if current != sig:
+                    self._pending[path] = (current, now)
+                elif now - changed_at >= self.settle_seconds:
+                    del self._pending[path]
+                    ready.append((path, st))
+        return ready
+
+    # ── Seeding ────────────────────────────────────────────
+
+    def _dispatch(self, path: str, st) -> Optional[object]:
+        project = _incoming_root(self.projects_dir, path)
+        if project is None or not self.index.claim(path, project, st.st_size, st.st_mtime_ns):
+            return None
+        logger.info(f"📥 New file detected: {path}")
+        file_info = {
+            "project": project,
+            "filename": os.path.basename(path),
+            "filepath": path,
+            "size": st.st_size,
+            "detected_at": datetime.now().isoformat(),
+        }
+        return self._pool.submit(self._seed, file_info)
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _seed(self, file_info: Dict) -> Dict:
+        """Seed a War Room session and issue a Socratic challenge for one file."""
+        session = self._session()
+        project, filename = file_info["project"], file_info["filename"]
+
+        # Auto-seed War Room session
+        topic = f"Legacy Audit: {project}/{filename} — New file in incoming/"
+        try:
+            resp = session.post(f"{self.api_base}/api/warroom/seed", json={"topic": topic}, timeout=5)
+            file_info["warroom_seeded"] = resp.status_code == 200
+            logger.info(f"🏛️ War Room seeded: {topic}")
+        except Exception as e:
+            file_info["warroom_seeded"] = False
+            logger.warning(f"Failed to seed War Room: {e}")
 
-    while True:
+        # Auto-trigger Socratic Challenge on the file
         try:
-            new_files = audit_incoming()
-            if new_files:
-                logger.info(f"📥 Detected {len(new_files)} new file(s)")
-                for f in new_files:
-                    logger.info(f"   → {f['project']}/{f['filename']} "
-                                f"(seeded: {f.get('warroom_seeded')}, "
-                                f"challenged: {f.get('challenge_issued')})")
+            challenge_resp = session.post(
+                f"{self.api_base}/api/warroom/challenge",
+                json={
+                    "proposal": f"Incoming file audit: {filename} in {project}. "
+                                f"File size: {file_info['size']} bytes. "
+                                f"Requires quality validation before integration.",
+                    "critic_score": 5.0,  # Start skeptical
+                },
+                timeout=10,
+            )
+            file_info["challenge_issued"] = challenge_resp.status_code == 200
+            if challenge_resp.status_code == 200:
+                cdata = challenge_resp.json()
+                file_info["challenge_id"] = cdata.get("challenge_id")
         except Exception as e:
-            logger.error(f"Watcher error: {e}")
+            file_info["challenge_issued"] = False
+            logger.warning(f"Failed to issue challenge: {e}")
+
+        self.index.record(file_info)
+        if self.on_audited:
+            try:
+                self.on_audited(file_info)
+            except Exception as e:
+                logger.error(f"on_audited callback failed: {e}")
+        return file_info
+
+    # ── Entry points ───────────────────────────────────────
+
+    def scan_once(self) -> List[Dict]:
+        """Full pass: seed every settled, unseen file concurrently and wait for the results.
+
+        Files modified within the last settle_seconds are left pending for the
+        running watcher (or the next scan) so partial writes are not audited.
+        """
+        if not os.path.exists(self.projects_dir):
+            os.makedirs(self.projects_dir, exist_ok=True)
+            logger.info(f"Created projects directory: {self.projects_dir}")
+            return []
+        self.index.import_legacy_state(_state_file, self.projects_dir)
+        futures, cutoff = [], time.time_ns() - int(self.settle_seconds * 1e9)
+        for project, filepath, st in _walk_incoming(self.projects_dir):
+            if self.index.is_seen(filepath, st.st_size, st.st_mtime_ns):
+                continue
+            if st.st_mtime_ns > cutoff:
+                self.notify(filepath)
+                continue
+            future = self._dispatch(filepath, st)
+            if future is not None:
+                futures.append(future)
+        wait(futures)
+        return [f.result() for f in futures]
+
+    def start(self):
+        """Start the background watcher thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        os.makedirs(self.projects_dir, exist_ok=True)
+        self.index.import_legacy_state(_state_file, self.projects_dir)
+        if self.use_events:
+            self._start_observer()
+        self.mode = "events" if self._observer is not None else "polling"
+        self._thread = threading.Thread(target=self._run, name="incoming-watcher", daemon=True)
+        self._thread.start()
+
+    def _start_observer(self):
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            logger.info("watchdog not installed; polling incoming/ directory mtimes")
+            return
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ("deleted", "opened"):
+                    return
+                path = getattr(event, "dest_path", "") or event.src_path
+                watcher.notify(path, closed=event.event_type == "closed",
+                               modified_dir=event.is_directory and event.event_type == "modified")
+
+        self._handler = _Handler()
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._watch_dirs()
+        self._observer.start()
+
+    def _watch_dirs(self):
+        """Schedule watches: projects/ and each project non-recursively, each incoming/ recursively.
+
+        Project and incoming/ directories created later show up as directory
+        events on the level above and are scheduled from notify().
+        """
+        observer = self._observer
+        if observer is None:
+            return
+        wanted = [(self.projects_dir, False)]
+        try:
+            projects = os.listdir(self.projects_dir)
+        except OSError:
+            projects = []
+        for name in projects:
+            project = os.path.join(self.projects_dir, name)
+            if os.path.isdir(project):
+                wanted.append((project, False))
+                incoming = os.path.join(project, "incoming")
+                if os.path.isdir(incoming):
+                    wanted.append((incoming, True))
+        for directory, recursive in wanted:
+            with self._lock:
+                if directory in self._watched:
+                    continue
+                self._watched.add(directory)
+            try:
+                observer.schedule(self._handler, directory, recursive=recursive)
+            except OSError as e:
+                with self._lock:
+                    self._watched.discard(directory)
+                logger.warning(f"Could not watch {directory}: {e}")
+
+    def _run(self):
+        self._poll_dirs()   # backlog present at startup
+        last_reconcile = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                if self._observer is None:
+                    self._poll_dirs()
+                for path, st in self._settled():
+                    self._dispatch(path, st)
+                if time.monotonic() - last_reconcile >= self._reconcile_every():
+                    last_reconcile = time.monotonic()
+                    self._reconcile()
+            except Exception as e:
+                logger.error(f"Watcher error: {e}")
+
+            with self._lock:
+                busy = bool(self._pending)
+            if busy:
+                timeout = min(self.settle_seconds / 2 or 0.05, 0.25)
+            elif self._observer is None:
+                timeout = self.poll_interval
+            else:
+                timeout = max(0.0, self._reconcile_every() - (time.monotonic() - last_reconcile))
+            if self._wakeup.wait(timeout):
+                self._wakeup.clear()
+
+    def _reconcile_every(self) -> float:
+        if self._observer is None:
+            return min(self.reconcile_interval, self.poll_reconcile_interval)
+        return self.reconcile_interval
+
+    def _reconcile(self):
+        if self._observer is not None:
+            self._watch_dirs()
+        for project, filepath, st in _walk_incoming(self.projects_dir):
+            if not self.index.is_seen(filepath, st.st_size, st.st_mtime_ns):
+                self.notify(filepath)
+        self.index.forget_missing()
+
+    def status(self) -> Dict:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "mode": self.mode,
+            "pending": pending,
+            "indexed": self.index.count(),
+        }
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+            with self._lock:
+                self._watched.clear()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.mode = "idle"
+
+    def close(self):
+        self.stop()
+        self._pool.shutdown(wait=True)
+        if self._index is not None:
+            self._index.close()
+
+
+_watcher = None
+
+
+def get_incoming_watcher() -> IncomingWatcher:
+    global _watcher
+    if _watcher is None:
+        _watcher = IncomingWatcher()
+    return _watcher
+
+
+def audit_incoming():
+    """
+    Scan all projects/{name}/incoming/ directories for new files.
+    For each new file detected, auto-seed a War Room boardroom session.
+
+    Returns a list of newly detected files and their audit actions.
+    """
+    return get_incoming_watcher().scan_once()
 
-        time.sleep(interval_seconds)
+
+def _log_audited(f):
+    logger.info(f"   → {f['project']}/{f['filename']} "
+                f"(seeded: {f.get('warroom_seeded')}, "
+                f"challenged: {f.get('challenge_issued')})")
+
+
+def watch_incoming(interval_seconds=None):
+    """
+    Continuous watcher — reacts to new files in projects/*/incoming/ as they settle.
+    Designed to run as a background task in the FastAPI server; returns once the
+    watcher thread is running. interval_seconds overrides the full reconcile period.
+    """
+    watcher = get_incoming_watcher()
+    if interval_seconds:
+        watcher.reconcile_interval = interval_seconds
+    watcher.on_audited = watcher.on_audited or _log_audited
+    watcher.start()
+    logger.info(f"🔍 Incoming Watcher started ({watcher.mode}, reconcile every {watcher._reconcile_every():g}s)")
+    logger.info(f"   Monitoring: {watcher.projects_dir}/*/incoming/")
+    return watcher
 
 
 # ── CLI ──────────────────────────────────────────────────
@@ -177,7 +613,8 @@ if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Incoming File Watcher — War Room Auto-Seed")
     parser.add_argument("--once", action="store_true", help="Run once then exit")
-    parser.add_argument("--interval", type=int, default=30, help="Poll interval in seconds")
+    parser.add_argument("--interval", type=int, default=None,
+                        help="Full reconcile interval in seconds (detection itself is event-driven)")
     args = parser.parse_args()
 
     if args.once:
@@ -194,5 +631,10 @@ if __name__ == "__main__":
         print(f"{'='*50}\n")
     else:
         watch_incoming(args.interval)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            get_incoming_watcher().close()
 
 # V3 MIGRATION COMPLETE
@@ -4,23 +4,43 @@ institutional_memory.py — Factory-wide Learning Engine
 Captures every correction, feedback, debate outcome, and self-heal cycle
 as persistent "lessons" that are inherited by all child apps at build time.
 
-Storage: projects/_shared/lessons.json (global) + projects/{project}/lessons.json (per-project)
+Storage: projects/_shared/lessons.db (SQLite, WAL)
+  - lessons:      one row per lesson; in_global marks the newest 1000
+                  (the former global lessons.json), per-project rows keep
+                  their newest 500 (the former projects/{project}/lessons.json)
+  - lessons_fts:  FTS5 trigram index over summary/details/tags, so
+                  search_lessons keeps its case-insensitive substring semantics
+
+Legacy JSON stores are imported once, on first open (see import_json_lessons).
 """
 
 import os
 import json
+import sqlite3
 import logging
+import threading
 from datetime import datetime, timezone
 
 logger = logging.getLogger("InstitutionalMemory")
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-SHARED_DIR = os.path.join(SCRIPT_DIR, "projects", "_shared")
+PROJECTS_DIR = os.path.join(SCRIPT_DIR, "projects")
+SHARED_DIR = os.path.join(PROJECTS_DIR, "_shared")
 SHARED_LESSONS = os.path.join(SHARED_DIR, "lessons.json")
+LESSONS_DB = os.path.join(SHARED_DIR, "lessons.db")
+
+GLOBAL_CAP = 1000
+PROJECT_CAP = 500
+_PRUNE_EVERY = 50
+
+_conn = None
+_conn_path = None
+_fts_enabled = False
+_lock = threading.RLock()
 
 
 def _ensure_dirs():
-    os.makedirs(SHARED_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(LESSONS_DB), exist_ok=True)
 
 
 def _load_lessons(path: str) -> list:
@@ -31,10 +51,154 @@ def _load_lessons(path: str) -> list:
         return []
 
 
-def _save_lessons(path: str, lessons: list):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(lessons, f, indent=2, default=str)
+# ── SQLite Store ─────────────────────────────────────────────────
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    details TEXT NOT NULL DEFAULT '',
+    source_agent TEXT NOT NULL DEFAULT 'SYSTEM',
+    severity TEXT NOT NULL DEFAULT 'normal',
+    tags TEXT NOT NULL DEFAULT '[]',
+    tags_text TEXT NOT NULL DEFAULT '',
+    project TEXT NOT NULL DEFAULT '_global',
+    created_at TEXT NOT NULL,
+    in_global INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_lessons_project ON lessons(project, category, created_at);
+CREATE INDEX IF NOT EXISTS idx_lessons_project_seq ON lessons(project, seq);
+CREATE INDEX IF NOT EXISTS idx_lessons_global ON lessons(in_global, category, created_at);
+CREATE TABLE IF NOT EXISTS lessons_meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS lessons_fts USING fts5(
+    summary, details, tags_text,
+    content='lessons', content_rowid='seq', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS lessons_ai AFTER INSERT ON lessons BEGIN
+    INSERT INTO lessons_fts(rowid, summary, details, tags_text)
+    VALUES (new.seq, new.summary, new.details, new.tags_text);
+END;
+CREATE TRIGGER IF NOT EXISTS lessons_ad AFTER DELETE ON lessons BEGIN
+    INSERT INTO lessons_fts(lessons_fts, rowid, summary, details, tags_text)
+    VALUES ('delete', old.seq, old.summary, old.details, old.tags_text);
+END;
+"""
+
+
+def _db() -> sqlite3.Connection:
+    """Shared connection to LESSONS_DB (schema + one-shot JSON import on first open)."""
+    global _conn, _conn_path, _fts_enabled
+    if _conn is not None and _conn_path == LESSONS_DB:
+        return _conn
+    _ensure_dirs()
+    conn = sqlite3.connect(LESSONS_DB, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    try:
+        conn.executescript(_FTS_SCHEMA)
+        _fts_enabled = True
+    except sqlite3.OperationalError as e:
+        # SQLite built without FTS5/trigram — search degrades to LIKE scans
+        logger.warning(f"[Memory] FTS5 unavailable, falling back to LIKE search: {e}")
+        _fts_enabled = False
+    conn.commit()
+    _conn, _conn_path = conn, LESSONS_DB
+    import_json_lessons()
+    return conn
+
+
+def _row_to_lesson(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "category": row["category"],
+        "summary": row["summary"],
+        "details": row["details"],
+        "source_agent": row["source_agent"],
+        "severity": row["severity"],
+        "tags": json.loads(row["tags"] or "[]"),
+        "project": row["project"],
+        "created_at": row["created_at"],
+    }
+
+
+def _insert(conn: sqlite3.Connection, lesson: dict, in_global: bool = True) -> int:
+    tags = lesson.get("tags") or []
+    cur = conn.execute(
+        "INSERT INTO lessons (id, category, summary, details, source_agent, severity, "
+        "tags, tags_text, project, created_at, in_global) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            lesson.get("id", ""), lesson.get("category", ""), lesson.get("summary", ""),
+            lesson.get("details", "") or "", lesson.get("source_agent", "SYSTEM"),
+            lesson.get("severity", "normal"), json.dumps(tags, default=str),
+            " ".join(str(t) for t in tags), lesson.get("project") or "_global",
+            lesson.get("created_at", ""), 1 if in_global else 0,
+        ),
+    )
+    return cur.lastrowid
+
+
+def _prune(conn: sqlite3.Connection, project: str = None):
+    """Enforce the global (1000) and per-project (500) retention caps."""
+    conn.execute(
+        "UPDATE lessons SET in_global = 0 WHERE in_global = 1 AND seq <= "
+        "(SELECT seq FROM lessons WHERE in_global = 1 ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+        (GLOBAL_CAP,),
+    )
+    conn.execute("DELETE FROM lessons WHERE in_global = 0 AND project = '_global'")
+    projects = [project] if project else [
+        r[0] for r in conn.execute("SELECT DISTINCT project FROM lessons WHERE in_global = 0")
+    ]
+    for proj in projects:
+        conn.execute(
+            "DELETE FROM lessons WHERE project = ? AND in_global = 0 AND seq <= "
+            "(SELECT seq FROM lessons WHERE project = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+            (proj, proj, PROJECT_CAP),
+        )
+
+
+def import_json_lessons(force: bool = False) -> int:
+    """
+    One-shot importer from the legacy JSON stores (global + every project).
+    Runs automatically on first open; returns the number of lessons imported.
+    """
+    conn = _conn
+    with _lock:
+        done = conn.execute("SELECT value FROM lessons_meta WHERE key = 'json_imported'").fetchone()
+        if done and not force:
+            return 0
+
+        global_lessons = _load_lessons(SHARED_LESSONS)
+        seen = {(l.get("id"), l.get("created_at")) for l in global_lessons}
+        rows = [(l, True) for l in global_lessons]
+        if os.path.isdir(PROJECTS_DIR):
+            for proj in sorted(os.listdir(PROJECTS_DIR)):
+                if proj == "_shared":
+                    continue
+                for l in _load_lessons(os.path.join(PROJECTS_DIR, proj, "lessons.json")):
+                    key = (l.get("id"), l.get("created_at"))
+                    if key not in seen:
+                        seen.add(key)
+                        rows.append((l, False))
+
+        rows.sort(key=lambda r: r[0].get("created_at", ""))
+        for lesson, in_global in rows:
+            _insert(conn, lesson, in_global)
+        _prune(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO lessons_meta (key, value) VALUES ('json_imported', ?)",
+            (datetime.now(timezone.utc).isoformat(),),
+        )
+        conn.commit()
+    if rows:
+        logger.info(f"[Memory] Imported {len(rows)} legacy JSON lessons into {LESSONS_DB}")
+    return len(rows)
 
 
 # ── Lesson Categories ────────────────────────────────────────────
@@ -61,7 +225,8 @@ def record_lesson(
     tags: list = None,
 ) -> dict:
     """
-    Record a lesson learned. Saved to both global and per-project stores.
+    Record a lesson learned. Saved to both global and per-project stores
+    (a single O(1) row insert).
     
     Args:
         category: One of CATEGORIES keys
@@ -72,8 +237,6 @@ def record_lesson(
         severity: "low" | "normal" | "high" | "critical"
         tags: Searchable tags for retrieval
     """
-    _ensure_dirs()
-
     lesson = {
         "id": f"L-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}-{hash(summary) % 10000:04d}",
         "category": category,
@@ -86,22 +249,12 @@ def record_lesson(
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
 
-    # Save to global shared lessons
-    global_lessons = _load_lessons(SHARED_LESSONS)
-    global_lessons.append(lesson)
-    # Keep only last 1000 lessons globally
-    if len(global_lessons) > 1000:
-        global_lessons = global_lessons[-1000:]
-    _save_lessons(SHARED_LESSONS, global_lessons)
-
-    # Also save to per-project lessons if applicable
-    if project_name:
-        project_path = os.path.join(SCRIPT_DIR, "projects", project_name, "lessons.json")
-        project_lessons = _load_lessons(project_path)
-        project_lessons.append(lesson)
-        if len(project_lessons) > 500:
-            project_lessons = project_lessons[-500:]
-        _save_lessons(project_path, project_lessons)
+    with _lock:
+        conn = _db()
+        seq = _insert(conn, lesson)
+        if seq % _PRUNE_EVERY == 0:
+            _prune(conn, project_name)
+        conn.commit()
 
     logger.info(f"[Memory] Lesson recorded: [{category}] {summary[:80]}...")
     return lesson
@@ -117,26 +270,25 @@ def get_lessons(
     Retrieve lessons, optionally filtered by project and/or category.
     If include_global=True, merges global lessons with project-specific ones.
     """
-    lessons = []
-
+    where, params = [], []
     if include_global:
-        lessons.extend(_load_lessons(SHARED_LESSONS))
-
+        where.append("in_global = 1")
     if project_name:
-        project_path = os.path.join(SCRIPT_DIR, "projects", project_name, "lessons.json")
-        project_lessons = _load_lessons(project_path)
-        # Deduplicate by ID
-        existing_ids = {l["id"] for l in lessons}
-        for pl in project_lessons:
-            if pl["id"] not in existing_ids:
-                lessons.append(pl)
+        where.append("project = ?")
+        params.append(project_name)
+    if not where:
+        return []
 
+    sql = f"SELECT * FROM lessons WHERE ({' OR '.join(where)})"
     if category:
-        lessons = [l for l in lessons if l.get("category") == category]
+        sql += " AND category = ?"
+        params.append(category)
+    sql += " ORDER BY created_at DESC LIMIT ?"
+    params.append(limit)
 
-    # Sort by creation date descending
-    lessons.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    return lessons[:limit]
+    with _lock:
+        rows = _db().execute(sql, params).fetchall()
+    return [_row_to_lesson(r) for r in rows]
 
 
 def get_lessons_for_build(project_name: str = None) -> str:
@@ -176,16 +328,32 @@ def get_lessons_for_build(project_name: str = None) -> str:
 
 
 def search_lessons(query: str, limit: int = 20) -> list:
-    """Full-text search across all lessons."""
-    all_lessons = _load_lessons(SHARED_LESSONS)
-    q = query.lower()
-    matches = []
-    for l in all_lessons:
-        searchable = f"{l.get('summary', '')} {l.get('details', '')} {' '.join(l.get('tags', []))}".lower()
-        if q in searchable:
-            matches.append(l)
-    matches.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    return matches[:limit]
+    """Full-text search across all lessons (case-insensitive substring match)."""
+    with _lock:
+        conn = _db()
+        if not query:
+            rows = conn.execute(
+                "SELECT * FROM lessons WHERE in_global = 1 ORDER BY created_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        elif _fts_enabled and len(query) >= 3:
+            # Trigram tokens make a quoted phrase behave like a substring match
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = conn.execute(
+                "SELECT l.* FROM lessons_fts f JOIN lessons l ON l.seq = f.rowid "
+                "WHERE lessons_fts MATCH ? AND l.in_global = 1 "
+                "ORDER BY l.created_at DESC LIMIT ?",
+                (phrase, limit),
+            ).fetchall()
+        else:
+            like = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            rows = conn.execute(
+                "SELECT * FROM lessons WHERE in_global = 1 AND "
+                "(summary LIKE ?1 ESCAPE '\\' OR details LIKE ?1 ESCAPE '\\' OR tags_text LIKE ?1 ESCAPE '\\') "
+                "ORDER BY created_at DESC LIMIT ?2",
+                (like, limit),
+            ).fetchall()
+    return [_row_to_lesson(r) for r in rows]
 
 
 if __name__ == "__main__":
@@ -1,8 +1,14 @@
 """
 local_state_manager.py — Outgoing Request State Logger
 ═══════════════════════════════════════════════════════
-Logs every outgoing HTTP request from factory.py to local_pending_sync.json
-with a UUID, timestamp, payload hash, and status before the call is made.
+Logs every outgoing HTTP request from factory.py with a UUID, timestamp,
+payload hash, and status before the call is made.
+
+Backed by the SQLite outbox (outbox.py): each call is a single-row write
+instead of a full rewrite of local_pending_sync.json, and the payload itself
+is stored, so a send that never reached the target can be handed to the
+outbox replay worker. Only transport failures are replayed: if the target
+answered (an HTTP error, a malformed body) the entry is failed for good.
 
 Usage:
     from local_state_manager import StateManager
@@ -10,166 +16,102 @@ Usage:
     entry_id = sm.log_outgoing(url, payload, project)
     # ... make HTTP call ...
     sm.mark_sent(entry_id, status_code)
-    # or on failure:
-    sm.mark_failed(entry_id, error)
+    # or when the target answered with an error (terminal):
+    sm.mark_failed(entry_id, error, status_code)
+    # or when the request never reached the target (replayed later):
+    sm.schedule_retry(entry_id, error)
 """
 
 import os
 import sys
 import json
-import uuid
-import hashlib
 import threading
-import re
-from datetime import datetime
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+from outbox import Outbox, get_outbox, sanitize_url
 
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-STATE_FILE = os.path.join(SCRIPT_DIR, "local_pending_sync.json")
-PENDING_DIR = os.path.join(SCRIPT_DIR, "pending_sync")
-os.makedirs(PENDING_DIR, exist_ok=True)
+STATE_FILE = os.path.join(SCRIPT_DIR, "local_pending_sync.json")   # legacy; read once for Safe-Buffer mode
+PENDING_DIR = os.path.join(SCRIPT_DIR, "pending_sync")              # legacy; imported by the outbox
 
 _lock = threading.Lock()
-
-# Keys that must NEVER be logged in URLs
-_SENSITIVE_PARAMS = {"key", "apikey", "api_key", "token", "secret", "password", "access_token"}
+_legacy_checked = False
 
 
 class StateManager:
     """Thread-safe outgoing request state logger."""
 
-    def __init__(self, state_file=STATE_FILE):
+    def __init__(self, state_file=STATE_FILE, outbox: Outbox = None):
         self.state_file = state_file
-        self._ensure_state()
+        self._outbox = outbox
 
-    @staticmethod
-    def _sanitize_url(url: str) -> str:
-        """Strip sensitive query parameters (API keys, tokens) from a URL before logging."""
-        try:
-            parsed = urlparse(url)
-            params = parse_qs(parsed.query, keep_blank_values=True)
-            sanitized = {
-                k: ["[REDACTED]"] if k.lower() in _SENSITIVE_PARAMS else v
-                for k, v in params.items()
-            }
-            # Also catch inline key patterns like ?key=AIzaSy...
-            clean_query = urlencode(
-                {k: v[0] if len(v) == 1 else v for k, v in sanitized.items()},
-                doseq=True,
-            )
-            return urlunparse(parsed._replace(query=clean_query))
-        except Exception:
-            # Fallback: regex strip common key patterns
-            return re.sub(r'([?&])(key|apikey|api_key|token|secret)=[^&]+', r'\1\2=[REDACTED]', url)
-
-    def _ensure_state(self):
-        """Initialize state file if missing."""
-        if not os.path.exists(self.state_file):
-            self._write_state({
-                "_version": "3.0",
-                "_initialized_at": datetime.now().isoformat(),
-                "safe_buffer_mode": False,
-                "pending_count": 0,
-                "entries": []
-            })
-
-    def _read_state(self) -> dict:
+    _sanitize_url = staticmethod(sanitize_url)
+
+    @property
+    def outbox(self) -> Outbox:
+        # Resolved on first use so importing modules don't open the database.
+        if self._outbox is None:
+            self._outbox = get_outbox()
+            self._carry_over_safe_buffer_mode()
+        return self._outbox
+
+    def _carry_over_safe_buffer_mode(self):
+        """Honour a Safe-Buffer flag left in the old JSON state file (once per process)."""
+        global _legacy_checked
+        with _lock:
+            if _legacy_checked:
+                return
+            _legacy_checked = True
+        if self._outbox.get_setting("safe_buffer_mode") is not None:
+            return
         try:
             with open(self.state_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {"entries": [], "pending_count": 0, "safe_buffer_mode": False}
-
-    def _write_state(self, state: dict):
-        with open(self.state_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, default=str)
+                legacy = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if legacy.get("safe_buffer_mode"):
+            self._outbox.set_safe_buffer_mode(True)
 
     def is_safe_buffer_mode(self) -> bool:
         """Check if Safe-Buffer mode is active."""
-        state = self._read_state()
-        return state.get("safe_buffer_mode", False)
+        return self.outbox.is_safe_buffer_mode()
 
     def set_safe_buffer_mode(self, enabled: bool):
         """Toggle Safe-Buffer mode."""
-        with _lock:
-            state = self._read_state()
-            state["safe_buffer_mode"] = enabled
-            state["safe_buffer_toggled_at"] = datetime.now().isoformat()
-            self._write_state(state)
+        self.outbox.set_safe_buffer_mode(enabled)
 
     def log_outgoing(self, url: str, payload: dict, project: str) -> str:
         """Log an outgoing request BEFORE it's sent. Returns entry UUID."""
-        entry_id = str(uuid.uuid4())
-        payload_hash = hashlib.sha256(
-            json.dumps(payload, sort_keys=True, default=str).encode()
-        ).hexdigest()[:16]
-
-        entry = {
-            "id": entry_id,
-            "timestamp": datetime.now().isoformat(),
-            "project": project,
-            "url": self._sanitize_url(url),
-            "payload_hash": payload_hash,
-            "status": "pending",
-            "response_code": None,
-            "latency_ms": None,
-            "error": None,
-        }
-
-        with _lock:
-            state = self._read_state()
-            state["entries"].append(entry)
-            state["pending_count"] = sum(1 for e in state["entries"] if e["status"] == "pending")
-            state["last_log_event"] = datetime.now().isoformat()
-            self._write_state(state)
-
-        return entry_id
+        return self.outbox.enqueue(url, payload, project)
 
     def mark_sent(self, entry_id: str, status_code: int, latency_ms: float = None):
         """Mark an entry as successfully sent."""
-        with _lock:
-            state = self._read_state()
-            for e in state["entries"]:
-                if e["id"] == entry_id:
-                    e["status"] = "sent"
-                    e["response_code"] = status_code
-                    e["latency_ms"] = latency_ms
-                    e["completed_at"] = datetime.now().isoformat()
-                    break
-            state["pending_count"] = sum(1 for e in state["entries"] if e["status"] == "pending")
-            self._write_state(state)
-
-    def mark_failed(self, entry_id: str, error: str):
-        """Mark an entry as failed and queue payload to pending_sync/."""
-        with _lock:
-            state = self._read_state()
-            for e in state["entries"]:
-                if e["id"] == entry_id:
-                    e["status"] = "failed"
-                    e["error"] = str(error)[:200]
-                    e["completed_at"] = datetime.now().isoformat()
-                    break
-            state["pending_count"] = sum(1 for e in state["entries"] if e["status"] == "pending")
-            self._write_state(state)
+        self.outbox.mark_sent(entry_id, status_code, latency_ms)
+
+    def mark_failed(self, entry_id: str, error: str, status_code: int = None):
+        """Mark an entry as failed. Terminal: the outbox does not replay it."""
+        self.outbox.mark_failed(entry_id, error, status_code)
+
+    def schedule_retry(self, entry_id: str, error: str):
+        """Hand an undelivered entry to the outbox replay worker (transport errors only)."""
+        self.outbox.schedule_retry(entry_id, error)
+
+    def buffer(self, url: str, payload: dict, project: str, reason: str) -> str:
+        """Queue a request for replay without sending it now (Safe-Buffer mode). Returns entry UUID."""
+        return self.outbox.enqueue(url, payload, project, status="pending", error=reason)
 
     def trim_old_entries(self, keep=100):
-        """Keep only the last N entries to prevent the file from growing unbounded."""
-        with _lock:
-            state = self._read_state()
-            if len(state["entries"]) > keep:
-                state["entries"] = state["entries"][-keep:]
-            self._write_state(state)
+        """Keep only the last N delivered entries to prevent the outbox from growing unbounded."""
+        self.outbox.purge_sent(keep)
 
     def get_stats(self) -> dict:
         """Get summary statistics."""
-        state = self._read_state()
-        entries = state.get("entries", [])
+        stats = self.outbox.stats()
         return {
-            "total": len(entries),
-            "pending": sum(1 for e in entries if e["status"] == "pending"),
-            "sent": sum(1 for e in entries if e["status"] == "sent"),
-            "failed": sum(1 for e in entries if e["status"] == "failed"),
-            "safe_buffer_mode": state.get("safe_buffer_mode", False),
+            "total": stats["total"],
+            "pending": stats["pending"] + stats["sending"],
+            "sent": stats["sent"],
+            "failed": stats["failed"] + stats["dead"],
+            "safe_buffer_mode": stats["safe_buffer_mode"],
         }
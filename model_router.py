@@ -7,8 +7,14 @@ Routes between Gemini 2.5 Flash (fast/creative/multimodal) and Claude 3.7 Sonnet
 
 import os
 import json
+import asyncio
 import logging
+import threading
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
+
+import prompt_cache
 
 # Standalone invocations (loop_engine planner, CLI tests) need .env loaded;
 # inside api.py this is a no-op since the environment is already populated.
@@ -83,18 +89,86 @@ def _get_anthropic_key():
     return key
 
 
-def _call_gemini(prompt: str, system_prompt: str = "", api_key: str = "",
-                 model_name: str = GEMINI_FLASH,
-                 image_b64: str = None, image_mime: str = "image/png") -> str:
-    """Call Gemini models via REST API. Optional inline image for vision tasks."""
-    if not api_key:
-        api_key = _get_gemini_key()
-    if not api_key:
-        # Loud, never silent (CLAUDE_RULES 0.3)
-        logger.warning("[ModelRouter] GEMINI_API_KEY missing — Gemini call skipped")
-        return ""
+# ── Pooled HTTP Clients ─────────────────────────────────────────────
+# One keep-alive connection pool per process (sync) and per event loop
+# (async), instead of a fresh TCP+TLS handshake on every LLM call.
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+CLAUDE_URL = "https://api.anthropic.com/v1/messages"
+GEMINI_TIMEOUT = 60
+CLAUDE_TIMEOUT = 90
+
+# Per-provider in-flight limits for route_async / route_many.
+PROVIDER_CONCURRENCY = {
+    "gemini": int(os.getenv("MODEL_ROUTER_GEMINI_CONCURRENCY", "8")),
+    "claude": int(os.getenv("MODEL_ROUTER_CLAUDE_CONCURRENCY", "4")),
+}
+_POOL_MAXSIZE = int(os.getenv("MODEL_ROUTER_POOL_SIZE", "32"))
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()   # loop -> httpx.AsyncClient
+_async_semaphores = weakref.WeakKeyDictionary()  # loop -> {provider: Semaphore}
+
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
+def _get_session() -> requests.Session:
+    """Shared keep-alive requests.Session (thread-safe lazy init)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401 — httpx only negotiates HTTP/2 when h2 is installed
+        return True
+    except ImportError:
+        return False
+
+
+def _get_async_client():
+    """Shared httpx.AsyncClient for the running event loop (HTTP/2 when available)."""
+    import httpx
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(max_connections=_POOL_MAXSIZE,
+                                max_keepalive_connections=_POOL_MAXSIZE),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sems = _async_semaphores.get(loop)
+    if sems is None:
+        sems = {p: asyncio.Semaphore(max(n, 1)) for p, n in PROVIDER_CONCURRENCY.items()}
+        _async_semaphores[loop] = sems
+    return sems[provider]
+
+
+async def aclose():
+    """Close the async client bound to the running loop (call on shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+# ── Provider Calls ──────────────────────────────────────────────────
+
+def _gemini_request(prompt: str, system_prompt: str, api_key: str, model_name: str,
+                    image_b64: str = None, image_mime: str = "image/png"):
+    """Build (url, headers, body) for a Gemini generateContent call."""
+    url = f"{GEMINI_BASE_URL}/{model_name}:generateContent"
     headers = {"Content-Type": "application/json", "x-goog-api-key": api_key}
 
     parts = []
@@ -105,32 +179,23 @@ def _call_gemini(prompt: str, system_prompt: str = "", api_key: str = "",
     if image_b64:
         parts.append({"inlineData": {"mimeType": image_mime, "data": image_b64}})
 
-    data = {"contents": [{"role": "user", "parts": parts}]}
+    return url, headers, {"contents": [{"role": "user", "parts": parts}]}
 
-    try:
-        r = requests.post(url, json=data, headers=headers, timeout=60)
-        candidates = r.json().get("candidates", [])
-        if candidates:
-            return candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "").strip()
-    except Exception as e:
-        logger.warning(f"[Gemini] Call failed: {e}")
+
+def _gemini_text(result: dict) -> str:
+    candidates = result.get("candidates", [])
+    if candidates:
+        return candidates[0].get("content", {}).get("parts", [{}])[0].get("text", "").strip()
     return ""
 
 
-def _call_claude(prompt: str, system_prompt: str = "", api_key: str = "") -> str:
-    """Call Claude 3.7 Sonnet via Anthropic Messages API."""
-    if not api_key:
-        api_key = _get_anthropic_key()
-    if not api_key:
-        return ""  # Will fallback to Gemini
-
-    url = "https://api.anthropic.com/v1/messages"
+def _claude_request(prompt: str, system_prompt: str, api_key: str):
+    """Build (url, headers, body) for an Anthropic Messages call."""
     headers = {
         "Content-Type": "application/json",
         "x-api-key": api_key,
         "anthropic-version": "2023-06-01",
     }
-
     data = {
         "model": CLAUDE_SONNET,
         "max_tokens": 4096,
@@ -138,18 +203,91 @@ def _call_claude(prompt: str, system_prompt: str = "", api_key: str = "") -> str
     }
     if system_prompt:
         data["system"] = system_prompt
+    return CLAUDE_URL, headers, data
+
 
+def _claude_text(result: dict) -> str:
+    content = result.get("content", [])
+    if content:
+        return content[0].get("text", "").strip()
+    return ""
+
+
+def _call_gemini(prompt: str, system_prompt: str = "", api_key: str = "",
+                 model_name: str = GEMINI_FLASH,
+                 image_b64: str = None, image_mime: str = "image/png") -> str:
+    """Call Gemini models via REST API. Optional inline image for vision tasks."""
+    if not api_key:
+        api_key = _get_gemini_key()
+    if not api_key:
+        # Loud, never silent (CLAUDE_RULES 0.3)
+        logger.warning("[ModelRouter] GEMINI_API_KEY missing — Gemini call skipped")
+        return ""
+
+    url, headers, data = _gemini_request(prompt, system_prompt, api_key, model_name,
+                                         image_b64, image_mime)
+    try:
+        r = _get_session().post(url, json=data, headers=headers, timeout=GEMINI_TIMEOUT)
+        return _gemini_text(r.json())
+    except Exception as e:
+        logger.warning(f"[Gemini] Call failed: {e}")
+    return ""
+
+
+def _call_claude(prompt: str, system_prompt: str = "", api_key: str = "") -> str:
+    """Call Claude Sonnet via Anthropic Messages API."""
+    if not api_key:
+        api_key = _get_anthropic_key()
+    if not api_key:
+        return ""  # Will fallback to Gemini
+
+    url, headers, data = _claude_request(prompt, system_prompt, api_key)
     try:
-        r = requests.post(url, json=data, headers=headers, timeout=90)
-        result = r.json()
-        content = result.get("content", [])
-        if content:
-            return content[0].get("text", "").strip()
+        r = _get_session().post(url, json=data, headers=headers, timeout=CLAUDE_TIMEOUT)
+        return _claude_text(r.json())
     except Exception as e:
         logger.warning(f"[Claude] Call failed: {e}")
     return ""
 
 
+async def _acall_gemini(prompt: str, system_prompt: str = "", api_key: str = "",
+                        model_name: str = GEMINI_FLASH) -> str:
+    """Async twin of _call_gemini over the pooled httpx client."""
+    if not api_key:
+        api_key = _get_gemini_key()
+    if not api_key:
+        logger.warning("[ModelRouter] GEMINI_API_KEY missing — Gemini call skipped")
+        return ""
+
+    url, headers, data = _gemini_request(prompt, system_prompt, api_key, model_name)
+    try:
+        async with _provider_semaphore("gemini"):
+            r = await _get_async_client().post(url, json=data, headers=headers,
+                                               timeout=GEMINI_TIMEOUT)
+        return _gemini_text(r.json())
+    except Exception as e:
+        logger.warning(f"[Gemini] Async call failed: {e}")
+    return ""
+
+
+async def _acall_claude(prompt: str, system_prompt: str = "", api_key: str = "") -> str:
+    """Async twin of _call_claude over the pooled httpx client."""
+    if not api_key:
+        api_key = _get_anthropic_key()
+    if not api_key:
+        return ""
+
+    url, headers, data = _claude_request(prompt, system_prompt, api_key)
+    try:
+        async with _provider_semaphore("claude"):
+            r = await _get_async_client().post(url, json=data, headers=headers,
+                                               timeout=CLAUDE_TIMEOUT)
+        return _claude_text(r.json())
+    except Exception as e:
+        logger.warning(f"[Claude] Async call failed: {e}")
+    return ""
+
+
 def get_model_for_task(task_type: str) -> str:
     """Return the model name that best fits the given task type."""
     return TASK_ROUTING.get(task_type, GEMINI_FLASH)
@@ -177,60 +315,143 @@ def route_multimodal(task_type: str, prompt: str, image_b64: str,
                         image_b64=image_b64, image_mime=image_mime)
 
 
-def route(task_type: str, prompt: str, system_prompt: str = "", high_availability: bool = False) -> str:
+_LABELS = {
+    CLAUDE_SONNET: "🧠 [Claude]",
+    GEMINI_PRO: "🤖 [Gemini Pro]",
+    GEMINI_FLASH: "🤖 [Gemini Flash]",
+}
+
+
+def _fallback_chain(preferred: str, high_availability: bool) -> list:
     """
-    Route a prompt to the optimal LLM based on task type.
-    Falls back: preferred model → alternative model → empty string.
-    
+    Ordered (provider, model) attempts for a preferred model.
+
     Resilience Matrix:
     - Heavy Tier (CLAUDE_SONNET) falls back strictly to Heavy Tier (GEMINI_PRO).
     - Heavy Tier (GEMINI_PRO) falls back strictly to Heavy Tier (CLAUDE_SONNET).
     - Speed Tier (GEMINI_FLASH) fails cleanly without fallback unless high_availability=True.
     """
+    if preferred == CLAUDE_SONNET:
+        return [("claude", CLAUDE_SONNET), ("gemini", GEMINI_PRO)]
+    if preferred == GEMINI_PRO:
+        return [("gemini", GEMINI_PRO), ("claude", CLAUDE_SONNET)]
+    if preferred == GEMINI_FLASH:
+        chain = [("gemini", GEMINI_FLASH)]
+        if high_availability:
+            chain += [("gemini", GEMINI_PRO), ("claude", CLAUDE_SONNET)]
+        return chain
+    return []
+
+
+def _log_fallback(task_type: str, model: str, attempt: int, chain: list, high_availability: bool):
+    if attempt + 1 < len(chain):
+        nxt = chain[attempt + 1][1]
+        logger.warning(f"[ModelRouter] {model} unavailable for '{task_type}', falling back to {nxt}")
+    elif model == GEMINI_FLASH and not high_availability:
+        logger.warning(f"[ModelRouter] Gemini Flash failed. high_availability=False, clean-failing to conserve tokens.")
+
+
+def _cache_lookup(task_type: str, model: str, system_prompt: str, prompt: str, use_cache: bool):
+    """Return (key, ttl, cached_response). key is None when caching is off for this call."""
+    if not use_cache or not prompt_cache.is_enabled():
+        return None, 0, None
+    ttl = prompt_cache.ttl_for(task_type)
+    if ttl <= 0:
+        return None, 0, None
+    key = prompt_cache.make_key(task_type, model, system_prompt, prompt)
+    return key, ttl, prompt_cache.get_prompt_cache().get(key)
+
+
+def route(task_type: str, prompt: str, system_prompt: str = "", high_availability: bool = False,
+          use_cache: bool = True) -> str:
+    """
+    Route a prompt to the optimal LLM based on task type.
+    Falls back: preferred model → alternative model → empty string.
+    See _fallback_chain for the resilience matrix.
+
+    Identical (task_type, model, system_prompt, prompt) calls are served from
+    prompt_cache within the task's TTL; pass use_cache=False to force a fresh call.
+    Only answers from the preferred model are cached, never fallback answers.
+    """
     preferred = get_model_for_task(task_type)
+    key, ttl, cached = _cache_lookup(task_type, preferred, system_prompt, prompt, use_cache)
+    if cached is not None:
+        logger.info(f"[ModelRouter] Task '{task_type}' → cache hit")
+        return cached
     logger.info(f"[ModelRouter] Task '{task_type}' → {preferred} (high_availability={high_availability})")
 
-    if preferred == CLAUDE_SONNET:
-        # Heavy Tier: Claude Sonnet -> Fallback strictly to Gemini Pro
-        response = _call_claude(prompt, system_prompt)
-        if response:
-            return f"🧠 [Claude] {response[:2000]}"
-        logger.warning(f"[ModelRouter] Claude Sonnet unavailable for '{task_type}', falling back strictly to Gemini Pro")
-        response = _call_gemini(prompt, system_prompt, model_name=GEMINI_PRO)
-        if response:
-            return f"🤖 [Gemini Pro] {response[:2000]}"
-            
-    elif preferred == GEMINI_PRO:
-        # Heavy Tier: Gemini Pro -> Fallback strictly to Claude Sonnet
-        response = _call_gemini(prompt, system_prompt, model_name=GEMINI_PRO)
-        if response:
-            return f"🤖 [Gemini Pro] {response[:2000]}"
-        logger.warning(f"[ModelRouter] Gemini Pro unavailable for '{task_type}', falling back strictly to Claude Sonnet")
-        response = _call_claude(prompt, system_prompt)
-        if response:
-            return f"🧠 [Claude] {response[:2000]}"
-            
-    elif preferred == GEMINI_FLASH:
-        # Speed Tier: Gemini Flash -> Fails cleanly unless high_availability=True
-        response = _call_gemini(prompt, system_prompt, model_name=GEMINI_FLASH)
-        if response:
-            return f"🤖 [Gemini Flash] {response[:2000]}"
-        
-        if high_availability:
-            logger.warning(f"[ModelRouter] Gemini Flash failed. high_availability=True, falling back to Heavy tier (Gemini Pro)")
-            response = _call_gemini(prompt, system_prompt, model_name=GEMINI_PRO)
-            if response:
-                return f"🤖 [Gemini Pro] {response[:2000]}"
-            logger.warning(f"[ModelRouter] Gemini Pro also failed under high_availability, trying Claude Sonnet")
+    chain = _fallback_chain(preferred, high_availability)
+    for attempt, (provider, model) in enumerate(chain):
+        if provider == "claude":
             response = _call_claude(prompt, system_prompt)
-            if response:
-                return f"🧠 [Claude] {response[:2000]}"
         else:
-            logger.warning(f"[ModelRouter] Gemini Flash failed. high_availability=False, clean-failing to conserve tokens.")
+            response = _call_gemini(prompt, system_prompt, model_name=model)
+        if response:
+            result = f"{_LABELS[model]} {response[:2000]}"
+            if key and model == preferred:   # a fallback answer is not cached under the preferred model's key
+                prompt_cache.get_prompt_cache().put(key, result, ttl, task_type)
+            return result
+        _log_fallback(task_type, model, attempt, chain, high_availability)
 
     return ""
 
 
+async def route_async(task_type: str, prompt: str, system_prompt: str = "",
+                      high_availability: bool = False, use_cache: bool = True) -> str:
+    """
+    Async twin of route(): same routing, fallback and caching, but runs on the
+    pooled httpx client and respects PROVIDER_CONCURRENCY, so many calls can be
+    in flight on one event loop.
+    """
+    preferred = get_model_for_task(task_type)
+    key, ttl, cached = _cache_lookup(task_type, preferred, system_prompt, prompt, use_cache)
+    if cached is not None:
+        logger.info(f"[ModelRouter] Async task '{task_type}' → cache hit")
+        return cached
+    logger.info(f"[ModelRouter] Async task '{task_type}' → {preferred} (high_availability={high_availability})")
+
+    chain = _fallback_chain(preferred, high_availability)
+    for attempt, (provider, model) in enumerate(chain):
+        if provider == "claude":
+            response = await _acall_claude(prompt, system_prompt)
+        else:
+            response = await _acall_gemini(prompt, system_prompt, model_name=model)
+        if response:
+            result = f"{_LABELS[model]} {response[:2000]}"
+            if key and model == preferred:   # a fallback answer is not cached under the preferred model's key
+                prompt_cache.get_prompt_cache().put(key, result, ttl, task_type)
+            return result
+        _log_fallback(task_type, model, attempt, chain, high_availability)
+
+    return ""
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the prompt cache (surfaced by /api/telemetry/stats)."""
+    return prompt_cache.get_prompt_cache().stats()
+
+
+async def route_many(calls: list) -> list:
+    """
+    Fan out independent prompts concurrently; results keep input order.
+
+    Each call is a dict of route_async kwargs, e.g.
+        await route_many([
+            {"task_type": "CEO", "prompt": p1},
+            {"task_type": "CFO", "prompt": p2, "system_prompt": sys},
+        ])
+    A failing call yields "" rather than cancelling its siblings.
+    """
+    results = await asyncio.gather(*(route_async(**c) for c in calls), return_exceptions=True)
+    out = []
+    for call, res in zip(calls, results):
+        if isinstance(res, BaseException):
+            logger.warning(f"[ModelRouter] route_many call '{call.get('task_type')}' failed: {res}")
+            res = ""
+        out.append(res)
+    return out
+
+
 if __name__ == "__main__":
     print(f"CEO   → {get_model_for_task('CEO')}")
     print(f"CFO   → {get_model_for_task('CFO')}")
@@ -0,0 +1,531 @@
+"""
+outbox.py — Durable outbox behind safe_post (System Hardening V3)
+═══════════════════════════════════════════════════════════════════
+Every outgoing child-app POST is recorded in SQLite (data/outbox.db, WAL)
+before it is sent, delivered over a pooled HTTP session, and — when the
+target is unreachable — retried by a background replay worker instead of
+being dropped into timestamp-named files.
+
+Lifecycle of a message:
+  sending ──2xx-4xx──▶ sent
+     │
+     ├─5xx on first send──▶ failed      (not retried: the target answered)
+     └─transport error / breaker open / Safe-Buffer──▶ pending
+                                            │
+           replay worker (batched, exponential backoff)
+                                            ├──▶ sent
+                                            └─max_retries exhausted──▶ dead
+
+Health is a per-host circuit breaker fed by real sends (resilience_config.json
+`circuit_breaker_defaults`), so there is no watchdog probe per call: an open
+breaker buffers immediately and replay resumes after the cooldown.
+
+Safe-Buffer mode and the legacy pending_sync/*.json files are handled here
+too, so local_state_manager.StateManager and recovery_sync.py are thin
+wrappers over this module.
+
+Author: Antigravity Master Architect
+Version: 1.0.0
+"""
+
+import os
+import re
+import glob
+import json
+import time
+import uuid
+import hashlib
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("Outbox")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.getenv("OUTBOX_DB", os.path.join(SCRIPT_DIR, "data", "outbox.db"))
+RESILIENCE_CFG = os.path.join(SCRIPT_DIR, "resilience_config.json")
+LEGACY_PENDING_DIR = os.path.join(SCRIPT_DIR, "pending_sync")
+
+# A row left in 'sending' this long (the sender crashed mid-request) is replayed.
+STALE_SENDING_SECONDS = 300.0
+
+# Keys that must NEVER be logged in URLs
+_SENSITIVE_PARAMS = {"key", "apikey", "api_key", "token", "secret", "password", "access_token"}
+
+
+class _ResilienceConfig:
+    """resilience_config.json, re-read only when the file changes."""
+
+    def __init__(self, path: str = RESILIENCE_CFG):
+        self.path = path
+        self._stamp = None
+        self._data: Dict[str, Any] = {}
+
+    def get(self) -> Dict[str, Any]:
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return {}
+        if stamp != self._stamp:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"resilience_config.json unreadable, keeping previous values: {e}")
+            self._stamp = stamp
+        return self._data
+
+
+class CircuitBreaker:
+    """closed → (failure_threshold failures) → open → (cooldown) → half_open → (success_threshold) → closed."""
+
+    def __init__(self, failure_threshold: int = 3, cooldown_seconds: float = 120.0, success_threshold: int = 2):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.success_threshold = success_threshold
+        self.state = "closed"
+        self.failures = 0
+        self.successes = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open" and time.time() - self.opened_at >= self.cooldown_seconds:
+                self.state, self.successes = "half_open", 0
+            return self.state != "open"
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state == "half_open":
+                self.successes += 1
+                if self.successes >= self.success_threshold:
+                    self.state = "closed"
+            else:
+                self.state = "closed"
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state, self.opened_at = "open", time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures,
+                "opened_at": self.opened_at or None}
+
+
+def sanitize_url(url: str) -> str:
+    """Strip sensitive query parameters (API keys, tokens) from a URL before logging."""
+    try:
+        parsed = urlparse(url)
+        params = parse_qs(parsed.query, keep_blank_values=True)
+        sanitized = {
+            k: ["[REDACTED]"] if k.lower() in _SENSITIVE_PARAMS else v
+            for k, v in params.items()
+        }
+        clean_query = urlencode(
+            {k: v[0] if len(v) == 1 else v for k, v in sanitized.items()},
+            doseq=True,
+        )
+        return urlunparse(parsed._replace(query=clean_query))
+    except Exception:
+        # Fallback: regex strip common key patterns
+        return re.sub(r'([?&])(key|apikey|api_key|token|secret)=[^&]+', r'\1\2=[REDACTED]', url)
+
+
+class Outbox:
+    """SQLite outbox + pooled sender + per-host circuit breakers + replay worker."""
+
+    def __init__(self, db_path: str = None, session: requests.Session = None,
+                 config: _ResilienceConfig = None, replay_batch_size: int = 50, replay_concurrency: int = 4,
+                 autostart_replay: bool = True):
+        self.db_path = db_path or DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id TEXT PRIMARY KEY,
+                project TEXT NOT NULL,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                payload_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                response_code INTEGER,
+                latency_ms REAL,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+            CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        """)
+        self.config = config or _ResilienceConfig()
+        self.replay_batch_size = replay_batch_size
+        self.replay_concurrency = replay_concurrency
+        self.autostart_replay = autostart_replay
+        self.session = session or self._pooled_session()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _pooled_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    # ── Config ─────────────────────────────────────────────────────
+
+    def _retry_policy(self):
+        cfg = self.config.get()
+        backoff = cfg.get("n8n_backoff", {})
+        buffer_cfg = cfg.get("local_queue_buffer", {})
+        return (float(backoff.get("base_seconds", 30)), float(backoff.get("max_seconds", 300)),
+                int(buffer_cfg.get("max_retries", 10)))
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = urlparse(url).netloc or url
+        with self._breakers_lock:
+            cb = self._breakers.get(host)
+            if cb is None:
+                d = self.config.get().get("circuit_breaker_defaults", {})
+                cb = CircuitBreaker(int(d.get("failure_threshold", 3)), float(d.get("cooldown_seconds", 120)),
+                                    int(d.get("success_threshold", 2)))
+                self._breakers[host] = cb
+            return cb
+
+    # ── Settings (Safe-Buffer mode) ────────────────────────────────
+
+    def get_setting(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row["value"]) if row else default
+
+    def set_setting(self, key: str, value: Any):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def is_safe_buffer_mode(self) -> bool:
+        return bool(self.get_setting("safe_buffer_mode", False))
+
+    def set_safe_buffer_mode(self, enabled: bool):
+        self.set_setting("safe_buffer_mode", bool(enabled))
+        self.set_setting("safe_buffer_toggled_at", time.time())
+        if not enabled:
+            self._wake.set()
+
+    # ── Store ──────────────────────────────────────────────────────
+
+    def enqueue(self, url: str, payload: Any, project: str, status: str = "sending",
+                error: str = None) -> str:
+        """Record a message; 'sending' for an immediate send (counts as attempt 1), 'pending' to leave it to replay."""
+        entry_id = str(uuid.uuid4())
+        body = json.dumps(payload, sort_keys=True, default=str)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO outbox (id, project, url, payload, payload_hash, status, attempts,"
+                " created_at, updated_at, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry_id, project, url, body, hashlib.sha256(body.encode()).hexdigest()[:16], status,
+                 1 if status == "sending" else 0, now, now, error),
+            )
+        if status == "pending":
+            self.ensure_replay_worker()
+            self._wake.set()
+        return entry_id
+
+    def mark_sent(self, entry_id: str, status_code: int, latency_ms: float = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = 'sent', response_code = ?, latency_ms = ?, error = NULL,"
+                " updated_at = ? WHERE id = ?", (status_code, latency_ms, time.time(), entry_id))
+
+    def mark_failed(self, entry_id: str, error: str, status_code: int = None):
+        """Terminal failure (the target answered with an error)."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = 'failed', response_code = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status_code, str(error)[:200], time.time(), entry_id))
+
+    def schedule_retry(self, entry_id: str, error: str, status_code: int = None):
+        """Back off and hand the message to the replay worker, or dead-letter it."""
+        base, cap, max_retries = self._retry_policy()
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT attempts FROM outbox WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                return
+            attempts = row["attempts"]
+            if attempts >= max_retries:
+                self._db.execute(
+                    "UPDATE outbox SET status = 'dead', response_code = ?, error = ?, updated_at = ? WHERE id = ?",
+                    (status_code, str(error)[:200], now, entry_id))
+                logger.warning(f"Outbox {entry_id[:8]} dead-lettered after {attempts} attempts: {error}")
+                return
+            delay = min(cap, base * (2 ** (attempts - 1))) if attempts else 0.0
+            self._db.execute(
+                "UPDATE outbox SET status = 'pending', next_attempt_at = ?, response_code = ?, error = ?,"
+                " updated_at = ? WHERE id = ?",
+                (now + delay, status_code, str(error)[:200], now, entry_id))
+        self.ensure_replay_worker()
+
+    def claim_due(self, limit: int) -> List[Dict[str, Any]]:
+        """Atomically move up to `limit` due messages to 'sending' (safe across processes)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    "SELECT * FROM outbox WHERE (status = 'pending' AND next_attempt_at <= ?)"
+                    " OR (status = 'sending' AND updated_at < ?) ORDER BY next_attempt_at, created_at LIMIT ?",
+                    (now, now - STALE_SENDING_SECONDS, max(1, int(limit))),
+                ).fetchall()
+                for row in rows:
+                    self._db.execute(
+                        "UPDATE outbox SET status = 'sending', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (now, row["id"]))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return [dict(r, attempts=r["attempts"] + 1) for r in rows]
+
+    def next_due_in(self) -> Optional[float]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(next_attempt_at) AS t FROM outbox WHERE status = 'pending'").fetchone()
+        return None if row["t"] is None else max(0.0, row["t"] - time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {r["status"]: r["n"] for r in self._db.execute(
+                "SELECT status, COUNT(*) AS n FROM outbox GROUP BY status")}
+        return {
+            "total": sum(counts.values()),
+            "sending": counts.get("sending", 0),
+            "pending": counts.get("pending", 0),
+            "sent": counts.get("sent", 0),
+            "failed": counts.get("failed", 0),
+            "dead": counts.get("dead", 0),
+            "safe_buffer_mode": self.is_safe_buffer_mode(),
+            "breakers": {host: cb.snapshot() for host, cb in list(self._breakers.items())},
+        }
+
+    def recent(self, limit: int = 20, status: str = None) -> List[Dict[str, Any]]:
+        sql = "SELECT id, project, url, status, attempts, response_code, latency_ms, error, created_at FROM outbox"
+        args: tuple = ()
+        if status:
+            sql, args = sql + " WHERE status = ?", (status,)
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY created_at DESC LIMIT ?", args + (limit,)).fetchall()
+        return [dict(r, url=sanitize_url(r["url"])) for r in rows]
+
+    def purge_sent(self, keep: int = 1000) -> int:
+        """Drop all but the newest `keep` delivered messages."""
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND id NOT IN"
+                " (SELECT id FROM outbox WHERE status = 'sent' ORDER BY updated_at DESC LIMIT ?)", (keep,))
+        return cur.rowcount
+
+    def requeue(self, statuses=("dead",)) -> int:
+        """Give dead-lettered (and optionally 'failed') messages a fresh set of attempts."""
+        statuses = tuple(statuses)
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = 0, updated_at = ?"
+                f" WHERE status IN ({','.join('?' * len(statuses))})", (time.time(),) + statuses)
+        if cur.rowcount:
+            self._wake.set()
+        return cur.rowcount
+
+    def import_legacy_files(self, pending_dir: str = LEGACY_PENDING_DIR) -> int:
+        """Move pending_sync/*.json (written by the old _queue_to_disk) into the outbox.
+
+        A file is removed before its payload is enqueued, so one that cannot be
+        removed is left for the next import instead of being delivered twice.
+        """
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(pending_dir, "*.json"))):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if not isinstance(data, dict):
+                logger.warning(f"Skipping legacy pending_sync file {path}: not a JSON object")
+                continue
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not remove legacy pending_sync file {path}; leaving it for the next import: {e}")
+                continue
+            if data.get("url"):
+                self.enqueue(data["url"], data.get("payload", {}), data.get("project", "child_app"),
+                             status="pending", error="imported from pending_sync/")
+                imported += 1
+        if imported:
+            logger.info(f"Imported {imported} legacy pending_sync payloads into the outbox")
+        return imported
+
+    # ── Delivery ───────────────────────────────────────────────────
+
+    def post(self, url: str, payload: Any, project: str = "child_app", timeout: float = 60) -> str:
+        """safe_post contract: "sent" | "buffered" | "failed"."""
+        if self.is_safe_buffer_mode():
+            self.enqueue(url, payload, project, status="pending", error="Safe-Buffer mode active")
+            return "buffered"
+        cb = self.breaker(url)
+        if not cb.allow():
+            self.enqueue(url, payload, project, status="pending", error="Circuit open")
+            return "buffered"
+
+        entry_id = self.enqueue(url, payload, project)
+        outcome, code, detail = self._send(url, payload, timeout)
+        if outcome == "sent":
+            self.mark_sent(entry_id, code, detail)
+            return "sent"
+        if outcome == "server_error":
+            self.mark_failed(entry_id, f"Server Error: {code}", code)
+            return "failed"
+        self.schedule_retry(entry_id, detail)
+        return "buffered"
+
+    def _send(self, url: str, payload: Any, timeout: float, headers: Dict[str, str] = None):
+        """POST once and feed the host's breaker. Returns (outcome, status_code, latency_ms | error)."""
+        cb = self.breaker(url)
+        try:
+            start = time.time()
+            resp = self.session.post(url, json=payload, headers=headers, timeout=timeout)
+            latency = (time.time() - start) * 1000
+        except requests.exceptions.RequestException as e:
+            cb.record_failure()
+            return "unreachable", None, str(e)
+        if resp.status_code >= 500:
+            cb.record_failure()
+            return "server_error", resp.status_code, f"Server Error: {resp.status_code}"
+        cb.record_success()
+        return "sent", resp.status_code, latency
+
+    # ── Replay ─────────────────────────────────────────────────────
+
+    def replay(self, force: bool = False, timeout: float = 60) -> Dict[str, int]:
+        """Drain due messages in batches until none are due. `force` ignores open breakers."""
+        headers = {"Content-Type": "application/json"}
+        n8n_key = os.getenv("N8N_API_KEY", "")
+        if n8n_key:
+            headers["X-N8N-API-KEY"] = n8n_key
+        totals = {"synced": 0, "retrying": 0, "deferred": 0}
+        if force:
+            with self._lock:
+                self._db.execute("UPDATE outbox SET next_attempt_at = 0 WHERE status = 'pending'")
+
+        def deliver(row):
+            if not force and not self.breaker(row["url"]).allow():
+                # Host still cooling down: put it back without spending an attempt.
+                with self._lock:
+                    self._db.execute(
+                        "UPDATE outbox SET status = 'pending', attempts = attempts - 1, next_attempt_at = ?,"
+                        " updated_at = ? WHERE id = ?",
+                        (time.time() + self.breaker(row["url"]).cooldown_seconds, time.time(), row["id"]))
+                return "deferred"
+            outcome, code, detail = self._send(row["url"], json.loads(row["payload"]), timeout, headers)
+            if outcome == "sent":
+                self.mark_sent(row["id"], code, detail)
+                return "synced"
+            self.schedule_retry(row["id"], detail, code)
+            return "retrying"
+
+        with ThreadPoolExecutor(max_workers=self.replay_concurrency) as pool:
+            while not self._stop.is_set():
+                if self.is_safe_buffer_mode() and not force:
+                    break
+                batch = self.claim_due(self.replay_batch_size)
+                if not batch:
+                    break
+                for result in pool.map(deliver, batch):
+                    totals[result] += 1
+        if totals["synced"] or totals["retrying"]:
+            logger.info(f"Outbox replay: {totals['synced']} synced, {totals['retrying']} retrying, "
+                        f"{totals['deferred']} deferred")
+        return totals
+
+    def has_backlog(self) -> bool:
+        """True if a previous run left messages to replay (pending, stuck in 'sending', or legacy files)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM outbox WHERE status = 'pending' OR (status = 'sending' AND updated_at < ?) LIMIT 1",
+                (time.time() - STALE_SENDING_SECONDS,)).fetchone()
+        return row is not None or bool(glob.glob(os.path.join(LEGACY_PENDING_DIR, "*.json")))
+
+    def ensure_replay_worker(self):
+        if not self.autostart_replay:
+            return
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._replay_loop, daemon=True, name="OutboxReplay")
+            self._worker.start()
+
+    def _replay_loop(self):
+        rounds, imported = 0, False
+        while not self._stop.is_set():
+            try:
+                if not imported:
+                    imported = True
+                    self.import_legacy_files()
+                self.replay()
+                if rounds % 100 == 0:
+                    self.purge_sent()
+            except Exception as e:
+                logger.error(f"Outbox replay failed: {e}")
+            rounds += 1
+            wait = self.next_due_in()
+            self._wake.wait(timeout=60.0 if wait is None else min(60.0, max(0.05, wait)))
+            self._wake.clear()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def close(self):
+        self.stop()
+        self.session.close()
+        with self._lock:
+            self._db.close()
+
+
+_outbox: Optional[Outbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> Outbox:
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = Outbox()
+            # Messages left over from a previous run are replayed without waiting for a new failure.
+            if _outbox.has_backlog():
+                _outbox.ensure_replay_worker()
+        return _outbox
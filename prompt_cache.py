@@ -0,0 +1,206 @@
+"""
+prompt_cache.py — Content-addressed LLM response cache for model_router
+═════════════════════════════════════════════════════════════════════════
+Two tiers:
+  - memory: bounded LRU (OrderedDict) of recent responses
+  - disk:   SQLite (data/llm_cache.db, WAL) shared across restarts
+
+Entries are keyed on sha256(task_type, resolved model, system_prompt, prompt)
+and expire after a per-task TTL (see TASK_TTL). Caching is opt-in: a task
+type missing from TASK_TTL is not cached unless MODEL_ROUTER_CACHE_TTL sets
+a default. Empty responses are never cached, so a failed call is always
+retried.
+
+Set MODEL_ROUTER_CACHE=0 to disable caching process-wide, or pass
+use_cache=False to model_router.route()/route_async() for a single call.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger("PromptCache")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(SCRIPT_DIR, "data", "llm_cache.db")
+
+# TTL for task types not listed in TASK_TTL; 0 (the default) means uncached.
+DEFAULT_TTL = int(os.getenv("MODEL_ROUTER_CACHE_TTL", "0"))
+
+# Seconds a response stays valid, per task type. Only task types whose answer
+# may be reused across calls belong here; 0 disables caching.
+TASK_TTL = {
+    # War Room Agents — re-run debates on the same topic reuse answers briefly
+    "CEO": 900, "CMO": 900, "CFO": 900, "CRITIC": 900, "ARCHITECT": 900,
+    "general": 900,
+    "architect": 1800,
+
+    # Deliverable Generators — expensive, slow-changing
+    "market_intel": 6 * 3600,
+    "brand_identity": 6 * 3600,
+    "legal_analysis": 6 * 3600,
+    "financial_model": 6 * 3600,
+    "business_plan": 6 * 3600,
+    "funding_strategy": 6 * 3600,
+    "pitch_deck": 6 * 3600,
+    "implementation_plan": 3600,
+
+    # Conversational — callers expect a fresh reply every turn
+    "chat": 0,
+}
+
+
+def is_enabled() -> bool:
+    return os.getenv("MODEL_ROUTER_CACHE", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def ttl_for(task_type: str) -> int:
+    return TASK_TTL.get(task_type, DEFAULT_TTL)
+
+
+def make_key(task_type: str, model: str, system_prompt: str, prompt: str) -> str:
+    payload = json.dumps([task_type, model, system_prompt or "", prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """Memory LRU in front of a SQLite store, with hit/miss counters."""
+
+    def __init__(self, db_path: Optional[str] = DB_PATH, max_memory_entries: int = 512):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0,
+                       "stores": 0, "evictions": 0, "expired": 0}
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " task_type TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, expires_at: float, value: str) -> None:
+        self._mem[key] = (expires_at, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_memory_entries:
+            self._mem.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None:
+                if hit[0] > now:
+                    self._mem.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return hit[1]
+                del self._mem[key]
+                self._stats["expired"] += 1
+
+            try:
+                db = self._db()
+                row = db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone() if db else None
+            except sqlite3.Error as e:
+                logger.warning(f"[PromptCache] disk lookup failed: {e}")
+                row = None
+
+            if row is not None and row[1] > now:
+                self._remember(key, row[1], row[0])
+                self._stats["disk_hits"] += 1
+                return row[0]
+            if row is not None:
+                self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: str, ttl: int, task_type: str = "") -> None:
+        if not value or ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._stats["stores"] += 1
+            try:
+                db = self._db()
+                if db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO llm_cache (key, task_type, value, created_at, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, task_type, value, now, expires_at),
+                    )
+                    db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[PromptCache] disk store failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Drop expired rows from both tiers. Returns disk rows removed."""
+        now = time.time()
+        with self._lock:
+            for k in [k for k, (exp, _) in self._mem.items() if exp <= now]:
+                del self._mem[k]
+            db = self._db()
+            if not db:
+                return 0
+            cur = db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            db.commit()
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            db = self._db()
+            if db:
+                db.execute("DELETE FROM llm_cache")
+                db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = dict(self._stats)
+            s["memory_entries"] = len(self._mem)
+        hits = s["memory_hits"] + s["disk_hits"]
+        lookups = hits + s["misses"]
+        s["hits"] = hits
+        s["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        s["enabled"] = is_enabled()
+        return s
+
+
+# ═══════════════════════════════════════════════════════════════
+# SINGLETON
+# ═══════════════════════════════════════════════════════════════
+
+_cache = None
+
+
+def get_prompt_cache() -> PromptCache:
+    global _cache
+    if _cache is None:
+        _cache = PromptCache()
+    return _cache
@@ -1,14 +1,14 @@
 """
 recovery_sync.py — Local-to-Cloud Recovery Sync Engine
 ═══════════════════════════════════════════════════════
-Reads buffered/pending payloads from local_pending_sync.json,
-validates cloud health via Resonance_Watchdog_V3, retransmits
-payloads to their original n8n target URLs, and archives
-successful syncs.
+Manual front-end to the durable outbox (outbox.py). The outbox's replay
+worker already retransmits buffered payloads in batches with exponential
+backoff; this CLI drains it on demand, shows the buffer, and imports any
+legacy pending_sync/*.json files first.
 
 Usage:
-    python recovery_sync.py              # Sync pending entries (requires healthy watchdog)
-    python recovery_sync.py --force      # Force sync even if watchdog is unhealthy
+    python recovery_sync.py              # Replay due entries (hosts with an open breaker are deferred)
+    python recovery_sync.py --force      # Replay everything now, incl. failed/dead-lettered entries
     python recovery_sync.py --status     # Show buffer status only
 
 Part of System Hardening V3.0 — Recovery Suite.
@@ -16,24 +16,13 @@ Part of System Hardening V3.0 — Recovery Suite.
 
 import os
 import sys
-import json
-import time
-import glob
-import shutil
 import argparse
-import requests
 from datetime import datetime
 
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Paths
-STATE_FILE = os.path.join(SCRIPT_DIR, "local_pending_sync.json")
-ARCHIVE_FILE = os.path.join(SCRIPT_DIR, "synced_archive.json")
-PENDING_DIR = os.path.join(SCRIPT_DIR, "pending_sync")
-RESILIENCE_CFG = os.path.join(SCRIPT_DIR, "resilience_config.json")
-
 # Load env
 try:
     from dotenv import load_dotenv
@@ -41,272 +30,77 @@ try:
 except ImportError:
     pass
 
-N8N_API_KEY = os.getenv("N8N_API_KEY", "")
+from outbox import Outbox, get_outbox  # noqa: E402
 
 
 def timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
 
 
-def load_config() -> dict:
-    """Load resilience config for watchdog URL."""
-    if os.path.exists(RESILIENCE_CFG):
-        with open(RESILIENCE_CFG, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-
-def load_state() -> dict:
-    """Load the local pending sync state."""
-    if not os.path.exists(STATE_FILE):
-        return {"entries": [], "pending_count": 0, "safe_buffer_mode": False}
-    try:
-        with open(STATE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return {"entries": [], "pending_count": 0, "safe_buffer_mode": False}
-
-
-def save_state(state: dict):
-    """Write state back to disk."""
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2, default=str)
-
-
-def load_archive() -> list:
-    """Load the synced archive."""
-    if not os.path.exists(ARCHIVE_FILE):
-        return []
-    try:
-        with open(ARCHIVE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
-
-
-def save_archive(archive: list):
-    """Write archive to disk."""
-    with open(ARCHIVE_FILE, "w", encoding="utf-8") as f:
-        json.dump(archive, f, indent=2, default=str)
-
-
-def ping_watchdog() -> tuple:
-    """Ping the Resonance_Watchdog_V3 and return (healthy: bool, latency_ms: float)."""
-    cfg = load_config()
-    url = cfg.get("cloud_health", {}).get("watchdog_url", "")
-    if not url:
-        return False, 0.0
-
-    try:
-        start = time.time()
-        r = requests.get(url, timeout=5)
-        ms = (time.time() - start) * 1000
-        return r.status_code == 200, ms
-    except Exception:
-        return False, 0.0
-
-
-def collect_pending() -> list:
-    """Collect all recoverable payloads from state file + pending_sync/ directory."""
-    items = []
-
-    # 1. From local_pending_sync.json entries
-    state = load_state()
-    for entry in state.get("entries", []):
-        if entry.get("status") in ("pending", "failed", "buffered"):
-            items.append({
-                "source": "state",
-                "id": entry.get("id", "?"),
-                "url": entry.get("url", ""),
-                "project": entry.get("project", "?"),
-                "timestamp": entry.get("timestamp", "?"),
-                "entry": entry,
-            })
-
-    # 2. From pending_sync/ directory (queued files)
-    if os.path.exists(PENDING_DIR):
-        for fpath in sorted(glob.glob(os.path.join(PENDING_DIR, "*.json"))):
-            try:
-                with open(fpath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                items.append({
-                    "source": "file",
-                    "id": os.path.basename(fpath),
-                    "url": data.get("url", ""),
-                    "payload": data.get("payload", {}),
-                    "project": data.get("project", "?"),
-                    "timestamp": data.get("queued_at", "?"),
-                    "filepath": fpath,
-                })
-            except Exception:
-                continue
-
-    return items
-
-
-def transmit_payload(url: str, payload: dict) -> tuple:
-    """POST a payload to its target URL. Returns (success: bool, status_code: int, latency_ms: float)."""
-    headers = {"Content-Type": "application/json"}
-    if N8N_API_KEY:
-        headers["X-N8N-API-KEY"] = N8N_API_KEY
-
-    try:
-        start = time.time()
-        r = requests.post(url, json=payload, headers=headers, timeout=60)
-        ms = (time.time() - start) * 1000
-        return r.status_code == 200, r.status_code, ms
-    except Exception as e:
-        return False, 0, 0.0
-
-
-def archive_entry(entry: dict, status_code: int, latency_ms: float):
-    """Move a synced entry to synced_archive.json."""
-    archive = load_archive()
-    archive.append({
-        "id": entry.get("id", "?"),
-        "url": entry.get("url", ""),
-        "project": entry.get("project", "?"),
-        "original_timestamp": entry.get("timestamp", "?"),
-        "synced_at": datetime.now().isoformat(),
-        "response_code": status_code,
-        "latency_ms": latency_ms,
-        "status": "synced",
-    })
-    save_archive(archive)
-
-
-def run_sync(force: bool = False):
+def run_sync(force: bool = False, outbox: Outbox = None):
     """Main sync execution."""
+    outbox = outbox or get_outbox()
     print(f"\n{'='*60}")
     print(f"  Recovery Sync Engine — V3.0")
     print(f"  {timestamp()}")
     print(f"{'='*60}\n")
 
-    # Step 1: Ping watchdog
-    healthy, wdog_ms = ping_watchdog()
-    icon = "🟢" if healthy else "🔴"
-    print(f"  Watchdog:  {icon} {'HEALTHY' if healthy else 'UNHEALTHY'} ({wdog_ms:.0f}ms)")
-
-    if not healthy and not force:
-        print(f"\n  ❌ Cloud is unhealthy. Use --force to sync anyway.")
-        print(f"{'='*60}\n")
-        return {"synced": 0, "failed": 0, "buffer_size": len(collect_pending())}
-
-    if not healthy and force:
-        print(f"  ⚠️ Forcing sync despite unhealthy watchdog...")
-
-    # Step 2: Collect pending items
-    pending = collect_pending()
-    print(f"  Buffer:    📦 {len(pending)} items\n")
-
-    if not pending:
-        print(f"  ✅ Buffer is empty — nothing to sync.")
-        # Disable Safe-Buffer mode if it was on
-        try:
-            from local_state_manager import StateManager
-            sm = StateManager()
-            if sm.is_safe_buffer_mode():
-                sm.set_safe_buffer_mode(False)
-                print(f"  ✅ Safe-Buffer mode disabled (cloud recovered)")
-        except ImportError:
-            pass
-        print(f"{'='*60}\n")
-        return {"synced": 0, "failed": 0, "buffer_size": 0}
-
-    # Step 3: Transmit each payload
-    synced = 0
-    failed = 0
-    state = load_state()
+    imported = outbox.import_legacy_files()
+    if imported:
+        print(f"  Imported:  📥 {imported} legacy pending_sync/ files")
+    if force:
+        requeued = outbox.requeue(("failed", "dead"))
+        if requeued:
+            print(f"  Requeued:  🔁 {requeued} failed/dead-lettered entries")
+        if outbox.is_safe_buffer_mode():
+            print(f"  ⚠️ Forcing sync despite Safe-Buffer mode...")
 
-    for item in pending:
-        source = item["source"]
-        project = item.get("project", "?")
-        url = item.get("url", "")
+    stats = outbox.stats()
+    print(f"  Buffer:    📦 {stats['pending'] + stats['sending']} items\n")
 
-        if not url:
-            print(f"  ⏭️ [{project}] No URL — skipping")
-            continue
-
-        # Get payload
-        if source == "file":
-            payload = item.get("payload", {})
-        else:
-            # State entries don't store payloads (only hashes) — skip
-            print(f"  ⏭️ [{project}] State entry (no payload stored) — marking synced")
-            for e in state.get("entries", []):
-                if e.get("id") == item["id"]:
-                    e["status"] = "synced"
-                    e["synced_at"] = datetime.now().isoformat()
-            synced += 1
-            continue
-
-        print(f"  📤 [{project}] → {url[:60]}...", end=" ", flush=True)
-        success, code, ms = transmit_payload(url, payload)
-
-        if success:
-            print(f"✅ {code} ({ms:.0f}ms)")
-            synced += 1
-            archive_entry(item, code, ms)
-
-            # Remove the pending_sync file
-            if "filepath" in item and os.path.exists(item["filepath"]):
-                os.remove(item["filepath"])
-        else:
-            print(f"❌ {code}")
-            failed += 1
-
-    # Step 4: Update state
-    state["pending_count"] = sum(
-        1 for e in state.get("entries", []) if e.get("status") in ("pending", "failed", "buffered")
-    )
-    save_state(state)
+    totals = outbox.replay(force=force)
+    remaining = outbox.stats()
+    buffer_size = remaining["pending"] + remaining["sending"]
 
     # Disable Safe-Buffer if everything synced
-    if failed == 0 and healthy:
-        try:
-            from local_state_manager import StateManager
-            sm = StateManager()
-            if sm.is_safe_buffer_mode():
-                sm.set_safe_buffer_mode(False)
-                print(f"\n  ✅ Safe-Buffer mode disabled (all synced)")
-        except ImportError:
-            pass
+    if buffer_size == 0 and outbox.is_safe_buffer_mode():
+        outbox.set_safe_buffer_mode(False)
+        print(f"  ✅ Safe-Buffer mode disabled (all synced)")
 
-    # Summary
-    remaining = len(collect_pending())
-    print(f"\n{'='*60}")
+    print(f"{'='*60}")
     print(f"  RECOVERY SYNC SUMMARY")
     print(f"{'='*60}")
-    print(f"  Total Synced:      {synced}")
-    print(f"  Failed Retries:    {failed}")
-    print(f"  Current Buffer:    {remaining} items remaining")
+    print(f"  Total Synced:      {totals['synced']}")
+    print(f"  Failed Retries:    {totals['retrying']}")
+    print(f"  Deferred (breaker):{totals['deferred']:>3}")
+    print(f"  Dead-lettered:     {remaining['dead']}")
+    print(f"  Current Buffer:    {buffer_size} items remaining")
     print(f"{'='*60}\n")
 
-    return {"synced": synced, "failed": failed, "buffer_size": remaining}
+    return {"synced": totals["synced"], "failed": totals["retrying"], "buffer_size": buffer_size}
 
 
-def show_status():
+def show_status(outbox: Outbox = None):
     """Display current buffer status without syncing."""
+    outbox = outbox or get_outbox()
+    stats = outbox.stats()
     print(f"\n{'='*60}")
     print(f"  Recovery Sync — Buffer Status")
     print(f"{'='*60}\n")
 
-    pending = collect_pending()
-    state = load_state()
-    archive = load_archive()
-
-    healthy, wdog_ms = ping_watchdog()
-    safe_buffer = state.get("safe_buffer_mode", False)
-
-    print(f"  Watchdog:        {'🟢' if healthy else '🔴'} {'HEALTHY' if healthy else 'UNHEALTHY'} ({wdog_ms:.0f}ms)")
-    print(f"  Safe-Buffer:     {'🛡️ ACTIVE' if safe_buffer else '✅ OFF'}")
-    print(f"  Pending:         {len(pending)} items")
-    print(f"  Archived:        {len(archive)} items")
+    print(f"  Safe-Buffer:     {'🛡️ ACTIVE' if stats['safe_buffer_mode'] else '✅ OFF'}")
+    print(f"  Pending:         {stats['pending'] + stats['sending']} items")
+    print(f"  Sent:            {stats['sent']} items")
+    print(f"  Failed / Dead:   {stats['failed']} / {stats['dead']}")
+    for host, cb in stats["breakers"].items():
+        print(f"  Breaker:         {'🔴' if cb['state'] == 'open' else '🟢'} {host} ({cb['state']})")
 
+    pending = outbox.recent(limit=20, status="pending")
     if pending:
         print(f"\n  Pending items:")
         for p in pending:
-            print(f"    [{p['source']}] {p['project']} @ {p['timestamp']} → {p['url'][:50]}")
+            queued = datetime.fromtimestamp(p["created_at"]).strftime("%Y-%m-%dT%H:%M:%S")
+            print(f"    {p['project']} @ {queued} (attempts {p['attempts']}) → {p['url'][:50]}")
 
     print(f"\n{'='*60}\n")
 
@@ -315,7 +109,7 @@ def show_status():
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Recovery Sync Engine — V3.0")
     parser.add_argument("--force", action="store_true",
-                        help="Force sync even if watchdog is unhealthy")
+                        help="Replay everything now, including failed and dead-lettered entries")
     parser.add_argument("--status", action="store_true",
                         help="Show buffer status without syncing")
     args = parser.parse_args()
@@ -0,0 +1,244 @@
+"""
+registry_service.py — In-process registry.json service
+═══════════════════════════════════════════════════════
+Single owner of the factory registry (registry.json) inside a process.
+
+  • Reads are served from a parsed copy that is revalidated with one os.stat
+    (mtime + size), so endpoints no longer re-open and re-parse the file.
+  • Writes go through update(): the mutation runs on the freshest on-disk
+    state under a thread lock plus an advisory file lock (registry.json.lock,
+    fcntl / msvcrt), and the result is written to a temp file and swapped in
+    with os.replace, so readers in other processes never see a torn file.
+  • Subscribers are told which apps changed, whether the change came from an
+    update() here or from another process rewriting the file.
+
+Usage:
+    from registry_service import get_registry_service
+    svc = get_registry_service()
+    port = (svc.get_app("CFO_Agent") or {}).get("port")
+    svc.update(lambda reg: reg["apps"].setdefault("NewApp", {"status": "scaffolding"}))
+
+Author: Antigravity Master Architect
+Version: 1.0.0
+"""
+
+import os
+import copy
+import json
+import time
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger("RegistryService")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_PATH = os.path.join(SCRIPT_DIR, "registry.json")
+LOCK_TIMEOUT_SECONDS = 10.0
+
+Subscriber = Callable[[dict, Set[str]], None]
+
+
+def _empty_registry() -> dict:
+    return {"services": {}, "apps": {}, "last_updated": ""}
+
+
+@contextmanager
+def _file_lock(lock_path: str, timeout: float = LOCK_TIMEOUT_SECONDS):
+    """Advisory exclusive lock shared with other processes that use this module."""
+    with open(lock_path, "a+b") as fh:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for {lock_path}")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _changed_apps(old: Optional[dict], new: dict) -> Set[str]:
+    old_apps = (old or {}).get("apps", {}) or {}
+    new_apps = new.get("apps", {}) or {}
+    if not isinstance(old_apps, dict) or not isinstance(new_apps, dict):
+        return set()
+    return {name for name in old_apps.keys() | new_apps.keys() if old_apps.get(name) != new_apps.get(name)}
+
+
+class RegistryService:
+    """mtime-validated cache and serialized, atomic writer for one registry file."""
+
+    def __init__(self, path: str = REGISTRY_PATH):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self._lock = threading.RLock()
+        self._data: Optional[dict] = None
+        self._sig: Optional[Tuple[int, int]] = None
+        self._subscribers: list = []
+        self.reloads = 0
+        self.writes = 0
+
+    # ── Reads ──────────────────────────────────────────────
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self) -> Tuple[dict, Set[str]]:
+        """Reload if the file changed on disk. Returns (data, apps changed by the reload)."""
+        sig = self._stat()
+        if sig is None:
+            raise FileNotFoundError(self.path)
+        if sig == self._sig and self._data is not None:
+            return self._data, set()
+        try:
+            with open(self.path, "r", encoding="utf-8-sig") as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            # A non-atomic writer elsewhere may be mid-write; serve the last good copy.
+            if self._data is None:
+                raise
+            logger.warning("registry.json is not valid JSON; serving the cached copy")
+            return self._data, set()
+        changed = _changed_apps(self._data, data) if self._data is not None else set()
+        self._data, self._sig = data, sig
+        self.reloads += 1
+        return data, changed
+
+    def snapshot(self) -> dict:
+        """The cached parsed registry. Shared between callers: treat it as read-only.
+
+        Raises FileNotFoundError / json.JSONDecodeError like json.load on the file would.
+        """
+        with self._lock:
+            data, changed = self._refresh()
+        if changed:
+            self._notify(data, changed)
+        return data
+
+    def read(self) -> dict:
+        """A private deep copy of the registry, safe to mutate."""
+        return copy.deepcopy(self.snapshot())
+
+    def get_app(self, name: str) -> Optional[dict]:
+        """Copy of one app entry, or None when the app (or the registry) is missing."""
+        try:
+            info = self.snapshot().get("apps", {}).get(name)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return copy.deepcopy(info) if isinstance(info, dict) else None
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the file does; usable as an ETag."""
+        sig = self._stat()
+        return "missing" if sig is None else f"{sig[0]:x}-{sig[1]:x}"
+
+    # ── Writes ─────────────────────────────────────────────
+
+    def update(self, mutate: Callable[[dict], Optional[bool]]) -> dict:
+        """Apply mutate(registry) to the latest state and persist it atomically.
+
+        mutate edits the dict in place; returning False skips the write. A
+        missing or unreadable file starts from an empty registry, as the old
+        _update_registry did. Returns the registry as written.
+        """
+        with self._lock, _file_lock(self.lock_path):
+            try:
+                current, changed = self._refresh()
+            except (FileNotFoundError, json.JSONDecodeError):
+                current, changed = None, set()
+            data = copy.deepcopy(current) if current is not None else _empty_registry()
+            if mutate(data) is not False:
+                self._write(data)
+                changed |= _changed_apps(current, data)
+                self._data, self._sig = data, self._stat()
+        if changed:
+            self._notify(data, changed)
+        return data
+
+    def _write(self, data: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=".registry.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            for attempt in range(5):
+                try:
+                    os.replace(tmp, self.path)
+                    break
+                except PermissionError:
+                    # Windows refuses the swap while another process holds the file open.
+                    if attempt == 4:
+                        raise
+                    time.sleep(0.05 * (attempt + 1))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        self.writes += 1
+
+    # ── Change notifications ───────────────────────────────
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        """Call callback(registry, changed_app_names) after every change. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _notify(self, data: dict, changed: Set[str]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(data, changed)
+            except Exception as e:
+                logger.error(f"Registry subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def stats(self) -> Dict:
+        return {"path": self.path, "version": self.version, "reloads": self.reloads,
+                "writes": self.writes, "subscribers": len(self._subscribers)}
+
+
+_services: Dict[str, RegistryService] = {}
+_services_lock = threading.Lock()
+
+
+def get_registry_service(path: str = REGISTRY_PATH) -> RegistryService:
+    """Process-wide service for the registry at path (one instance per file)."""
+    key = os.path.abspath(path)
+    with _services_lock:
+        if key not in _services:
+            _services[key] = RegistryService(key)
+        return _services[key]
@@ -1,35 +1,80 @@
 import asyncio
+import os
+import socket
 import httpx
 
-QUEUE_URL = "http://127.0.0.1:5052/v1/queue/dequeue"
+QUEUE_BASE_URL = "http://127.0.0.1:5052/v1/queue"
 MASTER_ARCHITECT_URL = "http://127.0.0.1:5050/api/review"
 
-async def consume_queue():
-    print("[SENTINEL CONSUMER] ONLINE. Bridging Port 5052 (Queue) -> Port 5050 (Architect)...")
-    async with httpx.AsyncClient(timeout=300.0) as client:  # 5-min timeout for complex architectures
+CONSUMERS = int(os.getenv("SENTINEL_CONSUMERS", "4"))
+LONG_POLL_SECONDS = 25.0
+VISIBILITY_TIMEOUT = 120.0  # renewed every third of this while the Architect works
+
+
+async def _keep_lease(client: httpx.AsyncClient, task: dict):
+    """Heartbeat the lease so a long Architect review is not redelivered mid-flight."""
+    while True:
+        await asyncio.sleep(VISIBILITY_TIMEOUT / 3)
+        try:
+            await client.post(f"{QUEUE_BASE_URL}/extend", json={
+                "task_id": task["task_id"], "lease_token": task["lease_token"],
+                "visibility_timeout": VISIBILITY_TIMEOUT})
+        except httpx.RequestError:
+            pass
+
+
+async def _process(client: httpx.AsyncClient, name: str, task: dict):
+    print(f"[SENTINEL CONSUMER:{name}] Leased task {task['task_id']} from {task.get('source_node')} "
+          f"(attempt {task.get('attempts')}/{task.get('max_attempts')}). Forwarding to Master Architect...")
+    lease = {"task_id": task["task_id"], "lease_token": task["lease_token"]}
+    heartbeat = asyncio.create_task(_keep_lease(client, task))
+    try:
+        # 5-min timeout for complex architectures
+        ma_response = await client.post(MASTER_ARCHITECT_URL, json=task.get("payload", {}), timeout=300.0)
+        error = None if ma_response.is_success else f"Master Architect returned {ma_response.status_code}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        heartbeat.cancel()
+
+    if error is None:
+        await client.post(f"{QUEUE_BASE_URL}/ack", json=lease)
+        print(f"[SENTINEL CONSUMER:{name}] Master Architect processing complete. Task {task['task_id']} acked.")
+    else:
+        res = await client.post(f"{QUEUE_BASE_URL}/nack", json={**lease, "error": error})
+        status = res.json().get("status") if res.is_success else "lease lost"
+        print(f"[SENTINEL CONSUMER:{name}] Task {task['task_id']} failed ({error}) -> {status}")
+
+
+async def consume_queue(name: str = "worker-0"):
+    """One consumer: long-poll for a task, forward it, ack or nack, repeat."""
+    consumer_id = f"{socket.gethostname()}:{os.getpid()}:{name}"
+    async with httpx.AsyncClient(timeout=LONG_POLL_SECONDS + 10.0) as client:
         while True:
             try:
-                response = await client.get(QUEUE_URL)
+                response = await client.get(f"{QUEUE_BASE_URL}/dequeue", params={
+                    "wait": LONG_POLL_SECONDS, "visibility_timeout": VISIBILITY_TIMEOUT,
+                    "consumer": consumer_id})
                 if response.status_code == 200:
-                    task_data = response.json().get("task", {})
-                    print(f"[SENTINEL CONSUMER] Dequeued task from {task_data.get('source_node')}. Forwarding to Master Architect...")
-                    
-                    # Force synchronous await on Master Architect processing
-                    ma_response = await client.post(MASTER_ARCHITECT_URL, json=task_data.get("payload", {}))
-                    print(f"[SENTINEL CONSUMER] Master Architect processing complete. Status: {ma_response.status_code}")
-                    
+                    await _process(client, name, response.json()["task"])
                 elif response.status_code == 404:
-                    # Queue empty, fall into CPU-idle hibernation
-                    await asyncio.sleep(2.0)
+                    # Long-poll expired with the queue empty; ask again straight away.
+                    continue
                 else:
-                    print(f"[SENTINEL CONSUMER] Anomalous queue response: {response.status_code}")
+                    print(f"[SENTINEL CONSUMER:{name}] Anomalous queue response: {response.status_code}")
                     await asyncio.sleep(5.0)
             except httpx.RequestError as e:
-                print(f"[SENTINEL CONSUMER] Network fracture detected: {e}. Retrying in 5s...")
+                print(f"[SENTINEL CONSUMER:{name}] Network fracture detected: {e}. Retrying in 5s...")
                 await asyncio.sleep(5.0)
             except Exception as e:
-                print(f"[SENTINEL CONSUMER] Fatal Execution Error: {e}")
+                print(f"[SENTINEL CONSUMER:{name}] Fatal Execution Error: {e}")
                 await asyncio.sleep(5.0)
 
+
+async def run_consumers(count: int = CONSUMERS):
+    print(f"[SENTINEL CONSUMER] ONLINE. Bridging Port 5052 (Queue) -> Port 5050 (Architect) with {count} consumers...")
+    await asyncio.gather(*(consume_queue(f"worker-{i}") for i in range(count)))
+
+
 if __name__ == "__main__":
-    asyncio.run(consume_queue())
+    asyncio.run(run_consumers())
@@ -1,32 +1,159 @@
 import asyncio
+import time
 from fastapi import FastAPI, HTTPException
 import uvicorn
-from pydantic import BaseModel
-from typing import Any, Dict
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
 
-app = FastAPI(title="Sentinel Queue Broker", version="1.0.0")
+from sentinel_queue_store import DEFAULT_MAX_ATTEMPTS, DEFAULT_VISIBILITY_TIMEOUT, get_queue_store
+
+app = FastAPI(title="Sentinel Queue Broker", version="2.0.0")
+
+# Long-poll wakeup: dequeue waiters hold the current event; enqueue swaps in a
+# fresh one and sets the old, so a task added between a waiter's empty lease
+# and its wait() is never missed.
+_work_available: Optional[asyncio.Event] = None
+_work_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Expired leases are only noticed on a lease attempt, so idle waiters re-check this often.
+LEASE_RECHECK_SECONDS = 1.0
+MAX_LONG_POLL_SECONDS = 60.0
+
+# Acked tasks are kept DONE_RETENTION_SECONDS for inspection, then purged by an
+# idle dequeue at most once per PURGE_INTERVAL_SECONDS.
+DONE_RETENTION_SECONDS = 86400.0
+PURGE_INTERVAL_SECONDS = 3600.0
+_last_purge: Optional[float] = None
 
-task_queue = asyncio.Queue()
 
 class TaskPayload(BaseModel):
     source_node: str
     task_type: str
     payload: Dict[str, Any]
+    priority: int = 0
+    max_attempts: int = Field(DEFAULT_MAX_ATTEMPTS, ge=1)
+    delay: float = Field(0.0, ge=0)
+
+
+class LeaseRef(BaseModel):
+    task_id: int
+    lease_token: str
+
+
+class NackPayload(LeaseRef):
+    error: Optional[str] = None
+    delay: Optional[float] = Field(None, ge=0)
+
+
+class ExtendPayload(LeaseRef):
+    visibility_timeout: float = Field(DEFAULT_VISIBILITY_TIMEOUT, gt=0)
+
+
+def _work_event() -> asyncio.Event:
+    global _work_available, _work_loop
+    # Events bind to the loop that first waits on them; start over on a new loop.
+    loop = asyncio.get_running_loop()
+    if _work_available is None or _work_loop is not loop:
+        _work_available, _work_loop = asyncio.Event(), loop
+    return _work_available
+
+
+def _notify_work():
+    global _work_available
+    event, _work_available = _work_event(), asyncio.Event()
+    event.set()
+
+
+async def _purge_if_due(store):
+    """Drop old acked tasks; called when a dequeue finds the queue idle."""
+    global _last_purge
+    now = time.monotonic()
+    if _last_purge is not None and now - _last_purge < PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    purged = await asyncio.to_thread(store.purge_done, DONE_RETENTION_SECONDS)
+    if purged:
+        print(f"[SENTINEL QUEUE] Purged {purged} acked task(s) older than {DONE_RETENTION_SECONDS:g}s.")
+
 
 @app.post("/v1/queue/enqueue")
 async def enqueue_task(task: TaskPayload):
-    await task_queue.put(task.model_dump())
-    print(f"[SENTINEL QUEUE] Task ingested from {task.source_node}. Queue depth: {task_queue.qsize()}")
-    return {"status": "queued", "queue_depth": task_queue.qsize()}
+    store = get_queue_store()
+    task_id = await asyncio.to_thread(store.enqueue, task.source_node, task.task_type, task.payload,
+                                      task.priority, task.max_attempts, task.delay)
+    _notify_work()
+    depth = await asyncio.to_thread(store.depth)
+    print(f"[SENTINEL QUEUE] Task {task_id} ingested from {task.source_node}. Queue depth: {depth}")
+    return {"status": "queued", "task_id": task_id, "queue_depth": depth}
+
 
 @app.get("/v1/queue/dequeue")
-async def dequeue_task():
-    if task_queue.empty():
-        raise HTTPException(status_code=404, detail="Queue empty")
-    task = await task_queue.get()
-    task_queue.task_done()
-    print(f"[SENTINEL QUEUE] Task dispatched to Master Architect.")
-    return {"status": "success", "task": task}
+async def dequeue_task(wait: float = 0.0, max_tasks: int = 1,
+                       visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT, consumer: Optional[str] = None):
+    """Lease up to max_tasks tasks. With wait > 0, hold the request open until work arrives.
+
+    Leased tasks must be acked (or nacked) before visibility_timeout seconds,
+    otherwise they are redelivered.
+    """
+    store = get_queue_store()
+    deadline = time.monotonic() + min(max(wait, 0.0), MAX_LONG_POLL_SECONDS)
+    while True:
+        event = _work_event()
+        tasks = await asyncio.to_thread(store.lease, max_tasks, visibility_timeout, consumer)
+        if tasks:
+            print(f"[SENTINEL QUEUE] {len(tasks)} task(s) leased to {consumer or 'consumer'}.")
+            return {"status": "success", "task": tasks[0], "tasks": tasks}
+        await _purge_if_due(store)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise HTTPException(status_code=404, detail="Queue empty")
+        try:
+            await asyncio.wait_for(event.wait(), timeout=min(remaining, LEASE_RECHECK_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+
+
+@app.post("/v1/queue/ack")
+async def ack_task(ref: LeaseRef):
+    if not await asyncio.to_thread(get_queue_store().ack, ref.task_id, ref.lease_token):
+        raise HTTPException(status_code=409, detail="Lease not held (expired or already settled)")
+    return {"status": "acked", "task_id": ref.task_id}
+
+
+@app.post("/v1/queue/nack")
+async def nack_task(ref: NackPayload):
+    status = await asyncio.to_thread(get_queue_store().nack, ref.task_id, ref.lease_token, ref.error, ref.delay)
+    if status is None:
+        raise HTTPException(status_code=409, detail="Lease not held (expired or already settled)")
+    if status == "ready":
+        _notify_work()
+    return {"status": status, "task_id": ref.task_id}
+
+
+@app.post("/v1/queue/extend")
+async def extend_lease(ref: ExtendPayload):
+    if not await asyncio.to_thread(get_queue_store().extend, ref.task_id, ref.lease_token, ref.visibility_timeout):
+        raise HTTPException(status_code=409, detail="Lease not held (expired or already settled)")
+    return {"status": "extended", "task_id": ref.task_id}
+
+
+@app.get("/v1/queue/stats")
+async def queue_stats():
+    return await asyncio.to_thread(get_queue_store().stats)
+
+
+@app.get("/v1/queue/dead")
+async def dead_letters(limit: int = 100):
+    return {"tasks": await asyncio.to_thread(get_queue_store().dead_letters, limit)}
+
+
+@app.post("/v1/queue/dead/{task_id}/requeue")
+async def requeue_dead_letter(task_id: int):
+    if not await asyncio.to_thread(get_queue_store().requeue_dead, task_id):
+        raise HTTPException(status_code=404, detail="No dead-lettered task with that id")
+    _notify_work()
+    return {"status": "queued", "task_id": task_id}
+
 
 if __name__ == '__main__':
     print("[SENTINEL QUEUE] ONLINE. Saturation Governors active on port 5052...")
@@ -0,0 +1,250 @@
+"""
+sentinel_queue_store.py — Durable task queue behind the Sentinel Queue Broker
+═══════════════════════════════════════════════════════════════════════════════
+SQLite (data/sentinel_queue.db, WAL) so queued work survives a broker restart.
+
+Lifecycle of a task:
+  ready ──lease()──▶ leased ──ack()──▶ done
+                       │
+                       ├─nack()──▶ ready (after a backoff delay)
+                       ├─lease expires──▶ ready (redelivered to another consumer)
+                       └─attempts exhausted──▶ dead (dead-letter, see requeue_dead)
+
+Higher priority is delivered first, FIFO within a priority. Every lease carries
+a token; ack/nack/extend with a stale token (the lease expired and the task was
+reclaimed for redelivery) are rejected.
+
+Author: Antigravity Master Architect
+Version: 1.0.0
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("SentinelQueue")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.getenv("SENTINEL_QUEUE_DB", os.path.join(SCRIPT_DIR, "data", "sentinel_queue.db"))
+
+DEFAULT_VISIBILITY_TIMEOUT = 300.0   # seconds a consumer owns a leased task
+DEFAULT_MAX_ATTEMPTS = 5
+MAX_RETRY_DELAY = 60.0
+
+
+class SentinelQueueStore:
+    """SQLite-backed queue with priorities, visibility-timeout leases and dead-lettering."""
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_node TEXT NOT NULL,
+                task_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'ready',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                enqueued_at REAL NOT NULL,
+                available_at REAL NOT NULL,
+                lease_token TEXT,
+                lease_expires REAL,
+                consumer TEXT,
+                finished_at REAL,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_ready ON tasks (status, priority DESC, id);
+            CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (status, lease_expires);
+        """)
+
+    # ── Producers ──────────────────────────────────────────────────
+
+    def enqueue(self, source_node: str, task_type: str, payload: Dict[str, Any], priority: int = 0,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay: float = 0.0) -> int:
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO tasks (source_node, task_type, payload, priority, max_attempts, "
+                "enqueued_at, available_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (source_node, task_type, json.dumps(payload), int(priority), max(1, int(max_attempts)),
+                 now, now + max(0.0, delay)),
+            )
+            return cur.lastrowid
+
+    # ── Consumers ──────────────────────────────────────────────────
+
+    def lease(self, max_tasks: int = 1, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+              consumer: str = None) -> List[Dict[str, Any]]:
+        """Claim up to max_tasks ready tasks for visibility_timeout seconds."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._reclaim_expired(now)
+                rows = self._db.execute(
+                    "SELECT * FROM tasks WHERE status = 'ready' AND available_at <= ? "
+                    "ORDER BY priority DESC, id LIMIT ?", (now, max(1, int(max_tasks))),
+                ).fetchall()
+                leased = []
+                for row in rows:
+                    token = uuid.uuid4().hex
+                    expires = now + visibility_timeout
+                    self._db.execute(
+                        "UPDATE tasks SET status = 'leased', lease_token = ?, lease_expires = ?, "
+                        "consumer = ?, attempts = attempts + 1 WHERE id = ?",
+                        (token, expires, consumer, row["id"]),
+                    )
+                    leased.append(self._task(row, lease_token=token, lease_expires=expires,
+                                             attempts=row["attempts"] + 1))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return leased
+
+    def _reclaim_expired(self, now: float):
+        # A consumer that died or stalled past its lease gives the task back,
+        # unless that was its last attempt.
+        self._db.execute(
+            "UPDATE tasks SET status = 'dead', finished_at = ?, lease_token = NULL, "
+            "last_error = COALESCE(last_error, 'lease expired') "
+            "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= max_attempts", (now, now))
+        self._db.execute(
+            "UPDATE tasks SET status = 'ready', lease_token = NULL, available_at = ? "
+            "WHERE status = 'leased' AND lease_expires <= ?", (now, now))
+
+    def ack(self, task_id: int, lease_token: str) -> bool:
+        """Mark a leased task done. False if the lease is no longer held."""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE tasks SET status = 'done', finished_at = ?, lease_token = NULL "
+                "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+                (time.time(), task_id, lease_token),
+            )
+            return cur.rowcount == 1
+
+    def nack(self, task_id: int, lease_token: str, error: str = None, delay: float = None) -> Optional[str]:
+        """Give a leased task back. Returns its new status ('ready' or 'dead'), None if the lease is gone.
+
+        Without an explicit delay the retry backs off exponentially with the attempt count.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT attempts, max_attempts FROM tasks "
+                "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+                (task_id, lease_token),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["attempts"] >= row["max_attempts"]:
+                self._db.execute(
+                    "UPDATE tasks SET status = 'dead', finished_at = ?, lease_token = NULL, last_error = ? "
+                    "WHERE id = ?", (now, error, task_id))
+                logger.warning(f"[SENTINEL QUEUE] Task {task_id} dead-lettered after {row['attempts']} attempts: {error}")
+                return "dead"
+            if delay is None:
+                delay = min(2.0 ** (row["attempts"] - 1), MAX_RETRY_DELAY)
+            self._db.execute(
+                "UPDATE tasks SET status = 'ready', available_at = ?, lease_token = NULL, last_error = ? "
+                "WHERE id = ?", (now + max(0.0, delay), error, task_id))
+            return "ready"
+
+    def extend(self, task_id: int, lease_token: str, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> bool:
+        """Heartbeat: push a held lease's expiry out by visibility_timeout."""
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE tasks SET lease_expires = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_token = ?",
+                (now + visibility_timeout, task_id, lease_token),
+            )
+            return cur.rowcount == 1
+
+    # ── Dead letters & introspection ───────────────────────────────
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM tasks WHERE status = 'dead' ORDER BY finished_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._task(row) for row in rows]
+
+    def requeue_dead(self, task_id: int) -> bool:
+        """Send a dead-lettered task back to the queue with a fresh attempt budget."""
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE tasks SET status = 'ready', attempts = 0, available_at = ?, finished_at = NULL "
+                "WHERE id = ? AND status = 'dead'", (time.time(), task_id))
+            return cur.rowcount == 1
+
+    def purge_done(self, older_than: float = 86400.0) -> int:
+        """Delete acked tasks finished more than older_than seconds ago."""
+        with self._lock:
+            cur = self._db.execute("DELETE FROM tasks WHERE status = 'done' AND finished_at < ?",
+                                   (time.time() - older_than,))
+            return cur.rowcount
+
+    def depth(self) -> int:
+        """Tasks not yet acked or dead-lettered."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM tasks WHERE status IN ('ready', 'leased')").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(enqueued_at) FROM tasks WHERE status = 'ready'").fetchone()[0]
+        return {
+            "ready": counts.get("ready", 0), "leased": counts.get("leased", 0),
+            "done": counts.get("done", 0), "dead": counts.get("dead", 0),
+            "oldest_ready_age_s": round(time.time() - oldest, 3) if oldest else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def _task(row: sqlite3.Row, **overrides) -> Dict[str, Any]:
+        task = {
+            "task_id": row["id"],
+            "source_node": row["source_node"],
+            "task_type": row["task_type"],
+            "payload": json.loads(row["payload"]),
+            "priority": row["priority"],
+            "attempts": row["attempts"],
+            "max_attempts": row["max_attempts"],
+            "enqueued_at": row["enqueued_at"],
+            "last_error": row["last_error"],
+        }
+        task.update(overrides)
+        return task
+
+
+_queue_store = None
+_queue_store_lock = threading.Lock()
+
+
+def get_queue_store() -> SentinelQueueStore:
+    """Get or create the process-wide SentinelQueueStore."""
+    global _queue_store
+    if _queue_store is None:
+        with _queue_store_lock:
+            if _queue_store is None:
+                _queue_store = SentinelQueueStore()
+    return _queue_store
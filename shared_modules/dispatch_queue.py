@@ -1,41 +1,363 @@
+"""Spool for mandates headed to the Master Architect's ay2_dispatch_queue.
+
+Layout (legacy names are kept so ipc_bridge and the E2E suite keep working):
+
+    ay2_dispatch_queue/
+        pending_blueprint_<id>.json      ready to run
+        inflight/pending_blueprint_<id>.json   claimed by one consumer
+        archived_blueprint_<id>.json / broken_blueprint_<id>.json   finished
+        .spool_index.sqlite3             status index (one row per blueprint)
+
+Ids are unique and sort in dispatch order, files are written to a temp name
+and renamed into place, and a claim is an atomic rename into inflight/, so
+exactly one consumer wins each blueprint. Consumers ask the index (or a
+SpoolWatcher) for pending work instead of listing the directory; the index
+is reconciled with files written by other producers only when the directory
+actually changes. A spool's own renames update the index directly and
+re-record the directory mtime, so they do not trigger a re-scan; a full
+re-scan still runs every FULL_SYNC_SECONDS as a backstop.
+"""
+import os
+import re
 import json
 import time
 import uuid
+import sqlite3
 import logging
+import threading
 from pathlib import Path
+from typing import Dict, List, Optional
 
 log = logging.getLogger("DispatchQueue")
 MAF_ROOT = Path(__file__).parent.parent.resolve()
 
+PENDING_PREFIX = "pending_blueprint_"
+INFLIGHT_DIR = "inflight"
+INDEX_NAME = ".spool_index.sqlite3"
+FULL_SYNC_SECONDS = 30.0
+
+# Every lifecycle name the fleet uses for a blueprint, including ipc_bridge's
+# port-scoped claim (claimed_<port>_pending_blueprint_<id>.json).
+_NAME_RE = re.compile(r"^(claimed_\d+_)?(pending|paused|archived|broken)_blueprint_(.+)\.json$")
+
+_id_lock = threading.Lock()
+_last_id_ns = 0
+
+
 def get_queue_dir() -> Path:
     """Resolves the ay2_dispatch_queue directory dynamically."""
     queue_dir = MAF_ROOT / "Master_Architect_Elite_Logic" / "ay2_dispatch_queue"
     queue_dir.mkdir(parents=True, exist_ok=True)
     return queue_dir
 
-def dispatch_mandate(mandate_text: str, source: str = "ClaudeAY") -> str:
-    """
-    Writes a mandate directly to the ay2_dispatch_queue.
-    Returns the blueprint filename for tracking.
-    """
-    try:
-        queue_dir = get_queue_dir()
-        blueprint_id = int(time.time())
-        filename = f"pending_blueprint_{blueprint_id}.json"
 
+def new_blueprint_id() -> str:
+    """Unique, dispatch-ordered id: nanosecond clock (strictly increasing per process) + pid."""
+    global _last_id_ns
+    with _id_lock:
+        _last_id_ns = max(time.time_ns(), _last_id_ns + 1)
+        return f"{_last_id_ns:019d}_{os.getpid()}"
+
+
+def _blueprint_id(filename: str) -> Optional[str]:
+    m = _NAME_RE.match(filename)
+    return m.group(3) if m else None
+
+
+class DispatchSpool:
+    """Atomic, indexed file spool over one ay2_dispatch_queue directory."""
+
+    def __init__(self, queue_dir: Path = None):
+        self.queue_dir = Path(queue_dir) if queue_dir else get_queue_dir()
+        self.inflight_dir = self.queue_dir / INFLIGHT_DIR
+        self.inflight_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._synced_mtime = None
+        self._synced_at = 0.0
+        self._db = sqlite3.connect(str(self.queue_dir / INDEX_NAME), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS blueprints ("
+            " blueprint_id TEXT PRIMARY KEY, filename TEXT NOT NULL, status TEXT NOT NULL,"
+            " source TEXT, execution_id TEXT, owner TEXT, updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_blueprints_status ON blueprints (status, blueprint_id)")
+        self._db.commit()
+
+    # ── Producers ──────────────────────────────────────────────────
+
+    def dispatch(self, mandate_text: str, source: str = "ClaudeAY", **fields) -> str:
+        """Atomically spool a mandate. Returns the blueprint filename."""
+        blueprint_id = new_blueprint_id()
+        filename = f"{PENDING_PREFIX}{blueprint_id}.json"
         blueprint = {
             "execution_id": str(uuid.uuid4()),
             "source": source,
             "mandate": mandate_text,
-            "timestamp": blueprint_id,
-            "status": "pending"
+            "timestamp": int(time.time()),
+            "status": "pending",
+            **fields,
         }
+        tmp_path = self.queue_dir / f".{filename}.tmp"
+        before = self._dir_mtimes()
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(blueprint, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.queue_dir / filename)
+        self._upsert(blueprint_id, filename, "pending", source=source, execution_id=blueprint["execution_id"])
+        self._own_change(before)
+        return filename
 
-        target_path = queue_dir / filename
-        target_path.write_text(
-            json.dumps(blueprint, indent=2),
-            encoding="utf-8"
-        )
+    # ── Consumers ──────────────────────────────────────────────────
+
+    def pending(self, limit: int = 100) -> List[str]:
+        """Oldest pending blueprint filenames, from the index."""
+        self.sync()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT filename FROM blueprints WHERE status = 'pending' ORDER BY blueprint_id LIMIT ?",
+                (limit,)).fetchall()
+        return [r[0] for r in rows]
+
+    def claim(self, filename: str, owner: str = None) -> Optional[Path]:
+        """Move a pending blueprint into inflight/. None if another consumer got it first."""
+        target = self.inflight_dir / filename
+        before = self._dir_mtimes()
+        try:
+            os.rename(self.queue_dir / filename, target)
+        except (FileNotFoundError, OSError):
+            # Someone else moved it; that rename changed the directory mtime, so the next sync sees it.
+            return None
+        self._set_status(filename, "inflight", owner=owner, new_filename=f"{INFLIGHT_DIR}/{filename}")
+        self._own_change(before)
+        return target
+
+    def claim_batch(self, limit: int = 16, owner: str = None) -> List[Path]:
+        claimed = []
+        for filename in self.pending(limit):
+            path = self.claim(filename, owner)
+            if path is not None:
+                claimed.append(path)
+        return claimed
+
+    def complete(self, filename: str, ok: bool = True) -> Path:
+        """Retire an inflight blueprint as archived_ (ok) or broken_ (failed)."""
+        return self._retire(filename, "archived" if ok else "broken")
+
+    def pause(self, filename: str) -> Path:
+        """Park an inflight blueprint as paused_ until an operator approves (renamed back to pending_) or rejects it."""
+        return self._retire(filename, "paused")
+
+    def _retire(self, filename: str, status: str) -> Path:
+        final_name = filename.replace(PENDING_PREFIX, f"{status}_blueprint_", 1)
+        target = self.queue_dir / final_name
+        before = self._dir_mtimes()
+        os.replace(self.inflight_dir / filename, target)
+        self._set_status(filename, status, new_filename=final_name)
+        self._own_change(before)
+        return target
+
+    def release(self, filename: str) -> None:
+        """Hand an inflight blueprint back to the pending pool."""
+        before = self._dir_mtimes()
+        os.replace(self.inflight_dir / filename, self.queue_dir / filename)
+        self._set_status(filename, "pending", owner=None, new_filename=filename)
+        self._own_change(before)
+
+    def requeue_stale(self, older_than: float = 3600.0) -> List[str]:
+        """Release inflight blueprints whose consumer has not finished within older_than seconds."""
+        self.sync()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT filename FROM blueprints WHERE status = 'inflight' AND filename LIKE ? AND updated_at < ?",
+                (f"{INFLIGHT_DIR}/%", time.time() - older_than)).fetchall()
+        stale = [Path(r[0]).name for r in rows]
+        for filename in stale:
+            log.warning(f"[DISPATCH] Re-queuing stale inflight blueprint: {filename}")
+            self.release(filename)
+        return stale
+
+    # ── Status index ───────────────────────────────────────────────
+
+    def status(self, blueprint: str) -> Optional[Dict]:
+        """Look up a blueprint by filename, id or execution_id."""
+        self.sync()
+        key = _blueprint_id(Path(blueprint).name) or blueprint
+        with self._lock:
+            row = self._db.execute(
+                "SELECT blueprint_id, filename, status, source, execution_id, owner, updated_at "
+                "FROM blueprints WHERE blueprint_id = ? OR execution_id = ?", (key, key)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("blueprint_id", "filename", "status", "source", "execution_id", "owner", "updated_at"), row))
+
+    def counts(self) -> Dict[str, int]:
+        self.sync()
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM blueprints GROUP BY status").fetchall())
+
+    def _dir_mtimes(self):
+        try:
+            return os.stat(self.queue_dir).st_mtime_ns, os.stat(self.inflight_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _own_change(self, before) -> None:
+        """Our rename is already in the index: accept the new directory mtime without a re-scan,
+        unless the directory had changed under us since the last sync."""
+        with self._lock:
+            if before is not None and before == self._synced_mtime:
+                self._synced_mtime = self._dir_mtimes()
+
+    def sync(self, force: bool = False) -> None:
+        """Fold in files other producers/consumers created or renamed, if either directory changed."""
+        mtime = self._dir_mtimes()
+        if mtime is None:
+            return
+        if (not force and mtime == self._synced_mtime
+                and time.monotonic() - self._synced_at < FULL_SYNC_SECONDS):
+            return
+        on_disk = {}
+        for name in os.listdir(self.queue_dir):
+            m = _NAME_RE.match(name)
+            if m:
+                on_disk[m.group(3)] = ("inflight" if m.group(1) else m.group(2), name)
+        for name in os.listdir(self.inflight_dir):
+            m = _NAME_RE.match(name)
+            if m:
+                on_disk[m.group(3)] = ("inflight", f"{INFLIGHT_DIR}/{name}")
+
+        now = time.time()
+        with self._lock:
+            indexed = {r[0]: (r[1], r[2]) for r in self._db.execute(
+                "SELECT blueprint_id, status, filename FROM blueprints")}
+            changed = [(bid, fname, status, now) for bid, (status, fname) in on_disk.items()
+                       if indexed.get(bid) != (status, fname)]
+            vanished = [(now, bid) for bid, (status, _) in indexed.items()
+                        if bid not in on_disk and status in ("pending", "inflight")]
+            self._db.executemany(
+                "INSERT INTO blueprints (blueprint_id, filename, status, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (blueprint_id) DO UPDATE SET filename = excluded.filename, "
+                "status = excluded.status, updated_at = excluded.updated_at",
+                [(bid, fname, status, ts) for bid, fname, status, ts in changed])
+            self._db.executemany("UPDATE blueprints SET status = 'gone', updated_at = ? WHERE blueprint_id = ?",
+                                 vanished)
+            self._db.commit()
+            self._synced_mtime = mtime
+            self._synced_at = time.monotonic()
+
+    def _upsert(self, blueprint_id, filename, status, source=None, execution_id=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO blueprints (blueprint_id, filename, status, source, execution_id, "
+                "owner, updated_at) VALUES (?, ?, ?, ?, ?, NULL, ?)",
+                (blueprint_id, filename, status, source, execution_id, time.time()))
+            self._db.commit()
+
+    def _set_status(self, filename, status, owner=..., new_filename=None):
+        blueprint_id = _blueprint_id(filename)
+        sets, params = ["status = ?", "updated_at = ?"], [status, time.time()]
+        if owner is not ...:
+            sets.append("owner = ?")
+            params.append(owner)
+        if new_filename:
+            sets.append("filename = ?")
+            params.append(new_filename)
+        with self._lock:
+            self._db.execute(f"UPDATE blueprints SET {', '.join(sets)} WHERE blueprint_id = ?",
+                             (*params, blueprint_id))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SpoolWatcher:
+    """Hands a consumer batches of claimed blueprints as they arrive.
+
+    Uses filesystem events (the optional watchdog package, inotify on Linux)
+    when available, otherwise polls the directory mtime. After the first
+    arrival it lingers batch_window seconds so a burst is claimed together.
+    """
+
+    def __init__(self, spool: DispatchSpool, owner: str = None, batch_size: int = 16,
+                 batch_window: float = 0.05, poll_interval: float = 0.5):
+        self.spool = spool
+        self.owner = owner or f"{os.getpid()}"
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._observer = None
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+
+            wakeup = self._wakeup
+
+            class _Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if PENDING_PREFIX in os.path.basename(getattr(event, "dest_path", "") or event.src_path):
+                        wakeup.set()
+
+            self._observer = Observer()
+            self._observer.schedule(_Handler(), str(spool.queue_dir), recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        except ImportError:
+            log.info("[DISPATCH] watchdog not installed; polling the spool directory")
+
+    def next_batch(self, timeout: float = None) -> List[Path]:
+        """Block until some pending blueprints are claimed (or timeout). Returns their inflight paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            claimed = self.spool.claim_batch(self.batch_size, self.owner)
+            if claimed:
+                return claimed
+            remaining = self.poll_interval if deadline is None else min(self.poll_interval,
+                                                                        deadline - time.monotonic())
+            if remaining <= 0:
+                return []
+            if self._wakeup.wait(remaining):
+                self._wakeup.clear()
+                time.sleep(self.batch_window)
+
+    async def batches(self, timeout: float = 1.0):
+        """Async iterator over claimed batches; the blocking wait runs in a worker thread."""
+        import asyncio
+        while True:
+            batch = await asyncio.to_thread(self.next_batch, timeout)
+            if batch:
+                yield batch
+
+    def close(self):
+        if self._observer is not None:
+            self._observer.stop()
+
+
+_spools: Dict[str, DispatchSpool] = {}
+_spools_lock = threading.Lock()
+
+
+def get_spool(queue_dir: Path = None) -> DispatchSpool:
+    """Get or create the process-wide DispatchSpool for a queue directory."""
+    queue_dir = Path(queue_dir) if queue_dir else get_queue_dir()
+    key = str(queue_dir.resolve())
+    with _spools_lock:
+        if key not in _spools:
+            _spools[key] = DispatchSpool(queue_dir)
+        return _spools[key]
+
+
+def dispatch_mandate(mandate_text: str, source: str = "ClaudeAY") -> str:
+    """
+    Writes a mandate directly to the ay2_dispatch_queue.
+    Returns the blueprint filename for tracking.
+    """
+    try:
+        filename = get_spool().dispatch(mandate_text, source=source)
         log.info(f"[DISPATCH] Blueprint queued: {filename}")
         return filename
     except Exception as e:
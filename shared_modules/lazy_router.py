@@ -0,0 +1,162 @@
+"""Lazy mounting of heavy FastAPI routers.
+
+Some routers do real work at import time (the vector and CIO routers open a
+Chroma VectorStore, Alpha Genesis creates its SQLite schema), which every hub
+restart used to pay before serving its first request. A LazyRouter reserves
+the router's URL prefix in the app's route table with a placeholder. The
+first request under that prefix, or warm_up() from a background task, imports
+the module in a worker thread, runs its on_load hook, and splices the real
+routes into the table at the placeholder's position, so route precedence is
+the same as an eager include_router.
+
+    LazyRouter(app, "/api/vector", "backend.app.routers.vector_router")
+
+If the import fails, requests under the prefix get a 503 and the import is
+retried after RETRY_SECONDS. The rest of the hub keeps serving.
+"""
+import time
+import asyncio
+import logging
+import importlib
+import threading
+from typing import Callable, List, Optional
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from starlette.routing import BaseRoute, Match, NoMatchFound
+
+from shared_modules.startup_profiler import get_startup_profiler
+
+logger = logging.getLogger("LazyRouter")
+
+RETRY_SECONDS = 60.0
+
+
+class LazyRouter(BaseRoute):
+    def __init__(self, app: FastAPI, prefix: str, module: str, attr: str = "router",
+                 on_load: Callable = None, **include_kwargs):
+        self.app_ref = app
+        self.prefix = prefix.rstrip("/")
+        self.module = module
+        self.attr = attr
+        self.on_load = on_load
+        self.include_kwargs = include_kwargs
+        self.loaded = False
+        self.error: Optional[str] = None
+        self._failed_at = 0.0
+        self._routes: Optional[List[BaseRoute]] = None
+        self._import_lock = threading.Lock()
+        self._async_lock = None
+        app.router.routes.append(self)
+        _instances.append(self)
+
+    # ── Starlette route protocol ─────────────────────────────
+
+    def matches(self, scope):
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope, receive, send):
+        if not self.loaded:
+            await self.warm_up()
+        if not self.loaded:
+            if scope["type"] == "websocket":
+                await send({"type": "websocket.close", "code": 1011})
+                return
+            response = JSONResponse({"error": f"{self.module} unavailable: {self.error}"}, status_code=503)
+            await response(scope, receive, send)
+            return
+        # The placeholder is gone from the table; dispatch again to the real routes.
+        await self.app_ref.router(scope, receive, send)
+
+    # ── Loading ──────────────────────────────────────────────
+
+    def _import(self) -> List[BaseRoute]:
+        """Import the module and build its routes. Blocking; runs off the event loop."""
+        with self._import_lock:
+            if self._routes is not None:
+                return self._routes
+            with get_startup_profiler().section(self.module, kind="lazy"):
+                module = importlib.import_module(self.module)
+                if self.on_load:
+                    self.on_load(module)
+            staging = APIRouter()
+            staging.include_router(getattr(module, self.attr), **self.include_kwargs)
+            self._routes = list(staging.routes)
+            return self._routes
+
+    def _splice(self, routes: List[BaseRoute]):
+        table = self.app_ref.router.routes
+        if self in table:
+            index = table.index(self)
+            table[index:index + 1] = routes
+            self.app_ref.openapi_schema = None
+        self.loaded = True
+        logger.info(f"[LAZY] Mounted {self.module} at {self.prefix} ({len(routes)} routes)")
+
+    def _failed(self, exc: Exception) -> bool:
+        self.error = f"{type(exc).__name__}: {exc}"
+        self._failed_at = time.monotonic()
+        logger.error(f"[LAZY] Failed to load {self.module}: {self.error}")
+        return False
+
+    def _retry_pending(self) -> bool:
+        return self.error is not None and time.monotonic() - self._failed_at < RETRY_SECONDS
+
+    async def warm_up(self) -> bool:
+        """Load and mount from the event loop; concurrent callers share one import."""
+        if self.loaded or self._retry_pending():
+            return self.loaded
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if self.loaded or self._retry_pending():
+                return self.loaded
+            try:
+                routes = await asyncio.to_thread(self._import)
+            except Exception as e:
+                return self._failed(e)
+            self.error = None
+            self._splice(routes)
+            return True
+
+    def load(self) -> bool:
+        """Synchronous load, for scripts and the startup profiler (no running event loop)."""
+        if self.loaded:
+            return True
+        try:
+            routes = self._import()
+        except Exception as e:
+            return self._failed(e)
+        self.error = None
+        self._splice(routes)
+        return True
+
+    def status(self) -> dict:
+        return {"prefix": self.prefix, "module": self.module, "loaded": self.loaded, "error": self.error}
+
+
+_instances: List[LazyRouter] = []
+
+
+def lazy_routers(app: FastAPI = None) -> List[LazyRouter]:
+    return [r for r in _instances if app is None or r.app_ref is app]
+
+
+async def warm_up(app: FastAPI, delay: float = 0.0):
+    """Background warmup: load every lazy router of app, one at a time, after delay seconds."""
+    if delay:
+        await asyncio.sleep(delay)
+    for lazy in lazy_routers(app):
+        await lazy.warm_up()
+
+
+def load_all(app: FastAPI = None):
+    for lazy in lazy_routers(app):
+        lazy.load()
@@ -0,0 +1,173 @@
+"""Startup profiler for the factory hub (api.py) and other FastAPI entry points.
+
+Initializer timings are always collected (one perf_counter pair each). Per-import
+timings are collected only in profiling mode (FACTORY_PROFILE_STARTUP=1, or the
+CLI below): the module under test has its import statements wrapped, so each
+entry is the wall time of one top-level import in that module, including
+everything it pulled in transitively.
+
+    python -m shared_modules.startup_profiler api      # import api.py, print the report
+    FACTORY_PROFILE_STARTUP=1 python api.py             # report logged once startup completes
+
+The report is also written to data/startup_profile.json and served by
+/api/startup/profile.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import builtins
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger("StartupProfiler")
+
+_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_PATH = os.path.join(os.path.dirname(_DIR), "data", "startup_profile.json")
+
+
+def profiling_enabled() -> bool:
+    return os.getenv("FACTORY_PROFILE_STARTUP", "").lower() in ("1", "true", "yes", "on")
+
+
+class StartupProfiler:
+    def __init__(self, enabled: bool = None):
+        self.enabled = profiling_enabled() if enabled is None else enabled
+        self.started = time.perf_counter()
+        self.finished_ms = None
+        self.entries = []          # (kind, name, ms)
+        self._lock = threading.Lock()
+        self._modules = set()
+        self._real_import = None
+
+    def record(self, kind: str, name: str, seconds: float):
+        with self._lock:
+            self.entries.append((kind, name, round(seconds * 1000, 2)))
+
+    @contextmanager
+    def section(self, name: str, kind: str = "init"):
+        """Time an initializer (or any block) under name."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, name, time.perf_counter() - t0)
+
+    async def run(self, name: str, fn):
+        """Call a sync or async initializer and time it."""
+        with self.section(name):
+            result = fn()
+            if hasattr(result, "__await__"):
+                await result
+
+    # ── Import timing ────────────────────────────────────────
+
+    def install_import_hook(self, module_name: str):
+        """Time the first import of every module that module_name imports (profiling mode only)."""
+        if not self.enabled:
+            return
+        self._modules.add(module_name)
+        if self._real_import is not None:
+            return
+        real_import = self._real_import = builtins.__import__
+        profiler = self
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if (level or not globals or globals.get("__name__") not in profiler._modules
+                    or name in sys.modules):
+                return real_import(name, globals, locals, fromlist, level)
+            t0 = time.perf_counter()
+            try:
+                return real_import(name, globals, locals, fromlist, level)
+            finally:
+                profiler.record("import", name, time.perf_counter() - t0)
+
+        builtins.__import__ = timed_import
+
+    def remove_import_hook(self):
+        if self._real_import is not None:
+            builtins.__import__ = self._real_import
+            self._real_import = None
+
+    # ── Reporting ────────────────────────────────────────────
+
+    def report(self) -> dict:
+        with self._lock:
+            entries = list(self.entries)
+        by_kind = {}
+        for kind, name, ms in entries:
+            by_kind.setdefault(kind, []).append({"name": name, "ms": ms})
+        for items in by_kind.values():
+            items.sort(key=lambda e: e["ms"], reverse=True)
+        total = self.finished_ms if self.finished_ms is not None else round(
+            (time.perf_counter() - self.started) * 1000, 2)
+        return {
+            "profiling": self.enabled,
+            "startup_ms": total,
+            "imports": by_kind.pop("import", []),
+            "initializers": by_kind.pop("init", []),
+            "lazy_loads": by_kind.pop("lazy", []),
+            **by_kind,
+        }
+
+    def finish(self, write: bool = True) -> dict:
+        """Mark startup complete; in profiling mode (and write) log the slowest entries and save the report."""
+        self.remove_import_hook()
+        self.finished_ms = round((time.perf_counter() - self.started) * 1000, 2)
+        report = self.report()
+        if self.enabled and write:
+            logger.info(format_report(report))
+            try:
+                os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+                with open(REPORT_PATH, "w", encoding="utf-8") as f:
+                    json.dump(report, f, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not write {REPORT_PATH}: {e}")
+        return report
+
+
+def format_report(report: dict, top: int = 15) -> str:
+    lines = [f"Startup took {report['startup_ms']:.0f} ms"]
+    for key, title in (("imports", "Slowest imports"), ("initializers", "Initializers"),
+                       ("lazy_loads", "Lazy loads")):
+        items = report.get(key) or []
+        if items:
+            lines.append(f"  {title}:")
+            lines += [f"    {e['ms']:>9.1f} ms  {e['name']}" for e in items[:top]]
+    return "\n".join(lines)
+
+
+_profiler = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler()
+    return _profiler
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Profile the cold import of a factory entry point")
+    parser.add_argument("module", nargs="?", default="api", help="module to import (default: api)")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--warm", action="store_true", help="also load every lazy router")
+    args = parser.parse_args()
+
+    os.environ["FACTORY_PROFILE_STARTUP"] = "1"
+    sys.path.insert(0, os.path.dirname(_DIR))
+    # Use the package module, not __main__, so api.py shares this profiler instance.
+    from shared_modules.startup_profiler import format_report, get_startup_profiler
+    profiler = get_startup_profiler()
+    profiler.enabled = True
+    profiler.install_import_hook(args.module)
+    with profiler.section(f"import {args.module}"):
+        mod = importlib.import_module(args.module)
+    if args.warm:
+        from shared_modules.lazy_router import load_all
+        load_all(getattr(mod, "app", None))
+    print(format_report(profiler.finish(write=False), top=args.top))
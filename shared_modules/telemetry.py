@@ -3,12 +3,25 @@
 Records LLM token usage to a local SQLite DB (data/maf_telemetry.db) and exposes
 aggregate statistics. Self-contained: importing this module ensures the schema
 exists, so api.py only needs to import it and expose the HTTP endpoints.
+
+Writes never touch the DB on the caller's thread: record_usage() appends to an
+in-process ring buffer that a background thread flushes in batches. Each flush
+also folds the batch into the usage_hourly rollup (hour, app, model), which is
+what get_stats() reads, so stats cost the same with 100 rows or 100 million.
 """
 import os
+import time
+import atexit
 import sqlite3
 import asyncio
+import logging
 import functools
+import threading
+from collections import deque
 from contextlib import closing
+from datetime import datetime, timezone
+
+logger = logging.getLogger("Telemetry")
 
 _DIR = os.path.dirname(os.path.abspath(__file__))
 _DATA_DIR = os.path.join(os.path.dirname(_DIR), "data")
@@ -25,16 +38,22 @@ PRICING = {
 }
 
 
-def _connect():
-    os.makedirs(_DATA_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+def _connect(db_path=None):
+    db_path = db_path or DB_PATH
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def init_db():
-    """Create the token_usage table if it does not exist (idempotent)."""
-    with closing(_connect()) as conn:
+def init_db(db_path=None):
+    """Create the token_usage and usage_hourly tables if they do not exist (idempotent).
+
+    A rollup left empty next to existing token_usage rows (a DB from before the
+    rollup existed) is backfilled once from the raw table.
+    """
+    with closing(_connect(db_path)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS token_usage (
@@ -48,6 +67,28 @@ def init_db():
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS usage_hourly (
+                hour TEXT NOT NULL,
+                app_id VARCHAR NOT NULL,
+                model_name VARCHAR NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                total_tokens INTEGER NOT NULL,
+                calls INTEGER NOT NULL,
+                PRIMARY KEY (hour, app_id, model_name)
+            )
+            """
+        )
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM usage_hourly LIMIT 1").fetchone() is None:
+            conn.execute(
+                "INSERT INTO usage_hourly "
+                "SELECT strftime('%Y-%m-%d %H:00:00', timestamp), app_id, model_name, "
+                "SUM(input_tokens), SUM(output_tokens), SUM(total_tokens), COUNT(*) "
+                "FROM token_usage GROUP BY 1, 2, 3"
+            )
         conn.commit()
 
 
@@ -56,22 +97,161 @@ def _cost(model_name, input_tokens, output_tokens):
     return round((input_tokens / 1000.0) * pin + (output_tokens / 1000.0) * pout, 6)
 
 
+class TelemetryWriter:
+    """Ring buffer of usage rows, flushed to SQLite in batches by a daemon thread.
+
+    When the buffer is full the oldest unflushed rows are dropped (and counted)
+    rather than blocking the caller.
+    """
+
+    def __init__(self, db_path=None, capacity=100_000, batch_size=500, flush_interval=0.5):
+        self.db_path = db_path or DB_PATH
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = deque(maxlen=capacity)
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._closed = False
+        self._thread = None
+        self.stats = {"recorded": 0, "written": 0, "dropped": 0, "flushes": 0,
+                      "flush_errors": 0, "flush_ms_total": 0.0}
+
+    def submit(self, row):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+                self._thread.start()
+            if len(self._buffer) == self._buffer.maxlen:
+                self.stats["dropped"] += 1
+            self._buffer.append(row)
+            self.stats["recorded"] += 1
+            if len(self._buffer) == 1 or len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def _run(self):
+        init_db(self.db_path)
+        conn = _connect(self.db_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                with self._cond:
+                    while not self._buffer and not self._closed:
+                        self._cond.wait()
+                    if not self._buffer:
+                        return
+                    if len(self._buffer) < self.batch_size and not (self._closed or self._flush_waiters):
+                        # Let a burst accumulate before paying for a commit.
+                        self._cond.wait(self.flush_interval)
+                    batch = [self._buffer.popleft()
+                             for _ in range(min(len(self._buffer), self.batch_size))]
+                    self._in_flight += len(batch)
+                self._write(conn, batch)
+                with self._cond:
+                    self._in_flight -= len(batch)
+                    self._cond.notify_all()
+        finally:
+            conn.close()
+
+    def _write(self, conn, batch):
+        started = time.perf_counter()
+        rollup = {}
+        for ts, app_id, model_name, i, o, t in batch:
+            key = (ts[:13] + ":00:00", app_id, model_name)
+            acc = rollup.setdefault(key, [0, 0, 0, 0])
+            acc[0] += i
+            acc[1] += o
+            acc[2] += t
+            acc[3] += 1
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO token_usage (timestamp, app_id, model_name, input_tokens, "
+                    "output_tokens, total_tokens) VALUES (?, ?, ?, ?, ?, ?)", batch)
+                conn.executemany(
+                    "INSERT INTO usage_hourly (hour, app_id, model_name, input_tokens, output_tokens, "
+                    "total_tokens, calls) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (hour, app_id, model_name) DO UPDATE SET "
+                    "input_tokens = input_tokens + excluded.input_tokens, "
+                    "output_tokens = output_tokens + excluded.output_tokens, "
+                    "total_tokens = total_tokens + excluded.total_tokens, "
+                    "calls = calls + excluded.calls",
+                    [(*key, *acc) for key, acc in rollup.items()])
+            self.stats["written"] += len(batch)
+        except Exception as e:
+            self.stats["flush_errors"] += 1
+            logger.error(f"Telemetry flush of {len(batch)} rows failed: {e}")
+        finally:
+            self.stats["flushes"] += 1
+            self.stats["flush_ms_total"] += (time.perf_counter() - started) * 1000
+
+    def flush(self, timeout=10.0):
+        """Block until every buffered row is written. False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._buffer or self._in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self):
+        """Flush buffered rows and stop the writer thread."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def metrics(self):
+        with self._cond:
+            m = dict(self.stats, buffered=len(self._buffer) + self._in_flight)
+        m["avg_flush_ms"] = round(m["flush_ms_total"] / m["flushes"], 3) if m["flushes"] else 0.0
+        return m
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Get or create the process-wide TelemetryWriter."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = TelemetryWriter()
+                atexit.register(_writer.close)
+    return _writer
+
+
+def flush(timeout=10.0):
+    """Write out everything recorded so far in this process."""
+    return _writer.flush(timeout) if _writer is not None else True
+
+
+def writer_stats():
+    """Buffer/flush counters for the in-process writer."""
+    return get_writer().metrics()
+
+
 def record_usage(app_id, model_name, input_tokens, output_tokens):
-    """Persist one usage record. Returns the stored row plus an estimated cost."""
+    """Queue one usage record. Returns the row plus an estimated cost."""
     input_tokens = int(input_tokens or 0)
     output_tokens = int(output_tokens or 0)
     total = input_tokens + output_tokens
-    with closing(_connect()) as conn:
-        conn.execute(
-            "INSERT INTO token_usage (app_id, model_name, input_tokens, output_tokens, total_tokens) "
-            "VALUES (?, ?, ?, ?, ?)",
-            (str(app_id or "unknown"), str(model_name or "unknown"),
-             input_tokens, output_tokens, total),
-        )
-        conn.commit()
+    app_id = str(app_id or "unknown")
+    model_name = str(model_name or "unknown")
+    ts = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+    get_writer().submit((ts, app_id, model_name, input_tokens, output_tokens, total))
     return {
-        "app_id": str(app_id or "unknown"),
-        "model_name": str(model_name or "unknown"),
+        "app_id": app_id,
+        "model_name": model_name,
         "input_tokens": input_tokens,
         "output_tokens": output_tokens,
         "total_tokens": total,
@@ -79,14 +259,55 @@ def record_usage(app_id, model_name, input_tokens, output_tokens):
     }
 
 
-def get_stats():
-    """Aggregate usage by app and by model, with estimated cost and totals."""
+def _hour_floor(value):
+    """ISO 8601 date/datetime string (or epoch seconds) -> 'YYYY-MM-DD HH:00:00' of its UTC hour.
+
+    A date-only value means midnight; an offset-aware value is converted to
+    UTC. Raises ValueError for anything else, rather than building a window
+    that silently matches the wrong rows.
+    """
+    if isinstance(value, (int, float)):
+        moment = datetime.fromtimestamp(value, timezone.utc)
+    else:
+        text = str(value).strip()
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        try:
+            moment = datetime.fromisoformat(text)
+        except ValueError:
+            raise ValueError(f"Invalid time bound {value!r}; expected ISO 8601, e.g. '2025-01-01' "
+                             f"or '2025-01-01 13:00:00'") from None
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:00:00")
+
+
+def get_stats(hours=None, since=None, until=None):
+    """Aggregate usage by app and by model, with estimated cost and totals.
+
+    Optionally restricted to the last ``hours`` hours, or to [since, until)
+    given as ISO 8601 strings (UTC unless they carry an offset) or epoch
+    seconds. Windows are served from the hourly rollup, so bounds are rounded
+    down to the hour. Raises ValueError for an unparseable bound.
+    """
+    flush()
+    if hours is not None and since is None:
+        since = time.time() - float(hours) * 3600
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("hour >= ?")
+        params.append(_hour_floor(since))
+    if until is not None:
+        clauses.append("hour < ?")
+        params.append(_hour_floor(until))
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
     with closing(_connect()) as conn:
         rows = conn.execute(
             "SELECT app_id, model_name, "
             "SUM(input_tokens) AS i, SUM(output_tokens) AS o, "
-            "SUM(total_tokens) AS t, COUNT(*) AS n "
-            "FROM token_usage GROUP BY app_id, model_name"
+            "SUM(total_tokens) AS t, SUM(calls) AS n "
+            f"FROM usage_hourly {where}GROUP BY app_id, model_name",
+            params,
         ).fetchall()
 
     by_app, by_model = {}, {}
@@ -115,7 +336,9 @@ def get_stats():
         return [dict(name=k, **v) for k, v in
                 sorted(bucket.items(), key=lambda kv: kv[1]["total_tokens"], reverse=True)]
 
-    return {"by_app": _flatten(by_app), "by_model": _flatten(by_model), "totals": totals}
+    return {"by_app": _flatten(by_app), "by_model": _flatten(by_model), "totals": totals,
+            "window": {"since": params[0] if since is not None else None,
+                       "until": params[-1] if until is not None else None}}
 
 
 def _extract_usage(result):
@@ -147,8 +370,9 @@ def track_operational_cost(app_id, model_name=None):
 
     Wraps a function that returns an LLM response; after it returns, the
     input/output tokens and model name are extracted (Gemini ``usage_metadata``
-    or Anthropic ``usage``) and written to maf_telemetry.db. Recording failures
-    never break the wrapped call. For full control, call ``record_usage()``
+    or Anthropic ``usage``) and queued for maf_telemetry.db. Recording is a
+    buffer append, so it never blocks the event loop, and failures never break
+    the wrapped call. For full control, call ``record_usage()``
     directly. Works on both sync and async functions.
     """
     def decorator(fn):
@@ -67,7 +67,8 @@ class _StubVectorMemory:
     def retrieve_context(self, query, n_results=3):
         return {"documents": [["PAST PLAN: SaaS launch, Critic punished unvalidated CPA assumptions."]]}
 
-_module("agent_memory_matrix", VectorMemoryMatrix=_StubVectorMemory)
+_module("agent_memory_matrix", VectorMemoryMatrix=_StubVectorMemory,
+        get_memory_matrix=lambda: _StubVectorMemory())
 _module("cpo_agent", run_cpo=lambda q: json.dumps({
     "value_capture_mechanism": "freemium upsell",
     "commercial_viability_score": 7.5,
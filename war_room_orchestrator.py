@@ -217,8 +217,8 @@ async def dispatch_to_csuite(intent: str, pre_collected_reports: dict = None):
     # =====================================================================
     historical_memories = []
     try:
-        from agent_memory_matrix import VectorMemoryMatrix
-        memory = VectorMemoryMatrix()
+        from agent_memory_matrix import get_memory_matrix
+        memory = get_memory_matrix()
         context = memory.retrieve_context(intent, n_results=3)
         if context and context.get("documents"):
             for doc_list in context["documents"]:
@@ -324,14 +324,15 @@ YOUR DIRECTIVE:
         # PHASE 2: NATIVE VECTOR MEMORY MATRIX RECORDING
         # =====================================================================
         try:
-            from agent_memory_matrix import VectorMemoryMatrix
-            memory = VectorMemoryMatrix()
-            memory.lock_memory(
+            from agent_memory_matrix import get_memory_matrix
+            memory = get_memory_matrix()
+            memory_id = memory.lock_memory(
                 session_id="warroom",
                 payload=f"Intent: {intent}\nStrategy: {ceo_strategy}",
                 metadata={"timestamp": datetime.now().isoformat(), "intent": intent[:100]}
             )
-            print("[Memory Matrix] Successfully locked strategy into vector store.")
+            # The write is batched in the background; failures are logged by the matrix.
+            print(f"[Memory Matrix] Strategy queued for the vector store ({memory_id}).")
         except Exception as mem_err:
             print(f"[Memory Matrix Error] Failed to lock memory: {mem_err}")
 
@@ -32,7 +32,7 @@ from warroom_protocol import (
     WarRoomReport, PipelineStep, HANDOFF_MODELS,
     ChaosScenario, CHAOS_LIBRARY,
     get_orchestrator, get_report_store, parse_agent_response,
-    get_strategy_mode,
+    get_strategy_mode, PipelineDAGExecutor, DAGRunResult,
 )
 from wisdom_vault import get_wisdom_vault
 
@@ -45,6 +45,18 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 # staffed agent except CFO/CRITIC.
 _DEFAULT_TRIAGE = ["CMO", "CEO", "CPO", "CTO", "CLO", "CFO", "CRITIC"]
 
+# Foundation + model stage, executed by PipelineDAGExecutor. CRITIC and
+# Phantom QA run after it: they need every report, including CPO/CLO.
+_FOUNDATION_DAG = [
+    PipelineStep(agent_name="CMO", phase="market"),
+    PipelineStep(agent_name="CPO", phase="product"),
+    PipelineStep(agent_name="CLO", phase="legal"),
+    PipelineStep(agent_name="CEO", phase="validation", depends_on=["CMO"], is_gate=True),
+    PipelineStep(agent_name="CTO", phase="technical", depends_on=["CMO", "CEO"],
+                 is_gate=True, gate_threshold=4.0),
+    PipelineStep(agent_name="CFO", phase="financials", depends_on=["CMO", "CEO", "CTO"]),
+]
+
 # Phase 6: "HIGH [CMO]: objection text" → (severity, agent, text)
 _OBJECTION_TAG_RE = re.compile(
     r'^\s*(HIGH|MEDIUM|LOW)\s*[\[\(]\s*(CMO|CEO|CTO|CFO|CPO|CLO)\s*[\]\)]\s*[:\-—]?\s*(.+)$',
@@ -442,8 +454,8 @@ class WarRoomPipelineRunner:
         Commander's intent, wrapped in explicit XML boundaries so agents can
         distinguish recalled history from live data."""
         try:
-            from agent_memory_matrix import VectorMemoryMatrix
-            memory = VectorMemoryMatrix()
+            from agent_memory_matrix import get_memory_matrix
+            memory = get_memory_matrix()
             context = memory.retrieve_context(self.message, n_results=3)
             docs = []
             if context and context.get("documents"):
@@ -617,6 +629,56 @@ class WarRoomPipelineRunner:
             triage_list = list(_DEFAULT_TRIAGE)
         return [str(a).upper().strip() for a in triage_list]
 
+    # ─────────────────────────────────────────────────────────────
+    # Foundation DAG: timing telemetry + gate short-circuit
+    # ─────────────────────────────────────────────────────────────
+
+    async def _record_dag_timing(self, iteration: int, result: DAGRunResult):
+        summary = result.timing_summary()
+        self.session.setdefault("dag_timings", []).append({"iteration": iteration, **summary})
+        await self._emit({
+            "type": "pipeline_timing",
+            "iteration": iteration,
+            **summary,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    async def _cycle_back_from_gate(self, failure: dict, foundation: dict, reports: dict, iteration: int):
+        """A foundation gate failed: skip CFO/CRITIC and re-open the debate."""
+        agent = failure["agent"]
+        if agent == "CEO":
+            ceo_target = reports["CEO"].handoff_payload.get("growth_target_annual", 0)
+            icon, color = "⚠️", "#f59e0b"
+            message = (
+                f"**Phase 1 GATE: CEO flags MISALIGNMENT**\nAlignment: {foundation['ceo_alignment']} | "
+                f"Growth Target: ${ceo_target:,.0f}\nRevision required. Cycling back."
+            )
+        else:
+            icon, color = "🛑", "#ef4444"
+            message = (
+                f"**TECHNICAL GATE FAILURE**\n{failure.get('reason', '')}\nCFO modeling BLOCKED. "
+                f"CTO recommends: {foundation.get('cto_recommendation', 'N/A')}.\nRevision required."
+            )
+        await self._emit({
+            "type": "dialogue",
+            "agent": "SYSTEM",
+            "icon": icon,
+            "color": color,
+            "message": message,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        self.topic = (
+            f"ITERATION {iteration} HALTED AT THE {agent} GATE — REVISE AND RESUBMIT:\n\n"
+            f"Gate: {failure.get('reason', '')}\n\n"
+            f"CMO: Revise your strategy so the plan clears the {agent} gate.\n"
+            f"Original directive: {self.message}"
+        )
+        for _stale_agent in ("CMO", "CEO", "CPO", "CTO", "CLO"):
+            reports.pop(_stale_agent, None)
+        self._save_checkpoint('GATE_RESET')
+        self.iteration += 1
+
     # ─────────────────────────────────────────────────────────────
     # Main session
     # ─────────────────────────────────────────────────────────────
@@ -644,7 +706,7 @@ class WarRoomPipelineRunner:
             logger.info(f"War Room Session: {self._orchestrator.get_pipeline_summary(pipeline)}")
 
             # ── Phase 5: Semantic memory recall (pre-loop, once) ──
-            self.semantic_memory_block = self._retrieve_semantic_memory()
+            self.semantic_memory_block = await asyncio.to_thread(self._retrieve_semantic_memory)
             if self.semantic_memory_block:
                 await self._emit({
                     "type": "dialogue",
@@ -718,23 +780,34 @@ class WarRoomPipelineRunner:
                 "agent": "SYSTEM",
                 "icon": "📊",
                 "color": "#a855f7",
-                "message": f"**PHASE 1: THE FOUNDATION**\nFetching Strategic Sentiment... Market Pulse: {verdict_str}. CMO pulling market research & quantifying costs...\nCPO & CLO running concurrently with the CMO → CEO → CTO dependency chain.",
+                "message": f"**PHASE 1: THE FOUNDATION**\nFetching Strategic Sentiment... Market Pulse: {verdict_str}. CMO pulling market research & quantifying costs...\nCPO & CLO running concurrently with the CMO → CEO → CTO → CFO dependency chain.",
                 "timestamp": datetime.now().isoformat()
             })
 
             # ═══════════════════════════════════════════════════
-            # PHASE 2 (Optimization): PARALLEL FOUNDATION NODES
-            # CPO ∥ CLO ∥ (CMO → CEO → CTO). CPO/CLO have zero
+            # PHASE 1 → 2: FOUNDATION + MODEL AS A DEPENDENCY DAG
+            # CPO ∥ CLO ∥ (CMO → CEO → CTO → CFO). CPO/CLO have zero
             # upstream dependencies; the chain stays strictly
             # sequential because CTO assesses the CEO-validated
-            # CMO strategy (Linear Dependency Protocol).
+            # CMO strategy (Linear Dependency Protocol), and the CFO
+            # starts the moment CTO clears instead of waiting on
+            # CPO/CLO. CEO and CTO are gates: a failure halts the
+            # DAG and the iteration cycles back for revision.
             # ═══════════════════════════════════════════════════
-            foundation: Dict[str, Any] = {}
+            foundation: Dict[str, Any] = {
+                # Defaults for agents the CEO triage did not staff
+                "cmo_hp": {}, "cmo_data": {},
+                "cmo_marketing_cost": 0, "cmo_projected_revenue": 0,
+                "cmo_demographic_reach": 0, "cmo_cpa": 0,
+                "cmo_recommendation": "SKIPPED", "cmo_strategy": "N/A",
+                "ceo_alignment": "UNKNOWN",
+                "cto_hp": {}, "cto_data": {},
+                "cto_feasibility": 0.0, "cto_project_type": "GLOBAL",
+                "cto_timeline": 0, "dev_buffer": 0, "infra_cost": 0,
+                "tech_debt_premium": 0, "cto_pre_deploy": "UNKNOWN",
+            }
 
             async def run_cpo_node():
-                if "CPO" not in self.triage_list:
-                    logger.info("COO: Skipping CPO per CEO Triage.")
-                    return
                 await self._emit({
                     "type": "dialogue",
                     "agent": "SYSTEM",
@@ -753,11 +826,9 @@ class WarRoomPipelineRunner:
                     self._store.save(_cpo_report)
                     reports['CPO'] = _cpo_report
                     self._save_checkpoint('CPO')
+                return reports['CPO']
 
             async def run_clo_node():
-                if "CLO" not in self.triage_list:
-                    logger.info("COO: Skipping CLO per CEO Triage.")
-                    return
                 await self._emit({
                     "type": "dialogue",
                     "agent": "SYSTEM",
@@ -776,86 +847,65 @@ class WarRoomPipelineRunner:
                     self._store.save(_clo_report)
                     reports['CLO'] = _clo_report
                     self._save_checkpoint('CLO')
+                return reports['CLO']
 
-            async def run_dependency_chain():
+            async def run_cmo_node():
                 # 1a. CMO: Market Research + Cost Quantification
-                if "CMO" in self.triage_list:
-                    if 'CMO' not in reports:
-                        cmo_resp, cmo_data_raw, cmo_meta = await self._trigger_agent_response('CMO', cmo_prompt_override)
-                        _cmo_report = parse_agent_response(cmo_resp, 'CMO', 'market', self.project_id, iteration,
-                                                           structured_data=cmo_data_raw, metadata=cmo_meta)
-                        self._store.save(_cmo_report)
-                        await self._propose_wisdom(_cmo_report)
-                        reports['CMO'] = _cmo_report
-                        self._save_checkpoint('CMO')
-
-                    cmo_report = reports['CMO']
-                    cmo_hp = cmo_report.handoff_payload  # Strictly typed CMOHandoff fields
-                    foundation.update({
-                        "cmo_hp": cmo_hp,
-                        "cmo_data": cmo_hp,
-                        "cmo_marketing_cost": cmo_hp.get("marketing_cost", 0),
-                        "cmo_projected_revenue": cmo_hp.get("projected_revenue", 0),
-                        "cmo_demographic_reach": cmo_hp.get("demographic_reach", 0),
-                        "cmo_cpa": cmo_hp.get("cost_per_acquisition", 0),
-                        "cmo_recommendation": cmo_report.recommendation,
-                        "cmo_strategy": cmo_hp.get(
-                            "market_strategy",
-                            cmo_report.detailed_report[:300] if isinstance(cmo_report.detailed_report, str) else "N/A"
-                        ),
-                    })
-                else:
-                    logger.info("COO: Skipping CMO per CEO Triage.")
-                    foundation.update({
-                        "cmo_hp": {}, "cmo_data": {},
-                        "cmo_marketing_cost": 0, "cmo_projected_revenue": 0,
-                        "cmo_demographic_reach": 0, "cmo_cpa": 0,
-                        "cmo_recommendation": "SKIPPED", "cmo_strategy": "N/A",
-                    })
+                if 'CMO' not in reports:
+                    cmo_resp, cmo_data_raw, cmo_meta = await self._trigger_agent_response('CMO', cmo_prompt_override)
+                    _cmo_report = parse_agent_response(cmo_resp, 'CMO', 'market', self.project_id, iteration,
+                                                       structured_data=cmo_data_raw, metadata=cmo_meta)
+                    self._store.save(_cmo_report)
+                    await self._propose_wisdom(_cmo_report)
+                    reports['CMO'] = _cmo_report
+                    self._save_checkpoint('CMO')
+
+                cmo_report = reports['CMO']
+                cmo_hp = cmo_report.handoff_payload  # Strictly typed CMOHandoff fields
+                foundation.update({
+                    "cmo_hp": cmo_hp,
+                    "cmo_data": cmo_hp,
+                    "cmo_marketing_cost": cmo_hp.get("marketing_cost", 0),
+                    "cmo_projected_revenue": cmo_hp.get("projected_revenue", 0),
+                    "cmo_demographic_reach": cmo_hp.get("demographic_reach", 0),
+                    "cmo_cpa": cmo_hp.get("cost_per_acquisition", 0),
+                    "cmo_recommendation": cmo_report.recommendation,
+                    "cmo_strategy": cmo_hp.get(
+                        "market_strategy",
+                        cmo_report.detailed_report[:300] if isinstance(cmo_report.detailed_report, str) else "N/A"
+                    ),
+                })
+                return cmo_report
 
+            async def run_ceo_node():
                 # 1b. CEO: Validate CMO strategy against growth targets
-                foundation["ceo_alignment"] = "UNKNOWN"
-                if "CEO" in self.triage_list:
-                    ceo_handoff = self._orchestrator.build_handoff_context(
-                        PipelineStep(agent_name='CEO', phase='validation', depends_on=['CMO']),
-                        reports,
-                        self.message,
-                        iteration=iteration,
-                        market_pulse=self.market_pulse_data,
-                        chaos_scenario=self.active_chaos if iteration > 1 else None,
-                        wisdom_vault=get_wisdom_vault(),
-                    )
-                    # Phase 5: CEO receives historical semantic memory
-                    ceo_handoff += self.semantic_memory_block
-                    if iteration > 1:
-                        ceo_handoff += self._mandate_block("CEO")
-                    if 'CEO' not in reports:
-                        ceo_resp, ceo_data_raw, ceo_meta = await self._trigger_agent_response('CEO', ceo_handoff)
-                        _ceo_report = parse_agent_response(ceo_resp, 'CEO', 'validation', self.project_id, iteration,
-                                                           structured_data=ceo_data_raw, metadata=ceo_meta)
-                        self._store.save(_ceo_report)
-                        await self._propose_wisdom(_ceo_report)
-                        reports['CEO'] = _ceo_report
-                        self._save_checkpoint('CEO')
-
-                    ceo_report = reports['CEO']
-                    ceo_hp = ceo_report.handoff_payload  # Strictly typed CEOHandoff fields
-                    ceo_approved = ceo_hp.get("approved_for_phase2", True)
-                    foundation["ceo_alignment"] = ceo_hp.get("growth_target_alignment", "UNKNOWN")
-                    ceo_target = ceo_hp.get("growth_target_annual", 0)
-
-                    if not ceo_approved:
-                        await self._emit({
-                            "type": "dialogue",
-                            "agent": "SYSTEM",
-                            "icon": "⚠️",
-                            "color": "#f59e0b",
-                            "message": f"**Phase 1 GATE: CEO flags MISALIGNMENT**\nAlignment: {foundation['ceo_alignment']} | Growth Target: ${ceo_target:,.0f}\nRevision required. Cycling back.",
-                            "timestamp": datetime.now().isoformat()
-                        })
-                else:
-                    logger.info("COO: Skipping CEO validation per CEO Triage.")
-
+                ceo_handoff = self._orchestrator.build_handoff_context(
+                    PipelineStep(agent_name='CEO', phase='validation', depends_on=['CMO']),
+                    reports,
+                    self.message,
+                    iteration=iteration,
+                    market_pulse=self.market_pulse_data,
+                    chaos_scenario=self.active_chaos if iteration > 1 else None,
+                    wisdom_vault=get_wisdom_vault(),
+                )
+                # Phase 5: CEO receives historical semantic memory
+                ceo_handoff += self.semantic_memory_block
+                if iteration > 1:
+                    ceo_handoff += self._mandate_block("CEO")
+                if 'CEO' not in reports:
+                    ceo_resp, ceo_data_raw, ceo_meta = await self._trigger_agent_response('CEO', ceo_handoff)
+                    _ceo_report = parse_agent_response(ceo_resp, 'CEO', 'validation', self.project_id, iteration,
+                                                       structured_data=ceo_data_raw, metadata=ceo_meta)
+                    self._store.save(_ceo_report)
+                    await self._propose_wisdom(_ceo_report)
+                    reports['CEO'] = _ceo_report
+                    self._save_checkpoint('CEO')
+
+                ceo_report = reports['CEO']
+                foundation["ceo_alignment"] = ceo_report.handoff_payload.get("growth_target_alignment", "UNKNOWN")
+                return ceo_report  # approved_for_phase2 is enforced by the CEO gate
+
+            async def run_cto_node():
                 # PHASE 1.5: THE ENGINEER — CTO
                 await self._emit({
                     "type": "dialogue",
@@ -867,206 +917,196 @@ class WarRoomPipelineRunner:
                 })
 
                 # CTO receives CMO strategy + CEO validation via orchestrator handoff
-                foundation.setdefault("cto_data", {})
-                foundation.setdefault("cto_hp", {})
-                if "CTO" in self.triage_list:
-                    cto_handoff = self._orchestrator.build_handoff_context(
-                        PipelineStep(agent_name='CTO', phase='technical', depends_on=['CMO', 'CEO']),
-                        reports,
-                        self.message,
-                        iteration=iteration,
-                        market_pulse=self.market_pulse_data,
-                        chaos_scenario=self.active_chaos if iteration > 1 else None,
-                        wisdom_vault=get_wisdom_vault(),
-                    )
-                    if iteration > 1:
-                        cto_handoff += self._mandate_block("CTO")
-                    if 'CTO' not in reports:
-                        cto_resp, cto_data_raw, cto_meta = await self._trigger_agent_response('CTO', cto_handoff)
-                        _cto_report = parse_agent_response(cto_resp, 'CTO', 'technical', self.project_id, iteration,
-                                                           structured_data=cto_data_raw, metadata=cto_meta)
-                        self._store.save(_cto_report)
-                        await self._propose_wisdom(_cto_report)
-                        reports['CTO'] = _cto_report
-                        self._save_checkpoint('CTO')
-
-                    cto_report = reports['CTO']
-                    cto_hp = cto_report.handoff_payload  # Strictly typed CTOHandoff fields
-
-                    cto_feasibility = float(cto_hp.get("technical_feasibility_score", 5))
-                    cto_timeline = cto_hp.get("implementation_timeline_weeks", 0)
-                    dev_buffer = cto_hp.get("development_buffer_weeks", 0)
-                    # Compute development_buffer_weeks if LLM didn't provide it
-                    if not dev_buffer and cto_timeline:
-                        dev_buffer = round(cto_timeline * 1.5, 1) if cto_feasibility < 7 else cto_timeline
-
-                    foundation.update({
-                        "cto_hp": cto_hp,
-                        "cto_data": cto_hp,
-                        "cto_feasibility": cto_feasibility,
-                        "cto_project_type": cto_hp.get("project_type", "DIGITAL"),
-                        "cto_tech_stack": cto_hp.get("tech_stack", []),
-                        "cto_automation_layer": cto_hp.get("automation_monitoring_layer", ""),
-                        "cto_skills_blocks": cto_hp.get("skills_library_blocks", []),
-                        "cto_timeline": cto_timeline,
-                        "cto_v3_compliance": cto_hp.get("v3_compliance", "UNKNOWN"),
-                        "cto_pre_deploy": cto_hp.get("pre_deploy_gate_status", "UNKNOWN"),
-                        "cto_recommendation": cto_report.recommendation,
-                        "infra_cost": cto_hp.get("infrastructure_cost_estimate", 0),
-                        "dev_buffer": dev_buffer,
-                        "tech_debt_premium": cto_hp.get("tech_debt_risk_premium_pct", 0),
-                        "gate_source": cto_hp.get(
-                            "gate_source",
-                            "aether_native" if self._pre_deploy_available else "llm_estimate"
-                        ),
-                    })
+                cto_handoff = self._orchestrator.build_handoff_context(
+                    PipelineStep(agent_name='CTO', phase='technical', depends_on=['CMO', 'CEO']),
+                    reports,
+                    self.message,
+                    iteration=iteration,
+                    market_pulse=self.market_pulse_data,
+                    chaos_scenario=self.active_chaos if iteration > 1 else None,
+                    wisdom_vault=get_wisdom_vault(),
+                )
+                if iteration > 1:
+                    cto_handoff += self._mandate_block("CTO")
+                if 'CTO' not in reports:
+                    cto_resp, cto_data_raw, cto_meta = await self._trigger_agent_response('CTO', cto_handoff)
+                    _cto_report = parse_agent_response(cto_resp, 'CTO', 'technical', self.project_id, iteration,
+                                                       structured_data=cto_data_raw, metadata=cto_meta)
+                    self._store.save(_cto_report)
+                    await self._propose_wisdom(_cto_report)
+                    reports['CTO'] = _cto_report
+                    self._save_checkpoint('CTO')
+
+                cto_report = reports['CTO']
+                cto_hp = cto_report.handoff_payload  # Strictly typed CTOHandoff fields
+
+                cto_feasibility = float(cto_hp.get("technical_feasibility_score", 5))
+                cto_timeline = cto_hp.get("implementation_timeline_weeks", 0)
+                dev_buffer = cto_hp.get("development_buffer_weeks", 0)
+                # Compute development_buffer_weeks if LLM didn't provide it
+                if not dev_buffer and cto_timeline:
+                    dev_buffer = round(cto_timeline * 1.5, 1) if cto_feasibility < 7 else cto_timeline
+
+                foundation.update({
+                    "cto_hp": cto_hp,
+                    "cto_data": cto_hp,
+                    "cto_feasibility": cto_feasibility,
+                    "cto_project_type": cto_hp.get("project_type", "DIGITAL"),
+                    "cto_tech_stack": cto_hp.get("tech_stack", []),
+                    "cto_automation_layer": cto_hp.get("automation_monitoring_layer", ""),
+                    "cto_skills_blocks": cto_hp.get("skills_library_blocks", []),
+                    "cto_timeline": cto_timeline,
+                    "cto_v3_compliance": cto_hp.get("v3_compliance", "UNKNOWN"),
+                    "cto_pre_deploy": cto_hp.get("pre_deploy_gate_status", "UNKNOWN"),
+                    "cto_recommendation": cto_report.recommendation,
+                    "infra_cost": cto_hp.get("infrastructure_cost_estimate", 0),
+                    "dev_buffer": dev_buffer,
+                    "tech_debt_premium": cto_hp.get("tech_debt_risk_premium_pct", 0),
+                    "gate_source": cto_hp.get(
+                        "gate_source",
+                        "aether_native" if self._pre_deploy_available else "llm_estimate"
+                    ),
+                })
+                return cto_report  # feasibility is enforced by the CTO gate
+
+            async def run_cfo_node():
+                # PHASE 2: THE MODEL — CFO
+                await self._emit({
+                    "type": "dialogue",
+                    "agent": "SYSTEM",
+                    "icon": "💰",
+                    "color": "#22c55e",
+                    "message": f"**PHASE 2: THE MODEL**\nCFO building Business Plan utilizing CTO Phase 1.5 USE Output:\n• Timeline: {foundation['cto_timeline']}wk (Buffer: {foundation['dev_buffer']}wk)\n• Infra Cost: ${foundation['infra_cost']:,.0f}/mo | Tech Debt Premium: {foundation['tech_debt_premium']}%\n• Gate Status: {foundation['cto_pre_deploy']}",
+                    "timestamp": datetime.now().isoformat()
+                })
 
-                    # TECHNICAL GATE CHECK via Orchestrator
-                    _cto_gate_step = PipelineStep(agent_name='CTO', phase='technical', is_gate=True, gate_threshold=4.0)
-                    _cto_gate_result = self._orchestrator.check_gate(_cto_gate_step, cto_report)
-                    if not _cto_gate_result['passed']:
+                # ── AETHER-NATIVE CFO EXCEL EXTRACTION ──────────────────
+                # Run the mathematical generation using native python/pandas
+                native_cfo_msg = ""
+                cfo_native_result = {}
+                try:
+                    from cfo_excel_architect import get_cfo_architect
+                    cfo_arch = get_cfo_architect()
+                    cfo_native_result = await asyncio.to_thread(
+                        cfo_arch.generate_business_plan,
+                        project_id=self.project_id,
+                        cmo_data=foundation["cmo_data"],
+                        cto_data=foundation["cto_data"],
+                        market_pulse=self.market_pulse_data
+                    )
+                    if cfo_native_result.get("status") == "success":
+                        native_cfo_msg = (
+                            f"\n\n=== Native Excel Architect Output ===\n"
+                            f"- Excel Artifact Generated: {cfo_native_result.get('file_name')}\n"
+                            f"- Fragility Index: {cfo_native_result.get('fragility_index')}/100\n"
+                            f"- Total Computed Cost Basis: ${cfo_native_result.get('total_cost'):,.2f}\n"
+                            f"- Baseline ROI: {cfo_native_result.get('roi_percentage')}%\n"
+                            f"- Risk-Adjusted ROI: {cfo_native_result.get('risk_adjusted_roi')}%\n"
+                            f"- Net Present Value (NPV): ${cfo_native_result.get('npv'):,.2f}\n"
+                        )
                         await self._emit({
                             "type": "dialogue",
                             "agent": "SYSTEM",
-                            "icon": "🛑",
-                            "color": "#ef4444",
-                            "message": f"**TECHNICAL GATE FAILURE**\n{_cto_gate_result['reason']}\nCFO modeling BLOCKED. CTO recommends: {foundation['cto_recommendation']}.\nRevision required.",
+                            "icon": "📊",
+                            "color": "#10b981",
+                            "message": f"**CFO EXCEL ARCHITECT**\nNative Fragility Report generated: {cfo_native_result.get('file_name')}\nTotal Cost Basis: ${cfo_native_result.get('total_cost'):,.0f} | Risk-Adj ROI: {cfo_native_result.get('risk_adjusted_roi')}%",
                             "timestamp": datetime.now().isoformat()
                         })
-                else:
-                    logger.info("COO: Skipping CTO per CEO Triage.")
-                    foundation.update({
-                        "cto_feasibility": 0.0, "cto_project_type": "GLOBAL",
-                        "cto_timeline": 0, "dev_buffer": 0, "infra_cost": 0,
-                        "tech_debt_premium": 0, "cto_pre_deploy": "UNKNOWN",
-                    })
-
-            try:
-                async with asyncio.TaskGroup() as tg:
-                    tg.create_task(run_cpo_node())
-                    tg.create_task(run_clo_node())
-                    tg.create_task(run_dependency_chain())
-            except BaseExceptionGroup as eg:
-                # Preserve the original single-exception contract
-                # (e.g. coo_agent.OpBudgetExceeded must reach run_session's handler).
-                raise eg.exceptions[0] from eg
-
-            cmo_hp = foundation.get("cmo_hp", {})
-            cmo_data = foundation.get("cmo_data", {})
-            cmo_marketing_cost = foundation.get("cmo_marketing_cost", 0)
-            cmo_projected_revenue = foundation.get("cmo_projected_revenue", 0)
-            cto_hp = foundation.get("cto_hp", {})
-            cto_data = foundation.get("cto_data", {})
-            cto_feasibility = foundation.get("cto_feasibility", 0.0)
-            cto_project_type = foundation.get("cto_project_type", "GLOBAL")
-            cto_timeline = foundation.get("cto_timeline", 0)
-            dev_buffer = foundation.get("dev_buffer", 0)
-            infra_cost = foundation.get("infra_cost", 0)
-            tech_debt_premium = foundation.get("tech_debt_premium", 0)
-            cto_pre_deploy = foundation.get("cto_pre_deploy", "UNKNOWN")
-
-            # ═══════════════════════════════════════════════════
-            # PHASE 2: THE MODEL — CFO
-            # ═══════════════════════════════════════════════════
-            await self._emit({
-                "type": "dialogue",
-                "agent": "SYSTEM",
-                "icon": "💰",
-                "color": "#22c55e",
-                "message": f"**PHASE 2: THE MODEL**\nCFO building Business Plan utilizing CTO Phase 1.5 USE Output:\n• Timeline: {cto_timeline}wk (Buffer: {dev_buffer}wk)\n• Infra Cost: ${infra_cost:,.0f}/mo | Tech Debt Premium: {tech_debt_premium}%\n• Gate Status: {cto_pre_deploy}",
-                "timestamp": datetime.now().isoformat()
-            })
-
-            # ── AETHER-NATIVE CFO EXCEL EXTRACTION ──────────────────
-            # Run the mathematical generation using native python/pandas
-            native_cfo_msg = ""
-            cfo_native_result = {}
-            try:
-                from cfo_excel_architect import get_cfo_architect
-                cfo_arch = get_cfo_architect()
-                cfo_native_result = cfo_arch.generate_business_plan(
-                    project_id=self.project_id,
-                    cmo_data=cmo_data,
-                    cto_data=cto_data,
-                    market_pulse=self.market_pulse_data
+                except Exception as e:
+                    logger.warning(f"Native CFO failed: {e}")
+
+                # CFO LLM receives upstream reports via orchestrator + native Excel output
+                cfo_handoff = self._orchestrator.build_handoff_context(
+                    PipelineStep(agent_name='CFO', phase='financials', depends_on=['CMO', 'CEO', 'CTO']),
+                    reports,
+                    self.message,
+                    iteration=iteration,
+                    market_pulse=self.market_pulse_data,
+                    chaos_scenario=self.active_chaos if iteration > 1 else None,
+                    wisdom_vault=get_wisdom_vault(),
                 )
-                if cfo_native_result.get("status") == "success":
-                    native_cfo_msg = (
-                        f"\n\n=== Native Excel Architect Output ===\n"
-                        f"- Excel Artifact Generated: {cfo_native_result.get('file_name')}\n"
-                        f"- Fragility Index: {cfo_native_result.get('fragility_index')}/100\n"
-                        f"- Total Computed Cost Basis: ${cfo_native_result.get('total_cost'):,.2f}\n"
-                        f"- Baseline ROI: {cfo_native_result.get('roi_percentage')}%\n"
-                        f"- Risk-Adjusted ROI: {cfo_native_result.get('risk_adjusted_roi')}%\n"
-                        f"- Net Present Value (NPV): ${cfo_native_result.get('npv'):,.2f}\n"
-                    )
-                    await self._emit({
-                        "type": "dialogue",
-                        "agent": "SYSTEM",
-                        "icon": "📊",
-                        "color": "#10b981",
-                        "message": f"**CFO EXCEL ARCHITECT**\nNative Fragility Report generated: {cfo_native_result.get('file_name')}\nTotal Cost Basis: ${cfo_native_result.get('total_cost'):,.0f} | Risk-Adj ROI: {cfo_native_result.get('risk_adjusted_roi')}%",
-                        "timestamp": datetime.now().isoformat()
-                    })
-            except Exception as e:
-                logger.warning(f"Native CFO failed: {e}")
+                # Append Native Excel results if available
+                if native_cfo_msg:
+                    cfo_handoff += native_cfo_msg
+                if iteration > 1:
+                    cfo_handoff += self._mandate_block("CFO")
+                cfo_resp, cfo_data, cfo_meta = await self._trigger_agent_response('CFO', cfo_handoff)
+
+                # ── WAR ROOM: Parse CFO into typed WarRoomReport ──
+                cfo_report = parse_agent_response(cfo_resp, 'CFO', 'financials', self.project_id, iteration,
+                                                  structured_data=cfo_data, metadata=cfo_meta)
+
+                # ═══════════════════════════════════════════════════
+                # PHASE 3 (Optimization): MATHEMATICAL HANDOFF RIGOR
+                # If the native Excel Architect computed the model,
+                # its figures are ground truth — overwrite the LLM's
+                # narrative numbers BEFORE the report is stored,
+                # handed to the Critic, or captured as predictions.
+                # ═══════════════════════════════════════════════════
+                if native_cfo_msg and cfo_native_result.get("status") == "success":
+                    _native_sync = {
+                        "roi_percentage": cfo_native_result.get("roi_percentage"),
+                        "roas": cfo_native_result.get("roas"),
+                        "total_cost_basis": cfo_native_result.get("total_cost"),
+                        "npv": cfo_native_result.get("npv"),
+                        "fragility_index": cfo_native_result.get("fragility_index"),
+                        "risk_adjusted_roi": cfo_native_result.get("risk_adjusted_roi"),
+                    }
+                    _synced_keys = []
+                    for k, v in _native_sync.items():
+                        if v is None:
+                            continue
+                        try:
+                            v = float(v)
+                        except (TypeError, ValueError):
+                            continue
+                        cfo_report.handoff_payload[k] = v
+                        cfo_report.detailed_report[k] = v
+                        _synced_keys.append(k)
+                    if _synced_keys:
+                        cfo_report.metadata["native_excel_synced"] = _synced_keys
+                        logger.info(f"[CFO SYNC] LLM narrative aligned to native Excel truth: {_synced_keys}")
+
+                self._store.save(cfo_report)
+                await self._propose_wisdom(cfo_report)
+                reports['CFO'] = cfo_report
+                return cfo_report
+
+            nodes = {
+                "CMO": run_cmo_node, "CPO": run_cpo_node, "CLO": run_clo_node,
+                "CEO": run_ceo_node, "CTO": run_cto_node, "CFO": run_cfo_node,
+            }
+            # CFO always models the plan; everyone else is staffed by CEO triage.
+            staffed = [s for s in _FOUNDATION_DAG if s.agent_name == "CFO" or s.agent_name in self.triage_list]
+            for skipped in (s.agent_name for s in _FOUNDATION_DAG if s not in staffed):
+                logger.info(f"COO: Skipping {skipped} per CEO Triage.")
 
-            # CFO LLM receives upstream reports via orchestrator + native Excel output
-            cfo_handoff = self._orchestrator.build_handoff_context(
-                PipelineStep(agent_name='CFO', phase='financials', depends_on=['CMO', 'CEO', 'CTO']),
-                reports,
-                self.message,
-                iteration=iteration,
-                market_pulse=self.market_pulse_data,
-                chaos_scenario=self.active_chaos if iteration > 1 else None,
-                wisdom_vault=get_wisdom_vault(),
+            async def run_step(step: PipelineStep):
+                return await nodes[step.agent_name]()
+
+            dag = PipelineDAGExecutor(
+                staffed, run_step,
+                gate_check=lambda step, report: self._orchestrator.check_gate(step, report),
             )
-            # Append Native Excel results if available
-            if native_cfo_msg:
-                cfo_handoff += native_cfo_msg
-            if iteration > 1:
-                cfo_handoff += self._mandate_block("CFO")
-            cfo_resp, cfo_data, cfo_meta = await self._trigger_agent_response('CFO', cfo_handoff)
+            dag_result = await dag.run()
+            await self._record_dag_timing(iteration, dag_result)
 
-            # ── WAR ROOM: Parse CFO into typed WarRoomReport ──
-            cfo_report = parse_agent_response(cfo_resp, 'CFO', 'financials', self.project_id, iteration,
-                                              structured_data=cfo_data, metadata=cfo_meta)
+            if dag_result.halted:
+                await self._cycle_back_from_gate(dag_result.gate_failure, foundation, reports, iteration)
+                continue
 
-            # ═══════════════════════════════════════════════════
-            # PHASE 3 (Optimization): MATHEMATICAL HANDOFF RIGOR
-            # If the native Excel Architect computed the model,
-            # its figures are ground truth — overwrite the LLM's
-            # narrative numbers BEFORE the report is stored,
-            # handed to the Critic, or captured as predictions.
-            # ═══════════════════════════════════════════════════
-            if native_cfo_msg and cfo_native_result.get("status") == "success":
-                _native_sync = {
-                    "roi_percentage": cfo_native_result.get("roi_percentage"),
-                    "roas": cfo_native_result.get("roas"),
-                    "total_cost_basis": cfo_native_result.get("total_cost"),
-                    "npv": cfo_native_result.get("npv"),
-                    "fragility_index": cfo_native_result.get("fragility_index"),
-                    "risk_adjusted_roi": cfo_native_result.get("risk_adjusted_roi"),
-                }
-                _synced_keys = []
-                for k, v in _native_sync.items():
-                    if v is None:
-                        continue
-                    try:
-                        v = float(v)
-                    except (TypeError, ValueError):
-                        continue
-                    cfo_report.handoff_payload[k] = v
-                    cfo_report.detailed_report[k] = v
-                    _synced_keys.append(k)
-                if _synced_keys:
-                    cfo_report.metadata["native_excel_synced"] = _synced_keys
-                    logger.info(f"[CFO SYNC] LLM narrative aligned to native Excel truth: {_synced_keys}")
-
-            self._store.save(cfo_report)
-            await self._propose_wisdom(cfo_report)
-            reports['CFO'] = cfo_report
+            cmo_hp = foundation["cmo_hp"]
+            cmo_data = foundation["cmo_data"]
+            cmo_marketing_cost = foundation["cmo_marketing_cost"]
+            cmo_projected_revenue = foundation["cmo_projected_revenue"]
+            cto_hp = foundation["cto_hp"]
+            cto_data = foundation["cto_data"]
+            cto_feasibility = foundation["cto_feasibility"]
+            cto_project_type = foundation["cto_project_type"]
+
+            cfo_report = reports['CFO']
             cfo_hp = cfo_report.handoff_payload  # Strictly typed CFOHandoff fields (Excel-synced)
+            cfo_data = cfo_report.structured_data
 
             cfo_roi = cfo_hp.get("roi_percentage", 0)
             cfo_roas = cfo_hp.get("roas", 0)
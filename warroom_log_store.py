@@ -0,0 +1,410 @@
+"""
+warroom_log_store.py — Append-Only War Room Log Store
+═══════════════════════════════════════════════════════
+Per-project segment log for War Room broadcasts. Replaces the old
+``warroom_history.json`` snapshot, which was re-serialized in full on
+every ``_broadcast()`` call.
+
+Layout (per project, under projects/<project>/):
+  - warroom_history.jsonl         one JSON message per line (append-only)
+  - warroom_history.idx           packed uint64 byte offsets, one per message
+  - warroom_history.sessions.idx  packed uint64 message indices where a
+                                  War Room session starts
+
+Writes are queued in memory and drained in batches by a background flusher
+thread, so a broadcast costs O(message) and never touches the event loop.
+When a log grows past ``max_messages * compact_factor`` it is compacted down
+to the newest ``max_messages`` entries (temp file + atomic rename).
+
+Readers call ``flush(project)`` implicitly, so reads always observe every
+message appended before them.
+
+Author: Antigravity Master Architect
+Version: 1.0.0
+"""
+
+import os
+import json
+import atexit
+import logging
+import threading
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("WarRoomLogStore")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECTS_DIR = os.path.join(SCRIPT_DIR, "projects")
+
+LOG_NAME = "warroom_history.jsonl"
+INDEX_NAME = "warroom_history.idx"
+SESSIONS_NAME = "warroom_history.sessions.idx"
+LEGACY_NAME = "warroom_history.json"
+
+
+def is_session_marker(msg: dict) -> bool:
+    """True when a message opens a new War Room session."""
+    return (
+        msg.get("type") == "dialogue"
+        and msg.get("agent") == "SYSTEM"
+        and "SESSION OPENED" in msg.get("message", "")
+    )
+
+
+class _ProjectLog:
+    """In-memory view of one project's on-disk index files."""
+
+    __slots__ = ("offsets", "session_starts", "size", "last_updated")
+
+    def __init__(self):
+        self.offsets = array("Q")
+        self.session_starts = array("Q")
+        self.size = 0
+        self.last_updated: Optional[str] = None
+
+
+class WarRoomLogStore:
+    """Append-only, index-addressed War Room message log.
+
+    Usage:
+        store = get_warroom_log_store()
+        store.append("Aether", {"type": "dialogue", ...})   # non-blocking
+        sessions, total = store.read_sessions("Aether", offset=0, limit=50)
+    """
+
+    def __init__(self, root_dir: str = PROJECTS_DIR, flush_interval: float = 0.25,
+                 max_messages: int = 500, compact_factor: int = 2, batch_size: int = 64):
+        self.root_dir = root_dir
+        self.flush_interval = flush_interval
+        self.max_messages = max_messages
+        self.compact_factor = max(compact_factor, 1)
+        self.batch_size = batch_size
+
+        self._logs: Dict[str, _ProjectLog] = {}
+        self._pending: Dict[str, List[dict]] = {}
+        self._pending_count = 0
+        self._cond = threading.Condition()
+        self._io_lock = threading.RLock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+    # ── Paths ────────────────────────────────────────────────
+
+    def _dir(self, project: str) -> str:
+        return os.path.join(self.root_dir, project)
+
+    def _path(self, project: str, name: str) -> str:
+        return os.path.join(self._dir(project), name)
+
+    def exists(self, project: str) -> bool:
+        return (
+            os.path.exists(self._path(project, LOG_NAME))
+            or os.path.exists(self._path(project, LEGACY_NAME))
+        )
+
+    def projects(self) -> List[str]:
+        """Projects that have a War Room log on disk."""
+        if not os.path.isdir(self.root_dir):
+            return []
+        return [p for p in sorted(os.listdir(self.root_dir)) if self.exists(p)]
+
+    # ── Write path ───────────────────────────────────────────
+
+    def append(self, project: str, msg: dict) -> None:
+        """Queue a message for the background flusher. Never blocks on disk."""
+        with self._cond:
+            self._pending.setdefault(project, []).append(msg)
+            self._pending_count += 1
+            if self._flusher is None or not self._flusher.is_alive():
+                self._closed = False
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="warroom-log-flusher", daemon=True
+                )
+                self._flusher.start()
+            if self._pending_count >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self, project: Optional[str] = None) -> None:
+        """Synchronously drain queued messages (all projects, or just one).
+
+        ``_io_lock`` is taken before the batch is popped and held until it is
+        written, so concurrent flushes write batches in the order they were
+        queued and a returning flush has persisted everything it popped.
+        Lock order is always ``_io_lock`` then ``_cond``.
+        """
+        with self._io_lock:
+            with self._cond:
+                if project is None:
+                    batches = self._pending
+                    self._pending = {}
+                    self._pending_count = 0
+                else:
+                    batch = self._pending.pop(project, [])
+                    self._pending_count -= len(batch)
+                    batches = {project: batch} if batch else {}
+            for proj, msgs in batches.items():
+                try:
+                    self._write_batch(proj, msgs)
+                except Exception as e:
+                    logger.warning(f"War Room log flush failed for {proj}: {e}")
+
+    def close(self) -> None:
+        """Stop the flusher thread after draining everything queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._flusher is not None:
+            self._flusher.join(timeout=5)
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and self._pending_count < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def _write_batch(self, project: str, msgs: List[dict]) -> None:
+        if not msgs:
+            return
+        with self._io_lock:
+            state = self._open(project)
+            lines = [
+                (json.dumps(m, default=str, ensure_ascii=False) + "\n").encode("utf-8")
+                for m in msgs
+            ]
+            new_offsets = array("Q")
+            new_starts = array("Q")
+            pos = state.size
+            count = len(state.offsets)
+            for i, (line, msg) in enumerate(zip(lines, msgs)):
+                new_offsets.append(pos)
+                if count + i == 0 or is_session_marker(msg):
+                    new_starts.append(count + i)
+                pos += len(line)
+
+            with open(self._path(project, LOG_NAME), "ab") as f:
+                f.write(b"".join(lines))
+            with open(self._path(project, INDEX_NAME), "ab") as f:
+                new_offsets.tofile(f)
+            if new_starts:
+                with open(self._path(project, SESSIONS_NAME), "ab") as f:
+                    new_starts.tofile(f)
+
+            state.offsets.extend(new_offsets)
+            state.session_starts.extend(new_starts)
+            state.size = pos
+            state.last_updated = datetime.now().isoformat()
+
+            if len(state.offsets) > self.max_messages * self.compact_factor:
+                self._compact_locked(project, state)
+
+    # ── Index maintenance ────────────────────────────────────
+
+    def _open(self, project: str) -> _ProjectLog:
+        """Load (or rebuild) a project's index. Caller holds ``_io_lock``."""
+        state = self._logs.get(project)
+        if state is not None:
+            return state
+
+        os.makedirs(self._dir(project), exist_ok=True)
+        log_path = self._path(project, LOG_NAME)
+        if not os.path.exists(log_path) and os.path.exists(self._path(project, LEGACY_NAME)):
+            self._import_legacy(project)
+
+        state = _ProjectLog()
+        if os.path.exists(log_path):
+            state.size = os.path.getsize(log_path)
+            state.last_updated = datetime.fromtimestamp(os.path.getmtime(log_path)).isoformat()
+            try:
+                state.offsets = self._read_array(self._path(project, INDEX_NAME))
+                state.session_starts = self._read_array(self._path(project, SESSIONS_NAME))
+            except (OSError, ValueError):
+                state.offsets, state.session_starts = array("Q"), array("Q")
+            if not self._index_consistent(log_path, state):
+                logger.info(f"War Room log: rebuilding index for {project}")
+                self._rebuild_index(project, state)
+        self._logs[project] = state
+        return state
+
+    @staticmethod
+    def _read_array(path: str) -> array:
+        arr = array("Q")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                arr.frombytes(f.read())
+        return arr
+
+    @staticmethod
+    def _index_consistent(log_path: str, state: _ProjectLog) -> bool:
+        if not state.offsets:
+            return state.size == 0
+        if state.offsets[-1] >= state.size:
+            return False
+        with open(log_path, "rb") as f:
+            f.seek(state.offsets[-1])
+            f.readline()
+            return f.tell() == state.size
+
+    def _rebuild_index(self, project: str, state: _ProjectLog) -> None:
+        offsets, starts = array("Q"), array("Q")
+        pos = 0
+        with open(self._path(project, LOG_NAME), "rb") as f:
+            for i, line in enumerate(f):
+                offsets.append(pos)
+                pos += len(line)
+                try:
+                    marker = is_session_marker(json.loads(line))
+                except ValueError:
+                    marker = False
+                if i == 0 or marker:
+                    starts.append(i)
+        state.offsets, state.session_starts, state.size = offsets, starts, pos
+        self._write_index_files(project, state)
+
+    def _write_index_files(self, project: str, state: _ProjectLog) -> None:
+        for name, arr in ((INDEX_NAME, state.offsets), (SESSIONS_NAME, state.session_starts)):
+            tmp = self._path(project, name + ".tmp")
+            with open(tmp, "wb") as f:
+                arr.tofile(f)
+            os.replace(tmp, self._path(project, name))
+
+    def _import_legacy(self, project: str) -> None:
+        """One-shot migration from the old full-snapshot warroom_history.json."""
+        legacy = self._path(project, LEGACY_NAME)
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                messages = json.load(f).get("messages", [])
+            tmp = self._path(project, LOG_NAME + ".tmp")
+            with open(tmp, "wb") as f:
+                for m in messages:
+                    f.write((json.dumps(m, default=str, ensure_ascii=False) + "\n").encode("utf-8"))
+            os.replace(tmp, self._path(project, LOG_NAME))
+            os.replace(legacy, legacy + ".migrated")
+            logger.info(f"War Room log: migrated {len(messages)} legacy messages for {project}")
+        except Exception as e:
+            logger.warning(f"War Room legacy history import failed for {project}: {e}")
+
+    def compact(self, project: str) -> None:
+        """Trim a project's log to the newest ``max_messages`` entries."""
+        self.flush(project)
+        with self._io_lock:
+            self._compact_locked(project, self._open(project))
+
+    def _compact_locked(self, project: str, state: _ProjectLog) -> None:
+        drop = len(state.offsets) - self.max_messages
+        if drop <= 0:
+            return
+        log_path = self._path(project, LOG_NAME)
+        cut = state.offsets[drop]
+        tmp = log_path + ".tmp"
+        with open(log_path, "rb") as src, open(tmp, "wb") as dst:
+            src.seek(cut)
+            while True:
+                chunk = src.read(1 << 20)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.replace(tmp, log_path)
+
+        state.offsets = array("Q", (o - cut for o in state.offsets[drop:]))
+        starts = array("Q", (s - drop for s in state.session_starts if s >= drop))
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        state.session_starts = starts
+        state.size -= cut
+        self._write_index_files(project, state)
+
+    # ── Read path ────────────────────────────────────────────
+
+    def count(self, project: str) -> int:
+        self.flush(project)
+        with self._io_lock:
+            return len(self._open(project).offsets)
+
+    def last_updated(self, project: str) -> Optional[str]:
+        self.flush(project)
+        with self._io_lock:
+            return self._open(project).last_updated
+
+    def read_messages(self, project: str, start: int = 0, stop: Optional[int] = None) -> List[dict]:
+        """Return messages[start:stop] using the offset index (one seek, one read)."""
+        self.flush(project)
+        with self._io_lock:
+            state = self._open(project)
+            n = len(state.offsets)
+            start, stop, _ = slice(start, stop).indices(n)
+            if start >= stop:
+                return []
+            begin = state.offsets[start]
+            end = state.offsets[stop] if stop < n else state.size
+            with open(self._path(project, LOG_NAME), "rb") as f:
+                f.seek(begin)
+                raw = f.read(end - begin)
+        out = []
+        for line in raw.splitlines():
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+        return out
+
+    def tail(self, project: str, n: int) -> List[dict]:
+        """Return the newest ``n`` messages."""
+        return self.read_messages(project, -n) if n > 0 else []
+
+    def read_sessions(self, project: str, offset: int = 0, limit: int = 50) -> Tuple[List[dict], int]:
+        """Return (sessions newest-first, total session count) for one page.
+
+        Only the messages belonging to the requested page are read from disk.
+        """
+        self.flush(project)
+        with self._io_lock:
+            state = self._open(project)
+            starts = list(state.session_starts)
+            n = len(state.offsets)
+        total = len(starts)
+        sessions = []
+        for j in range(total - 1 - offset, max(total - 1 - offset - limit, -1), -1):
+            stop = starts[j + 1] if j + 1 < total else n
+            messages = self.read_messages(project, starts[j], stop)
+            if not messages:
+                continue
+            first = messages[0]
+            if is_session_marker(first):
+                topic = first.get("message", "").split("Topic: ")[-1].strip('"')
+                started = first.get("timestamp")
+            else:
+                topic, started = "Unknown", None
+            sessions.append({"topic": topic, "started": started, "messages": messages})
+        return sessions, total
+
+    def clear(self, project: str) -> None:
+        """Delete every persisted message for a project."""
+        with self._io_lock:
+            with self._cond:
+                self._pending_count -= len(self._pending.pop(project, []))
+            self._logs.pop(project, None)
+            for name in (LOG_NAME, INDEX_NAME, SESSIONS_NAME, LEGACY_NAME):
+                path = self._path(project, name)
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+# ═══════════════════════════════════════════════════════════════
+# SINGLETON
+# ═══════════════════════════════════════════════════════════════
+
+_store = None
+
+
+def get_warroom_log_store() -> WarRoomLogStore:
+    global _store
+    if _store is None:
+        _store = WarRoomLogStore()
+        atexit.register(_store.close)
+    return _store
@@ -21,6 +21,9 @@ import os
 import json
 import logging
 import re
+import sqlite3
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Callable
 from pydantic import BaseModel, Field
@@ -424,34 +427,170 @@ class WarRoomReport(BaseModel):
 # §2  REPORT STORE — Persistence Layer
 # ═══════════════════════════════════════════════════════════════════
 
+REPORT_INDEX_DB = "_report_index.sqlite3"
+REPORT_CACHE_SIZE = 256  # parsed WarRoomReports kept in-process (LRU)
+
+
 class ReportStore:
     """Persists WarRoomReports to the Boardroom Exchange file system.
 
     Storage layout:
         Boardroom_Exchange/reports/{project_id}/{agent}_{phase}_{timestamp}.json
+        Boardroom_Exchange/reports/_report_index.sqlite3
+
+    The JSON files stay the source of truth. The SQLite index holds one
+    row per report — (project, agent, phase, iteration, timestamp, file)
+    — written on save, so latest/iteration lookups are indexed point
+    queries instead of directory scans. Reports dropped in by other
+    tools (or written before the index existed) are picked up whenever
+    the project directory's mtime changes. Parsed reports are kept in a
+    small LRU; callers always get their own copy.
     """
 
     def __init__(self, base_dir: str = None):
         self.base_dir = base_dir or REPORTS_DIR
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[tuple, WarRoomReport]" = OrderedDict()
+        self._synced_mtime: Dict[str, int] = {}   # project_id -> dir mtime at last sync
+        self._unreadable: Dict[tuple, tuple] = {}  # (project_id, filename) -> (mtime_ns, size) that failed to parse
+        self._db = sqlite3.connect(
+            os.path.join(self.base_dir, REPORT_INDEX_DB), check_same_thread=False, timeout=10
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS report_index (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                project_id  TEXT NOT NULL,
+                filename    TEXT NOT NULL,
+                agent       TEXT,
+                phase       TEXT,
+                iteration   INTEGER,
+                timestamp   TEXT,
+                file_ts     TEXT,
+                UNIQUE(project_id, filename)
+            );
+            CREATE INDEX IF NOT EXISTS idx_report_latest
+                ON report_index(project_id, agent, phase, file_ts);
+            CREATE INDEX IF NOT EXISTS idx_report_iteration
+                ON report_index(project_id, iteration);
+        """)
+        self._db.commit()
 
     def _project_dir(self, project_id: str) -> str:
         d = os.path.join(self.base_dir, project_id)
         os.makedirs(d, exist_ok=True)
         return d
 
+    # ── Index maintenance ────────────────────────────────────────
+
+    def _index_row(self, project_id: str, filename: str, report: WarRoomReport):
+        self._db.execute(
+            "INSERT OR REPLACE INTO report_index "
+            "(project_id, filename, agent, phase, iteration, timestamp, file_ts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (project_id, filename, report.agent, report.phase, report.iteration,
+             report.timestamp, filename[:-len(".json")].rsplit("_", 1)[-1]),
+        )
+
+    @staticmethod
+    def _file_sig(path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _retry_due(self, project_id: str, pdir: str) -> bool:
+        """True if a report that failed to parse has been rewritten (or removed) since."""
+        return any(self._file_sig(os.path.join(pdir, fname)) != sig
+                   for (pid, fname), sig in self._unreadable.items() if pid == project_id)
+
+    def _sync(self, project_id: str) -> str:
+        """Reconcile the index with the project directory if it changed."""
+        pdir = self._project_dir(project_id)
+        mtime = os.stat(pdir).st_mtime_ns
+        with self._lock:
+            # An in-place rewrite does not move the directory mtime, so unreadable
+            # files are re-stat'ed and retried once their mtime or size changes.
+            if self._synced_mtime.get(project_id) == mtime and not self._retry_due(project_id, pdir):
+                return pdir
+            on_disk = {f for f in os.listdir(pdir) if f.endswith(".json")}
+            indexed = {r[0] for r in self._db.execute(
+                "SELECT filename FROM report_index WHERE project_id = ?", (project_id,))}
+            for fname in indexed - on_disk:
+                self._db.execute("DELETE FROM report_index WHERE project_id = ? AND filename = ?",
+                                 (project_id, fname))
+                self._cache.pop((project_id, fname), None)
+            for key in [k for k in self._unreadable if k[0] == project_id and k[1] not in on_disk]:
+                del self._unreadable[key]
+            for fname in sorted(on_disk - indexed):
+                key, sig = (project_id, fname), self._file_sig(os.path.join(pdir, fname))
+                if self._unreadable.get(key) == sig:
+                    continue
+                try:
+                    report = self._read(project_id, fname, cache=False)
+                except Exception as e:
+                    logger.warning(f"Skipping corrupt report {os.path.join(pdir, fname)}: {e}")
+                    self._unreadable[key] = sig
+                    continue
+                self._unreadable.pop(key, None)
+                self._index_row(project_id, fname, report)
+            self._db.commit()
+            self._synced_mtime[project_id] = mtime
+        return pdir
+
+    # ── Parsed-report LRU ────────────────────────────────────────
+
+    def _remember(self, key: tuple, report: WarRoomReport):
+        with self._lock:
+            self._cache[key] = report
+            self._cache.move_to_end(key)
+            while len(self._cache) > REPORT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _read(self, project_id: str, filename: str, cache: bool = True) -> WarRoomReport:
+        """Load one report (LRU first). Raises on missing/corrupt files."""
+        key = (project_id, filename)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit.model_copy(deep=True)
+        with open(os.path.join(self.base_dir, project_id, filename), "r", encoding="utf-8") as f:
+            report = WarRoomReport(**json.load(f))
+        if not cache:
+            return report
+        self._remember(key, report)
+        return report.model_copy(deep=True)
+
+    def _indexed_files(self, project_id: str, where: str = "", params: tuple = ()) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute(
+                f"SELECT filename FROM report_index WHERE project_id = ? {where} "
+                f"ORDER BY file_ts, id", (project_id, *params))]
+
     def save(self, report: WarRoomReport, is_gate: bool = False, gate_score: float = 0.0) -> str:
-        """Save a report to disk. Returns the file path.
+        """Save a report to disk and index it. Returns the file path.
         
         If is_gate=True, evaluates gate_score to generate the final Vision/Autopsy document.
         """
         project_id = report.project_id or "unassigned"
         ts = datetime.now().strftime("%Y%m%dT%H%M%S")
         filename = f"{report.agent}_{report.phase}_{ts}.json"
-        filepath = os.path.join(self._project_dir(project_id), filename)
+        pdir = self._sync(project_id)
+        filepath = os.path.join(pdir, filename)
 
         with open(filepath, "w", encoding="utf-8") as f:
             json.dump(report.model_dump(), f, indent=2, default=str)
 
+        with self._lock:
+            self._index_row(project_id, filename, report)
+            self._db.commit()
+            self._remember((project_id, filename), report.model_copy(deep=True))
+            # Our own write moved the directory mtime; don't rescan for it.
+            self._synced_mtime[project_id] = os.stat(pdir).st_mtime_ns
+
         logger.info(f"Report saved: {filepath}")
         
         # ── War Room Verdict Generator (Phase 5) ──
@@ -461,24 +600,27 @@ class ReportStore:
         return filepath
 
     def _generate_verdict_document(self, project_id: str, gate_score: float):
-        """Compile all display_content for the project into a final document."""
-        reports = self.get_all_for_project(project_id)
-        if not reports:
+        """Compile all display_content for the project into a final document.
+
+        Reports are streamed one at a time straight into the document.
+        """
+        self._sync(project_id)
+        filenames = self._indexed_files(project_id)
+        if not filenames:
             return
-            
+
         verdict_type = "[APPROVED] Project_Vision.md" if gate_score >= 7.0 else "[FAILED_GATE] Project_Autopsy.md"
         doc_path = os.path.join(self.base_dir, project_id, verdict_type)
-        
-        content = [f"# {verdict_type.replace('.md', '')}\n", f"**Project:** {project_id} | **Score:** {gate_score}/10\n", "---"]
-        for r in reports:
-            content.append(f"\n## 🤖 {r.agent} ({r.phase.upper()})")
-            if r.metadata:
-                cost = r.metadata.get('cost', '$0.00')
-                content.append(f"*Execution Cost: {cost}*")
-            content.append(f"\n{r.display_content}\n---")
-            
+
         with open(doc_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(content))
+            f.write("\n".join([f"# {verdict_type.replace('.md', '')}\n", f"**Project:** {project_id} | **Score:** {gate_score}/10\n", "---"]))
+            for r in self._stream(project_id, filenames):
+                content = [f"\n## 🤖 {r.agent} ({r.phase.upper()})"]
+                if r.metadata:
+                    cost = r.metadata.get('cost', '$0.00')
+                    content.append(f"*Execution Cost: {cost}*")
+                content.append(f"\n{r.display_content}\n---")
+                f.write("\n" + "\n".join(content))
         logger.info(f"War Room Verdict compiled: {doc_path}")
 
     def get_latest(self, project_id: str, agent: str, phase: str = None,
@@ -489,25 +631,22 @@ class ReportStore:
         a GhostAlert is logged and returned as metadata, signaling
         a pipeline break to the War Room dashboard.
         """
-        pdir = self._project_dir(project_id)
-        pattern = f"{agent}_"
+        self._sync(project_id)
+        query = "SELECT filename FROM report_index WHERE project_id = ? AND agent = ?"
+        params = [project_id, agent]
         if phase:
-            pattern += f"{phase}_"
-
-        matching = sorted(
-            [f for f in os.listdir(pdir) if f.startswith(pattern) and f.endswith(".json")],
-            reverse=True
-        )
-        if not matching:
+            query += " AND phase = ?"
+            params.append(phase)
+        with self._lock:
+            row = self._db.execute(query + " ORDER BY file_ts DESC, id DESC LIMIT 1", params).fetchone()
+        if not row:
             if ghost_alert:
                 self._emit_ghost_alert(project_id, agent, phase)
             return None
 
-        filepath = os.path.join(pdir, matching[0])
+        filepath = os.path.join(self.base_dir, project_id, row[0])
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return WarRoomReport(**data)
+            return self._read(project_id, row[0])
         except Exception as e:
             logger.warning(f"Failed to load report {filepath}: {e}")
             if ghost_alert:
@@ -553,33 +692,47 @@ class ReportStore:
         except Exception as e:
             logger.error(f"Failed to persist ghost alert: {e}")
 
+    def _stream(self, project_id: str, filenames: List[str]):
+        """Yield parsed reports without filling the LRU."""
+        for fname in filenames:
+            try:
+                yield self._read(project_id, fname, cache=False)
+            except Exception as e:
+                logger.warning(f"Skipping corrupt report {os.path.join(self.base_dir, project_id, fname)}: {e}")
+
+    def iter_project_reports(self, project_id: str):
+        """Stream all reports for a project, oldest first."""
+        self._sync(project_id)
+        yield from self._stream(project_id, self._indexed_files(project_id))
+
     def get_all_for_project(self, project_id: str) -> List[WarRoomReport]:
         """Retrieve all reports for a project, sorted by timestamp."""
-        pdir = self._project_dir(project_id)
+        return list(self.iter_project_reports(project_id))
+
+    def get_latest_iteration_reports(self, project_id: str, iteration: int) -> List[WarRoomReport]:
+        """Get all reports from a specific iteration for consensus scoring."""
+        self._sync(project_id)
         reports = []
-        for fname in sorted(os.listdir(pdir)):
-            if not fname.endswith(".json"):
-                continue
-            filepath = os.path.join(pdir, fname)
+        for fname in self._indexed_files(project_id, "AND iteration = ?", (iteration,)):
             try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                reports.append(WarRoomReport(**data))
+                reports.append(self._read(project_id, fname))
             except Exception as e:
-                logger.warning(f"Skipping corrupt report {filepath}: {e}")
+                logger.warning(f"Skipping corrupt report {os.path.join(self.base_dir, project_id, fname)}: {e}")
         return reports
 
-    def get_latest_iteration_reports(self, project_id: str, iteration: int) -> List[WarRoomReport]:
-        """Get all reports from a specific iteration for consensus scoring."""
-        all_reports = self.get_all_for_project(project_id)
-        return [r for r in all_reports if r.iteration == iteration]
-
     def clear_project(self, project_id: str):
         """Remove all reports for a project (use before starting fresh pipeline)."""
         pdir = self._project_dir(project_id)
         for fname in os.listdir(pdir):
             if fname.endswith(".json"):
                 os.remove(os.path.join(pdir, fname))
+        with self._lock:
+            self._db.execute("DELETE FROM report_index WHERE project_id = ?", (project_id,))
+            self._db.commit()
+            for key in [k for k in self._cache if k[0] == project_id]:
+                del self._cache[key]
+            self._unreadable = {k: v for k, v in self._unreadable.items() if k[0] != project_id}
+            self._synced_mtime.pop(project_id, None)
         logger.info(f"Cleared all reports for project: {project_id}")
 
 
@@ -1579,3 +1732,252 @@ def get_priority_queue() -> PriorityTaskQueue:
 def get_resource_lock() -> AgentResourceLock:
     """Get the global War Room resource lock manager."""
     return _resource_lock
+
+
+# ═══════════════════════════════════════════════════════════════════
+# §8  PIPELINE DAG EXECUTOR — Dependency-Ordered Concurrent Steps
+#     Steps run as soon as their depends_on reports exist, so a
+#     pipeline's wall time approaches its longest dependency chain
+#     instead of the sum of every agent.
+# ═══════════════════════════════════════════════════════════════════
+
+import asyncio
+
+
+class PipelineCycleError(ValueError):
+    """Raised when a pipeline's depends_on edges form a cycle."""
+
+
+@dataclass
+class StepTiming:
+    """Per-step timing, in seconds from the start of the DAG run."""
+    agent: str
+    status: str = "pending"     # pending / done / gate_failed / failed / skipped
+    queued_at: float = 0.0      # dependencies satisfied
+    started_at: float = 0.0     # LLM slot granted
+    finished_at: float = 0.0
+
+    @property
+    def slot_wait(self) -> float:
+        return max(0.0, self.started_at - self.queued_at)
+
+    @property
+    def duration(self) -> float:
+        return max(0.0, self.finished_at - self.started_at)
+
+
+@dataclass
+class DAGRunResult:
+    """Outcome of one PipelineDAGExecutor.run()."""
+    results: Dict[str, Any]
+    timings: Dict[str, StepTiming]
+    wall_seconds: float
+    critical_path: List[str]
+    critical_path_seconds: float
+    gate_failure: Optional[Dict[str, Any]] = None  # {"agent": ..., **check_gate result}
+
+    @property
+    def halted(self) -> bool:
+        return self.gate_failure is not None
+
+    @property
+    def serial_seconds(self) -> float:
+        """What the same steps would have cost run one after another."""
+        return sum(t.duration for t in self.timings.values())
+
+    def timing_summary(self) -> Dict[str, Any]:
+        """JSON-friendly digest for telemetry / the War Room dashboard."""
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "serial_seconds": round(self.serial_seconds, 3),
+            "critical_path": self.critical_path,
+            "critical_path_seconds": round(self.critical_path_seconds, 3),
+            "halted_at": self.gate_failure["agent"] if self.gate_failure else None,
+            "steps": {
+                a: {"status": t.status, "start": round(t.started_at, 3),
+                    "duration": round(t.duration, 3), "slot_wait": round(t.slot_wait, 3)}
+                for a, t in self.timings.items()
+            },
+        }
+
+
+class PipelineDAGExecutor:
+    """Topological scheduler for a List[PipelineStep].
+
+    A step becomes ready once every ``depends_on`` agent that is part of
+    this pipeline has finished; dependencies on agents outside it (e.g.
+    skipped by CEO triage) count as satisfied, exactly as
+    build_handoff_context skips reports that do not exist. Ready steps
+    run concurrently, each holding one shared LLM slot from
+    AgentResourceLock, so fan-out never exceeds the War Room budget.
+
+    Gate steps are evaluated with ``gate_check(step, result)`` as soon as
+    they finish. A failed gate stops anything new from being scheduled:
+    steps already in flight finish (their LLM spend is sunk) and every
+    other step is reported as skipped. If a step raises, the DAG drains
+    the same way and the first exception is re-raised.
+
+    Usage:
+        dag = PipelineDAGExecutor(pipeline, run_step=my_async_step_fn)
+        result = await dag.run()
+        if result.halted: ...
+    """
+
+    def __init__(
+        self,
+        steps: List[PipelineStep],
+        run_step: Callable[[PipelineStep], Any],
+        gate_check: Callable[[PipelineStep, Any], Dict[str, Any]] = None,
+        resource_lock: AgentResourceLock = None,
+        slot_timeout: float = 60.0,
+    ):
+        self.steps: Dict[str, PipelineStep] = {}
+        for step in steps:
+            if step.agent_name in self.steps:
+                raise ValueError(f"Duplicate pipeline step for agent '{step.agent_name}'")
+            self.steps[step.agent_name] = step
+        self._run_step = run_step
+        self._gate_check = gate_check or (lambda step, result: get_orchestrator().check_gate(step, result))
+        self._lock = resource_lock or get_resource_lock()
+        self.slot_timeout = slot_timeout
+        self.order = self.topological_order()
+
+    def dependencies(self, agent: str) -> List[str]:
+        """In-pipeline dependencies of a step (external ones are dropped)."""
+        return [d for d in dict.fromkeys(self.steps[agent].depends_on)
+                if d in self.steps and d != agent]
+
+    def topological_order(self) -> List[str]:
+        """Kahn's algorithm; ties keep the pipeline's declared order."""
+        pending = {a: len(self.dependencies(a)) for a in self.steps}
+        order: List[str] = []
+        ready = [a for a in self.steps if pending[a] == 0]
+        while ready:
+            agent = ready.pop(0)
+            order.append(agent)
+            for child in self.steps:
+                if agent in self.dependencies(child):
+                    pending[child] -= 1
+                    if pending[child] == 0:
+                        ready.append(child)
+        if len(order) != len(self.steps):
+            stuck = sorted(a for a in self.steps if a not in order)
+            raise PipelineCycleError(f"Pipeline dependency cycle among: {stuck}")
+        return order
+
+    async def _acquire_slot(self, agent: str) -> None:
+        loop = asyncio.get_running_loop()
+        fut = loop.run_in_executor(None, self._lock.acquire_llm_slot, agent, self.slot_timeout)
+        try:
+            acquired = await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            # The semaphore wait keeps going in its thread — hand the slot
+            # straight back if it is granted after we stopped caring.
+            fut.add_done_callback(
+                lambda f: self._lock.release_llm_slot(agent)
+                if not f.cancelled() and f.exception() is None and f.result() else None
+            )
+            raise
+        if not acquired:
+            raise TimeoutError(f"{agent} timed out after {self.slot_timeout}s waiting for an LLM slot")
+
+    async def _run_one(self, step: PipelineStep, timing: StepTiming, t0: float) -> Any:
+        await self._acquire_slot(step.agent_name)
+        timing.started_at = _time.perf_counter() - t0
+        try:
+            return await self._run_step(step)
+        finally:
+            timing.finished_at = _time.perf_counter() - t0
+            self._lock.release_llm_slot(step.agent_name)
+
+    async def run(self) -> DAGRunResult:
+        t0 = _time.perf_counter()
+        rank = {a: i for i, a in enumerate(self.order)}
+        timings = {a: StepTiming(agent=a) for a in self.order}
+        pending = {a: len(self.dependencies(a)) for a in self.order}
+        dependents: Dict[str, List[str]] = {a: [] for a in self.order}
+        for a in self.order:
+            for d in self.dependencies(a):
+                dependents[d].append(a)
+
+        results: Dict[str, Any] = {}
+        running: Dict[asyncio.Task, str] = {}
+        ready = [a for a in self.order if pending[a] == 0]
+        gate_failure: Optional[Dict[str, Any]] = None
+        error: Optional[BaseException] = None
+
+        try:
+            while ready or running:
+                if gate_failure is None and error is None:
+                    for agent in sorted(ready, key=rank.get):
+                        timings[agent].queued_at = _time.perf_counter() - t0
+                        task = asyncio.create_task(
+                            self._run_one(self.steps[agent], timings[agent], t0))
+                        running[task] = agent
+                ready = []
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: rank[running[t]]):
+                    agent = running.pop(task)
+                    timing = timings[agent]
+                    if task.exception() is not None:
+                        timing.status = "failed"
+                        error = error or task.exception()
+                        logger.error(f"[DAG] {agent} failed: {task.exception()}")
+                        continue
+                    result = results[agent] = task.result()
+
+                    step = self.steps[agent]
+                    if step.is_gate and result is not None:
+                        verdict = self._gate_check(step, result)
+                        if not verdict.get("passed", True):
+                            timing.status = "gate_failed"
+                            gate_failure = gate_failure or {"agent": agent, **verdict}
+                            logger.warning(f"[DAG] Gate {agent} failed: {verdict.get('reason')} — halting pipeline")
+                            continue
+                    timing.status = "done"
+                    for child in dependents[agent]:
+                        pending[child] -= 1
+                        if pending[child] == 0:
+                            ready.append(child)
+        finally:
+            for task in running:
+                task.cancel()
+
+        for timing in timings.values():
+            if timing.status == "pending":
+                timing.status = "skipped"
+        if error is not None:
+            raise error
+
+        path, path_seconds = self._critical_path(timings)
+        result = DAGRunResult(
+            results=results, timings=timings, wall_seconds=_time.perf_counter() - t0,
+            critical_path=path, critical_path_seconds=path_seconds, gate_failure=gate_failure,
+        )
+        logger.info(
+            f"[DAG] wall {result.wall_seconds:.2f}s vs serial {result.serial_seconds:.2f}s | "
+            f"critical path {' > '.join(path) or '-'} ({path_seconds:.2f}s)"
+        )
+        return result
+
+    def _critical_path(self, timings: Dict[str, StepTiming]) -> tuple:
+        """Longest chain of executed steps by measured duration."""
+        finish: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for agent in self.order:
+            if timings[agent].status not in ("done", "gate_failed"):
+                continue
+            deps = [d for d in self.dependencies(agent) if d in finish]
+            parent = max(deps, key=finish.get) if deps else None
+            finish[agent] = timings[agent].duration + (finish[parent] if parent else 0.0)
+            via[agent] = parent
+        if not finish:
+            return [], 0.0
+        tail = max(finish, key=finish.get)
+        path = [tail]
+        while via[path[-1]]:
+            path.append(via[path[-1]])
+        return path[::-1], finish[tail]